@@ -1,4 +1,4 @@
-import { readFile } from 'node:fs/promises';
+import { readdir, readFile } from 'node:fs/promises';
 import path from 'node:path';
 import { fileURLToPath } from 'node:url';
 import { after, before, beforeEach, describe, test } from 'node:test';
@@ -8,11 +8,19 @@ import {
   assertSucceeds,
   initializeTestEnvironment,
 } from '@firebase/rules-unit-testing';
-import { doc, getDoc, serverTimestamp, setDoc, Timestamp } from 'firebase/firestore';
+import {
+  deleteDoc,
+  doc,
+  getDoc,
+  serverTimestamp,
+  setDoc,
+  Timestamp,
+} from 'firebase/firestore';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 const rulesPath = path.resolve(__dirname, '../../firestore.rules');
+const casesDir = path.resolve(__dirname, '../cases');
 
 const projectId = 'quiznetic-firestore-rules-test';
 let testEnv;
@@ -80,6 +88,69 @@ function attemptPayload({
   };
 }
 
+// Cases shared with `tools/firestore_rules_eval.py`, which evaluates the same
+// files offline; running them here keeps both verdicts in agreement.
+async function loadSharedCases() {
+  const files = (await readdir(casesDir)).filter((name) => name.endsWith('.json')).sort();
+  const cases = [];
+  for (const file of files) {
+    const parsed = JSON.parse(await readFile(path.join(casesDir, file), 'utf8'));
+    cases.push(...parsed.map((entry) => ({ ...entry, file })));
+  }
+  return cases;
+}
+
+const sharedCases = await loadSharedCases();
+
+function decodeCaseValue(value) {
+  if (Array.isArray(value)) {
+    return value.map(decodeCaseValue);
+  }
+  if (value && typeof value === 'object') {
+    if (value.__serverTimestamp__) {
+      return serverTimestamp();
+    }
+    if ('__timestamp__' in value) {
+      return Timestamp.fromDate(new Date(value.__timestamp__));
+    }
+    return Object.fromEntries(
+      Object.entries(value).map(([key, entry]) => [key, decodeCaseValue(entry)]),
+    );
+  }
+  return value;
+}
+
+async function runSharedCase(sharedCase) {
+  if (sharedCase.existing) {
+    await testEnv.withSecurityRulesDisabled(async (ctx) => {
+      await setDoc(doc(ctx.firestore(), sharedCase.path), decodeCaseValue(sharedCase.existing));
+    });
+  }
+
+  const db = sharedCase.auth
+    ? testEnv.authenticatedContext(sharedCase.auth).firestore()
+    : testEnv.unauthenticatedContext().firestore();
+  const ref = doc(db, sharedCase.path);
+  let operation;
+  if (sharedCase.op === 'get') {
+    operation = getDoc(ref);
+  } else if (sharedCase.op === 'delete') {
+    operation = deleteDoc(ref);
+  } else {
+    operation = setDoc(
+      ref,
+      decodeCaseValue(sharedCase.data),
+      sharedCase.merge ? { merge: true } : {},
+    );
+  }
+
+  if (sharedCase.expect === 'allow') {
+    await assertSucceeds(operation);
+  } else {
+    await assertFails(operation);
+  }
+}
+
 before(async () => {
   const rules = await readFile(rulesPath, 'utf8');
   const emulator = parseEmulatorHost();
@@ -311,3 +382,11 @@ describe('Firestore security rules', () => {
     );
   });
 });
+
+describe('Shared rules cases', () => {
+  for (const sharedCase of sharedCases) {
+    test(`${sharedCase.file}: ${sharedCase.name}`, async () => {
+      await runSharedCase(sharedCase);
+    });
+  }
+});
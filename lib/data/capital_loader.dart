@@ -9,6 +9,7 @@ import 'dart:math';
 import 'package:flutter/services.dart' show rootBundle;
 
 import 'flag_description_loader.dart';
+import 'flag_loader.dart' show flagAssetPaths;
 import '../models/flag_question.dart';
 
 const Map<String, String> _countryCapitalByNormalizedKey = {
@@ -182,9 +183,7 @@ Future<List<FlagQuestion>> loadAllCapitals() async {
   final Map<String, dynamic> manifestMap = json.decode(manifestJson);
   final descriptions = await loadFlagDescriptions();
 
-  final flagPaths = manifestMap.keys
-      .where((path) => path.startsWith('assets/flags/'))
-      .toList();
+  final flagPaths = flagAssetPaths(manifestMap.keys);
 
   final questions = <FlagQuestion>[];
   for (final path in flagPaths) {
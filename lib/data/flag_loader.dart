@@ -18,10 +18,8 @@ Future<List<FlagQuestion>> loadAllFlags() async {
   final Map<String, dynamic> manifestMap = json.decode(manifestJson);
   final descriptions = await loadFlagDescriptions();
 
-  // 2) Filter for your flags folder
-  final flagPaths = manifestMap.keys
-      .where((path) => path.startsWith('assets/flags/'))
-      .toList();
+  // 2) Filter for your flags folder.
+  final flagPaths = flagAssetPaths(manifestMap.keys);
 
   // 3) Build your questions
   return flagPaths.map((path) {
@@ -70,6 +68,23 @@ List<FlagQuestion> prepareQuiz(List<FlagQuestion> all) {
   }).toList();
 }
 
+/// Flag image paths among asset manifest keys, one per flag.
+///
+/// Resolution variants (assets/flags/2.0x/...) belong to their main asset and
+/// must never become extra questions.
+List<String> flagAssetPaths(Iterable<String> manifestKeys) {
+  return manifestKeys
+      .where((path) => path.startsWith('assets/flags/'))
+      .where((path) => !isDensityVariantAsset(path))
+      .toList();
+}
+
+/// Whether [path] is a resolution-aware variant (e.g. `.../2.0x/x.png`).
+bool isDensityVariantAsset(String path) =>
+    _densityVariantPattern.hasMatch(path);
+
+final RegExp _densityVariantPattern = RegExp(r'/\d+(\.\d+)?x/');
+
 String _normalizeCountryKey(String raw) {
   return raw
       .toLowerCase()
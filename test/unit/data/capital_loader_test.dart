@@ -1,8 +1,13 @@
+import 'dart:convert';
+
+import 'package:flutter/services.dart';
 import 'package:flutter_test/flutter_test.dart';
 import 'package:quiznetic_flutter/data/capital_loader.dart';
 import 'package:quiznetic_flutter/models/flag_question.dart';
 
 void main() {
+  TestWidgetsFlutterBinding.ensureInitialized();
+
   group('normalizeCountryKey', () {
     test('normalizes mixed separators and casing for lookups', () {
       expect(normalizeCountryKey('United-States'), equals('united states'));
@@ -74,4 +79,55 @@ void main() {
       expect(shortQuiz, isEmpty);
     });
   });
+
+  group('loadAllCapitals', () {
+    const manifestPath = 'AssetManifest.json';
+    const descriptionsPath = 'assets/metadata/flag_descriptions.json';
+    final messenger =
+        TestDefaultBinaryMessengerBinding.instance.defaultBinaryMessenger;
+
+    ByteData encodeAsset(String value) {
+      final bytes = Uint8List.fromList(utf8.encode(value));
+      return ByteData.view(bytes.buffer);
+    }
+
+    setUp(() {
+      rootBundle.evict(manifestPath);
+      rootBundle.evict(descriptionsPath);
+      messenger.setMockMessageHandler('flutter/assets', (message) async {
+        final key = const StringCodec().decodeMessage(message);
+        if (key != manifestPath) {
+          return null;
+        }
+        return encodeAsset(
+          json.encode({
+            'assets/flags/france.png': ['assets/flags/france.png'],
+            'assets/flags/2.0x/france.png': ['assets/flags/2.0x/france.png'],
+            'assets/flags/3.0x/france.png': ['assets/flags/3.0x/france.png'],
+            'assets/flags/japan.png': ['assets/flags/japan.png'],
+            'assets/flags/1.5x/japan.png': ['assets/flags/1.5x/japan.png'],
+          }),
+        );
+      });
+    });
+
+    tearDown(() {
+      rootBundle.evict(manifestPath);
+      rootBundle.evict(descriptionsPath);
+      messenger.setMockMessageHandler('flutter/assets', null);
+    });
+
+    test('skips resolution variants of flag assets', () async {
+      final capitals = await loadAllCapitals();
+
+      expect(
+        capitals.map((question) => question.imagePath),
+        unorderedEquals(['assets/flags/france.png', 'assets/flags/japan.png']),
+      );
+      expect(
+        capitals.map((question) => question.correctAnswer),
+        unorderedEquals(['Paris', 'Tokyo']),
+      );
+    });
+  });
 }
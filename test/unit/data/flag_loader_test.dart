@@ -1,8 +1,72 @@
+import 'dart:convert';
+
+import 'package:flutter/services.dart';
 import 'package:flutter_test/flutter_test.dart';
 import 'package:quiznetic_flutter/data/flag_loader.dart';
 import 'package:quiznetic_flutter/models/flag_question.dart';
 
 void main() {
+  TestWidgetsFlutterBinding.ensureInitialized();
+
+  group('loadAllFlags', () {
+    const manifestPath = 'AssetManifest.json';
+    const descriptionsPath = 'assets/metadata/flag_descriptions.json';
+    final messenger =
+        TestDefaultBinaryMessengerBinding.instance.defaultBinaryMessenger;
+
+    ByteData encodeAsset(String value) {
+      final bytes = Uint8List.fromList(utf8.encode(value));
+      return ByteData.view(bytes.buffer);
+    }
+
+    setUp(() {
+      rootBundle.evict(manifestPath);
+      rootBundle.evict(descriptionsPath);
+      messenger.setMockMessageHandler('flutter/assets', (message) async {
+        final key = const StringCodec().decodeMessage(message);
+        if (key != manifestPath) {
+          return null;
+        }
+        return encodeAsset(
+          json.encode({
+            'assets/flags/france.png': ['assets/flags/france.png'],
+            'assets/flags/2.0x/france.png': ['assets/flags/2.0x/france.png'],
+            'assets/flags/3.0x/france.png': ['assets/flags/3.0x/france.png'],
+            'assets/flags/united_states.png': [
+              'assets/flags/united_states.png',
+            ],
+            'assets/flags/1.5x/united_states.png': [
+              'assets/flags/1.5x/united_states.png',
+            ],
+            'assets/images/logo-color.png': ['assets/images/logo-color.png'],
+          }),
+        );
+      });
+    });
+
+    tearDown(() {
+      rootBundle.evict(manifestPath);
+      rootBundle.evict(descriptionsPath);
+      messenger.setMockMessageHandler('flutter/assets', null);
+    });
+
+    test('skips resolution variants of flag assets', () async {
+      final flags = await loadAllFlags();
+
+      expect(
+        flags.map((flag) => flag.imagePath),
+        unorderedEquals([
+          'assets/flags/france.png',
+          'assets/flags/united_states.png',
+        ]),
+      );
+      expect(
+        flags.map((flag) => flag.correctAnswer),
+        unorderedEquals(['France', 'United States']),
+      );
+    });
+  });
+
   group('prepareQuiz', () {
     final all = <FlagQuestion>[
       FlagQuestion(
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""Watch-mode daemon for the review, documentation, and asset-usage agents.
+
+Each one-shot agent run pays interpreter startup, a full tree walk, and a
+full re-parse. The daemon keeps per-file results in memory, polls the
+watched paths (`lib/`, `.github/workflows/`, `firestore.rules`, `assets/`,
+`pubspec.yaml`, the Xcode project) by `stat()`, and on change re-runs only:
+
+- the `review_agent.RULES` whose input globs match a changed file
+- `documentation_agent.entry_for_file` for changed Dart files
+- `asset_usage_agent` scans for changed Dart/asset files, then `classify`
+
+Results are served as one JSON line per request over a Unix socket. Every
+request re-polls first, so an answer never predates the last save.
+
+    python3 tools/agent_daemon.py serve &
+    python3 tools/agent_daemon.py query --paths lib/main.dart --fail-on error
+    python3 tools/agent_daemon.py stop
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import asset_usage_agent
+    import review_agent
+
+# The agents are imported inside `AgentState` methods, not here, so the
+# `query`/`status`/`stop` clients start with the standard library only;
+# in a git hook, client startup is most of the feedback latency.
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_SOCKET = ROOT / "tools" / ".cache" / "agent_daemon.sock"
+WATCHED_DIRS = ("lib", ".github/workflows", "assets")
+WATCHED_FILES = (
+    "firestore.rules",
+    "pubspec.yaml",
+    "ios/Runner.xcodeproj/project.pbxproj",
+)
+LEVELS = ("error", "warning", "notice")
+
+
+def snapshot(root: Path) -> dict[str, tuple[int, int]]:
+    """`{rel_path: (mtime_ns, size)}` for every watched file."""
+    out: dict[str, tuple[int, int]] = {}
+    stack = [root / rel for rel in WATCHED_DIRS]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(Path(entry.path))
+            elif entry.is_file():
+                stat = entry.stat()
+                rel = Path(entry.path).relative_to(root).as_posix()
+                out[rel] = (stat.st_mtime_ns, stat.st_size)
+    for rel in WATCHED_FILES:
+        try:
+            stat = (root / rel).stat()
+        except OSError:
+            continue
+        out[rel] = (stat.st_mtime_ns, stat.st_size)
+    return out
+
+
+class AgentState:
+    """In-memory agent results, refreshed incrementally from file changes."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.lock = threading.Lock()
+        self.files: dict[str, tuple[int, int]] = {}
+        self.review: dict[str, list[review_agent.Finding]] = {}
+        self.docs: dict[str, tuple[Any, list[Any]]] = {}
+        self.dart_refs: dict[str, list[str]] = {}
+        self.asset_info: dict[str, dict] = {}
+        self.assets: list[asset_usage_agent.AssetRecord] = []
+        self.generation = 0
+        self.last_changed: list[str] = []
+        self.last_refresh_ms = 0.0
+
+    def refresh(self) -> list[str]:
+        """Polls once and re-runs what the changes touch; returns changed paths."""
+        with self.lock:
+            started = time.perf_counter()
+            current = snapshot(self.root)
+            changed = sorted(
+                rel
+                for rel in current.keys() | self.files.keys()
+                if current.get(rel) != self.files.get(rel)
+            )
+            if not changed:
+                return []
+            first = not self.files
+            self.files = current
+            self._refresh_review(changed, first)
+            self._refresh_docs(changed)
+            self._refresh_assets(changed, first)
+            self.generation += 1
+            self.last_changed = changed
+            self.last_refresh_ms = (time.perf_counter() - started) * 1000
+            return changed
+
+    def _refresh_review(self, changed: list[str], first: bool) -> None:
+        import review_agent
+
+        rules = review_agent.RULES if first else review_agent.rules_for_paths(changed)
+        for rule in rules:
+            self.review[rule.name] = review_agent.run_rules(self.root, [rule])
+
+    def _refresh_docs(self, changed: list[str]) -> None:
+        import documentation_agent
+
+        for rel in changed:
+            if not (rel.startswith("lib/") and rel.endswith(".dart")):
+                continue
+            path = self.root / rel
+            if rel not in self.files or not documentation_agent.should_include(Path(rel), []):
+                self.docs.pop(rel, None)
+                continue
+            self.docs[rel] = documentation_agent.entry_for_file(path)
+
+    def _refresh_assets(self, changed: list[str], first: bool) -> None:
+        import asset_usage_agent
+
+        relevant = [
+            rel
+            for rel in changed
+            if rel == "pubspec.yaml" or rel.startswith("assets/") or (
+                rel.startswith("lib/") and rel.endswith(".dart")
+            )
+        ]
+        if not relevant and not first:
+            return
+        for rel in relevant:
+            if rel.startswith("lib/"):
+                if rel in self.files:
+                    self.dart_refs[rel] = asset_usage_agent.scan_dart_file(self.root / rel)
+                else:
+                    self.dart_refs.pop(rel, None)
+            elif rel.startswith("assets/"):
+                self.asset_info.pop(rel, None)
+
+        pubspec = self.root / "pubspec.yaml"
+        declared = asset_usage_agent.parse_declared_assets(pubspec)
+        assets: dict[str, dict] = {}
+        for path in asset_usage_agent.expand_declared(declared):
+            rel = path.relative_to(self.root).as_posix()
+            info = self.asset_info.get(rel)
+            if info is None:
+                info = self.asset_info[rel] = asset_usage_agent.scan_asset_file(path)
+            assets[rel] = info
+        self.assets = asset_usage_agent.classify(
+            assets,
+            self.dart_refs,
+            asset_usage_agent.parse_build_time_references(pubspec),
+        )
+
+    def results(self, paths: list[str] | None = None) -> dict[str, Any]:
+        import review_agent
+
+        with self.lock:
+            wanted = set(paths or [])
+
+            def keep(rel: str) -> bool:
+                return not wanted or rel in wanted
+
+            findings = review_agent.sort_findings(
+                [f for group in self.review.values() for f in group if keep(f.path)]
+            )
+            entries = [self.docs[rel] for rel in sorted(self.docs) if keep(rel)]
+            unreachable = [r for r in self.assets if r.status != "used" and keep(r.path)]
+            return {
+                "generation": self.generation,
+                "files": len(self.files),
+                "last_changed": self.last_changed[:20],
+                "last_refresh_ms": round(self.last_refresh_ms, 2),
+                "review": [asdict(f) for f in findings],
+                "missing_headers": [
+                    entry.rel_path.as_posix() for entry, _ in entries if not entry.documented
+                ],
+                "missing_function_docs": [
+                    f"{f.rel_path.as_posix()}:{f.line} {f.name}"
+                    for _, functions in entries
+                    for f in functions
+                    if not f.documented
+                ],
+                "unreachable_assets": [
+                    {"path": r.path, "status": r.status, "size_bytes": r.size_bytes}
+                    for r in unreachable
+                ],
+            }
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    server: "AgentServer"
+
+    def handle(self) -> None:
+        started = time.perf_counter()
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+        except ValueError:
+            request = {}
+        command = request.get("cmd", "results")
+        state = self.server.state
+        if command == "shutdown":
+            response: dict[str, Any] = {"ok": True}
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif command == "status":
+            state.refresh()
+            response = {
+                "ok": True,
+                "pid": os.getpid(),
+                "generation": state.generation,
+                "files": len(state.files),
+                "uptime_s": round(time.time() - self.server.started_at, 1),
+            }
+        elif command == "results":
+            changed = state.refresh()
+            response = {"ok": True, "refreshed": changed[:20], **state.results(request.get("paths"))}
+        else:
+            response = {"ok": False, "error": f"unknown command `{command}`"}
+        response["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+
+class AgentServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, state: AgentState) -> None:
+        self.state = state
+        self.started_at = time.time()
+        super().__init__(str(socket_path), RequestHandler)
+
+
+def watch(state: AgentState, interval: float, stop: threading.Event) -> None:
+    while not stop.wait(interval):
+        changed = state.refresh()
+        if changed:
+            print(
+                f"[gen {state.generation}] {len(changed)} changed "
+                f"({', '.join(changed[:3])}{', ...' if len(changed) > 3 else ''}) "
+                f"refreshed in {state.last_refresh_ms:.1f}ms",
+                flush=True,
+            )
+
+
+def serve(socket_path: Path, interval: float) -> int:
+    if socket_path.exists():
+        if request(socket_path, {"cmd": "status"}) is not None:
+            print(f"ERROR: daemon already running on {socket_path}")
+            return 2
+        socket_path.unlink()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+    state = AgentState(ROOT)
+    state.refresh()
+    print(
+        f"Agent daemon: {len(state.files)} files watched, initial scan "
+        f"{state.last_refresh_ms:.0f}ms; listening on {socket_path}",
+        flush=True,
+    )
+    stop = threading.Event()
+    watcher = threading.Thread(target=watch, args=(state, interval, stop), daemon=True)
+    watcher.start()
+    server = AgentServer(socket_path, state)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+    return 0
+
+
+def request(socket_path: Path, payload: dict[str, Any], timeout: float = 10.0) -> dict | None:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(str(socket_path))
+            client.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+            chunks = []
+            while True:
+                chunk = client.recv(1 << 16)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return None
+    return json.loads(b"".join(chunks) or b"null")
+
+
+def should_fail(review: list[dict], fail_on: str) -> bool:
+    if fail_on == "none":
+        return False
+    levels = set(LEVELS[: LEVELS.index(fail_on) + 1])
+    return any(f["level"] in levels for f in review)
+
+
+def print_results(response: dict[str, Any]) -> None:
+    review = response["review"]
+    print(
+        f"Agent daemon (gen {response['generation']}, {response['elapsed_ms']}ms): "
+        f"{len(review)} review findings, {len(response['missing_headers'])} missing headers, "
+        f"{len(response['missing_function_docs'])} missing function docs, "
+        f"{len(response['unreachable_assets'])} unreachable assets."
+    )
+    for f in review:
+        print(f"[{f['level'].upper()}] {f['rule_id']} {f['path']}:{f['line']} - {f['message']}")
+    for rel in response["missing_headers"]:
+        print(f"[DOC] missing header {rel}")
+    for asset in response["unreachable_assets"]:
+        print(f"[{asset['status'].upper()}] {asset['path']} ({asset['size_bytes']:,} bytes)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Long-lived daemon serving incremental agent results over a Unix socket."
+    )
+    parser.add_argument("--socket", type=Path, default=DEFAULT_SOCKET)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    srv = sub.add_parser("serve", help="Run the daemon in the foreground.")
+    srv.add_argument("--poll-interval", type=float, default=0.5)
+
+    query = sub.add_parser("query", help="Fetch current results from the daemon.")
+    query.add_argument(
+        "--paths",
+        nargs="*",
+        default=[],
+        help="Only report results for these repo-relative paths (e.g. staged files).",
+    )
+    query.add_argument(
+        "--fail-on",
+        choices=["none", "error", "warning"],
+        default="none",
+        help="Exit non-zero when review findings at/above this severity are present.",
+    )
+    query.add_argument(
+        "--fallback",
+        action="store_true",
+        help="Compute results in-process when no daemon is listening.",
+    )
+    query.add_argument("--json", action="store_true", help="Print the raw JSON response.")
+
+    sub.add_parser("status", help="Print daemon status.")
+    sub.add_parser("stop", help="Shut the daemon down.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    socket_path = args.socket.resolve()
+    if args.command == "serve":
+        return serve(socket_path, args.poll_interval)
+
+    if args.command == "stop":
+        response = request(socket_path, {"cmd": "shutdown"})
+        print("Stopped." if response else f"No daemon on {socket_path}.")
+        return 0 if response else 1
+
+    if args.command == "status":
+        response = request(socket_path, {"cmd": "status"})
+        if response is None:
+            print(f"No daemon on {socket_path}.")
+            return 1
+        print(json.dumps(response, indent=2))
+        return 0
+
+    paths = [p.strip().removeprefix("./") for p in args.paths if p.strip()]
+    response = request(socket_path, {"cmd": "results", "paths": paths})
+    if response is None:
+        if not args.fallback:
+            print(f"No daemon on {socket_path}; start one with `agent_daemon.py serve`.")
+            return 2
+        started = time.perf_counter()
+        state = AgentState(ROOT)
+        state.refresh()
+        response = {"ok": True, **state.results(paths)}
+        response["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    if not response.get("ok"):
+        print(f"ERROR: {response.get('error')}")
+        return 2
+
+    if args.json:
+        print(json.dumps(response, indent=2))
+    else:
+        print_results(response)
+    return 1 if should_fail(response["review"], args.fail_on) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
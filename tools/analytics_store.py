@@ -0,0 +1,1164 @@
+#!/usr/bin/env python3
+"""Columnar local analytics store built from Firestore JSON exports.
+
+Ops questions such as "how many users sit in a top 100" or "attempt volume
+per difficulty per hour" have no local query path. This tool streams
+exported `users`, `users/{uid}/attempts`, `users/{uid}/scores`, and
+`leaderboard/{scope}/entries` documents into one directory of flat column
+files that are memory-mapped at query time:
+
+- numeric columns are raw native `array` buffers (`q` ints, `d` floats and
+  epoch-ms times, `b` booleans) with NaN / sentinel nulls
+- string columns are dictionary-encoded: a sorted `*.dict.json` value list
+  plus `i` codes (`-1` for null), so code order is string order
+- `uid` and `scope` carry CSR indexes (row ids grouped by value plus an
+  offsets array); each table's time column carries a sorted row-id index
+  and the matching sorted times, so equality and time-range filters are
+  slices found with `bisect`
+
+Accepted inputs (files or directories of `*.json` / `*.jsonl`):
+- JSONL or JSON arrays of `{path|__path__, ...fields}` documents (fields may
+  sit under `data`), the shape the other tools/ exporters write
+- Firestore REST documents (`{name, fields}`), or `{"documents": [...]}`
+- nested trees with `__collections__` (node-firestore-import-export)
+
+JSONL is streamed line by line and columns are flushed to disk in blocks,
+so memory holds only the string dictionaries. Other offline tools can load
+tables through `open_store()`; `attempt_risk_scorer.py score` accepts a store
+directory in place of JSONL exports.
+
+Subcommands:
+- `import`: build a store from exports (replaces an existing store).
+- `info`: tables, row counts, and columns.
+- `query`: filter, group, and aggregate one table.
+- `top`: users inside each scope's leaderboard top N.
+- `bench`: import a synthetic export and time representative queries.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import math
+import mmap
+import random
+import shutil
+import sys
+import tempfile
+import time
+from array import array
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import repeat
+from operator import floordiv
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from attempt_risk_scorer import CATEGORIES, DIFFICULTIES, EXPECTED_TOTAL_QUESTIONS, to_ms
+
+
+STORE_VERSION = 1
+MANIFEST = "manifest.json"
+FLUSH_ROWS = 1 << 16
+INT_NULL = -(1 << 63)
+TYPECODES = {"str": "i", "int": "q", "float": "d", "time": "d", "bool": "b"}
+BUCKETS_MS = {"minute": 60_000, "hour": 3_600_000, "day": 86_400_000}
+
+
+# -----------------
+# Schema
+# -----------------
+@dataclass(frozen=True)
+class TableSchema:
+    name: str
+    columns: tuple[tuple[str, str], ...]
+    time: str
+    # Secondary sort inside each index group; `-name` sorts descending.
+    order: tuple[str, ...]
+    indexes: tuple[str, ...] = ("uid", "scope")
+
+
+SCHEMAS = {
+    schema.name: schema
+    for schema in (
+        TableSchema(
+            "users",
+            (
+                ("uid", "str"),
+                ("displayName", "str"),
+                ("isAnonymous", "bool"),
+                ("createdAt", "time"),
+                ("lastSeen", "time"),
+            ),
+            time="createdAt",
+            order=("createdAt",),
+            indexes=("uid",),
+        ),
+        TableSchema(
+            "attempts",
+            (
+                ("uid", "str"),
+                ("attemptId", "str"),
+                ("scope", "str"),
+                ("categoryKey", "str"),
+                ("difficulty", "str"),
+                ("correctCount", "int"),
+                ("totalQuestions", "int"),
+                ("durationMs", "float"),
+                ("status", "str"),
+                ("source", "str"),
+                ("startedAt", "time"),
+                ("finishedAt", "time"),
+                ("createdAt", "time"),
+            ),
+            time="createdAt",
+            order=("createdAt",),
+            indexes=("uid", "scope", "difficulty", "status"),
+        ),
+        TableSchema(
+            "scores",
+            (
+                ("uid", "str"),
+                ("scope", "str"),
+                ("bestScore", "int"),
+                ("updatedAt", "time"),
+            ),
+            time="updatedAt",
+            order=("updatedAt",),
+        ),
+        TableSchema(
+            "leaderboard",
+            (
+                ("scope", "str"),
+                ("uid", "str"),
+                ("score", "int"),
+                ("displayName", "str"),
+                ("isAnonymous", "bool"),
+                ("updatedAt", "time"),
+            ),
+            time="updatedAt",
+            # Matches `compareLeaderboardEntries`, so a scope slice is ranked.
+            order=("-score", "updatedAt", "uid"),
+        ),
+    )
+}
+
+
+def route(path: str) -> tuple[str, dict[str, str]] | None:
+    """Maps a document path to `(table, fields taken from the path)`."""
+    parts = path.strip("/").split("/")
+    if parts[0] == "users" and len(parts) == 2:
+        return "users", {"uid": parts[1]}
+    if parts[0] == "users" and len(parts) == 4 and parts[2] == "attempts":
+        return "attempts", {"uid": parts[1], "attemptId": parts[3]}
+    if parts[0] == "users" and len(parts) == 4 and parts[2] == "scores":
+        return "scores", {"uid": parts[1], "scope": parts[3]}
+    if parts[0] == "leaderboard" and len(parts) == 4 and parts[2] == "entries":
+        return "leaderboard", {"scope": parts[1], "uid": parts[3]}
+    return None
+
+
+def time_ms(value: Any) -> float | None:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp() * 1000.0
+    return to_ms(value)
+
+
+def encode(kind: str, value: Any) -> Any:
+    """Python value -> column value; wrong types become the column's null."""
+    if kind == "str":
+        return value if isinstance(value, str) else None
+    if kind == "time":
+        ms = time_ms(value)
+        return math.nan if ms is None else ms
+    if kind == "bool":
+        return int(value) if isinstance(value, bool) else -1
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        if kind == "float":
+            return float(value)
+        if value == int(value) and abs(value) < 1 << 63:
+            return int(value)
+    return math.nan if kind == "float" else INT_NULL
+
+
+def is_null(kind: str, value: Any) -> bool:
+    if kind == "str" or kind == "bool":
+        return value < 0
+    if kind == "int":
+        return value == INT_NULL
+    return value != value
+
+
+# -----------------
+# Export readers
+# -----------------
+def iter_documents(path: Path) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Yields `(document path, fields)` from one export file.
+
+    JSONL is streamed; a JSON document (array, REST list, or tree) is loaded
+    whole, since the `json` module cannot stream a single value.
+    """
+    if path.suffix == ".jsonl" or _is_jsonl(path):
+        with path.open("rb") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    yield "", {}
+                    continue
+                yield from _records(record, "")
+        return
+    with path.open("rb") as handle:
+        yield from _records(json.load(handle), "")
+
+
+def _is_jsonl(path: Path) -> bool:
+    # A `.json` file whose first line is a complete value followed by more
+    # lines is JSONL under the wrong suffix.
+    with path.open("rb") as handle:
+        first = handle.readline()
+        second = handle.readline()
+    try:
+        json.loads(first)
+    except ValueError:
+        return False
+    return bool(second.strip())
+
+
+def _records(record: Any, prefix: str) -> Iterator[tuple[str, dict[str, Any]]]:
+    if isinstance(record, list):
+        for item in record:
+            yield from _records(item, prefix)
+        return
+    if not isinstance(record, dict):
+        yield "", {}
+        return
+    if isinstance(record.get("documents"), list):
+        yield from _records(record["documents"], prefix)
+        return
+    name = record.get("name")
+    if isinstance(name, str) and "/documents/" in name and isinstance(record.get("fields"), dict):
+        from firestore_standin import decode_fields  # REST exports only
+
+        yield name.split("/documents/", 1)[1], decode_fields(record["fields"])
+        return
+    path = record.get("path") or record.get("__path__")
+    if isinstance(path, str):
+        data = record.get("data") if isinstance(record.get("data"), dict) else record
+        yield path, data
+        return
+    # `{collection: {docId: {...fields, __collections__: {...}}}}` trees.
+    tree = record.get("__collections__", record)
+    for collection, docs in tree.items():
+        if not isinstance(docs, dict):
+            yield "", {}
+            continue
+        for doc_id, fields in docs.items():
+            if not isinstance(fields, dict):
+                yield "", {}
+                continue
+            doc_path = f"{prefix}{collection}/{doc_id}"
+            yield doc_path, {k: v for k, v in fields.items() if k != "__collections__"}
+            if isinstance(fields.get("__collections__"), dict):
+                yield from _records({"__collections__": fields["__collections__"]}, doc_path + "/")
+
+
+def expand_inputs(paths: Iterable[Path]) -> list[Path]:
+    files: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*") if p.suffix in (".json", ".jsonl")))
+        else:
+            files.append(path)
+    return files
+
+
+# -----------------
+# Import
+# -----------------
+class ColumnWriter:
+    """Appends one column to `<dir>/<name>.col` in fixed-size blocks."""
+
+    def __init__(self, directory: Path, name: str, kind: str) -> None:
+        self.path = directory / f"{name}.col"
+        self.kind = kind
+        self.buffer = array(TYPECODES[kind])
+        self.handle = self.path.open("wb")
+        # Provisional first-seen codes; remapped to sorted order on close.
+        self.codes: dict[str, int] | None = {} if kind == "str" else None
+
+    def append(self, value: Any) -> None:
+        if self.codes is not None:
+            if value is None:
+                value = -1
+            else:
+                code = self.codes.get(value)
+                if code is None:
+                    code = self.codes[value] = len(self.codes)
+                value = code
+        self.buffer.append(value)
+        if len(self.buffer) >= FLUSH_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        self.buffer.tofile(self.handle)
+        del self.buffer[:]
+
+    def close(self) -> list[str] | None:
+        self.flush()
+        self.handle.close()
+        if self.codes is None:
+            return None
+        values = sorted(self.codes)
+        rank = {value: i for i, value in enumerate(values)}
+        remap = array("i", bytes(4 * len(values)))
+        for value, code in self.codes.items():
+            remap[code] = rank[value]
+        with self.path.open("r+b") as handle:
+            while True:
+                start = handle.tell()
+                block = array("i")
+                try:
+                    block.fromfile(handle, FLUSH_ROWS)
+                except EOFError:
+                    pass
+                if not block:
+                    break
+                block = array("i", (remap[c] if c >= 0 else -1 for c in block))
+                handle.seek(start)
+                block.tofile(handle)
+        return values
+
+
+class TableWriter:
+    def __init__(self, root: Path, schema: TableSchema) -> None:
+        self.schema = schema
+        self.directory = root / schema.name
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.writers = [(name, ColumnWriter(self.directory, name, kind)) for name, kind in schema.columns]
+        self.kinds = dict(schema.columns)
+        self.rows = 0
+
+    def append(self, fields: dict[str, Any]) -> None:
+        for name, writer in self.writers:
+            writer.append(encode(self.kinds[name], fields.get(name)))
+        self.rows += 1
+
+    def close(self) -> dict[str, Any]:
+        columns: dict[str, Any] = {}
+        for name, writer in self.writers:
+            values = writer.close()
+            columns[name] = {"kind": writer.kind, "typecode": TYPECODES[writer.kind]}
+            if values is not None:
+                (self.directory / f"{name}.dict.json").write_text(json.dumps(values), encoding="utf-8")
+                columns[name]["distinct"] = len(values)
+        return {"rows": self.rows, "columns": columns}
+
+
+def normalize(table: str, from_path: dict[str, str], data: dict[str, Any]) -> dict[str, Any]:
+    fields = {**data, **from_path}
+    if table == "attempts":
+        category, difficulty = data.get("categoryKey"), data.get("difficulty")
+        if isinstance(category, str) and isinstance(difficulty, str):
+            fields["scope"] = f"{category}_{difficulty}"
+        # Older attempts predate the server `createdAt`; fall back to finish time.
+        if time_ms(data.get("createdAt")) is None:
+            fields["createdAt"] = data.get("finishedAt")
+    return fields
+
+
+def import_exports(store: Path, inputs: list[Path]) -> dict[str, Any]:
+    """Builds a store from export files; replaces `store` only on success."""
+    if store.exists() and not (store / MANIFEST).exists() and any(store.iterdir()):
+        raise ValueError(f"{store} exists and is not an analytics store")
+    store.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{store.name}-", dir=store.parent))
+    try:
+        started = time.perf_counter()
+        writers = {name: TableWriter(staging, schema) for name, schema in SCHEMAS.items()}
+        documents = skipped = 0
+        files = expand_inputs(inputs)
+        for path in files:
+            for doc_path, data in iter_documents(path):
+                documents += 1
+                routed = route(doc_path) if doc_path else None
+                if routed is None:
+                    skipped += 1
+                    continue
+                table, from_path = routed
+                writers[table].append(normalize(table, from_path, data))
+        tables = {name: writer.close() for name, writer in writers.items()}
+        for name, schema in SCHEMAS.items():
+            tables[name]["order"] = list(schema.order)
+        parsed = time.perf_counter()
+        manifest = {
+            "version": STORE_VERSION,
+            "byteorder": sys.byteorder,
+            "sources": [str(path) for path in files],
+            "documents": documents,
+            "skipped": skipped,
+            "tables": tables,
+        }
+        for name, schema in SCHEMAS.items():
+            tables[name]["indexes"] = build_indexes(Table(staging, name, tables[name]), schema)
+        manifest["import_seconds"] = round(parsed - started, 3)
+        manifest["index_seconds"] = round(time.perf_counter() - parsed, 3)
+        (staging / MANIFEST).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+        if store.exists():
+            shutil.rmtree(store)
+        staging.rename(store)
+        return manifest
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def _sort_key(table: Table, name: str) -> Callable[[int], Any]:
+    descending = name.startswith("-")
+    name = name.lstrip("-")
+    column = table.column(name)
+    kind = table.kind(name)
+    if kind in ("time", "float"):
+        # Nulls sort last either way.
+        if descending:
+            return lambda row: -column[row] if column[row] == column[row] else math.inf
+        return lambda row: column[row] if column[row] == column[row] else math.inf
+    if descending:
+        return lambda row: -column[row] if column[row] != INT_NULL else math.inf
+    return column.__getitem__
+
+
+def build_indexes(table: Table, schema: TableSchema) -> dict[str, str]:
+    built: dict[str, str] = {}
+    secondary = [_sort_key(table, name) for name in schema.order]
+    for name in schema.indexes:
+        codes = table.column(name)
+        rows = [row for row in range(table.rows) if codes[row] >= 0]
+        rows.sort(key=lambda row: (codes[row], *(key(row) for key in secondary)))
+        counts = Counter(map(codes.__getitem__, rows))
+        offsets = array("Q", [0])
+        for code in range(len(table.values(name))):
+            offsets.append(offsets[-1] + counts.get(code, 0))
+        _write(table.directory / f"{name}.idx", array("I", rows))
+        _write(table.directory / f"{name}.off", offsets)
+        built[name] = "csr"
+
+    times = table.column(schema.time)
+    rows = [row for row in range(table.rows) if times[row] == times[row]]
+    rows.sort(key=times.__getitem__)
+    _write(table.directory / f"{schema.time}.idx", array("I", rows))
+    _write(table.directory / f"{schema.time}.sorted", array("d", map(times.__getitem__, rows)))
+    built[schema.time] = "sorted"
+    return built
+
+
+def _write(path: Path, values: array) -> None:
+    with path.open("wb") as handle:
+        values.tofile(handle)
+
+
+# -----------------
+# Reading
+# -----------------
+class Table:
+    """One memory-mapped table; columns come back as typed `memoryview`s."""
+
+    def __init__(self, root: Path, name: str, meta: dict[str, Any]) -> None:
+        self.name = name
+        self.directory = root / name
+        self.meta = meta
+        self.rows: int = meta["rows"]
+        self._views: dict[str, Sequence[Any]] = {}
+        self._values: dict[str, list[str]] = {}
+
+    def kind(self, column: str) -> str:
+        try:
+            return self.meta["columns"][column]["kind"]
+        except KeyError:
+            raise KeyError(f"unknown column {self.name}.{column}") from None
+
+    def column(self, name: str) -> Sequence[Any]:
+        """Codes for string columns, values otherwise."""
+        self.kind(name)
+        return self._map(f"{name}.col", self.meta["columns"][name]["typecode"])
+
+    def values(self, name: str) -> list[str]:
+        if name not in self._values:
+            path = self.directory / f"{name}.dict.json"
+            self._values[name] = json.loads(path.read_text(encoding="utf-8"))
+        return self._values[name]
+
+    def code(self, name: str, value: str) -> int:
+        """Dictionary code for `value`, or `-1` if it never occurs."""
+        values = self.values(name)
+        pos = bisect.bisect_left(values, value)
+        return pos if pos < len(values) and values[pos] == value else -1
+
+    def rows_equal(self, name: str, value: str) -> Sequence[int]:
+        """Row ids where `name == value`, via the CSR index."""
+        code = self.code(name, value)
+        if code < 0:
+            return ()
+        offsets = self._map(f"{name}.off", "Q")
+        return self._map(f"{name}.idx", "I")[offsets[code] : offsets[code + 1]]
+
+    def groups(self, name: str) -> Iterator[tuple[str, Sequence[int]]]:
+        """`(value, row ids)` for every value of an indexed column."""
+        offsets = self._map(f"{name}.off", "Q")
+        index = self._map(f"{name}.idx", "I")
+        for code, value in enumerate(self.values(name)):
+            yield value, index[offsets[code] : offsets[code + 1]]
+
+    def group_sizes(self, name: str) -> list[int]:
+        """Row count per dictionary code of an indexed column."""
+        offsets = self._map(f"{name}.off", "Q")
+        return [offsets[code + 1] - offsets[code] for code in range(len(offsets) - 1)]
+
+    def time_index(self, name: str) -> tuple[Sequence[float], Sequence[int]]:
+        """Sorted non-null times and the row ids in that order."""
+        return self._map(f"{name}.sorted", "d"), self._map(f"{name}.idx", "I")
+
+    def rows_between(self, name: str, low: float = -math.inf, high: float = math.inf) -> Sequence[int]:
+        """Row ids with `low <= name < high`, via the sorted time index."""
+        ordered, index = self.time_index(name)
+        return index[bisect.bisect_left(ordered, low) : bisect.bisect_left(ordered, high)]
+
+    def indexed(self, name: str) -> str | None:
+        return self.meta.get("indexes", {}).get(name)
+
+    def _map(self, filename: str, typecode: str) -> Sequence[Any]:
+        view = self._views.get(filename)
+        if view is None:
+            path = self.directory / filename
+            if path.stat().st_size == 0:
+                view = array(typecode)
+            else:
+                with path.open("rb") as handle:
+                    view = memoryview(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)).cast(typecode)
+            self._views[filename] = view
+        return view
+
+
+class AnalyticsStore:
+    def __init__(self, root: Path) -> None:
+        manifest_path = root / MANIFEST
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"not an analytics store: {root}")
+        self.root = root
+        self.manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if self.manifest.get("version") != STORE_VERSION:
+            raise ValueError(f"unsupported store version {self.manifest.get('version')}; re-import")
+        if self.manifest.get("byteorder") != sys.byteorder:
+            raise ValueError("store was built on a machine with a different byte order; re-import")
+        self.tables = {
+            name: Table(root, name, meta) for name, meta in self.manifest["tables"].items()
+        }
+
+    def table(self, name: str) -> Table:
+        try:
+            return self.tables[name]
+        except KeyError:
+            raise KeyError(f"unknown table {name!r}; have {', '.join(self.tables)}") from None
+
+
+def open_store(root: Path) -> AnalyticsStore:
+    return AnalyticsStore(root)
+
+
+# -----------------
+# Queries
+# -----------------
+OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+@dataclass(frozen=True)
+class Filter:
+    column: str
+    op: str
+    value: Any
+
+
+def parse_filter(text: str) -> Filter:
+    """Parses `column<op>value`, e.g. `status=accepted` or `createdAt>=2026-03-01`."""
+    for op in ("==", "!=", "<=", ">=", "=", "<", ">"):
+        column, found, value = text.partition(op)
+        if found and column.strip():
+            return Filter(column.strip(), "==" if op == "=" else op, value.strip())
+    raise ValueError(f"cannot parse filter {text!r}; use column=value, column>=value, ...")
+
+
+def coerce(table: Table, column: str, raw: Any, op: str = "==") -> Any:
+    """Filter operand -> column value space (code, int, bool int, or ms)."""
+    kind = table.kind(column)
+    if kind == "str":
+        # Codes follow string order, so an absent value still has a position.
+        values = table.values(column)
+        pos = bisect.bisect_left(values, str(raw))
+        if pos < len(values) and values[pos] == raw:
+            return pos
+        return -2 if op in ("==", "!=") else pos - (0.5 if op in ("<=", ">") else 0)
+    if kind == "bool":
+        return 1 if str(raw).lower() in ("1", "true", "yes") else 0
+    if kind == "time":
+        if isinstance(raw, str) and raw.replace(".", "", 1).isdigit():
+            raw = float(raw)
+        value = time_ms(raw)
+        if value is None:
+            raise ValueError(f"cannot read {raw!r} as a time for {column}")
+        return value
+    return float(raw) if kind == "float" else int(raw)
+
+
+def select_rows(table: Table, filters: list[Filter]) -> Sequence[int]:
+    """Row ids matching every filter; starts from the narrowest index slice."""
+    candidates: list[tuple[int, Sequence[int], set[int]]] = []
+    low: dict[str, float] = defaultdict(lambda: -math.inf)
+    high: dict[str, float] = defaultdict(lambda: math.inf)
+    ranged: dict[str, set[int]] = defaultdict(set)
+    for position, f in enumerate(filters):
+        index = table.indexed(f.column)
+        if index == "csr" and f.op == "==":
+            rows = table.rows_equal(f.column, f.value)
+            candidates.append((len(rows), rows, {position}))
+        elif index == "sorted" and f.op in (">=", ">", "<", "<="):
+            value = coerce(table, f.column, f.value)
+            if f.op in (">=", ">"):
+                # `>` is refined by the residual check below.
+                low[f.column] = max(low[f.column], value)
+            else:
+                high[f.column] = min(high[f.column], math.nextafter(value, math.inf) if f.op == "<=" else value)
+            if f.op in (">=", "<"):
+                ranged[f.column].add(position)
+    for column in low.keys() | high.keys():
+        rows = table.rows_between(column, low[column], high[column])
+        candidates.append((len(rows), rows, ranged[column]))
+
+    if candidates:
+        _, rows, covered = min(candidates, key=lambda c: c[0])
+    else:
+        rows, covered = range(table.rows), set()
+    for position, f in enumerate(filters):
+        if position in covered:
+            continue
+        column = table.column(f.column)
+        value = coerce(table, f.column, f.value, f.op)
+        test = OPERATORS[f.op]
+        kind = table.kind(f.column)
+        if f.op == "!=":
+            # SQL-style: nulls never match a comparison.
+            rows = [r for r in rows if not is_null(kind, column[r]) and column[r] != value]
+        elif f.op == "==":
+            rows = [r for r in rows if column[r] == value]
+        else:
+            rows = [r for r in rows if not is_null(kind, column[r]) and test(column[r], value)]
+    return rows
+
+
+def gather(table: Table, column: Sequence[Any], rows: Sequence[int]) -> Iterable[Any]:
+    """Column values for `rows`; a full scan iterates the mapped buffer directly."""
+    if isinstance(rows, range) and len(rows) == table.rows:
+        return column
+    return map(column.__getitem__, rows)
+
+
+def _key_getter(table: Table, key: str, rows: Sequence[int]) -> tuple[Iterable[Any], Callable[[Any], Any]]:
+    """Per-row key values for `column` or `column:hour`, plus a decoder."""
+    name, _, bucket = key.partition(":")
+    column = table.column(name)
+    kind = table.kind(name)
+    values = gather(table, column, rows)
+    if bucket:
+        if kind != "time" or bucket not in BUCKETS_MS:
+            raise ValueError(f"bucket {key!r} needs a time column and one of {', '.join(BUCKETS_MS)}")
+        size = BUCKETS_MS[bucket]
+        labels: dict[float, str] = {}
+
+        def label(b: float) -> str | None:
+            if b != b:
+                return None
+            if b not in labels:
+                moment = datetime.fromtimestamp(b * size / 1000, tz=timezone.utc)
+                labels[b] = moment.strftime("%Y-%m-%dT%H:%MZ")
+            return labels[b]
+
+        return map(floordiv, values, repeat(size)), label
+    if kind == "str":
+        names = table.values(name)
+        return values, lambda c: names[c] if c >= 0 else None
+    if kind == "time":
+        return values, lambda v: None if v != v else v
+    if kind == "bool":
+        return values, lambda v: None if v < 0 else bool(v)
+    return values, lambda v: None if v == INT_NULL else v
+
+
+def _bucket_walk(
+    table: Table,
+    filters: list[Filter],
+    group_by: Sequence[str],
+    function: str,
+    target: str,
+) -> dict[tuple[Any, ...], int] | None:
+    """Counts per time bucket (and at most one other key), or distinct values
+    per bucket, by walking the sorted time index bucket by bucket; `None`
+    when the query does not fit."""
+    buckets = [key for key in group_by if ":" in key]
+    if len(buckets) != 1 or len(group_by) > 2:
+        return None
+    if function == "distinct" and (len(group_by) > 1 or table.kind(target) not in ("str", "int", "bool")):
+        return None
+    if function not in ("count", "distinct"):
+        return None
+    name, _, unit = buckets[0].partition(":")
+    if (
+        table.indexed(name) != "sorted"
+        or unit not in BUCKETS_MS
+        or any(f.column != name or f.op not in (">=", "<") for f in filters)
+    ):
+        return None
+    low = max((coerce(table, name, f.value) for f in filters if f.op == ">="), default=-math.inf)
+    high = min((coerce(table, name, f.value) for f in filters if f.op == "<"), default=math.inf)
+    ordered, index = table.time_index(name)
+    pos = bisect.bisect_left(ordered, low)
+    end = bisect.bisect_left(ordered, high)
+    others = [key for key in group_by if key != buckets[0]]
+    codes = table.column(others[0]) if others else None
+    bucket_first = group_by[0] == buckets[0]
+    size = BUCKETS_MS[unit]
+    results: dict[tuple[Any, ...], int] = {}
+    if function == "distinct":
+        column = table.column(target)
+        null = INT_NULL if table.kind(target) == "int" else -1
+        while pos < end:
+            bucket = ordered[pos] // size
+            stop = bisect.bisect_left(ordered, (bucket + 1) * size, pos, end)
+            seen = set(map(column.__getitem__, index[pos:stop]))
+            seen.discard(null)
+            if seen:
+                results[(bucket,)] = len(seen)
+            pos = stop
+        return results
+    if others and table.indexed(others[0]) == "csr" and table.meta.get("order", [None])[0] == name:
+        sizes = table.group_sizes(others[0])
+        if sum(sizes) == table.rows:
+            # Index groups are already in time order: bucket edges are
+            # bisections inside each group, independent of the row count.
+            times = table.column(name).__getitem__
+            for code, (_, group) in enumerate(table.groups(others[0])):
+                pos = bisect.bisect_left(group, low, key=times)
+                end = bisect.bisect_left(group, high, pos, key=times)
+                while pos < end:
+                    bucket = times(group[pos]) // size
+                    stop = bisect.bisect_left(group, (bucket + 1) * size, pos, end, key=times)
+                    results[(bucket, code) if bucket_first else (code, bucket)] = stop - pos
+                    pos = stop
+            return results
+    while pos < end:
+        bucket = ordered[pos] // size
+        stop = bisect.bisect_left(ordered, (bucket + 1) * size, pos, end)
+        if codes is None:
+            results[(bucket,)] = stop - pos
+        else:
+            for code, count in Counter(map(codes.__getitem__, index[pos:stop])).items():
+                results[(bucket, code) if bucket_first else (code, bucket)] = count
+        pos = stop
+    return results
+
+
+def _grouped(
+    table: Table,
+    rows: Sequence[int],
+    group_by: Sequence[str],
+    unfiltered: bool,
+    function: str,
+    target: str,
+) -> dict[tuple[Any, ...], Any]:
+    """Aggregates `rows` per group; keys are tuples of raw column values."""
+    streams = [_key_getter(table, key, rows)[0] for key in group_by]
+    # One group column keeps scalar keys (no per-row tuples) until the end.
+    if not streams:
+        keys: Iterable[Any] = repeat(None, len(rows))
+    elif len(streams) == 1:
+        keys = streams[0]
+    else:
+        keys = zip(*streams)
+
+    results: dict[Any, Any]
+    if function == "count":
+        if not streams:
+            results = {None: len(rows)} if rows else {}
+        elif len(streams) == 1 and unfiltered and table.indexed(group_by[0]) == "csr":
+            # Group sizes are offset differences; nulls are not indexed.
+            results = {code: size for code, size in enumerate(table.group_sizes(group_by[0])) if size}
+            nulls = table.rows - sum(results.values())
+            if nulls:
+                results[-1] = nulls
+        else:
+            results = Counter(keys)
+    elif function == "distinct":
+        kind = table.kind(target)
+        pairs = set(zip(keys, gather(table, table.column(target), rows)))
+        results = Counter(key for key, value in pairs if not is_null(kind, value))
+    else:
+        kind = table.kind(target)
+        totals: dict[Any, list[float]] = {}
+        for key, value in zip(keys, gather(table, table.column(target), rows)):
+            if is_null(kind, value):
+                continue
+            slot = totals.get(key)
+            if slot is None:
+                totals[key] = [value, 1, value, value]
+            else:
+                slot[0] += value
+                slot[1] += 1
+                if value < slot[2]:
+                    slot[2] = value
+                if value > slot[3]:
+                    slot[3] = value
+        pick = {
+            "sum": lambda slot: slot[0],
+            "avg": lambda slot: round(slot[0] / slot[1], 4),
+            "min": lambda slot: slot[2],
+            "max": lambda slot: slot[3],
+        }[function]
+        results = {key: pick(slot) for key, slot in totals.items()}
+
+    if not streams:
+        return {(): value for value in results.values()}
+    if len(streams) == 1:
+        return {(key,): value for key, value in results.items()}
+    return dict(results)
+
+
+def aggregate(
+    table: Table,
+    filters: Sequence[Filter] = (),
+    group_by: Sequence[str] = (),
+    agg: str = "count",
+) -> list[dict[str, Any]]:
+    """`count`, `sum:col`, `avg:col`, `min:col`, `max:col`, or `distinct:col` per group."""
+    function, _, target = agg.partition(":")
+    if function not in ("count", "sum", "avg", "min", "max", "distinct") or (function != "count") != bool(target):
+        raise ValueError(f"unsupported aggregate {agg!r}")
+    unfiltered = not filters
+    filters = list(filters)
+    for key in group_by:
+        name, _, bucket = key.partition(":")
+        if bucket and not any(f.column == name for f in filters):
+            # Buckets need a time; this also routes through the time index.
+            filters.append(Filter(name, ">=", -math.inf))
+
+    results = _bucket_walk(table, filters, group_by, function, target)
+    if results is None:
+        rows = select_rows(table, filters)
+        results = _grouped(table, rows, group_by, unfiltered, function, target)
+
+    decoders = [_key_getter(table, key, ())[1] for key in group_by]
+    out = [
+        {
+            **{name: decode(part) for name, decode, part in zip(group_by, decoders, key)},
+            agg: value,
+        }
+        for key, value in results.items()
+    ]
+    out.sort(key=lambda row: tuple((row[name] is None, row[name] if row[name] is not None else "") for name in group_by))
+    return out
+
+
+def top_membership(store: AnalyticsStore, n: int) -> dict[str, Any]:
+    """Users inside each scope's top `n` (leaderboard order) and across scopes."""
+    table = store.table("leaderboard")
+    uid = table.column("uid")
+    uids = table.values("uid")
+    scopes: dict[str, dict[str, Any]] = {}
+    members: Counter[int] = Counter()
+    for scope, rows in table.groups("scope"):
+        top = rows[:n]
+        members.update(map(uid.__getitem__, top))
+        scopes[scope] = {"entries": len(rows), "in_top": len(top)}
+    return {
+        "top": n,
+        "scopes": scopes,
+        "distinct_users_in_any_top": len(members),
+        "users_in_multiple_tops": sum(1 for count in members.values() if count > 1),
+        "most_tops": [
+            {"uid": uids[code], "scopes": count} for code, count in members.most_common(5) if count > 1
+        ],
+    }
+
+
+# -----------------
+# Synthetic export + bench
+# -----------------
+def generate_export(path: Path, users: int, attempts: int, seed: int) -> int:
+    """Writes users, attempts, scores, and leaderboard docs as one JSONL file."""
+    rng = random.Random(seed)
+    start = datetime(2026, 3, 1, tzinfo=timezone.utc).timestamp() * 1000.0
+    written = 0
+    per_user = max(1, attempts // max(1, users))
+    with path.open("w", encoding="utf-8", buffering=1 << 20) as handle:
+
+        def emit(doc: dict[str, Any]) -> None:
+            nonlocal written
+            handle.write(json.dumps(doc, separators=(",", ":")) + "\n")
+            written += 1
+
+        remaining = attempts
+        for index in range(users):
+            uid = f"user{index:07d}"
+            anonymous = rng.random() < 0.4
+            name = f"Guest {uid[-4:]}" if anonymous else f"Player {index}"
+            joined = start + rng.uniform(0, 14 * 86_400_000)
+            emit({"path": f"users/{uid}", "displayName": name, "isAnonymous": anonymous,
+                  "createdAt": joined, "lastSeen": joined + rng.uniform(0, 86_400_000)})
+            count = remaining if index == users - 1 else min(remaining, max(1, int(rng.expovariate(1 / per_user))))
+            remaining -= count
+            best: dict[str, tuple[int, float]] = {}
+            skill = rng.betavariate(4, 2)
+            # Each player is active for up to a week after joining.
+            finishes = sorted(joined + rng.uniform(0, 7 * 86_400_000) for _ in range(count))
+            for n, t in enumerate(finishes):
+                category = rng.choice(CATEGORIES)
+                difficulty = rng.choices(DIFFICULTIES, weights=(5, 3, 2))[0]
+                total = EXPECTED_TOTAL_QUESTIONS[difficulty]
+                correct = sum(1 for _ in range(total) if rng.random() < skill)
+                duration = total * rng.uniform(2_500, 7_000)
+                scope = f"{category}_{difficulty}"
+                emit({"path": f"users/{uid}/attempts/{uid}-{n}", "categoryKey": category,
+                      "difficulty": difficulty, "correctCount": correct, "totalQuestions": total,
+                      "startedAt": t - duration, "finishedAt": t, "durationMs": duration,
+                      "status": "accepted", "source": "callable", "createdAt": t + 40})
+                if correct > best.get(scope, (-1, 0.0))[0]:
+                    best[scope] = (correct, t)
+            for scope, (score, updated) in best.items():
+                emit({"path": f"users/{uid}/scores/{scope}", "bestScore": score, "updatedAt": updated})
+                emit({"path": f"leaderboard/{scope}/entries/{uid}", "score": score, "uid": uid,
+                      "displayName": name, "isAnonymous": anonymous, "updatedAt": updated})
+    return written
+
+
+BENCH_QUERIES: tuple[tuple[str, str, tuple[str, ...], tuple[str, ...], str], ...] = (
+    ("attempts per difficulty per hour", "attempts", (), ("difficulty", "createdAt:hour"), "count"),
+    ("attempts per scope", "attempts", (), ("scope",), "count"),
+    ("one user's attempts", "attempts", ("uid=user0000042",), (), "count"),
+    ("one day, mean score by scope", "attempts",
+     ("createdAt>=2026-03-03T00:00:00Z", "createdAt<2026-03-04T00:00:00Z"), ("scope",), "avg:correctCount"),
+    ("active users per day", "attempts", (), ("createdAt:day",), "distinct:uid"),
+    ("expert perfect scores", "attempts", ("difficulty=expert", "correctCount>=50"), (), "count"),
+    ("anonymous leaderboard entries per scope", "leaderboard", ("isAnonymous=true",), ("scope",), "count"),
+)
+
+
+def time_call(fn: Callable[[], Any], repeat_count: int) -> tuple[float, Any]:
+    best, result = math.inf, None
+    for _ in range(repeat_count):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0, result
+
+
+def bench(args: argparse.Namespace) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="analytics-store-") as tmp:
+        export = Path(tmp) / "export.jsonl"
+        started = time.perf_counter()
+        documents = generate_export(export, args.users, args.attempts, args.seed)
+        generated = time.perf_counter() - started
+        manifest = import_exports(Path(tmp) / "store", [export])
+        store = open_store(Path(tmp) / "store")
+        queries = []
+        for label, table, filters, group_by, agg in BENCH_QUERIES:
+            parsed = [parse_filter(text) for text in filters]
+            ms, rows = time_call(
+                lambda: aggregate(store.table(table), parsed, group_by, agg), args.repeat
+            )
+            queries.append({"query": label, "table": table, "ms": round(ms, 2), "groups": len(rows)})
+        ms, top = time_call(lambda: top_membership(store, 100), args.repeat)
+        queries.append({
+            "query": "users in any scope's top 100", "table": "leaderboard", "ms": round(ms, 2),
+            "groups": top["distinct_users_in_any_top"],
+        })
+        size = sum(path.stat().st_size for path in (Path(tmp) / "store").rglob("*") if path.is_file())
+        return {
+            "documents": documents,
+            "export_bytes": export.stat().st_size,
+            "store_bytes": size,
+            "rows": {name: meta["rows"] for name, meta in manifest["tables"].items()},
+            "generate_seconds": round(generated, 2),
+            "import_seconds": manifest["import_seconds"],
+            "index_seconds": manifest["index_seconds"],
+            "queries": queries,
+        }
+
+
+def render_summary_markdown(result: dict[str, Any]) -> str:
+    rows = result["rows"]
+    lines = [
+        "## Analytics Store",
+        "",
+        f"- Imported **{result['documents']:,}** documents ({result['export_bytes'] / 1e6:.1f} MB JSONL) in "
+        f"{result['import_seconds']}s + {result['index_seconds']}s indexing; store {result['store_bytes'] / 1e6:.1f} MB",
+        "- Rows: " + ", ".join(f"{name} {count:,}" for name, count in rows.items()),
+        "",
+        "| Query | Table | Groups | ms (best) |",
+        "| --- | --- | ---: | ---: |",
+    ]
+    for query in result["queries"]:
+        lines.append(f"| {query['query']} | {query['table']} | {query['groups']:,} | {query['ms']} |")
+    return "\n".join(lines) + "\n"
+
+
+# -----------------
+# CLI
+# -----------------
+def print_rows(rows: list[dict[str, Any]], as_json: bool) -> None:
+    if as_json:
+        print(json.dumps(rows, indent=2))
+        return
+    if not rows:
+        print("(no rows)")
+        return
+    headers = list(rows[0])
+    cells = [[("" if row[h] is None else str(row[h])) for h in headers] for row in rows]
+    widths = [max(len(h), *(len(c[i]) for c in cells)) for i, h in enumerate(headers)]
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)).rstrip())
+    for line in cells:
+        print("  ".join(c.ljust(w) for c, w in zip(line, widths)).rstrip())
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Columnar, memory-mapped analytics over Firestore JSON exports.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = sub.add_parser("import", help="Build a store from export files or directories.")
+    import_parser.add_argument("store", type=Path)
+    import_parser.add_argument("inputs", type=Path, nargs="+")
+
+    info_parser = sub.add_parser("info", help="Show tables, row counts, and columns.")
+    info_parser.add_argument("store", type=Path)
+
+    query_parser = sub.add_parser("query", help="Filter, group, and aggregate one table.")
+    query_parser.add_argument("store", type=Path)
+    query_parser.add_argument("table", choices=sorted(SCHEMAS))
+    query_parser.add_argument(
+        "--where",
+        action="append",
+        default=[],
+        help="Filter such as status=accepted or createdAt>=2026-03-01 (repeatable).",
+    )
+    query_parser.add_argument(
+        "--group-by",
+        nargs="+",
+        default=[],
+        help="Columns, or time buckets like createdAt:hour (minute, hour, day).",
+    )
+    query_parser.add_argument("--agg", default="count", help="count, sum:col, avg:col, min:col, max:col, distinct:col")
+    query_parser.add_argument("--json", action="store_true")
+
+    top_parser = sub.add_parser("top", help="Users inside each scope's leaderboard top N.")
+    top_parser.add_argument("store", type=Path)
+    top_parser.add_argument("--n", type=int, default=100)
+    top_parser.add_argument("--json", action="store_true")
+
+    bench_parser = sub.add_parser("bench", help="Import a synthetic export and time representative queries.")
+    bench_parser.add_argument("--users", type=int, default=10_000)
+    bench_parser.add_argument("--attempts", type=int, default=200_000)
+    bench_parser.add_argument("--seed", type=int, default=31)
+    bench_parser.add_argument("--repeat", type=int, default=3)
+    bench_parser.add_argument("--summary-file", type=Path)
+    bench_parser.add_argument("--json-file", type=Path)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    if args.command == "bench":
+        result = bench(args)
+        summary = render_summary_markdown(result)
+        print(summary, end="")
+        if args.summary_file:
+            args.summary_file.parent.mkdir(parents=True, exist_ok=True)
+            with args.summary_file.open("a", encoding="utf-8") as handle:
+                handle.write(summary)
+        if args.json_file:
+            args.json_file.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        return 0
+
+    if args.command == "import":
+        missing = [path for path in args.inputs if not path.exists()]
+        if missing:
+            print(f"ERROR: input not found: {missing[0]}")
+            return 2
+        try:
+            manifest = import_exports(args.store, args.inputs)
+        except ValueError as error:
+            print(f"ERROR: {error}")
+            return 2
+        rows = ", ".join(f"{name} {meta['rows']:,}" for name, meta in manifest["tables"].items())
+        print(
+            f"Imported {manifest['documents']:,} documents ({manifest['skipped']:,} skipped) into "
+            f"{args.store} in {manifest['import_seconds']}s + {manifest['index_seconds']}s indexing: {rows}"
+        )
+        return 0
+
+    try:
+        store = open_store(args.store)
+    except (FileNotFoundError, ValueError) as error:
+        print(f"ERROR: {error}")
+        return 2
+
+    if args.command == "info":
+        print(f"{args.store}: {store.manifest['documents']:,} documents from {len(store.manifest['sources'])} files")
+        for name, table in store.tables.items():
+            columns = ", ".join(
+                f"{column}:{meta['kind']}" for column, meta in table.meta["columns"].items()
+            )
+            indexes = ", ".join(table.meta.get("indexes", {}))
+            print(f"- {name}: {table.rows:,} rows; indexes {indexes}; {columns}")
+        return 0
+
+    if args.command == "top":
+        result = top_membership(store, args.n)
+        if args.json:
+            print(json.dumps(result, indent=2))
+            return 0
+        for scope, stats in result["scopes"].items():
+            print(f"{scope}: {stats['in_top']} of {stats['entries']:,} entries in the top {args.n}")
+        print(
+            f"Distinct users in any top {args.n}: {result['distinct_users_in_any_top']:,} "
+            f"({result['users_in_multiple_tops']:,} in more than one)"
+        )
+        return 0
+
+    try:
+        filters = [parse_filter(text) for text in args.where]
+        started = time.perf_counter()
+        rows = aggregate(store.table(args.table), filters, args.group_by, args.agg)
+    except (KeyError, ValueError) as error:
+        print(f"ERROR: {error.args[0] if error.args else error}")
+        return 2
+    elapsed = (time.perf_counter() - started) * 1000.0
+    print_rows(rows, args.json)
+    if not args.json:
+        print(f"({len(rows):,} groups in {elapsed:.1f} ms)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""Detect unreachable and oversized assets shipped by `pubspec.yaml`.
+
+Declared assets (files and directory entries under `flutter: assets:`) are
+cross-referenced with `assets/...` string literals in `lib/`. A literal is an
+exact reference, while a literal ending in `/` (for example the
+`startsWith('assets/flags/')` filter in the loaders) or an interpolated path
+(`'assets/flags/$name.png'`) reaches every asset under its prefix.
+
+Dart files and asset files are scanned in parallel, and per-file results are
+cached by size + mtime so repeat runs only re-read what changed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import os
+import re
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = ROOT / "lib"
+PUBSPEC = ROOT / "pubspec.yaml"
+DEFAULT_CACHE = ROOT / "tools" / ".cache" / "asset_usage_cache.json"
+CACHE_VERSION = 1
+
+ASSET_LITERAL_RE = re.compile(r"""(['"])(assets/[^'"\n]*)\1""")
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+@dataclass
+class AssetRecord:
+    path: str
+    size_bytes: int
+    width: int | None
+    height: int | None
+    status: str
+    referenced_by: list[str]
+
+
+def read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def write_text(path: Path, content: str) -> None:
+    path.write_text(content, encoding="utf-8")
+
+
+def parse_declared_assets(pubspec_path: Path) -> list[str]:
+    """Returns the `flutter: assets:` entries from pubspec.yaml."""
+    text = read_text(pubspec_path)
+    flutter_block = re.search(r"(?ms)^flutter\s*:\s*\n(.*?)(?=^\S|\Z)", text)
+    if not flutter_block:
+        return []
+    assets_block = re.search(
+        r"(?ms)^(\s+)assets\s*:\s*\n(.*?)(?=^\1\S|^\S|\Z)",
+        flutter_block.group(1),
+    )
+    if not assets_block:
+        return []
+    out: list[str] = []
+    for line in assets_block.group(2).splitlines():
+        match = re.match(r"^\s*-\s*['\"]?([^'\"#]+?)['\"]?\s*(?:#.*)?$", line)
+        if match:
+            out.append(match.group(1).strip())
+    return out
+
+
+def parse_build_time_references(pubspec_path: Path) -> set[str]:
+    """Returns asset paths used only by build-time generators in pubspec.yaml."""
+    text = read_text(pubspec_path)
+    refs: set[str] = set()
+    for section in ("flutter_launcher_icons", "flutter_native_splash"):
+        block = re.search(rf"(?ms)^{section}\s*:\s*\n(.*?)(?=^\S|\Z)", text)
+        if not block:
+            continue
+        for match in re.finditer(r"(assets/[^\s'\"#]+)", block.group(1)):
+            refs.add(match.group(1))
+    return refs
+
+
+def expand_declared(declared: list[str]) -> list[Path]:
+    """Expands declared entries the way Flutter does (directories are not recursive)."""
+    files: set[Path] = set()
+    for entry in declared:
+        path = ROOT / entry
+        if entry.endswith("/"):
+            if path.is_dir():
+                files.update(p for p in path.iterdir() if p.is_file())
+        elif path.is_file():
+            files.add(path)
+    return sorted(files)
+
+
+def load_cache(path: Path) -> dict:
+    if not path.exists():
+        return {"version": CACHE_VERSION, "dart": {}, "assets": {}}
+    try:
+        data = json.loads(read_text(path))
+    except (OSError, json.JSONDecodeError):
+        data = {}
+    if data.get("version") != CACHE_VERSION:
+        return {"version": CACHE_VERSION, "dart": {}, "assets": {}}
+    return data
+
+
+def save_cache(path: Path, cache: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_text(path, json.dumps(cache, sort_keys=True))
+
+
+def stat_key(path: Path) -> str:
+    stat = path.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def scan_dart_file(path: Path) -> list[str]:
+    """Returns `assets/...` literals; interpolated literals are cut to their prefix."""
+    refs: list[str] = []
+    for match in ASSET_LITERAL_RE.finditer(read_text(path)):
+        literal = match.group(2)
+        dollar = literal.find("$")
+        if dollar >= 0:
+            literal = literal[:dollar]
+            literal = literal[: literal.rfind("/") + 1] if "/" in literal else literal
+        refs.append(literal)
+    return refs
+
+
+def png_dimensions(path: Path) -> tuple[int | None, int | None]:
+    with path.open("rb") as handle:
+        head = handle.read(24)
+    if len(head) < 24 or not head.startswith(PNG_SIGNATURE):
+        return None, None
+    width, height = struct.unpack(">II", head[16:24])
+    return width, height
+
+
+def scan_asset_file(path: Path) -> dict:
+    width, height = png_dimensions(path) if path.suffix.lower() == ".png" else (None, None)
+    return {"size": path.stat().st_size, "width": width, "height": height}
+
+
+def cached_map(
+    paths: list[Path],
+    section: dict,
+    worker,
+    jobs: int,
+) -> tuple[dict[str, object], int]:
+    """Runs `worker` over stale paths in parallel and returns `(results, hits)`."""
+    results: dict[str, object] = {}
+    stale: list[tuple[str, str, Path]] = []
+    for path in paths:
+        rel = path.relative_to(ROOT).as_posix()
+        key = stat_key(path)
+        entry = section.get(rel)
+        if entry and entry.get("key") == key:
+            results[rel] = entry["value"]
+        else:
+            stale.append((rel, key, path))
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for (rel, key, _), value in zip(stale, pool.map(worker, [s[2] for s in stale])):
+            section[rel] = {"key": key, "value": value}
+            results[rel] = value
+
+    for rel in list(section):
+        if rel not in results:
+            del section[rel]
+    return results, len(paths) - len(stale)
+
+
+def classify(
+    assets: dict[str, dict],
+    refs_by_file: dict[str, list[str]],
+    build_time_refs: set[str],
+) -> list[AssetRecord]:
+    exact: dict[str, list[str]] = {}
+    prefixes: dict[str, list[str]] = {}
+    for source, refs in refs_by_file.items():
+        for ref in refs:
+            bucket = prefixes if ref.endswith("/") else exact
+            bucket.setdefault(ref, []).append(source)
+
+    records: list[AssetRecord] = []
+    for rel, info in sorted(assets.items()):
+        referenced_by = set(exact.get(rel, []))
+        for prefix, sources in prefixes.items():
+            if rel.startswith(prefix):
+                referenced_by.update(sources)
+
+        if referenced_by:
+            status = "used"
+        elif rel in build_time_refs:
+            status = "build-only"
+        else:
+            status = "unreferenced"
+        records.append(
+            AssetRecord(
+                path=rel,
+                size_bytes=info["size"],
+                width=info["width"],
+                height=info["height"],
+                status=status,
+                referenced_by=sorted(referenced_by),
+            )
+        )
+    return records
+
+
+def is_ignored(rel: str, patterns: list[str]) -> bool:
+    return any(fnmatch.fnmatch(rel, pattern) for pattern in patterns)
+
+
+def oversized(
+    records: list[AssetRecord],
+    max_bytes: int,
+    max_dimension: int,
+) -> list[AssetRecord]:
+    return [
+        r
+        for r in records
+        if r.size_bytes > max_bytes
+        or (r.width or 0) > max_dimension
+        or (r.height or 0) > max_dimension
+    ]
+
+
+def render_summary_markdown(
+    records: list[AssetRecord],
+    dead: list[AssetRecord],
+    large: list[AssetRecord],
+) -> str:
+    total = sum(r.size_bytes for r in records)
+    savings = sum(r.size_bytes for r in dead)
+    lines = [
+        "## Asset Usage Report",
+        "",
+        f"- Declared asset files: **{len(records)}** ({total:,} bytes)",
+        f"- Unreachable from `lib/`: **{len(dead)}** ({savings:,} bytes removable)",
+        f"- Oversized: **{len(large)}**",
+        "",
+    ]
+    if dead:
+        lines += ["| Asset | Status | Bytes |", "| --- | --- | --- |"]
+        for record in sorted(dead, key=lambda r: -r.size_bytes):
+            lines.append(f"| `{record.path}` | {record.status} | {record.size_bytes:,} |")
+        lines.append("")
+    if large:
+        lines += ["| Oversized asset | Bytes | Dimensions |", "| --- | --- | --- |"]
+        for record in sorted(large, key=lambda r: -r.size_bytes):
+            dims = f"{record.width}x{record.height}" if record.width else "-"
+            lines.append(f"| `{record.path}` | {record.size_bytes:,} | {dims} |")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Asset usage agent: reports declared assets that lib/ cannot reach "
+            "and assets above size budgets."
+        )
+    )
+    parser.add_argument("--pubspec", type=Path, default=PUBSPEC)
+    parser.add_argument("--lib-dir", type=Path, default=LIB_DIR)
+    parser.add_argument("--cache-file", type=Path, default=DEFAULT_CACHE)
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not write the scan cache.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=min(32, (os.cpu_count() or 1) * 4),
+        help="Parallel file-scan workers.",
+    )
+    parser.add_argument(
+        "--ignore",
+        nargs="*",
+        default=[],
+        help="Glob patterns of assets that may ship without a lib/ reference.",
+    )
+    parser.add_argument(
+        "--max-unused-bytes",
+        type=int,
+        default=0,
+        help="Exit non-zero when unreachable assets exceed this many bytes.",
+    )
+    parser.add_argument(
+        "--max-asset-bytes",
+        type=int,
+        default=256 * 1024,
+        help="Per-asset size budget for the oversized report.",
+    )
+    parser.add_argument(
+        "--max-image-dimension",
+        type=int,
+        default=1024,
+        help="Per-image width/height budget for the oversized report.",
+    )
+    parser.add_argument(
+        "--fail-on-oversized",
+        action="store_true",
+        help="Also exit non-zero when any asset is over budget.",
+    )
+    parser.add_argument("--summary-file", type=Path)
+    parser.add_argument("--json-file", type=Path)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if not args.pubspec.exists():
+        print(f"ERROR: pubspec not found: {args.pubspec}")
+        return 2
+
+    declared = parse_declared_assets(args.pubspec)
+    asset_files = expand_declared(declared)
+    dart_files = sorted(args.lib_dir.resolve().rglob("*.dart"))
+
+    cache = (
+        {"version": CACHE_VERSION, "dart": {}, "assets": {}}
+        if args.no_cache
+        else load_cache(args.cache_file)
+    )
+    refs_by_file, dart_hits = cached_map(dart_files, cache["dart"], scan_dart_file, args.jobs)
+    assets, asset_hits = cached_map(asset_files, cache["assets"], scan_asset_file, args.jobs)
+    if not args.no_cache:
+        save_cache(args.cache_file, cache)
+
+    records = classify(assets, refs_by_file, parse_build_time_references(args.pubspec))
+    dead = [
+        r
+        for r in records
+        if r.status != "used" and not is_ignored(r.path, args.ignore)
+    ]
+    large = oversized(records, args.max_asset_bytes, args.max_image_dimension)
+    savings = sum(r.size_bytes for r in dead)
+
+    print(
+        f"Asset usage: {len(records)} declared files, {len(dead)} unreachable "
+        f"({savings:,} bytes), {len(large)} oversized. "
+        f"Cache hits: {dart_hits}/{len(dart_files)} Dart, "
+        f"{asset_hits}/{len(asset_files)} assets."
+    )
+    for record in dead:
+        print(f"[{record.status.upper()}] {record.path} ({record.size_bytes:,} bytes)")
+    for record in large:
+        print(f"[OVERSIZED] {record.path} ({record.size_bytes:,} bytes)")
+
+    if args.summary_file:
+        write_text(args.summary_file, render_summary_markdown(records, dead, large))
+    if args.json_file:
+        write_text(
+            args.json_file,
+            json.dumps(
+                {
+                    "declared": declared,
+                    "removable_bytes": savings,
+                    "assets": [asdict(r) for r in records],
+                },
+                indent=2,
+            ),
+        )
+
+    failed = savings > args.max_unused_bytes
+    if args.fail_on_oversized and large:
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
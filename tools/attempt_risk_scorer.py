@@ -0,0 +1,703 @@
+#!/usr/bin/env python3
+"""Offline risk scoring over exported `users/{uid}/attempts` documents.
+
+`buildRiskFlags` in `functions/index.cjs` only checks
+`too_fast_perfect_score`. This batch scorer adds the other flags from
+`docs/ANTI_CHEAT_CONTRACT.md` using the whole attempt history:
+
+- `too_fast_for_scope`: seconds-per-question far below the
+  category+difficulty distribution (robust z on log time) at high accuracy
+- `abnormal_attempt_burst`: attempts packed near the 20-per-10-minute limit
+- `timestamp_anomaly`: overlapping attempts or `durationMs` that disagrees
+  with `finishedAt - startedAt`
+- per-user speed/accuracy z-scores that are consistently extreme
+
+Attempts are parsed in parallel byte-range chunks into typed `array`
+columns (codes for uid and scope, numeric columns for counts and times).
+Every feature is then a single pass over those columns, or over one index
+permutation sorted by `(uid, startedAt)`, so millions of attempts score
+with the standard library only. A store directory built by
+`analytics_store.py` is read from its memory-mapped columns instead, with no
+JSON parsing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from tool_helpers import percentile
+
+
+# Mirrors functions/index.cjs.
+CATEGORIES = ("flag", "capital")
+DIFFICULTIES = ("easy", "intermediate", "expert")
+EXPECTED_TOTAL_QUESTIONS = {"easy": 15, "intermediate": 30, "expert": 50}
+RATE_LIMIT_ATTEMPTS = 20
+RATE_LIMIT_WINDOW_MS = 10 * 60_000
+TOO_FAST_PERFECT_MS = 8_000
+SCOPES = tuple(f"{c}_{d}" for c in CATEGORIES for d in DIFFICULTIES)
+SCOPE_INDEX = {scope: i for i, scope in enumerate(SCOPES)}
+MAD_TO_SIGMA = 1.4826
+
+
+@dataclass
+class Thresholds:
+    scope_z: float = -3.5
+    min_accuracy: float = 0.8
+    burst_attempts: int = 18
+    duration_skew_ms: float = 2_000.0
+    user_z: float = -2.5
+    user_min_attempts: int = 5
+
+
+@dataclass
+class AttemptColumns:
+    """Columnar attempt export; row `i` is one attempt document."""
+
+    uids: list[str] = field(default_factory=list)
+    attempt_ids: list[str] = field(default_factory=list)
+    uid_code: array = field(default_factory=lambda: array("l"))
+    scope: array = field(default_factory=lambda: array("b"))
+    correct: array = field(default_factory=lambda: array("h"))
+    total: array = field(default_factory=lambda: array("h"))
+    started_ms: array = field(default_factory=lambda: array("d"))
+    finished_ms: array = field(default_factory=lambda: array("d"))
+    duration_ms: array = field(default_factory=lambda: array("d"))
+    skipped: int = 0
+
+    def __len__(self) -> int:
+        return len(self.attempt_ids)
+
+
+@dataclass
+class ScopeStats:
+    scope: str
+    attempts: int
+    median_log_spq: float
+    sigma_log_spq: float
+    p5_spq: float
+    p50_spq: float
+    p95_spq: float
+    mean_accuracy: float
+    sigma_accuracy: float
+
+
+@dataclass
+class FlaggedAttempt:
+    uid: str
+    attempt_id: str
+    scope: str
+    correct: int
+    total: int
+    duration_ms: float
+    speed_z: float
+    flags: list[str]
+
+
+@dataclass
+class FlaggedUser:
+    uid: str
+    attempts: int
+    flagged_attempts: int
+    mean_speed_z: float
+    mean_accuracy_z: float
+    max_burst: int
+    risk: float
+    flags: list[str]
+
+
+# -----------------
+# Loading
+# -----------------
+def to_ms(value: Any) -> float | None:
+    """Accepts epoch ms, ISO-8601, or Firestore `{_seconds,_nanoseconds}` / `{seconds,nanos}`."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value) * (1000.0 if value < 1e11 else 1.0)
+    if isinstance(value, dict):
+        seconds = value.get("_seconds", value.get("seconds"))
+        nanos = value.get("_nanoseconds", value.get("nanos", 0)) or 0
+        if isinstance(seconds, (int, float)):
+            return seconds * 1000.0 + nanos / 1e6
+        return None
+    if isinstance(value, str) and value:
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp() * 1000.0
+    return None
+
+
+def uid_of(record: dict[str, Any]) -> str | None:
+    uid = record.get("uid")
+    if isinstance(uid, str) and uid:
+        return uid
+    path = record.get("path") or record.get("__path__") or ""
+    parts = str(path).strip("/").split("/")
+    if len(parts) >= 4 and parts[0] == "users" and parts[2] == "attempts":
+        return parts[1]
+    return None
+
+
+def file_chunks(paths: list[Path], chunk_bytes: int) -> list[tuple[str, int, int]]:
+    """Splits files into `(path, start, end)` byte ranges aligned to line starts."""
+    chunks: list[tuple[str, int, int]] = []
+    for path in paths:
+        size = path.stat().st_size
+        with path.open("rb") as handle:
+            start = 0
+            while start < size:
+                end = min(size, start + chunk_bytes)
+                if end < size:
+                    handle.seek(end)
+                    handle.readline()
+                    end = handle.tell()
+                chunks.append((str(path), start, end))
+                start = end
+    return chunks
+
+
+def load_chunk(chunk: tuple[str, int, int]) -> AttemptColumns:
+    path, start, end = chunk
+    cols = AttemptColumns()
+    uid_codes: dict[str, int] = {}
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        for line in handle.read(end - start).splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                cols.skipped += 1
+                continue
+            if not append_record(cols, uid_codes, record):
+                cols.skipped += 1
+    return cols
+
+
+def merge_columns(parts: Iterator[AttemptColumns]) -> AttemptColumns:
+    cols = AttemptColumns()
+    uid_codes: dict[str, int] = {}
+    for part in parts:
+        remap = array("l")
+        for uid in part.uids:
+            code = uid_codes.get(uid)
+            if code is None:
+                code = uid_codes[uid] = len(cols.uids)
+                cols.uids.append(uid)
+            remap.append(code)
+        cols.uid_code.extend(map(remap.__getitem__, part.uid_code))
+        cols.attempt_ids.extend(part.attempt_ids)
+        for name in ("scope", "correct", "total", "started_ms", "finished_ms", "duration_ms"):
+            getattr(cols, name).extend(getattr(part, name))
+        cols.skipped += part.skipped
+    return cols
+
+
+def load_attempts(paths: list[Path], jobs: int = 1, chunk_bytes: int = 64 << 20) -> AttemptColumns:
+    """Parses JSONL exports into columns, fanning byte-range chunks out to processes."""
+    chunks = file_chunks(paths, chunk_bytes)
+    if jobs <= 1 or len(chunks) <= 1:
+        return merge_columns(map(load_chunk, chunks))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return merge_columns(pool.map(load_chunk, chunks))
+
+
+def load_store(path: Path) -> AttemptColumns:
+    """Reads the `attempts` table of an `analytics_store.py` store directory."""
+    from analytics_store import INT_NULL, open_store
+
+    table = open_store(path).table("attempts")
+    cols = AttemptColumns(uids=table.values("uid"))
+    attempt_ids = table.values("attemptId")
+    scopes = [SCOPE_INDEX.get(scope, -1) for scope in table.values("scope")]
+    rows = zip(
+        *(
+            table.column(name)
+            for name in (
+                "uid",
+                "attemptId",
+                "scope",
+                "correctCount",
+                "totalQuestions",
+                "startedAt",
+                "finishedAt",
+                "durationMs",
+            )
+        )
+    )
+    for uid, attempt, scope, correct, total, started, finished, duration in rows:
+        scope = scopes[scope] if scope >= 0 else -1
+        if (
+            uid < 0
+            or scope < 0
+            or started != started
+            or finished != finished
+            or correct == INT_NULL
+            or total == INT_NULL
+            or total <= 0
+        ):
+            cols.skipped += 1
+            continue
+        cols.uid_code.append(uid)
+        cols.attempt_ids.append(attempt_ids[attempt] if attempt >= 0 else "")
+        cols.scope.append(scope)
+        cols.correct.append(correct)
+        cols.total.append(total)
+        cols.started_ms.append(started)
+        cols.finished_ms.append(finished)
+        cols.duration_ms.append(duration if duration == duration else finished - started)
+    return cols
+
+
+def append_record(cols: AttemptColumns, uid_codes: dict[str, int], record: Any) -> bool:
+    if not isinstance(record, dict):
+        return False
+    data = record.get("data") if isinstance(record.get("data"), dict) else record
+    uid = uid_of(record)
+    scope = SCOPE_INDEX.get(f"{data.get('categoryKey')}_{data.get('difficulty')}")
+    started = to_ms(data.get("startedAt"))
+    finished = to_ms(data.get("finishedAt"))
+    correct = data.get("correctCount")
+    total = data.get("totalQuestions")
+    if (
+        uid is None
+        or scope is None
+        or started is None
+        or finished is None
+        or not isinstance(correct, int)
+        or not isinstance(total, int)
+        or total <= 0
+    ):
+        return False
+    duration = data.get("durationMs")
+    code = uid_codes.get(uid)
+    if code is None:
+        code = uid_codes[uid] = len(cols.uids)
+        cols.uids.append(uid)
+    cols.uid_code.append(code)
+    cols.attempt_ids.append(str(data.get("attemptId") or record.get("id") or ""))
+    cols.scope.append(scope)
+    cols.correct.append(correct)
+    cols.total.append(total)
+    cols.started_ms.append(started)
+    cols.finished_ms.append(finished)
+    cols.duration_ms.append(
+        float(duration) if isinstance(duration, (int, float)) else finished - started
+    )
+    return True
+
+
+# -----------------
+# Features
+# -----------------
+def scope_statistics(
+    cols: AttemptColumns,
+) -> tuple[list[ScopeStats], array, array, array]:
+    """Returns per-scope stats plus per-attempt log-spq, speed z, and accuracy z columns."""
+    log_spq = array(
+        "d",
+        map(
+            lambda d, t: math.log(max(d, 1.0) / 1000.0 / t),
+            cols.duration_ms,
+            cols.total,
+        ),
+    )
+    accuracy = array("d", map(lambda c, t: c / t, cols.correct, cols.total))
+
+    groups: list[list[int]] = [[] for _ in SCOPES]
+    for index, scope in enumerate(cols.scope):
+        groups[scope].append(index)
+
+    medians = [0.0] * len(SCOPES)
+    sigmas = [1.0] * len(SCOPES)
+    acc_means = [0.0] * len(SCOPES)
+    acc_sigmas = [1.0] * len(SCOPES)
+    stats: list[ScopeStats] = []
+    for scope, rows in enumerate(groups):
+        if not rows:
+            continue
+        values = sorted(log_spq[i] for i in rows)
+        median = percentile(values, 50)
+        deviations = sorted(abs(v - median) for v in values)
+        sigma = max(MAD_TO_SIGMA * percentile(deviations, 50), 1e-6)
+        accs = [accuracy[i] for i in rows]
+        acc_mean = sum(accs) / len(accs)
+        acc_sigma = max(math.sqrt(sum((a - acc_mean) ** 2 for a in accs) / len(accs)), 1e-6)
+        medians[scope], sigmas[scope] = median, sigma
+        acc_means[scope], acc_sigmas[scope] = acc_mean, acc_sigma
+        stats.append(
+            ScopeStats(
+                scope=SCOPES[scope],
+                attempts=len(rows),
+                median_log_spq=round(median, 4),
+                sigma_log_spq=round(sigma, 4),
+                p5_spq=round(math.exp(percentile(values, 5)), 2),
+                p50_spq=round(math.exp(median), 2),
+                p95_spq=round(math.exp(percentile(values, 95)), 2),
+                mean_accuracy=round(acc_mean, 4),
+                sigma_accuracy=round(acc_sigma, 4),
+            )
+        )
+
+    speed_z = array(
+        "d", map(lambda v, s: (v - medians[s]) / sigmas[s], log_spq, cols.scope)
+    )
+    accuracy_z = array(
+        "d", map(lambda a, s: (a - acc_means[s]) / acc_sigmas[s], accuracy, cols.scope)
+    )
+    return stats, log_spq, speed_z, accuracy_z
+
+
+def user_order(cols: AttemptColumns) -> list[int]:
+    """Row indices sorted by `(uid, startedAt)`."""
+    # Epoch ms fit in 44 bits, so one integer key sorts by uid then time.
+    keys = [code << 44 | int(ts) for code, ts in zip(cols.uid_code, cols.started_ms)]
+    return sorted(range(len(keys)), key=keys.__getitem__)
+
+
+def burst_and_overlap(
+    cols: AttemptColumns,
+    order: list[int],
+) -> tuple[array, array]:
+    """Per-attempt max attempts in any 10-minute window ending at it, and overlap marks."""
+    burst = array("h", bytes(2 * len(cols)))
+    overlap = array("b", bytes(len(cols)))
+    codes, started, finished = cols.uid_code, cols.started_ms, cols.finished_ms
+    left = 0
+    for pos, row in enumerate(order):
+        if pos == 0 or codes[order[pos - 1]] != codes[row]:
+            left = pos
+        else:
+            previous = order[pos - 1]
+            if started[row] < finished[previous]:
+                overlap[row] = 1
+                overlap[previous] = 1
+        while started[order[left]] <= started[row] - RATE_LIMIT_WINDOW_MS:
+            left += 1
+        burst[row] = pos - left + 1
+    return burst, overlap
+
+
+def rows_where(predicate, *columns: array) -> list[int]:
+    return [i for i, values in enumerate(zip(*columns)) if predicate(*values)]
+
+
+def score_attempts(
+    cols: AttemptColumns,
+    thresholds: Thresholds,
+) -> tuple[list[ScopeStats], list[FlaggedAttempt], list[FlaggedUser]]:
+    stats, _, speed_z, accuracy_z = scope_statistics(cols)
+    order = user_order(cols)
+    burst, overlap = burst_and_overlap(cols, order)
+
+    min_accuracy = thresholds.min_accuracy
+    scope_z = thresholds.scope_z
+    skew_ms = thresholds.duration_skew_ms
+    rules = {
+        "too_fast_perfect_score": rows_where(
+            lambda c, t, d: c == t and d < TOO_FAST_PERFECT_MS,
+            cols.correct,
+            cols.total,
+            cols.duration_ms,
+        ),
+        "too_fast_for_scope": rows_where(
+            lambda z, c, t: z < scope_z and c >= min_accuracy * t,
+            speed_z,
+            cols.correct,
+            cols.total,
+        ),
+        "abnormal_attempt_burst": rows_where(
+            lambda b: b >= thresholds.burst_attempts, burst
+        ),
+        "timestamp_anomaly": rows_where(
+            lambda o, s, f, d: o or abs((f - s) - d) > skew_ms,
+            overlap,
+            cols.started_ms,
+            cols.finished_ms,
+            cols.duration_ms,
+        ),
+    }
+    flags_by_row: dict[int, list[str]] = {}
+    for name, rows in rules.items():
+        for row in rows:
+            flags_by_row.setdefault(row, []).append(name)
+
+    flagged = [
+        FlaggedAttempt(
+            uid=cols.uids[cols.uid_code[row]],
+            attempt_id=cols.attempt_ids[row],
+            scope=SCOPES[cols.scope[row]],
+            correct=cols.correct[row],
+            total=cols.total[row],
+            duration_ms=cols.duration_ms[row],
+            speed_z=round(speed_z[row], 3),
+            flags=flags,
+        )
+        for row, flags in sorted(flags_by_row.items())
+    ]
+
+    # `order` groups rows by user, so per-user aggregates are one linear pass.
+    users: list[FlaggedUser] = []
+    codes = cols.uid_code
+    n = len(order)
+    start = 0
+    while start < n:
+        code = codes[order[start]]
+        end = start
+        while end < n and codes[order[end]] == code:
+            end += 1
+        rows = order[start:end]
+        start = end
+
+        count = len(rows)
+        mean_speed = sum(speed_z[r] for r in rows) / count
+        mean_accuracy = sum(accuracy_z[r] for r in rows) / count
+        flags = {f for r in rows for f in flags_by_row.get(r, ())}
+        if count >= thresholds.user_min_attempts and mean_speed < thresholds.user_z:
+            flags.add("consistent_speed_outlier")
+        if not flags:
+            continue
+        flagged_count = sum(1 for r in rows if r in flags_by_row)
+        max_burst = max(burst[r] for r in rows)
+        # Few attempts carry little evidence; scale by history length.
+        confidence = min(1.0, count / thresholds.user_min_attempts)
+        risk = confidence * (
+            flagged_count / count
+            + max(0.0, -mean_speed) / 4
+            + max(0.0, mean_accuracy) / 8
+        ) + (1.0 if max_burst >= thresholds.burst_attempts else 0.0)
+        users.append(
+            FlaggedUser(
+                uid=cols.uids[code],
+                attempts=count,
+                flagged_attempts=flagged_count,
+                mean_speed_z=round(mean_speed, 3),
+                mean_accuracy_z=round(mean_accuracy, 3),
+                max_burst=max_burst,
+                risk=round(risk, 3),
+                flags=sorted(flags),
+            )
+        )
+    users.sort(key=lambda u: (-u.risk, u.uid))
+    return stats, flagged, users
+
+
+# -----------------
+# Synthetic export
+# -----------------
+def generate_export(
+    path: Path,
+    users: int,
+    attempts_per_user: int,
+    cheater_share: float,
+    seed: int,
+) -> int:
+    """Writes attempt docs: regular players, fast bots, and burst grinders."""
+    rng = random.Random(seed)
+    start = datetime(2026, 3, 1, tzinfo=timezone.utc).timestamp() * 1000.0
+    written = 0
+    with path.open("w", encoding="utf-8", buffering=1 << 20) as handle:
+        for index in range(users):
+            uid = f"user{index:07d}"
+            kind = "regular"
+            if rng.random() < cheater_share:
+                kind = rng.choice(("bot", "grinder", "clock"))
+            skill = rng.betavariate(4, 2)
+            pace = rng.uniform(2.5, 7.0)
+            t = start + rng.uniform(0, 7 * 86_400_000)
+            count = max(1, int(rng.expovariate(1 / attempts_per_user)))
+            for n in range(count):
+                difficulty = rng.choices(DIFFICULTIES, weights=(5, 3, 2))[0]
+                total = EXPECTED_TOTAL_QUESTIONS[difficulty]
+                if kind == "bot":
+                    seconds = total * rng.uniform(0.4, 0.8)
+                    correct = total
+                elif kind == "grinder":
+                    seconds = rng.uniform(20, 40)
+                    correct = int(total * rng.uniform(0.2, 0.5))
+                else:
+                    seconds = total * pace * rng.lognormvariate(0, 0.25)
+                    correct = min(total, int(round(total * min(1.0, rng.gauss(skill, 0.08)))))
+                duration = max(5_000.0, min(seconds * 1000.0, 30 * 60_000 - 1))
+                finished = t + duration
+                reported = duration
+                if kind == "clock" and rng.random() < 0.3:
+                    reported = duration * rng.uniform(0.2, 0.6)
+                doc = {
+                    "path": f"users/{uid}/attempts/{uid}-{n}",
+                    "attemptId": f"{uid}-{n}",
+                    "categoryKey": rng.choice(CATEGORIES),
+                    "difficulty": difficulty,
+                    "correctCount": max(0, correct),
+                    "totalQuestions": total,
+                    "startedAt": {"_seconds": int(t // 1000), "_nanoseconds": int(t % 1000) * 1_000_000},
+                    "finishedAt": {
+                        "_seconds": int(finished // 1000),
+                        "_nanoseconds": int(finished % 1000) * 1_000_000,
+                    },
+                    "durationMs": int(reported),
+                    "status": "accepted",
+                }
+                handle.write(json.dumps(doc, separators=(",", ":")) + "\n")
+                written += 1
+                if kind == "grinder":
+                    gap = rng.uniform(1_000, 8_000)
+                elif kind == "clock" and rng.random() < 0.2:
+                    gap = -duration / 2
+                else:
+                    gap = rng.expovariate(1 / 1_800_000)
+                t = finished + gap
+    return written
+
+
+# -----------------
+# CLI
+# -----------------
+def render_summary_markdown(
+    cols: AttemptColumns,
+    stats: list[ScopeStats],
+    flagged: list[FlaggedAttempt],
+    users: list[FlaggedUser],
+    top: int,
+) -> str:
+    lines = [
+        "## Attempt Risk Scoring",
+        "",
+        f"- Attempts scored: **{len(cols):,}** ({cols.skipped:,} skipped), users: **{len(cols.uids):,}**",
+        f"- Flagged attempts: **{len(flagged):,}**, flagged users: **{len(users):,}**",
+        "",
+        "| Scope | Attempts | s/question p5 | p50 | p95 | Mean accuracy |",
+        "| --- | --- | --- | --- | --- | --- |",
+    ]
+    for s in stats:
+        lines.append(
+            f"| `{s.scope}` | {s.attempts:,} | {s.p5_spq} | {s.p50_spq} | {s.p95_spq} "
+            f"| {s.mean_accuracy:.1%} |"
+        )
+    lines.append("")
+    if users:
+        lines += [
+            "| User | Risk | Attempts | Flagged | Speed z | Accuracy z | Max burst | Flags |",
+            "| --- | --- | --- | --- | --- | --- | --- | --- |",
+        ]
+        for u in users[:top]:
+            lines.append(
+                f"| `{u.uid}` | {u.risk} | {u.attempts} | {u.flagged_attempts} "
+                f"| {u.mean_speed_z} | {u.mean_accuracy_z} | {u.max_burst} | {', '.join(u.flags)} |"
+            )
+        lines.append("")
+    return "\n".join(lines)
+
+
+def write_jsonl(path: Path, rows: Iterator[dict[str, Any]]) -> None:
+    with path.open("w", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json.dumps(row) + "\n")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Batch risk scoring over exported users/{uid}/attempts documents."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    score = sub.add_parser(
+        "score",
+        help="Score JSONL attempt exports, or an analytics_store.py store directory.",
+    )
+    score.add_argument("inputs", type=Path, nargs="+")
+    defaults = Thresholds()
+    score.add_argument("--scope-z", type=float, default=defaults.scope_z)
+    score.add_argument("--min-accuracy", type=float, default=defaults.min_accuracy)
+    score.add_argument("--burst-attempts", type=int, default=defaults.burst_attempts)
+    score.add_argument("--duration-skew-ms", type=float, default=defaults.duration_skew_ms)
+    score.add_argument("--user-z", type=float, default=defaults.user_z)
+    score.add_argument("--user-min-attempts", type=int, default=defaults.user_min_attempts)
+    score.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Parallel JSON parsing processes.",
+    )
+    score.add_argument("--top", type=int, default=25)
+    score.add_argument("--attempts-file", type=Path, help="Write flagged attempts as JSONL.")
+    score.add_argument("--users-file", type=Path, help="Write flagged users as JSONL.")
+    score.add_argument("--summary-file", type=Path)
+
+    gen = sub.add_parser("generate", help="Write a synthetic attempt export.")
+    gen.add_argument("output", type=Path)
+    gen.add_argument("--users", type=int, default=100_000)
+    gen.add_argument("--attempts-per-user", type=int, default=10)
+    gen.add_argument("--cheater-share", type=float, default=0.01)
+    gen.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.command == "generate":
+        written = generate_export(
+            args.output, args.users, args.attempts_per_user, args.cheater_share, args.seed
+        )
+        print(f"Wrote {written:,} attempt documents to {args.output}")
+        return 0
+
+    missing = [path for path in args.inputs if not path.exists()]
+    if missing:
+        print(f"ERROR: input not found: {missing[0]}")
+        return 2
+
+    started = time.perf_counter()
+    stores = [path for path in args.inputs if (path / "manifest.json").exists()]
+    if stores and len(args.inputs) > 1:
+        print("ERROR: pass either one analytics store directory or JSONL exports")
+        return 2
+    cols = load_store(stores[0]) if stores else load_attempts(args.inputs, jobs=args.jobs)
+    loaded = time.perf_counter()
+    thresholds = Thresholds(
+        scope_z=args.scope_z,
+        min_accuracy=args.min_accuracy,
+        burst_attempts=args.burst_attempts,
+        duration_skew_ms=args.duration_skew_ms,
+        user_z=args.user_z,
+        user_min_attempts=args.user_min_attempts,
+    )
+    stats, flagged, users = score_attempts(cols, thresholds)
+    scored = time.perf_counter()
+
+    print(
+        f"Attempt risk: {len(cols):,} attempts from {len(cols.uids):,} users "
+        f"(load {loaded - started:.1f}s, score {scored - loaded:.1f}s); "
+        f"{len(flagged):,} flagged attempts, {len(users):,} flagged users."
+    )
+    for user in users[: args.top]:
+        print(f"[RISK {user.risk:.2f}] {user.uid} {','.join(user.flags)}")
+
+    if args.attempts_file:
+        write_jsonl(args.attempts_file, (asdict(a) for a in flagged))
+    if args.users_file:
+        write_jsonl(args.users_file, (asdict(u) for u in users))
+    if args.summary_file:
+        args.summary_file.write_text(
+            render_summary_markdown(cols, stats, flagged, users, args.top), encoding="utf-8"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
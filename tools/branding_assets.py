@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+"""Incremental launcher icon and native splash generation.
+
+`refresh_branding_assets.sh` used to run `flutter_launcher_icons` and
+`flutter_native_splash:create` on every call, rewriting every Android
+mipmap, iOS/macOS `AppIcon.appiconset`, web icon, Windows `.ico`, and splash
+drawable even when `assets/images/logo-*.png` had not changed. This tool
+produces the same output matrix directly:
+
+- settings come from the `flutter_launcher_icons` and `flutter_native_splash`
+  blocks of `pubspec.yaml` (image paths, background colors,
+  `remove_alpha_ios`, Windows `icon_size`), which stay the source of truth
+- every output records its source hash, target size, render parameters,
+  and output hash in `tools/baselines/branding_assets.json`. `build`
+  re-renders only outputs whose record no longer matches, on a process
+  pool (`png_raster`).
+- a checked-in output that already matches a fresh render (same size and
+  alpha mode, mean channel difference within `--tolerance`) is adopted
+  instead of rewritten, so the first run does not churn binary files
+  produced by the Dart generators. Once recorded, an output whose sources or
+  settings change is always rewritten.
+- `Contents.json` for the iOS/macOS icon sets and iOS launch images, the
+  Android `ic_launcher_background` color, and the Android 12
+  `windowSplashScreenBackground` in `values[-night]-v31/styles.xml` are
+  rewritten only when their parsed content differs
+
+Platform XML templates (`launch_background.xml`, `styles.xml`, adaptive icon
+XML) are otherwise static and are not regenerated. `launch_background.xml`
+takes its color from the generated `background.png`.
+
+Subcommands:
+- `build`: render stale outputs and update metadata and state.
+- `verify`: check state, metadata, and pixels of checked-in outputs; non-zero on drift.
+- `list`: print the output matrix.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import png_raster
+
+
+ROOT = Path(__file__).resolve().parents[1]
+STATE_VERSION = 1
+DEFAULT_TOLERANCE = 2.0
+
+ANDROID_DENSITIES = (("mdpi", 1.0), ("hdpi", 1.5), ("xhdpi", 2.0), ("xxhdpi", 3.0), ("xxxhdpi", 4.0))
+ANDROID_LAUNCHER_DP = 48
+ANDROID_FOREGROUND_DP = 108
+IOS_ICONS = (
+    ("20x20", "iphone", (2, 3)),
+    ("29x29", "iphone", (1, 2, 3)),
+    ("40x40", "iphone", (2, 3)),
+    ("57x57", "iphone", (1, 2)),
+    ("60x60", "iphone", (2, 3)),
+    ("20x20", "ipad", (1, 2)),
+    ("29x29", "ipad", (1, 2)),
+    ("40x40", "ipad", (1, 2)),
+    ("50x50", "ipad", (1, 2)),
+    ("72x72", "ipad", (1, 2)),
+    ("76x76", "ipad", (1, 2)),
+    ("83.5x83.5", "ipad", (2,)),
+    ("1024x1024", "ios-marketing", (1,)),
+)
+MACOS_ICONS = (("16x16", 16), ("32x32", 32), ("128x128", 128), ("256x256", 256), ("512x512", 512))
+WEB_ICONS = (("favicon.png", 16), ("icons/Icon-192.png", 192), ("icons/Icon-512.png", 512),
+             ("icons/Icon-maskable-192.png", 192), ("icons/Icon-maskable-512.png", 512))
+# flutter_native_splash draws the logo at source size on xxxhdpi (4x) and
+# scales the other densities from there.
+SPLASH_SOURCE_DENSITY = 4.0
+
+IOS_ICONSET = "ios/Runner/Assets.xcassets/AppIcon.appiconset"
+MACOS_ICONSET = "macos/Runner/Assets.xcassets/AppIcon.appiconset"
+IOS_LAUNCH_IMAGE = "ios/Runner/Assets.xcassets/LaunchImage.imageset"
+IOS_LAUNCH_BACKGROUND = "ios/Runner/Assets.xcassets/LaunchBackground.imageset"
+ANDROID_RES = "android/app/src/main/res"
+
+
+# -----------------
+# pubspec settings
+# -----------------
+def read_block(pubspec: str, name: str) -> dict[str, Any]:
+    """Nested scalar mapping under a top-level pubspec key.
+
+    Covers the plain `key: value` YAML these plugin blocks use; lists and
+    flow syntax are not needed there.
+    """
+    lines = pubspec.splitlines()
+    try:
+        start = next(i for i, line in enumerate(lines) if line.rstrip() == f"{name}:")
+    except StopIteration:
+        return {}
+    root: dict[str, Any] = {}
+    stack: list[tuple[int, dict[str, Any]]] = [(-1, root)]
+    for line in lines[start + 1 :]:
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        indent = len(line) - len(line.lstrip())
+        if indent == 0:
+            break
+        key, _, value = line.strip().partition(":")
+        value = value.split(" #", 1)[0].strip().strip("\"'")
+        while stack[-1][0] >= indent:
+            stack.pop()
+        parent = stack[-1][1]
+        if value:
+            parent[key] = {"true": True, "false": False}.get(value, value)
+        else:
+            parent[key] = {}
+            stack.append((indent, parent[key]))
+    return root
+
+
+def parse_color(raw: str) -> tuple[int, int, int]:
+    match = re.fullmatch(r"#?([0-9a-fA-F]{6})", raw.strip())
+    if not match:
+        raise ValueError(f"expected #RRGGBB color, got {raw!r}")
+    value = int(match[1], 16)
+    return (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF
+
+
+# -----------------
+# Output matrix
+# -----------------
+@dataclass(frozen=True)
+class Output:
+    path: str
+    source: str | None
+    width: int
+    height: int
+    background: str | None = None  # flatten onto this color (no alpha)
+    fill: str | None = None  # solid color, no source
+    container: str = "png"  # or "ico"
+
+
+@dataclass(frozen=True)
+class Metadata:
+    path: str
+    kind: str  # "json", "text", or "style_item" (one <item> value in a static XML file)
+    content: Any
+    json_style: str = "xcode"
+
+
+def build_matrix(pubspec: str) -> tuple[list[Output], list[Metadata]]:
+    icons = read_block(pubspec, "flutter_launcher_icons")
+    splash = read_block(pubspec, "flutter_native_splash")
+    outputs: list[Output] = []
+    metadata: list[Metadata] = []
+
+    icon = icons.get("image_path")
+    if icon and icons.get("android"):
+        foreground = icons.get("adaptive_icon_foreground")
+        for bucket, scale in ANDROID_DENSITIES:
+            size = round(ANDROID_LAUNCHER_DP * scale)
+            outputs.append(Output(f"{ANDROID_RES}/mipmap-{bucket}/ic_launcher.png", icon, size, size))
+            if foreground:
+                size = round(ANDROID_FOREGROUND_DP * scale)
+                outputs.append(
+                    Output(f"{ANDROID_RES}/drawable-{bucket}/ic_launcher_foreground.png", foreground, size, size)
+                )
+        if icons.get("adaptive_icon_background", "").startswith("#"):
+            color = icons["adaptive_icon_background"].upper()
+            metadata.append(
+                Metadata(
+                    f"{ANDROID_RES}/values/colors.xml",
+                    "text",
+                    '<?xml version="1.0" encoding="utf-8"?>\n<resources>\n'
+                    f'    <color name="ic_launcher_background">{color}</color>\n</resources>\n',
+                )
+            )
+
+    if icon and icons.get("ios"):
+        background = icons.get("background_color_ios", "#FFFFFF") if icons.get("remove_alpha_ios") else None
+        images = []
+        for size_label, idiom, scales in IOS_ICONS:
+            points = float(size_label.split("x")[0])
+            for scale in scales:
+                filename = f"Icon-App-{size_label}@{scale}x.png"
+                pixels = round(points * scale)
+                images.append({"size": size_label, "idiom": idiom, "filename": filename, "scale": f"{scale}x"})
+                output = Output(f"{IOS_ICONSET}/{filename}", icon, pixels, pixels, background=background)
+                if output not in outputs:  # iPhone and iPad share some files
+                    outputs.append(output)
+        metadata.append(
+            Metadata(
+                f"{IOS_ICONSET}/Contents.json",
+                "json",
+                {"images": images, "info": {"version": 1, "author": "xcode"}},
+                json_style="compact",
+            )
+        )
+
+    macos = icons.get("macos") or {}
+    if macos.get("generate"):
+        source = macos.get("image_path", icon)
+        images = []
+        for size_label, points in MACOS_ICONS:
+            for scale in (1, 2):
+                pixels = points * scale
+                images.append(
+                    {"size": size_label, "idiom": "mac", "filename": f"app_icon_{pixels}.png", "scale": f"{scale}x"}
+                )
+        for pixels in sorted({int(image["filename"][9:-4]) for image in images}):
+            outputs.append(Output(f"{MACOS_ICONSET}/app_icon_{pixels}.png", source, pixels, pixels))
+        metadata.append(
+            Metadata(
+                f"{MACOS_ICONSET}/Contents.json",
+                "json",
+                {"info": {"version": 1, "author": "xcode"}, "images": images},
+                json_style="indent4",
+            )
+        )
+
+    web = icons.get("web") or {}
+    if web.get("generate"):
+        source = web.get("image_path", icon)
+        for path, pixels in WEB_ICONS:
+            outputs.append(Output(f"web/{path}", source, pixels, pixels))
+
+    windows = icons.get("windows") or {}
+    if windows.get("generate"):
+        pixels = int(windows.get("icon_size", 48))
+        outputs.append(
+            Output("windows/runner/resources/app_icon.ico", windows.get("image_path", icon), pixels, pixels, container="ico")
+        )
+
+    if splash:
+        outputs.extend(_splash_outputs(splash))
+        metadata.extend(_splash_metadata(splash))
+    return outputs, metadata
+
+
+def _splash_outputs(splash: dict[str, Any]) -> list[Output]:
+    outputs: list[Output] = []
+    android_12 = splash.get("android_12") or {}
+    variants = [("", splash.get("image"), splash.get("color")), ("night-", splash.get("image_dark"), splash.get("color_dark"))]
+    for prefix, image, color in variants:
+        if color:
+            for folder in (f"drawable-{prefix}v21" if prefix else "drawable-v21", f"drawable-{prefix.rstrip('-')}" if prefix else "drawable"):
+                outputs.append(Output(f"{ANDROID_RES}/{folder}/background.png", None, 1, 1, fill=color))
+        if not image:
+            continue
+        size = _png_size(ROOT / image)
+        image_12 = android_12.get("image_dark" if prefix else "image", image)
+        size_12 = _png_size(ROOT / image_12)
+        for bucket, scale in ANDROID_DENSITIES:
+            factor = scale / SPLASH_SOURCE_DENSITY
+            width, height = round(size[0] * factor), round(size[1] * factor)
+            outputs.append(Output(f"{ANDROID_RES}/drawable-{prefix}{bucket}/splash.png", image, width, height))
+            width, height = round(size_12[0] * factor), round(size_12[1] * factor)
+            outputs.append(Output(f"{ANDROID_RES}/drawable-{prefix}{bucket}/android12splash.png", image_12, width, height))
+        if splash.get("ios", True) is not False:
+            suffix = "Dark" if prefix else ""
+            for scale in (1, 2, 3):
+                factor = scale / SPLASH_SOURCE_DENSITY
+                name = f"LaunchImage{suffix}{'' if scale == 1 else f'@{scale}x'}.png"
+                outputs.append(
+                    Output(f"{IOS_LAUNCH_IMAGE}/{name}", image, round(size[0] * factor), round(size[1] * factor))
+                )
+    if splash.get("ios", True) is not False:
+        if splash.get("color"):
+            outputs.append(Output(f"{IOS_LAUNCH_BACKGROUND}/background.png", None, 1, 1, fill=splash["color"]))
+        if splash.get("color_dark"):
+            outputs.append(Output(f"{IOS_LAUNCH_BACKGROUND}/darkbackground.png", None, 1, 1, fill=splash["color_dark"]))
+    return outputs
+
+
+def _splash_metadata(splash: dict[str, Any]) -> list[Metadata]:
+    metadata: list[Metadata] = []
+    android_12 = splash.get("android_12") or {}
+    for folder, key in (("values-v31", "color"), ("values-night-v31", "color_dark")):
+        if android_12.get(key):
+            metadata.append(
+                Metadata(
+                    f"{ANDROID_RES}/{folder}/styles.xml",
+                    "style_item",
+                    {"name": "android:windowSplashScreenBackground", "value": android_12[key].upper()},
+                )
+            )
+    if splash.get("ios", True) is False:
+        return metadata
+    dark = [{"appearance": "luminosity", "value": "dark"}]
+    images = []
+    for scale in (1, 2, 3):
+        suffix = "" if scale == 1 else f"@{scale}x"
+        images.append({"filename": f"LaunchImage{suffix}.png", "idiom": "universal", "scale": f"{scale}x"})
+        if splash.get("image_dark"):
+            images.append(
+                {"appearances": dark, "filename": f"LaunchImageDark{suffix}.png", "idiom": "universal", "scale": f"{scale}x"}
+            )
+    backgrounds = [{"filename": "background.png", "idiom": "universal"}]
+    if splash.get("color_dark"):
+        backgrounds.append({"appearances": dark, "filename": "darkbackground.png", "idiom": "universal"})
+    info = {"author": "xcode", "version": 1}
+    return metadata + [
+        Metadata(f"{IOS_LAUNCH_IMAGE}/Contents.json", "json", {"images": images, "info": info}),
+        Metadata(f"{IOS_LAUNCH_BACKGROUND}/Contents.json", "json", {"images": backgrounds, "info": info}),
+    ]
+
+
+def _png_size(path: Path) -> tuple[int, int]:
+    with path.open("rb") as handle:
+        return png_raster.png_size(handle.read(32))
+
+
+# -----------------
+# Rendering
+# -----------------
+_SOURCES: dict[str, tuple[png_raster.Raster, list[float]]] = {}
+
+
+def _source(path: str) -> tuple[png_raster.Raster, list[float]]:
+    # Each worker decodes and premultiplies a logo once for all its sizes.
+    if path not in _SOURCES:
+        image = png_raster.decode((ROOT / path).read_bytes())
+        _SOURCES[path] = (image, png_raster.premultiply(image))
+    return _SOURCES[path]
+
+
+def render(output: Output) -> png_raster.Raster:
+    if output.fill:
+        return png_raster.solid(output.width, output.height, (*parse_color(output.fill), 255))
+    image, premultiplied = _source(output.source or "")
+    raster = png_raster.resize(image, output.width, output.height, premultiplied)
+    if output.background:
+        raster = png_raster.flatten(raster, parse_color(output.background))
+    return raster
+
+
+def wrap_ico(png: bytes, width: int, height: int) -> bytes:
+    """Single-image ICO with an embedded PNG (Vista+), as the Dart tool writes."""
+    entry = struct.pack("<BBBBHHII", width % 256, height % 256, 0, 0, 1, 32, len(png), 22)
+    return struct.pack("<HHH", 0, 1, 1) + entry + png
+
+
+def read_output(path: Path, container: str) -> png_raster.Raster:
+    data = path.read_bytes()
+    if container == "ico":
+        length, offset = struct.unpack("<II", data[14:22])
+        data = data[offset : offset + length]
+    return png_raster.decode(data)
+
+
+def _has_alpha_channel(path: Path, container: str) -> bool:
+    data = path.read_bytes()
+    if container == "ico":
+        data = data[struct.unpack("<I", data[18:22])[0] :]
+    return data[25] in (4, 6) or b"tRNS" in data[:4096]
+
+
+def process(task: tuple[Output, str, float]) -> dict[str, Any]:
+    """Renders one output and adopts, writes, or compares it (worker process)."""
+    output, mode, tolerance = task
+    started = time.perf_counter()
+    target = ROOT / output.path
+    raster = render(output)
+    result: dict[str, Any] = {"path": output.path}
+    if target.exists():
+        try:
+            existing = read_output(target, output.container)
+            diff = png_raster.mean_abs_diff(existing, raster)
+            alpha_ok = _has_alpha_channel(target, output.container) == (output.background is None and not output.fill)
+        except (ValueError, struct.error, IndexError):
+            diff, alpha_ok = float("inf"), False
+        result["diff"] = round(diff, 3) if diff != float("inf") else None
+        matches = diff <= tolerance and (alpha_ok or output.fill is not None)
+        if mode == "verify" or (mode == "build" and matches):
+            result["action"] = "match" if matches else "mismatch"
+            result["sha256"] = hashlib.sha256(target.read_bytes()).hexdigest()
+            result["seconds"] = round(time.perf_counter() - started, 3)
+            return result
+    elif mode == "verify":
+        result.update(action="missing", diff=None)
+        return result
+
+    data = png_raster.encode(raster, alpha=output.background is None and output.fill is None)
+    if output.container == "ico":
+        data = wrap_ico(data, output.width, output.height)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(f".{target.name}.{os.getpid()}")
+    partial.write_bytes(data)
+    os.replace(partial, target)
+    result.update(action="written", sha256=hashlib.sha256(data).hexdigest(), seconds=round(time.perf_counter() - started, 3))
+    return result
+
+
+# -----------------
+# State + metadata
+# -----------------
+def output_key(output: Output, source_hashes: dict[str, str]) -> dict[str, Any]:
+    """Everything that determines an output's pixels."""
+    return {
+        **{k: v for k, v in asdict(output).items() if k != "path"},
+        "source_sha256": source_hashes.get(output.source or ""),
+        "resampler": png_raster.RESAMPLER_VERSION,
+    }
+
+
+def sha256_file(path: Path) -> str | None:
+    return hashlib.sha256(path.read_bytes()).hexdigest() if path.exists() else None
+
+
+def load_state(path: Path) -> dict[str, Any]:
+    if path.exists():
+        state = json.loads(path.read_text(encoding="utf-8"))
+        if state.get("version") == STATE_VERSION:
+            return state
+    return {"version": STATE_VERSION, "outputs": {}}
+
+
+def is_fresh(output: Output, state: dict[str, Any], source_hashes: dict[str, str]) -> bool:
+    recorded = state["outputs"].get(output.path)
+    return (
+        recorded is not None
+        and recorded.get("key") == output_key(output, source_hashes)
+        and recorded.get("sha256") == sha256_file(ROOT / output.path)
+    )
+
+
+def build_mode(output: Output, state: dict[str, Any], source_hashes: dict[str, str], force: bool) -> str:
+    """`write` when the sources or settings changed since the last build; adoption
+    is only for outputs the state has never seen (or whose file was replaced)."""
+    recorded = state["outputs"].get(output.path)
+    if force or (recorded is not None and recorded.get("key") != output_key(output, source_hashes)):
+        return "write"
+    return "build"
+
+
+def _style_item_pattern(name: str) -> re.Pattern[str]:
+    return re.compile(rf'(<item name="{re.escape(name)}">)([^<]*)(</item>)')
+
+
+def render_metadata(item: Metadata) -> str:
+    if item.kind == "style_item":
+        # The XML templates are static; only the item value is ours to set.
+        path = ROOT / item.path
+        current = path.read_text(encoding="utf-8") if path.exists() else ""
+        pattern = _style_item_pattern(item.content["name"])
+        if not pattern.search(current):
+            raise ValueError(f"{item.path} has no <item name=\"{item.content['name']}\">; restore the template")
+        return pattern.sub(lambda match: match[1] + item.content["value"] + match[3], current, count=1)
+    if item.kind == "text":
+        return item.content
+    if item.json_style == "compact":
+        return json.dumps(item.content, separators=(",", ":"))
+    if item.json_style == "indent4":
+        return json.dumps(item.content, indent=4) + "\n"
+    return json.dumps(item.content, indent=2, separators=(",", " : ")) + "\n"
+
+
+def metadata_matches(item: Metadata) -> bool:
+    path = ROOT / item.path
+    if not path.exists():
+        return False
+    current = path.read_text(encoding="utf-8")
+    if item.kind == "style_item":
+        match = _style_item_pattern(item.content["name"]).search(current)
+        return match is not None and match[2].strip().upper() == item.content["value"]
+    if item.kind == "json":
+        try:
+            return json.loads(current) == item.content
+        except ValueError:
+            return False
+    return " ".join(current.split()) == " ".join(item.content.split())
+
+
+# -----------------
+# CLI
+# -----------------
+def render_summary_markdown(report: dict[str, Any]) -> str:
+    return "\n".join(
+        [
+            "## Branding Assets",
+            "",
+            f"- Outputs: **{report['outputs']}** ({report['up_to_date']} up to date, {report['adopted']} adopted, "
+            f"{report['written']} written) in {report['seconds']}s on {report['workers']} workers",
+            f"- Metadata files rewritten: {', '.join(report['metadata_written']) or 'none'}",
+            "",
+        ]
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate launcher icons and native splash assets from the logo sources.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (
+        ("build", "Render stale outputs and update metadata and state."),
+        ("verify", "Check state, metadata, and pixels of checked-in outputs."),
+        ("list", "Print the output matrix."),
+    ):
+        command = sub.add_parser(name, help=help_text)
+        command.add_argument("--pubspec", type=Path, default=ROOT / "pubspec.yaml")
+        command.add_argument("--state", type=Path, default=ROOT / "tools" / "baselines" / "branding_assets.json")
+        command.add_argument("--workers", type=int, default=max(1, os.cpu_count() or 1))
+        command.add_argument(
+            "--tolerance",
+            type=float,
+            default=DEFAULT_TOLERANCE,
+            help="Mean per-channel difference (0-255) at which a checked-in output still matches.",
+        )
+    sub.choices["build"].add_argument("--force", action="store_true", help="Rewrite every output.")
+    sub.choices["build"].add_argument("--summary-file", type=Path)
+    sub.choices["build"].add_argument("--json-file", type=Path)
+    sub.choices["verify"].add_argument(
+        "--fast", action="store_true", help="Only compare hashes against the state file; skip pixel checks."
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if not args.pubspec.exists():
+        print(f"ERROR: pubspec not found: {args.pubspec}")
+        return 2
+    if args.workers < 1:
+        print("ERROR: --workers must be positive.")
+        return 2
+    try:
+        outputs, metadata = build_matrix(args.pubspec.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as error:
+        print(f"ERROR: {error}")
+        return 2
+    if not outputs:
+        print("ERROR: pubspec.yaml has no flutter_launcher_icons / flutter_native_splash settings.")
+        return 2
+
+    if args.command == "list":
+        for output in outputs:
+            origin = output.source or f"fill {output.fill}"
+            alpha = f", flattened on {output.background}" if output.background else ""
+            print(f"{output.path}  {output.width}x{output.height}  <- {origin}{alpha}")
+        for item in metadata:
+            print(f"{item.path}  (metadata)")
+        return 0
+
+    sources = sorted({output.source for output in outputs if output.source})
+    missing = [source for source in sources if not (ROOT / source).exists()]
+    if missing:
+        print(f"ERROR: logo source not found: {missing[0]}")
+        return 2
+    source_hashes = {source: sha256_file(ROOT / source) or "" for source in sources}
+    state = load_state(args.state)
+    started = time.perf_counter()
+
+    if args.command == "verify":
+        problems = [f"{item.path}: metadata differs; run build" for item in metadata if not metadata_matches(item)]
+        stale = [output for output in outputs if not is_fresh(output, state, source_hashes)]
+        problems += [f"{output.path}: source, size, or file changed since last build" for output in stale]
+        if not args.fast:
+            with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                results = pool.map(process, [(output, "verify", args.tolerance) for output in outputs])
+                for result in results:
+                    if result["action"] != "match":
+                        problems.append(f"{result['path']}: {result['action']} (mean diff {result['diff']})")
+        for problem in problems:
+            print(f"ERROR: {problem}")
+        if problems:
+            return 1
+        print(f"Branding assets match their sources ({len(outputs)} outputs, {len(metadata)} metadata files).")
+        return 0
+
+    try:
+        pending_metadata = [(item, render_metadata(item)) for item in metadata if not metadata_matches(item)]
+    except (OSError, ValueError) as error:
+        print(f"ERROR: {error}")
+        return 2
+    stale = [output for output in outputs if args.force or not is_fresh(output, state, source_hashes)]
+    results = []
+    if stale:
+        # Largest renders first so the pool is not left waiting on one 1024px icon.
+        stale.sort(key=lambda output: -output.width * output.height)
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            tasks = [(output, build_mode(output, state, source_hashes, args.force), args.tolerance) for output in stale]
+            results = list(pool.map(process, tasks))
+    by_path = {output.path: output for output in outputs}
+    next_outputs = {
+        path: recorded for path, recorded in state["outputs"].items() if path in by_path
+    }
+    for result in results:
+        next_outputs[result["path"]] = {
+            "key": output_key(by_path[result["path"]], source_hashes),
+            "sha256": result["sha256"],
+        }
+
+    metadata_written = []
+    for item, content in pending_metadata:
+        path = ROOT / item.path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        metadata_written.append(item.path)
+
+    args.state.parent.mkdir(parents=True, exist_ok=True)
+    args.state.write_text(
+        json.dumps({"version": STATE_VERSION, "outputs": dict(sorted(next_outputs.items()))}, indent=2) + "\n",
+        encoding="utf-8",
+    )
+    report = {
+        "outputs": len(outputs),
+        "up_to_date": len(outputs) - len(stale),
+        "adopted": sum(1 for result in results if result["action"] == "match"),
+        "written": sum(1 for result in results if result["action"] == "written"),
+        "metadata_written": metadata_written,
+        "workers": args.workers,
+        "seconds": round(time.perf_counter() - started, 2),
+        "results": results,
+    }
+    print(render_summary_markdown(report), end="")
+    if args.summary_file:
+        args.summary_file.parent.mkdir(parents=True, exist_ok=True)
+        with args.summary_file.open("a", encoding="utf-8") as handle:
+            handle.write(render_summary_markdown(report))
+    if args.json_file:
+        args.json_file.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
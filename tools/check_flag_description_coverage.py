@@ -1,18 +1,188 @@
 #!/usr/bin/env python3
-"""Check flag-description metadata coverage against bundled flag assets."""
+"""Check flag-description metadata coverage against bundled flag assets.
+
+`--mode duplicates` instead looks for near-copy descriptions: entries whose
+character-shingle Jaccard similarity is at least `--similarity`. Candidate
+pairs come from MinHash banding (LSH), so the check stays sub-quadratic for
+100k-entry metadata files. `--mode all` runs both checks.
+"""
 
 from __future__ import annotations
 
 import argparse
 import json
 import pathlib
-import re
 import sys
+import time
+from collections import defaultdict
+
+from minhash_lsh import band_keys, lsh_shape, one_permutation_signature
+from tool_helpers import normalize_key
+
+
+def asset_keys_from(paths: list[pathlib.Path]) -> set[str]:
+    return {normalize_key(path.stem) for path in paths if path.suffix}
+
+
+def compute_coverage(
+    metadata_keys: set[str],
+    asset_keys: set[str],
+) -> tuple[float, list[str], list[str]]:
+    covered = len(asset_keys & metadata_keys)
+    coverage = covered / len(asset_keys) if asset_keys else 0.0
+    missing = sorted(asset_keys - metadata_keys)
+    orphan = sorted(metadata_keys - asset_keys)
+    return coverage, missing, orphan
+
+
+# 64 one-permutation MinHash bins; bands x rows is picked per threshold.
+SIGNATURE_BINS = 64
+# The LSH S-curve midpoint sits this far below `--similarity`, which keeps
+# recall high for pairs at the threshold while cutting the random
+# candidates that each cost an exact Jaccard check.
+RECALL_MARGIN = 0.05
+
 
+def description_text(value: object) -> str:
+    """Description string from a plain value or a `{"description": ...}` entry."""
+    if isinstance(value, dict):
+        value = value.get("description", "")
+    return str(value)
+
+
+def shingles(text: str, size: int) -> set[str]:
+    normalized = normalize_key(text)
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i : i + size] for i in range(len(normalized) - size + 1)}
+
+
+def jaccard(left: set[str], right: set[str]) -> float:
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+def find_near_duplicates(
+    descriptions: dict[str, str],
+    similarity: float,
+    shingle_size: int,
+) -> tuple[list[list[str]], dict[str, int]]:
+    """Groups keys whose descriptions are near-copies.
+
+    Identical normalized texts collapse first; each distinct text is then
+    banded, and a text is verified (exact Jaccard) only against the first
+    text seen in each of its buckets. Matches are merged with union-find,
+    so work is O(n * bands) instead of O(n^2) pairs.
+    """
+    keys_by_text: dict[str, list[str]] = defaultdict(list)
+    for key, text in descriptions.items():
+        keys_by_text[normalize_key(text)].append(key)
+    texts = list(keys_by_text)
+
+    bands, rows = lsh_shape(SIGNATURE_BINS, similarity - RECALL_MARGIN)
+    parent = list(range(len(texts)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    hash_cache: dict[str, int] = {}
+    buckets: dict[tuple[int, int], int] = {}
+    candidates = verified = 0
+    for index, text in enumerate(texts):
+        tokens = shingles(text, shingle_size)
+        signature = one_permutation_signature(tokens, SIGNATURE_BINS, hash_cache)
+        checked: set[int] = set()
+        for bucket in band_keys(signature, bands, rows):
+            first = buckets.setdefault(bucket, index)
+            if first == index:
+                continue
+            root, own = find(first), find(index)
+            if root == own or root in checked:
+                continue
+            checked.add(root)
+            candidates += 1
+            if jaccard(tokens, shingles(texts[first], shingle_size)) >= similarity:
+                verified += 1
+                parent[own] = root
+
+    groups: dict[int, list[str]] = defaultdict(list)
+    for index, text in enumerate(texts):
+        groups[find(index)].extend(keys_by_text[text])
+    clusters = sorted(
+        (sorted(keys) for keys in groups.values() if len(keys) > 1),
+        key=lambda keys: (-len(keys), keys[0]),
+    )
+    stats = {
+        "entries": len(descriptions),
+        "distinct_texts": len(texts),
+        "bands": bands,
+        "rows": rows,
+        "candidate_pairs": candidates,
+        "verified_pairs": verified,
+    }
+    return clusters, stats
 
-def normalize_key(raw: str) -> str:
-    key = re.sub(r"[^a-z0-9]+", " ", raw.lower()).strip()
-    return re.sub(r"\s+", " ", key)
+
+def check_duplicates(data: dict[str, object], args: argparse.Namespace) -> int:
+    descriptions = {str(k): description_text(v) for k, v in data.items()}
+    started = time.perf_counter()
+    clusters, stats = find_near_duplicates(descriptions, args.similarity, args.shingle_size)
+    elapsed = time.perf_counter() - started
+    duplicated = sum(len(keys) for keys in clusters)
+    ratio = duplicated / len(descriptions) if descriptions else 0.0
+
+    print(
+        f"Near-duplicate scan: {stats['entries']} entries, {stats['distinct_texts']} distinct texts, "
+        f"{stats['candidate_pairs']} LSH candidates ({stats['bands']}x{stats['rows']} bands) "
+        f"in {elapsed:.2f}s"
+    )
+    print(f"Near-duplicate clusters: {len(clusters)} ({duplicated} entries, {ratio * 100:.2f}%)")
+    for keys in clusters[: args.show_clusters]:
+        print(f"- {len(keys)} entries: {keys[:6]}{' ...' if len(keys) > 6 else ''}")
+        print(f"  \"{descriptions[keys[0]]}\"")
+
+    if ratio > args.max_duplicate_ratio:
+        print(
+            "ERROR: near-duplicate descriptions above maximum "
+            f"({ratio * 100:.2f}% > {args.max_duplicate_ratio * 100:.2f}%)."
+        )
+        return 1
+    print("Flag description near-duplicate check passed.")
+    return 0
+
+
+def check_coverage(data: dict[str, object], flags_dir: pathlib.Path, min_coverage: float) -> int:
+    metadata_keys = {str(k) for k in data.keys()}
+    asset_keys = asset_keys_from([path for path in flags_dir.iterdir() if path.is_file()])
+    coverage, missing, orphan = compute_coverage(metadata_keys, asset_keys)
+
+    print(f"Flag assets: {len(asset_keys)}")
+    print(f"Metadata entries: {len(metadata_keys)}")
+    print(f"Coverage: {coverage * 100:.2f}%")
+    print(f"Missing descriptions: {len(missing)}")
+    if missing:
+        print(f"Missing sample: {missing[:15]}")
+    print(f"Orphan metadata keys: {len(orphan)}")
+    if orphan:
+        print(f"Orphan sample: {orphan[:15]}")
+
+    if coverage < min_coverage:
+        print(
+            "ERROR: coverage below minimum "
+            f"({coverage * 100:.2f}% < {min_coverage * 100:.2f}%)."
+        )
+        return 1
+
+    if orphan:
+        print("ERROR: metadata contains keys without matching assets.")
+        return 1
+
+    print("Flag description coverage check passed.")
+    return 0
 
 
 def main() -> int:
@@ -35,6 +205,36 @@ def main() -> int:
         default=0.70,
         help="Minimum required coverage ratio (0.0 to 1.0).",
     )
+    parser.add_argument(
+        "--mode",
+        choices=("coverage", "duplicates", "all"),
+        default="coverage",
+        help="Run the coverage check, the near-duplicate check, or both.",
+    )
+    parser.add_argument(
+        "--similarity",
+        type=float,
+        default=0.7,
+        help="Shingle Jaccard similarity at which two descriptions count as near-duplicates.",
+    )
+    parser.add_argument(
+        "--shingle-size",
+        type=int,
+        default=5,
+        help="Character shingle length used for similarity.",
+    )
+    parser.add_argument(
+        "--max-duplicate-ratio",
+        type=float,
+        default=0.15,
+        help="Maximum share of entries allowed in near-duplicate clusters (0.0 to 1.0).",
+    )
+    parser.add_argument(
+        "--show-clusters",
+        type=int,
+        default=10,
+        help="Number of near-duplicate clusters to print.",
+    )
     args = parser.parse_args()
 
     metadata_path = pathlib.Path(args.metadata)
@@ -43,50 +243,24 @@ def main() -> int:
     if not metadata_path.exists():
         print(f"ERROR: metadata file not found: {metadata_path}")
         return 2
-    if not flags_dir.exists():
+    if args.mode != "duplicates" and not flags_dir.exists():
         print(f"ERROR: flags directory not found: {flags_dir}")
         return 2
+    if not 0.0 < args.similarity <= 1.0:
+        print("ERROR: --similarity must be in (0, 1].")
+        return 2
 
     data = json.loads(metadata_path.read_text())
     if not isinstance(data, dict):
         print("ERROR: metadata JSON root must be an object.")
         return 2
 
-    metadata_keys = {str(k) for k in data.keys()}
-    asset_keys = {
-        normalize_key(path.stem)
-        for path in flags_dir.iterdir()
-        if path.is_file() and path.suffix
-    }
-
-    covered = len(asset_keys & metadata_keys)
-    coverage = covered / len(asset_keys) if asset_keys else 0.0
-    missing = sorted(asset_keys - metadata_keys)
-    orphan = sorted(metadata_keys - asset_keys)
-
-    print(f"Flag assets: {len(asset_keys)}")
-    print(f"Metadata entries: {len(metadata_keys)}")
-    print(f"Coverage: {coverage * 100:.2f}%")
-    print(f"Missing descriptions: {len(missing)}")
-    if missing:
-        print(f"Missing sample: {missing[:15]}")
-    print(f"Orphan metadata keys: {len(orphan)}")
-    if orphan:
-        print(f"Orphan sample: {orphan[:15]}")
-
-    if coverage < args.min_coverage:
-        print(
-            "ERROR: coverage below minimum "
-            f"({coverage * 100:.2f}% < {args.min_coverage * 100:.2f}%)."
-        )
-        return 1
-
-    if orphan:
-        print("ERROR: metadata contains keys without matching assets.")
-        return 1
-
-    print("Flag description coverage check passed.")
-    return 0
+    status = 0
+    if args.mode in ("coverage", "all"):
+        status = max(status, check_coverage(data, flags_dir, args.min_coverage))
+    if args.mode in ("duplicates", "all"):
+        status = max(status, check_duplicates(data, args))
+    return status
 
 
 if __name__ == "__main__":
@@ -0,0 +1,845 @@
+#!/usr/bin/env python3
+"""Streaming ingestion of source datasets into per-category content bundles.
+
+Flag content is hand-maintained (`assets/flags/*.png` plus
+`assets/metadata/flag_descriptions.json`). The celebrity, song-lyrics, and
+anime categories need licensed third-party datasets far larger than that, so
+this pipeline turns CSV / JSONL sources into bundles the app can ship:
+
+1. Records are streamed from each source (`.csv`, `.jsonl`, optionally
+   `.gz`). Keys are normalized with `normalize_key` from `tool_helpers.py` (the
+   same rules as `_normalizeCountryKey` in `lib/data/flag_loader.dart`).
+2. Licensing is attached per record (`license`, `attribution`, `author`,
+   `source_url`, falling back to `--default-*`). Records whose license is
+   not in `--allowed-licenses`, or that need attribution and have none, are
+   rejected with a reason instead of being shipped.
+3. Records are deduplicated by key with an external merge sort: sorted runs
+   of `--chunk-records` are spilled to disk and merged, keeping the first
+   occurrence of each key. Memory is bounded by the chunk size, not the
+   dataset size.
+4. Images are validated (PNG/JPEG/GIF/WebP magic and dimensions), hashed,
+   and copied into a content-addressed `images/` tree by a process pool.
+   At most a few batches of images are in flight, so the ordered output
+   stream stays bounded too.
+5. Entries are written, sorted by key, to `shard-NNNNN.jsonl` files with a
+   `shard-NNNNN.idx` sidecar (little-endian u64 byte offset of each line),
+   and `manifest.json` records shard key ranges, hashes, license counts,
+   sources, and rejections. Bundles are staged and swapped in atomically.
+
+Bundle layout (`<out>/<category>/`):
+- `manifest.json`
+- `shard-00000.jsonl`, `shard-00000.idx`, ...
+- `images/<sha256[:2]>/<sha256>.<ext>`
+
+Subcommands:
+- `ingest`: build one category bundle from source files.
+- `verify`: check a bundle against its manifest.
+- `generate`: write a synthetic CSV source with images for trying the pipeline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import gzip
+import hashlib
+import heapq
+import io
+import json
+import os
+import random
+import re
+import resource
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from array import array
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from tool_helpers import normalize_key
+
+
+MANIFEST = "manifest.json"
+BUNDLE_VERSION = 1
+CATEGORY_PATTERN = re.compile(r"^[a-z][a-z0-9_]*$")
+DEFAULT_ALLOWED_LICENSES = (
+    "CC0-1.0",
+    "PDM-1.0",
+    "CC-BY-4.0",
+    "CC-BY-SA-4.0",
+    "LicenseRef-Quiznetic-Licensed",
+)
+# Licenses whose terms require crediting the author in-app.
+ATTRIBUTION_REQUIRED_PREFIXES = ("CC-BY", "LicenseRef-")
+IMAGE_TYPES = {
+    "png": "png",
+    "jpeg": "jpg",
+    "gif": "gif",
+    "webp": "webp",
+}
+MERGE_FAN_IN = 64
+# Both shards and offsets are read by key; offsets are fixed-width so the
+# app can seek to line `i` without scanning.
+OFFSET_TYPECODE = "Q"
+
+
+# -----------------
+# Sources
+# -----------------
+def open_text(path: Path) -> io.TextIOBase:
+    if path.suffix == ".gz":
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", newline="")
+    return path.open("r", encoding="utf-8", newline="")
+
+
+def source_format(path: Path) -> str:
+    suffixes = [suffix for suffix in path.suffixes if suffix != ".gz"]
+    return suffixes[-1].lstrip(".") if suffixes else ""
+
+
+def iter_source(path: Path, stats: Counter[str]) -> Iterator[tuple[int, dict[str, Any]]]:
+    """`(line_number, record)` for every row of a CSV or JSONL source."""
+    fmt = source_format(path)
+    with open_text(path) as handle:
+        if fmt == "csv":
+            reader = csv.DictReader(handle)
+            for row in reader:
+                yield reader.line_num, {k: v for k, v in row.items() if k is not None}
+            return
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                stats["invalid_json"] += 1
+                continue
+            if isinstance(record, dict):
+                yield line_number, record
+            else:
+                stats["invalid_json"] += 1
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# -----------------
+# Normalization + licensing
+# -----------------
+@dataclass(frozen=True)
+class FieldMap:
+    key: str = "name"
+    answer: str | None = None
+    text: str | None = None
+    image: str = "image"
+    license: str = "license"
+    attribution: str = "attribution"
+    author: str = "author"
+    source_url: str = "source_url"
+
+
+@dataclass(frozen=True)
+class LicensePolicy:
+    allowed: frozenset[str]
+    default_license: str | None = None
+    default_attribution: str | None = None
+    require_image: bool = False
+
+
+def _field(record: dict[str, Any], name: str | None) -> str:
+    if not name:
+        return ""
+    value = record.get(name)
+    return "" if value is None else str(value).strip()
+
+
+def needs_attribution(license_id: str) -> bool:
+    return license_id.startswith(ATTRIBUTION_REQUIRED_PREFIXES)
+
+
+def normalize_record(
+    record: dict[str, Any],
+    fields: FieldMap,
+    policy: LicensePolicy,
+    category: str,
+    origin: str,
+) -> tuple[dict[str, Any] | None, str | None]:
+    """Bundle entry for one source record, or `(None, rejection_reason)`."""
+    raw_key = _field(record, fields.key)
+    key = normalize_key(raw_key)
+    if not key:
+        return None, "missing_key"
+    license_id = _field(record, fields.license) or (policy.default_license or "")
+    if not license_id:
+        return None, "missing_license"
+    if license_id not in policy.allowed:
+        return None, "license_not_allowed"
+    attribution = _field(record, fields.attribution) or (policy.default_attribution or "")
+    if needs_attribution(license_id) and not attribution:
+        return None, "missing_attribution"
+    image = _field(record, fields.image)
+    if policy.require_image and not image:
+        return None, "missing_image"
+
+    entry: dict[str, Any] = {
+        "key": key,
+        "answer": _field(record, fields.answer or fields.key) or raw_key,
+        "category": category,
+    }
+    text = _field(record, fields.text)
+    if text:
+        entry["text"] = text
+    if image:
+        entry["image_source"] = image
+    entry["license"] = license_id
+    if attribution:
+        entry["attribution"] = attribution
+    for name, source_field in (("author", fields.author), ("source_url", fields.source_url)):
+        value = _field(record, source_field)
+        if value:
+            entry[name] = value
+    entry["origin"] = origin
+    return entry, None
+
+
+# -----------------
+# External sort + dedupe
+# -----------------
+def _write_run(directory: Path, index: int, rows: list[tuple[str, int, dict[str, Any]]]) -> Path:
+    rows.sort(key=lambda row: (row[0], row[1]))
+    path = directory / f"run-{index:05d}.jsonl"
+    with path.open("w", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json.dumps(row, separators=(",", ":"), ensure_ascii=False) + "\n")
+    return path
+
+
+def _read_run(path: Path) -> Iterator[tuple[str, int, dict[str, Any]]]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            key, seq, entry = json.loads(line)
+            yield key, seq, entry
+
+
+def _merge_runs(paths: list[Path]) -> Iterator[tuple[str, int, dict[str, Any]]]:
+    return heapq.merge(*(_read_run(path) for path in paths), key=lambda row: (row[0], row[1]))
+
+
+def sorted_groups(
+    entries: Iterator[dict[str, Any]],
+    workdir: Path,
+    chunk_records: int,
+    stats: Counter[str],
+) -> Iterator[list[dict[str, Any]]]:
+    """Entries grouped by key in key order, each group in source order.
+
+    Only one group is held in memory at a time. The caller picks the first
+    entry of a group that passes the image checks, so a bad image on the first
+    occurrence falls back to the next one instead of dropping the key.
+    """
+    runs: list[Path] = []
+    chunk: list[tuple[str, int, dict[str, Any]]] = []
+    for seq, entry in enumerate(entries):
+        chunk.append((entry["key"], seq, entry))
+        if len(chunk) >= chunk_records:
+            runs.append(_write_run(workdir, len(runs), chunk))
+            chunk = []
+    if chunk or not runs:
+        runs.append(_write_run(workdir, len(runs), chunk))
+    stats["sort_runs"] = len(runs)
+
+    # Merge in passes so open files stay under MERGE_FAN_IN.
+    generation = 0
+    while len(runs) > MERGE_FAN_IN:
+        generation += 1
+        merged: list[Path] = []
+        for start in range(0, len(runs), MERGE_FAN_IN):
+            group = runs[start : start + MERGE_FAN_IN]
+            path = workdir / f"merge-{generation}-{len(merged):05d}.jsonl"
+            with path.open("w", encoding="utf-8") as handle:
+                for row in _merge_runs(group):
+                    handle.write(json.dumps(row, separators=(",", ":"), ensure_ascii=False) + "\n")
+            for old in group:
+                old.unlink()
+            merged.append(path)
+        runs = merged
+
+    group: list[dict[str, Any]] = []
+    for key, _, entry in _merge_runs(runs):
+        if group and key != group[0]["key"]:
+            yield group
+            group = []
+        group.append(entry)
+    if group:
+        yield group
+
+
+# -----------------
+# Images
+# -----------------
+def image_info(head: bytes) -> tuple[str, int, int] | None:
+    """`(type, width, height)` from the first bytes of an image, or `None`."""
+    if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+        width, height = struct.unpack(">II", head[16:24])
+        return "png", width, height
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        width, height = struct.unpack("<HH", head[6:10])
+        return "gif", width, height
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        chunk = head[12:16]
+        if chunk == b"VP8X":
+            width = int.from_bytes(head[24:27], "little") + 1
+            height = int.from_bytes(head[27:30], "little") + 1
+            return "webp", width, height
+        if chunk == b"VP8L":
+            bits = int.from_bytes(head[21:25], "little")
+            return "webp", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8 ":
+            width, height = struct.unpack("<HH", head[26:30])
+            return "webp", width & 0x3FFF, height & 0x3FFF
+        return None
+    if head[:2] == b"\xff\xd8":
+        offset = 2
+        while offset + 9 < len(head):
+            if head[offset] != 0xFF:
+                return None
+            marker = head[offset + 1]
+            length = struct.unpack(">H", head[offset + 2 : offset + 4])[0]
+            # SOF0..SOF15 minus DHT (C4), JPG (C8), DAC (CC).
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack(">HH", head[offset + 5 : offset + 9])
+                return "jpeg", width, height
+            offset += 2 + length
+    return None
+
+
+IMAGE_BATCH = 256
+# JPEG SOF markers can sit after large EXIF blocks.
+IMAGE_HEAD_BYTES = 1 << 16
+
+
+def process_image(task: tuple[str, str, int, int]) -> dict[str, Any]:
+    """Validates, hashes, and copies one image into the bundle (worker process)."""
+    source, images_dir, max_bytes, max_side = task
+    path = Path(source)
+    if "://" in source:
+        return {"error": "remote_image"}
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return {"error": "image_not_found"}
+    if size > max_bytes:
+        return {"error": "image_too_large"}
+    data = path.read_bytes()
+    info = image_info(data[:IMAGE_HEAD_BYTES])
+    if info is None:
+        return {"error": "image_unsupported"}
+    kind, width, height = info
+    if not width or not height or max(width, height) > max_side:
+        return {"error": "image_bad_dimensions"}
+    digest = hashlib.sha256(data).hexdigest()
+    relative = f"images/{digest[:2]}/{digest}.{IMAGE_TYPES[kind]}"
+    target = Path(images_dir).parent / relative
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Same content from two workers lands on the same name; replace is atomic.
+        partial = target.with_name(f".{target.name}.{os.getpid()}")
+        partial.write_bytes(data)
+        os.replace(partial, target)
+    return {"image": relative, "image_sha256": digest, "width": width, "height": height, "bytes": size}
+
+
+def process_group(tasks: list[tuple[str | None, str, int, int]]) -> list[dict[str, Any] | None]:
+    """Image results for one key's candidates, stopping at the first usable one."""
+    results: list[dict[str, Any] | None] = []
+    for task in tasks:
+        result = None if task[0] is None else process_image(task)
+        results.append(result)
+        if result is None or "error" not in result:
+            break
+    return results
+
+
+def process_images(groups: list[list[tuple[str | None, str, int, int]]]) -> list[list[dict[str, Any] | None]]:
+    return [process_group(tasks) for tasks in groups]
+
+
+def resolve_image(entry: dict[str, Any], images_root: Path | None, source_dir: Path) -> str:
+    raw = entry.pop("image_source")
+    if "://" in raw:
+        return raw
+    path = Path(raw)
+    if not path.is_absolute():
+        path = (images_root or source_dir) / path
+    return str(path)
+
+
+# -----------------
+# Shards
+# -----------------
+@dataclass
+class ShardWriter:
+    directory: Path
+    shard_size: int
+    shards: list[dict[str, Any]] = field(default_factory=list)
+    _handle: Any = None
+    _digest: Any = None
+    _offsets: array = field(default_factory=lambda: array(OFFSET_TYPECODE))
+    _position: int = 0
+    _first: str | None = None
+    _last: str | None = None
+
+    def write(self, entry: dict[str, Any]) -> None:
+        if self._handle is None:
+            self._open()
+        line = (json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+        self._offsets.append(self._position)
+        self._handle.write(line)
+        self._digest.update(line)
+        self._position += len(line)
+        if self._first is None:
+            self._first = entry["key"]
+        self._last = entry["key"]
+        if len(self._offsets) >= self.shard_size:
+            self._close()
+
+    def _name(self) -> str:
+        return f"shard-{len(self.shards):05d}"
+
+    def _open(self) -> None:
+        self._handle = (self.directory / f"{self._name()}.jsonl").open("wb")
+        self._digest = hashlib.sha256()
+        self._offsets = array(OFFSET_TYPECODE)
+        self._position = 0
+        self._first = self._last = None
+
+    def _close(self) -> None:
+        name = self._name()
+        self._handle.close()
+        offsets = self._offsets
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        (self.directory / f"{name}.idx").write_bytes(offsets.tobytes())
+        self.shards.append(
+            {
+                "file": f"{name}.jsonl",
+                "index": f"{name}.idx",
+                "entries": len(self._offsets),
+                "first_key": self._first,
+                "last_key": self._last,
+                "bytes": self._position,
+                "sha256": self._digest.hexdigest(),
+            }
+        )
+        self._handle = None
+
+    def finish(self) -> list[dict[str, Any]]:
+        if self._handle is not None:
+            self._close()
+        return self.shards
+
+
+# -----------------
+# Pipeline
+# -----------------
+@dataclass(frozen=True)
+class IngestOptions:
+    category: str
+    fields: FieldMap
+    policy: LicensePolicy
+    images_root: Path | None = None
+    shard_size: int = 5_000
+    chunk_records: int = 50_000
+    workers: int = max(1, os.cpu_count() or 1)
+    max_image_bytes: int = 2 << 20
+    max_image_side: int = 4096
+
+
+def ingest(sources: list[Path], out: Path, options: IngestOptions, rejects_file: Path | None = None) -> dict[str, Any]:
+    started = time.perf_counter()
+    stats: Counter[str] = Counter()
+    rejected: Counter[str] = Counter()
+    licenses: Counter[str] = Counter()
+    source_rows: Counter[str] = Counter()
+    bundle = out / options.category
+    bundle.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{options.category}-", dir=bundle.parent))
+    rejects = rejects_file.open("w", encoding="utf-8") if rejects_file else None
+
+    def reject(origin: str, reason: str) -> None:
+        rejected[reason] += 1
+        if rejects is not None:
+            rejects.write(json.dumps({"origin": origin, "reason": reason}) + "\n")
+
+    def entries() -> Iterator[dict[str, Any]]:
+        for source in sources:
+            for line_number, record in iter_source(source, stats):
+                source_rows[str(source)] += 1
+                origin = f"{source.name}:{line_number}"
+                entry, reason = normalize_record(record, options.fields, options.policy, options.category, origin)
+                if entry is None:
+                    reject(origin, reason or "invalid")
+                    continue
+                if "image_source" in entry:
+                    entry["image_source"] = resolve_image(entry, options.images_root, source.parent)
+                yield entry
+
+    try:
+        images_dir = staging / "images"
+        writer = ShardWriter(staging, options.shard_size)
+        with tempfile.TemporaryDirectory(prefix="content-ingest-sort-") as workdir, ProcessPoolExecutor(
+            max_workers=options.workers
+        ) as pool:
+            # Entries travel in batches so each pool round trip covers many
+            # images; at most `workers * 2` batches are in flight.
+            window: deque[tuple[list[list[dict[str, Any]]], Future]] = deque()
+            batch: list[list[dict[str, Any]]] = []
+
+            def submit() -> None:
+                tasks = [
+                    [
+                        (entry.pop("image_source", None), str(images_dir), options.max_image_bytes, options.max_image_side)
+                        for entry in group
+                    ]
+                    for group in batch
+                ]
+                window.append((batch, pool.submit(process_images, tasks)))
+
+            def drain(limit: int) -> None:
+                while len(window) > limit:
+                    groups, future = window.popleft()
+                    for group, results in zip(groups, future.result()):
+                        for entry, result in zip(group, results):
+                            if result is not None:
+                                if "error" in result:
+                                    reject(entry["origin"], result["error"])
+                                    continue
+                                stats["image_bytes"] += result.pop("bytes")
+                                entry.update(result)
+                            licenses[entry["license"]] += 1
+                            writer.write(entry)
+                            # Later entries for the key were never checked.
+                            stats["duplicates"] += len(group) - len(results)
+
+            for group in sorted_groups(entries(), Path(workdir), options.chunk_records, stats):
+                batch.append(group)
+                if len(batch) >= IMAGE_BATCH:
+                    submit()
+                    batch = []
+                    drain(options.workers * 2)
+            if batch:
+                submit()
+            drain(0)
+        shards = writer.finish()
+
+        images = sum(1 for _ in images_dir.glob("*/*")) if images_dir.exists() else 0
+        entries_written = sum(shard["entries"] for shard in shards)
+        manifest = {
+            "version": BUNDLE_VERSION,
+            "category": options.category,
+            "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "key_normalization": "lowercase; runs of non [a-z0-9] -> single space; trimmed",
+            "entries": entries_written,
+            "shard_size": options.shard_size,
+            "offset_index": {"type": "u64", "byteorder": "little"},
+            "licenses": dict(sorted(licenses.items())),
+            "images": {"files": images, "bytes_referenced": stats["image_bytes"]},
+            "duplicates": stats["duplicates"],
+            "rejected": dict(sorted(rejected.items())),
+            "sources": [
+                {"path": source.name, "sha256": file_sha256(source), "records": source_rows[str(source)]}
+                for source in sources
+            ],
+            "shards": shards,
+        }
+        (staging / MANIFEST).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+        if bundle.exists():
+            shutil.rmtree(bundle)
+        staging.rename(bundle)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    finally:
+        if rejects is not None:
+            rejects.close()
+
+    elapsed = time.perf_counter() - started
+    records = sum(source_rows.values())
+    return {
+        "bundle": str(bundle),
+        "records": records,
+        "entries": entries_written,
+        "duplicates": stats["duplicates"],
+        "rejected": dict(sorted(rejected.items())),
+        "invalid_json": stats["invalid_json"],
+        "shards": len(shards),
+        "images": images,
+        "sort_runs": stats["sort_runs"],
+        "workers": options.workers,
+        "seconds": round(elapsed, 2),
+        "records_per_second": round(records / elapsed) if elapsed > 0 else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS; worker processes excluded.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1 << 20) if sys.platform == "darwin" else rss / 1024
+
+
+# -----------------
+# Verify
+# -----------------
+def verify_bundle(bundle: Path, deep: bool = False) -> list[str]:
+    """Problems found in a bundle; empty when it matches its manifest."""
+    manifest_path = bundle / MANIFEST
+    if not manifest_path.exists():
+        return [f"missing {MANIFEST}"]
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    problems: list[str] = []
+    previous: str | None = None
+    total = 0
+    licenses: Counter[str] = Counter()
+    for shard in manifest["shards"]:
+        data_path, index_path = bundle / shard["file"], bundle / shard["index"]
+        if not data_path.exists() or not index_path.exists():
+            problems.append(f"{shard['file']}: missing shard or index")
+            continue
+        if file_sha256(data_path) != shard["sha256"]:
+            problems.append(f"{shard['file']}: sha256 mismatch")
+        offsets = array(OFFSET_TYPECODE)
+        offsets.frombytes(index_path.read_bytes())
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        if len(offsets) != shard["entries"]:
+            problems.append(f"{shard['index']}: {len(offsets)} offsets for {shard['entries']} entries")
+        with data_path.open("rb") as handle:
+            for position, line in enumerate(iter(handle.readline, b"")):
+                if position < len(offsets) and handle.tell() - len(line) != offsets[position]:
+                    problems.append(f"{shard['file']}:{position + 1}: offset mismatch")
+                    break
+                entry = json.loads(line)
+                total += 1
+                key = entry.get("key", "")
+                if key != normalize_key(key):
+                    problems.append(f"{shard['file']}:{position + 1}: key not normalized: {key!r}")
+                if previous is not None and key <= previous:
+                    problems.append(f"{shard['file']}:{position + 1}: key out of order or duplicate: {key!r}")
+                previous = key
+                licenses[entry.get("license")] += 1
+                image = entry.get("image")
+                if image:
+                    image_path = bundle / image
+                    if not image_path.exists():
+                        problems.append(f"{shard['file']}:{position + 1}: missing {image}")
+                    elif deep and file_sha256(image_path) != entry.get("image_sha256"):
+                        problems.append(f"{shard['file']}:{position + 1}: image sha256 mismatch")
+                if len(problems) > 50:
+                    return problems + ["too many problems; stopping"]
+    if total != manifest["entries"]:
+        problems.append(f"manifest lists {manifest['entries']} entries, shards hold {total}")
+    if dict(sorted(licenses.items())) != manifest["licenses"]:
+        problems.append("license counts differ from manifest")
+    return problems
+
+
+# -----------------
+# Synthetic source
+# -----------------
+def tiny_png(width: int, height: int, rgb: tuple[int, int, int]) -> bytes:
+    def chunk(kind: bytes, payload: bytes) -> bytes:
+        return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload))
+
+    row = b"\x00" + bytes(rgb) * width
+    return b"".join(
+        (
+            b"\x89PNG\r\n\x1a\n",
+            chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+            chunk(b"IDAT", zlib.compress(row * height)),
+            chunk(b"IEND", b""),
+        )
+    )
+
+
+def generate_source(out: Path, records: int, images: int, seed: int) -> Path:
+    """CSV source with duplicates, unlicensed rows, and shared/missing images."""
+    rng = random.Random(seed)
+    image_dir = out / "images"
+    image_dir.mkdir(parents=True, exist_ok=True)
+    for index in range(images):
+        (image_dir / f"img_{index:05d}.png").write_bytes(
+            tiny_png(64, 48, (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+        )
+    licenses = ("CC-BY-4.0", "CC-BY-SA-4.0", "CC0-1.0", "All-Rights-Reserved", "")
+    path = out / "source.csv"
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["name", "text", "image", "license", "attribution", "author", "source_url"])
+        for index in range(records):
+            # ~5% exact-key duplicates with different casing/punctuation.
+            number = rng.randrange(index) if index and rng.random() < 0.05 else index
+            name = f"Person {number:07d}" if rng.random() < 0.5 else f"person-{number:07d}!"
+            license_id = rng.choices(licenses, weights=(50, 20, 25, 3, 2))[0]
+            author = f"Photographer {rng.randrange(500)}"
+            image = f"images/img_{rng.randrange(images):05d}.png" if rng.random() < 0.98 else "images/missing.png"
+            writer.writerow(
+                [
+                    name,
+                    f"Synthetic clue {number}",
+                    image,
+                    license_id,
+                    f"Photo by {author}" if license_id.startswith("CC-BY") and rng.random() < 0.99 else "",
+                    author,
+                    f"https://example.org/item/{number}",
+                ]
+            )
+    return path
+
+
+# -----------------
+# CLI
+# -----------------
+def render_summary_markdown(report: dict[str, Any]) -> str:
+    rejected = ", ".join(f"{reason} {count:,}" for reason, count in report["rejected"].items()) or "none"
+    return "\n".join(
+        [
+            "## Content Ingestion",
+            "",
+            f"- Bundle: `{report['bundle']}`",
+            f"- Records: **{report['records']:,}** -> entries **{report['entries']:,}** "
+            f"in {report['shards']:,} shards ({report['images']:,} images)",
+            f"- Duplicates dropped: {report['duplicates']:,}; rejected: {rejected}; "
+            f"invalid JSON lines: {report['invalid_json']:,}",
+            f"- Time: {report['seconds']}s ({report['records_per_second'] or 0:,} records/s, "
+            f"{report['workers']} image workers, {report['sort_runs']} sort runs, "
+            f"peak RSS {report['peak_rss_mb']} MB)",
+            "",
+        ]
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Ingest CSV/JSONL datasets into sharded content bundles.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = sub.add_parser("ingest", help="Build a category bundle from source files.")
+    ingest_parser.add_argument("sources", type=Path, nargs="+", help="CSV or JSONL files (optionally .gz).")
+    ingest_parser.add_argument("--category", required=True, help="Bundle name, e.g. celebrity, song, anime.")
+    ingest_parser.add_argument("--out", type=Path, default=Path("build/content"))
+    ingest_parser.add_argument("--key-field", default="name")
+    ingest_parser.add_argument("--answer-field", help="Display answer field (defaults to the key field).")
+    ingest_parser.add_argument("--text-field", help="Optional prompt text field (lyric snippet, clue).")
+    ingest_parser.add_argument("--image-field", default="image")
+    ingest_parser.add_argument("--images-root", type=Path, help="Base for relative image paths.")
+    ingest_parser.add_argument("--require-image", action="store_true")
+    ingest_parser.add_argument("--default-license", help="License for records without one (SPDX id).")
+    ingest_parser.add_argument("--default-attribution", help="Attribution for records without one.")
+    ingest_parser.add_argument(
+        "--allowed-licenses",
+        default=",".join(DEFAULT_ALLOWED_LICENSES),
+        help="Comma-separated SPDX ids accepted into bundles.",
+    )
+    ingest_parser.add_argument("--shard-size", type=int, default=5_000)
+    ingest_parser.add_argument("--chunk-records", type=int, default=50_000, help="Records per in-memory sort run.")
+    ingest_parser.add_argument("--workers", type=int, default=max(1, os.cpu_count() or 1))
+    ingest_parser.add_argument("--max-image-bytes", type=int, default=2 << 20)
+    ingest_parser.add_argument("--max-image-side", type=int, default=4096)
+    ingest_parser.add_argument("--rejects-file", type=Path, help="Write rejected records (origin, reason) as JSONL.")
+    ingest_parser.add_argument("--summary-file", type=Path)
+    ingest_parser.add_argument("--json-file", type=Path)
+
+    verify_parser = sub.add_parser("verify", help="Check a bundle against its manifest.")
+    verify_parser.add_argument("bundle", type=Path)
+    verify_parser.add_argument("--deep", action="store_true", help="Also re-hash every referenced image.")
+
+    gen = sub.add_parser("generate", help="Write a synthetic CSV source with images.")
+    gen.add_argument("output", type=Path)
+    gen.add_argument("--records", type=int, default=100_000)
+    gen.add_argument("--images", type=int, default=2_000)
+    gen.add_argument("--seed", type=int, default=1)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    if args.command == "generate":
+        path = generate_source(args.output, args.records, args.images, args.seed)
+        print(f"Wrote {args.records:,} records and {args.images:,} images to {path.parent}")
+        return 0
+
+    if args.command == "verify":
+        problems = verify_bundle(args.bundle, args.deep)
+        for problem in problems:
+            print(f"ERROR: {problem}")
+        if problems:
+            return 1
+        print(f"Bundle {args.bundle} matches its manifest.")
+        return 0
+
+    if not CATEGORY_PATTERN.match(args.category):
+        print(f"ERROR: category must match {CATEGORY_PATTERN.pattern}: {args.category!r}")
+        return 2
+    for source in args.sources:
+        if not source.exists():
+            print(f"ERROR: source not found: {source}")
+            return 2
+        if source_format(source) not in ("csv", "jsonl"):
+            print(f"ERROR: unsupported source format (expected .csv or .jsonl): {source}")
+            return 2
+    if args.shard_size < 1 or args.chunk_records < 1 or args.workers < 1:
+        print("ERROR: --shard-size, --chunk-records, and --workers must be positive.")
+        return 2
+    allowed = frozenset(item.strip() for item in args.allowed_licenses.split(",") if item.strip())
+    if args.default_license and args.default_license not in allowed:
+        print(f"ERROR: --default-license {args.default_license} is not in --allowed-licenses.")
+        return 2
+
+    options = IngestOptions(
+        category=args.category,
+        fields=FieldMap(
+            key=args.key_field,
+            answer=args.answer_field,
+            text=args.text_field,
+            image=args.image_field,
+        ),
+        policy=LicensePolicy(
+            allowed=allowed,
+            default_license=args.default_license,
+            default_attribution=args.default_attribution,
+            require_image=args.require_image,
+        ),
+        images_root=args.images_root,
+        shard_size=args.shard_size,
+        chunk_records=args.chunk_records,
+        workers=args.workers,
+        max_image_bytes=args.max_image_bytes,
+        max_image_side=args.max_image_side,
+    )
+    report = ingest(args.sources, args.out, options, args.rejects_file)
+    print(render_summary_markdown(report), end="")
+    if args.summary_file:
+        args.summary_file.parent.mkdir(parents=True, exist_ok=True)
+        with args.summary_file.open("a", encoding="utf-8") as handle:
+            handle.write(render_summary_markdown(report))
+    if args.json_file:
+        args.json_file.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,843 @@
+#!/usr/bin/env python3
+"""Streaming crash clustering for exported Crashlytics events.
+
+`CrashReportingService` forwards Flutter framework errors and the
+`runZonedGuarded` handler in `main.dart` to Crashlytics. For incident triage
+(`docs/INCIDENT_POSTMORTEM_TEMPLATE.md`) this tool groups exported crash
+events by root cause instead of by hand:
+
+1. Dart stack frames are normalized: line/column numbers, `file://` and web
+   URL prefixes, AOT `abs`/`virt` addresses, and dump headers are stripped,
+   and zone/async plumbing frames are dropped.
+2. A stable fingerprint is the exception type plus the top app frames
+   (`package:quiznetic_flutter/`), or the top frames when no app frame exists.
+3. New fingerprints are MinHashed over their frames and frame pairs and
+   looked up in an LSH index; a near-identical trace of the same exception
+   type joins the existing cluster, otherwise it starts a new one.
+
+Memory is bounded regardless of input size: events are streamed, each
+cluster keeps capped version/route/issue counters and a small HyperLogLog of
+affected users, and when more than `--max-fingerprints` fingerprints are
+tracked the lowest-count clusters are evicted (lossy counting). The report
+states how many events were evicted and the largest evicted count, which
+bounds how far any reported count can be under.
+
+Accepted records (JSONL, one event per line; other analytics events with a
+`name` other than `crash` are skipped):
+- Crashlytics BigQuery rows: `exceptions[].{type, exception_message,
+  frames[]}`, `application.display_version`, `custom_keys`, `is_fatal`,
+  `issue_id`, `installation_uuid`, `event_timestamp`
+- flat records: `stack` / `stack_trace` text, `error` / `exception_type`,
+  `message`, `version`, `route`, `fatal`, `uid`, `ts`
+
+Subcommands:
+- `cluster`: cluster one or more exports and report the top clusters.
+- `generate`: write a synthetic export with known root causes.
+- `bench`: generate, cluster, and score against the known root causes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import hashlib
+import json
+import random
+import re
+import resource
+import sys
+import tempfile
+import time
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from kpi_stream_evaluator import HyperLogLog, parse_ts
+from minhash_lsh import MinHasher, band_keys, lsh_shape, similarity
+
+
+APP_PACKAGE = "package:quiznetic_flutter/"
+FINGERPRINT_FRAMES = 5
+SHINGLE_FRAMES = 24
+SAMPLE_FRAMES = 8
+COUNTER_CAP = 32
+OTHER = "(other)"
+
+# Zone, microtask, and future plumbing shows up in almost every async trace
+# and says nothing about the root cause.
+NOISE_LOCATIONS = (
+    "dart:async/zone.dart",
+    "dart:async/future_impl.dart",
+    "dart:async/schedule_microtask.dart",
+    "dart:async/timer.dart",
+    "dart:async/broadcast_stream_controller.dart",
+    "dart:async/stream_impl.dart",
+    "dart:async-patch/",
+    "dart:isolate-patch/",
+    "dart:core-patch/",
+)
+HEADER_PREFIXES = (
+    "***",
+    "pid:",
+    "os:",
+    "build_id:",
+    "isolate_dso_base:",
+    "vm_dso_base:",
+    "isolate_instructions:",
+    "vm_instructions:",
+    "<asynchronous suspension>",
+    "===== asynchronous gap",
+)
+
+# `#3      Foo.bar (package:app/foo.dart:12:5)`
+VM_FRAME = re.compile(r"^#\d+\s+(?P<symbol>.+?)\s+\((?P<location>.+)\)$")
+# `#00 abs 000000706e4f5a2f virt 00000000002d5a2f _kDartIsolateSnapshotInstructions+0x2a5a2f`
+AOT_FRAME = re.compile(r"^#\d+\s+abs\s+[0-9a-f]+(?:\s+virt\s+[0-9a-f]+)?\s+(?P<symbol>\S+)")
+# `at Object.foo (http://host/main.dart.js:1:2)` or `at http://host/main.dart.js:1:2`
+WEB_FRAME = re.compile(r"^at\s+(?:(?P<symbol>.+?)\s+\()?(?P<location>[^()\s]+?)\)?$")
+# `package:app/foo.dart 12:5  Foo.bar` (package:stack_trace terse format)
+TERSE_FRAME = re.compile(r"^(?P<location>(?:package|dart|file|https?):\S+)\s+(?:\d+(?::\d+)?\s+)?(?P<symbol>.+)$")
+LINE_COLUMN = re.compile(r"(?::\d+){1,2}$")
+# DDC serves sources as `/packages/<pkg>/...` and `/dart-sdk/lib/<lib>/...`.
+WEB_PACKAGE = re.compile(r"/packages/(?P<path>[^?#]+)")
+WEB_SDK = re.compile(r"/dart-sdk/lib/(?P<path>[^?#]+)")
+# Debug builds report `file://` paths: pub-cache dependencies, else the app.
+PUB_CACHE = re.compile(r"/\.pub-cache/(?:hosted/[^/]+|git)/(?P<package>[a-z0-9_]+)-[^/]+/lib/(?P<path>.+)")
+APP_SOURCE = re.compile(r"/lib/(?P<path>.+)")
+TYPE_NAME = re.compile(r"[A-Z_$][\w$]*(?:<[\w$<>?, ]*>)?\??")
+MESSAGE_NOISE = (
+    (re.compile(r"https?://\S+"), "<url>"),
+    (re.compile(r"0x[0-9a-fA-F]+"), "<hex>"),
+    # Quoted values vary per event; quoted type names (`type 'Null'`) do not.
+    (re.compile(r"'[^']*'|\"[^\"]*\""), lambda m: m[0] if TYPE_NAME.fullmatch(m[0][1:-1]) else "<str>"),
+    (re.compile(r"\b[A-Za-z0-9]{20,}\b"), "<id>"),
+    (re.compile(r"-?\b\d+(?:\.\d+)?\b"), "<n>"),
+)
+TYPE_PREFIX = re.compile(r"^\s*(?P<type>[A-Za-z_$][\w$]*)(?=\s*[:(])")
+
+
+# -----------------
+# Normalization
+# -----------------
+def _location(raw: str) -> str:
+    raw = LINE_COLUMN.sub("", raw.strip())
+    if raw.startswith(("http://", "https://", "file://")):
+        if match := WEB_PACKAGE.search(raw):
+            return f"package:{match['path']}"
+        if match := WEB_SDK.search(raw):
+            return f"dart:{match['path']}"
+        if raw.startswith("file://"):
+            if match := PUB_CACHE.search(raw):
+                return f"package:{match['package']}/{match['path']}"
+            if match := APP_SOURCE.search(raw):
+                return f"{APP_PACKAGE}{match['path']}"
+        # Hosts and build paths differ per machine; keep the file name.
+        raw = raw.rsplit("/", 1)[-1]
+    return raw
+
+
+# Stack lines repeat heavily within a release; the bounded caches keep the
+# regex work per distinct line instead of per event.
+@functools.lru_cache(maxsize=1 << 16)
+def normalize_frame(line: str) -> str | None:
+    """One stack line -> `symbol (location)` without positions, or `None`."""
+    line = line.strip()
+    if not line or line.startswith(HEADER_PREFIXES):
+        return None
+    match = AOT_FRAME.match(line)
+    if match:
+        # Obfuscated AOT frames only carry an instruction offset; it is
+        # stable within one build, so symbolize first to group across builds.
+        return f"native {match['symbol']}"
+    match = VM_FRAME.match(line) or TERSE_FRAME.match(line)
+    if match:
+        symbol, location = match["symbol"].strip(), _location(match["location"])
+    else:
+        match = WEB_FRAME.match(line)
+        if not match:
+            return None
+        symbol, location = (match["symbol"] or "<anonymous>").strip(), _location(match["location"])
+    if location.startswith(NOISE_LOCATIONS):
+        return None
+    return f"{symbol} ({location})"
+
+
+def normalize_stack(stack: str | Iterable[Any]) -> list[str]:
+    if isinstance(stack, str):
+        lines: Iterable[Any] = stack.splitlines()
+    else:
+        lines = stack
+    frames: list[str] = []
+    for item in lines:
+        if isinstance(item, dict):
+            # Crashlytics export frame: {symbol, file, line, library, ...}.
+            symbol = item.get("symbol") or item.get("owner") or "<unknown>"
+            location = item.get("file") or item.get("library") or ""
+            item = f"#0 {symbol} ({location})" if location else f"#0 {symbol} (<unknown>)"
+        frame = normalize_frame(str(item))
+        if frame is not None:
+            frames.append(frame)
+    return frames
+
+
+@functools.lru_cache(maxsize=1 << 14)
+def normalize_message(message: str) -> str:
+    for pattern, placeholder in MESSAGE_NOISE:
+        message = pattern.sub(placeholder, message)
+    return " ".join(message.split())[:200]
+
+
+def fingerprint(exception_type: str, frames: list[str], message: str) -> str:
+    app = [frame for frame in frames if APP_PACKAGE in frame]
+    top = (app or frames)[:FINGERPRINT_FRAMES]
+    # Without frames the normalized message is the only signal left.
+    basis = "\n".join([exception_type, *top]) if top else f"{exception_type}\n{message}"
+    return hashlib.blake2b(basis.encode("utf-8"), digest_size=8).hexdigest()
+
+
+# -----------------
+# Input
+# -----------------
+@dataclass
+class Crash:
+    ts: float | None
+    exception_type: str
+    message: str
+    frames: list[str]
+    fatal: bool
+    version: str
+    route: str
+    user: str
+    issue_id: str
+    label: str = ""
+
+
+def _custom_key(record: dict[str, Any], key: str) -> Any:
+    for item in record.get("custom_keys") or ():
+        if isinstance(item, dict) and item.get("key") == key:
+            value = item.get("value")
+            if isinstance(value, dict):
+                return next((v for v in value.values() if v is not None), None)
+            return value
+    return None
+
+
+def to_crash(record: Any) -> Crash | None:
+    if not isinstance(record, dict):
+        return None
+    name = record.get("name") or record.get("event_name")
+    if name is not None and name != "crash":
+        return None
+    params = record.get("params") if isinstance(record.get("params"), dict) else {}
+
+    exceptions = record.get("exceptions") or record.get("errors")
+    first = exceptions[0] if isinstance(exceptions, list) and exceptions and isinstance(exceptions[0], dict) else {}
+    raw_error = str(
+        first.get("exception_message")
+        or record.get("error")
+        or record.get("message")
+        or record.get("issue_subtitle")
+        or ""
+    )
+    exception_type = str(
+        first.get("type")
+        or record.get("exception_type")
+        or record.get("error_type")
+        or ((match := TYPE_PREFIX.match(raw_error)) and match["type"])
+        or record.get("issue_title")
+        or "UnknownError"
+    )
+    stack = first.get("frames") or record.get("stack") or record.get("stack_trace") or record.get("stackTrace") or ""
+    frames = normalize_stack(stack)
+    if not frames and not raw_error and exception_type == "UnknownError":
+        return None
+
+    application = record.get("application") if isinstance(record.get("application"), dict) else {}
+    version = (
+        application.get("display_version")
+        or record.get("app_version")
+        or record.get("version")
+        or params.get("app_version")
+        or "unknown"
+    )
+    if application.get("build_version"):
+        version = f"{version}+{application['build_version']}"
+    user = record.get("user") if isinstance(record.get("user"), dict) else {}
+    fatal = record.get("is_fatal", record.get("fatal", params.get("fatal", True)))
+    return Crash(
+        ts=parse_ts(record.get("event_timestamp", record.get("ts", record.get("timestamp")))),
+        exception_type=exception_type,
+        message=normalize_message(raw_error.removeprefix(f"{exception_type}:").strip()),
+        frames=frames,
+        fatal=fatal in (True, 1, "true", "1"),
+        version=str(version),
+        route=str(record.get("route") or params.get("route") or _custom_key(record, "route") or "unknown"),
+        user=str(
+            record.get("installation_uuid")
+            or user.get("id")
+            or record.get("uid")
+            or record.get("user_id")
+            or ""
+        ),
+        issue_id=str(record.get("issue_id") or params.get("issue_id") or ""),
+        label=str(record.get("synthetic_cluster") or ""),
+    )
+
+
+def read_crashes(paths: list[Path], stats: Counter[str]) -> Iterator[Crash]:
+    """Streams crashes from JSONL files (`-` for stdin), counting skips."""
+    for path in paths:
+        handle = sys.stdin.buffer if str(path) == "-" else path.open("rb")
+        try:
+            for line in handle:
+                if not line.strip():
+                    continue
+                stats["lines"] += 1
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    stats["invalid"] += 1
+                    continue
+                crash = to_crash(record)
+                if crash is None:
+                    stats["skipped"] += 1
+                    continue
+                yield crash
+        finally:
+            if handle is not sys.stdin.buffer:
+                handle.close()
+
+
+# -----------------
+# Shingles
+# -----------------
+def shingles(frames: list[str]) -> set[str]:
+    top = frames[:SHINGLE_FRAMES]
+    if not top:
+        return set()
+    # The crash site is tagged so traces that only share callers stay apart.
+    return {*top, f"site {top[0]}"}
+
+
+# -----------------
+# Clusters
+# -----------------
+def bump(counter: Counter[str], key: str) -> None:
+    """Counts `key`, folding new keys into `(other)` once the counter is full."""
+    if key in counter or len(counter) < COUNTER_CAP:
+        counter[key] += 1
+    else:
+        counter[OTHER] += 1
+
+
+@dataclass
+class Cluster:
+    id: str
+    exception_type: str
+    message: str
+    frames: list[str]
+    events: int = 0
+    fatal: int = 0
+    first_seen: float | None = None
+    last_seen: float | None = None
+    versions: Counter[str] = field(default_factory=Counter)
+    routes: Counter[str] = field(default_factory=Counter)
+    issues: Counter[str] = field(default_factory=Counter)
+    labels: Counter[str] = field(default_factory=Counter)
+    users: HyperLogLog = field(default_factory=lambda: HyperLogLog(precision=8))
+    fingerprints: list[str] = field(default_factory=list)
+
+    def observe(self, crash: Crash) -> None:
+        self.events += 1
+        self.fatal += crash.fatal
+        if crash.ts is not None:
+            self.first_seen = crash.ts if self.first_seen is None else min(self.first_seen, crash.ts)
+            self.last_seen = crash.ts if self.last_seen is None else max(self.last_seen, crash.ts)
+        bump(self.versions, crash.version)
+        bump(self.routes, crash.route)
+        if crash.issue_id:
+            bump(self.issues, crash.issue_id)
+        if crash.label:
+            bump(self.labels, crash.label)
+        if crash.user:
+            self.users.add(crash.user)
+
+    def summary(self, total: int, breakdown: int = 5) -> dict[str, Any]:
+        def shares(counter: Counter[str]) -> list[dict[str, Any]]:
+            return [
+                {"value": key, "events": count, "share": round(count / self.events, 4)}
+                for key, count in counter.most_common(breakdown)
+            ]
+
+        app_frames = [frame for frame in self.frames if APP_PACKAGE in frame]
+        return {
+            "id": self.id,
+            "exception_type": self.exception_type,
+            "message": self.message,
+            "events": self.events,
+            "share": round(self.events / max(1, total), 4),
+            "fatal": self.fatal,
+            "users_estimate": round(self.users.count()) if self.events else 0,
+            "first_seen": iso(self.first_seen),
+            "last_seen": iso(self.last_seen),
+            "top_app_frame": app_frames[0] if app_frames else (self.frames[0] if self.frames else None),
+            "fingerprints": len(self.fingerprints),
+            "versions": shares(self.versions),
+            "routes": shares(self.routes),
+            "issue_ids": [key for key, _ in self.issues.most_common(breakdown)],
+            "frames": self.frames[:SAMPLE_FRAMES],
+        }
+
+
+def iso(ts: float | None) -> str | None:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class CrashClusterer:
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        num_perm: int = 64,
+        max_fingerprints: int = 20_000,
+        seed: int = 1,
+    ) -> None:
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands, self.rows = lsh_shape(num_perm, threshold)
+        self.max_fingerprints = max_fingerprints
+        self.clusters: dict[str, Cluster] = {}
+        self.cluster_of: dict[str, str] = {}
+        self.signatures: dict[str, array] = {}
+        self.buckets: dict[tuple[int, int], list[str]] = {}
+        self.events = 0
+        self.lsh_lookups = 0
+        self.evicted_clusters = 0
+        self.evicted_events = 0
+        self.max_evicted_events = 0
+
+    def add(self, crash: Crash) -> Cluster:
+        self.events += 1
+        fp = fingerprint(crash.exception_type, crash.frames, crash.message)
+        cluster_id = self.cluster_of.get(fp)
+        if cluster_id is None:
+            cluster_id = self._assign(fp, crash)
+        cluster = self.clusters[cluster_id]
+        cluster.observe(crash)
+        if len(self.cluster_of) > self.max_fingerprints:
+            self._evict()
+        return cluster
+
+    def _assign(self, fp: str, crash: Crash) -> str:
+        tokens = shingles(crash.frames)
+        signature = self.hasher.signature(tokens) if tokens else None
+        best, best_score = None, 0.0
+        if signature is not None:
+            self.lsh_lookups += 1
+            seen: set[str] = set()
+            for key in band_keys(signature, self.bands, self.rows):
+                for candidate in self.buckets.get(key, ()):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    cluster = self.clusters[self.cluster_of[candidate]]
+                    if cluster.exception_type != crash.exception_type:
+                        continue
+                    score = similarity(signature, self.signatures[candidate])
+                    if score > best_score:
+                        best, best_score = candidate, score
+        if best is not None and best_score >= self.threshold:
+            cluster_id = self.cluster_of[best]
+        else:
+            cluster_id = fp
+            self.clusters[fp] = Cluster(fp, crash.exception_type, crash.message, crash.frames)
+        self.cluster_of[fp] = cluster_id
+        self.clusters[cluster_id].fingerprints.append(fp)
+        if signature is not None:
+            self.signatures[fp] = signature
+            for key in band_keys(signature, self.bands, self.rows):
+                self.buckets.setdefault(key, []).append(fp)
+        return cluster_id
+
+    def _evict(self) -> None:
+        """Drops the lowest-count clusters until a quarter of the budget is free."""
+        target = self.max_fingerprints * 3 // 4
+        for cluster in sorted(self.clusters.values(), key=lambda c: c.events):
+            if len(self.cluster_of) <= target:
+                break
+            del self.clusters[cluster.id]
+            self.evicted_clusters += 1
+            self.evicted_events += cluster.events
+            self.max_evicted_events = max(self.max_evicted_events, cluster.events)
+            for fp in cluster.fingerprints:
+                del self.cluster_of[fp]
+                signature = self.signatures.pop(fp, None)
+                if signature is None:
+                    continue
+                for key in band_keys(signature, self.bands, self.rows):
+                    members = self.buckets[key]
+                    members.remove(fp)
+                    if not members:
+                        del self.buckets[key]
+
+    def top(self, n: int) -> list[Cluster]:
+        return sorted(self.clusters.values(), key=lambda c: (-c.events, c.id))[:n]
+
+
+def cluster_stream(crashes: Iterable[Crash], clusterer: CrashClusterer) -> float:
+    started = time.perf_counter()
+    for crash in crashes:
+        clusterer.add(crash)
+    return time.perf_counter() - started
+
+
+def build_report(clusterer: CrashClusterer, stats: Counter[str], elapsed: float, top: int) -> dict[str, Any]:
+    return {
+        "events": clusterer.events,
+        "lines": stats["lines"],
+        "invalid_lines": stats["invalid"],
+        "skipped_records": stats["skipped"],
+        "clusters": len(clusterer.clusters),
+        "fingerprints": len(clusterer.cluster_of),
+        "lsh_lookups": clusterer.lsh_lookups,
+        "lsh": {"threshold": clusterer.threshold, "bands": clusterer.bands, "rows": clusterer.rows},
+        "evicted_clusters": clusterer.evicted_clusters,
+        "evicted_events": clusterer.evicted_events,
+        "max_count_error": clusterer.max_evicted_events,
+        "seconds": round(elapsed, 3),
+        "events_per_second": round(clusterer.events / elapsed) if elapsed > 0 else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "top": [cluster.summary(clusterer.events) for cluster in clusterer.top(top)],
+    }
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1 << 20) if sys.platform == "darwin" else rss / 1024
+
+
+# -----------------
+# Synthetic export + bench
+# -----------------
+# Root-cause templates: (exception type, message, app frames). Framework and
+# zone frames are added per event with random positions and depth.
+TEMPLATES = (
+    ("RangeError", "RangeError (index): Invalid value: Not in inclusive range 0..{n}: {m}",
+     ["_QuizScreenState._nextQuestion (package:quiznetic_flutter/screens/quiz_screen.dart)",
+      "_QuizScreenState._handleAnswer (package:quiznetic_flutter/screens/quiz_screen.dart)",
+      "_QuizScreenState.build.<anonymous closure> (package:quiznetic_flutter/screens/quiz_screen.dart)"]),
+    ("_TypeError", "type 'Null' is not a subtype of type 'String' in type cast",
+     ["LeaderboardService.load.<anonymous closure> (package:quiznetic_flutter/services/leaderboard_service.dart)",
+      "LeaderboardService.load (package:quiznetic_flutter/services/leaderboard_service.dart)",
+      "_LeaderboardScreenState._refresh (package:quiznetic_flutter/screens/leaderboard_screen.dart)"]),
+    ("FirebaseException", "[cloud_firestore/unavailable] The service is currently unavailable ({n} ms)",
+     ["ScoreService._saveScoreDirect (package:quiznetic_flutter/services/score_service.dart)",
+      "ScoreService.saveScore (package:quiznetic_flutter/services/score_service.dart)",
+      "_ResultScreenState._loadResultData (package:quiznetic_flutter/screens/result_screen.dart)"]),
+    ("FirebaseFunctionsException", "[firebase_functions/deadline-exceeded] submitScore timed out after {n}s",
+     ["ScoreService._saveScoreViaCallable (package:quiznetic_flutter/services/score_service.dart)",
+      "ScoreService.saveScore (package:quiznetic_flutter/services/score_service.dart)",
+      "_ResultScreenState._loadResultData (package:quiznetic_flutter/screens/result_screen.dart)"]),
+    ("StateError", "Bad state: No element",
+     ["FlagLoader.loadFlags (package:quiznetic_flutter/data/flag_loader.dart)",
+      "_DifficultyScreenState._start (package:quiznetic_flutter/screens/difficulty_screen.dart)"]),
+    ("FormatException", "FormatException: Unexpected character (at character {n})",
+     ["FlagDescriptionLoader.load (package:quiznetic_flutter/data/flag_description_loader.dart)",
+      "_QuizScreenState._requestHint (package:quiznetic_flutter/screens/quiz_screen.dart)"]),
+    ("PlatformException", "PlatformException(sign_in_failed, {id}, null, null)",
+     ["AuthService.signInWithGoogle (package:quiznetic_flutter/services/auth_service.dart)",
+      "_LoginScreenState._google (package:quiznetic_flutter/screens/login_screen.dart)"]),
+    ("FlutterError", "A RenderFlex overflowed by {n} pixels on the right.",
+     ["_ResultScreenState.build (package:quiznetic_flutter/screens/result_screen.dart)"]),
+)
+ROUTES_BY_TEMPLATE = ("/quiz", "/leaderboard", "/result", "/result", "/difficulty", "/quiz", "/login", "/result")
+FRAMEWORK_FRAMES = (
+    "StatefulElement.build (package:flutter/src/widgets/framework.dart)",
+    "ComponentElement.performRebuild (package:flutter/src/widgets/framework.dart)",
+    "Element.rebuild (package:flutter/src/widgets/framework.dart)",
+    "BuildOwner.buildScope (package:flutter/src/widgets/framework.dart)",
+    "GestureRecognizer.invokeCallback (package:flutter/src/gestures/recognizer.dart)",
+    "TapGestureRecognizer.handleTapUp (package:flutter/src/gestures/tap.dart)",
+    "SchedulerBinding.handleDrawFrame (package:flutter/src/scheduler/binding.dart)",
+)
+APP_CALLERS = (
+    "QuizneticApp.build.<anonymous closure> (package:quiznetic_flutter/main.dart)",
+    "_HomeScreenState._openQuiz (package:quiznetic_flutter/screens/home_screen.dart)",
+    "_EntryScreenState._continue (package:quiznetic_flutter/screens/entry_screen.dart)",
+)
+ZONE_FRAMES = (
+    "_rootRunUnary (dart:async/zone.dart)",
+    "_CustomZone.runUnary (dart:async/zone.dart)",
+    "Future._propagateToListeners (dart:async/future_impl.dart)",
+    "_microtaskLoop (dart:async/schedule_microtask.dart)",
+)
+
+
+def _render_frame(rng: random.Random, index: int, frame: str, style: str) -> str:
+    symbol, _, location = frame.partition(" (")
+    location = location.rstrip(")")
+    line, column = rng.randint(20, 900), rng.randint(1, 40)
+    if style == "web":
+        scheme, _, path = location.partition(":")
+        prefix = "packages" if scheme == "package" else "dart-sdk/lib"
+        return f"    at {symbol} (http://localhost:{rng.randint(50000, 60000)}/{prefix}/{path}:{line}:{column})"
+    if style == "terse":
+        return f"{location} {line}:{column}  {symbol}"
+    return f"#{index:<6} {symbol} ({location}:{line}:{column})"
+
+
+def synthetic_stack(rng: random.Random, template: int, style: str) -> str:
+    _, _, app = TEMPLATES[template]
+    frames = list(app)
+    # Each cause is reached through a stable widget/gesture path; variants
+    # lose one framework frame to inlining or gain an extra caller.
+    tail = [FRAMEWORK_FRAMES[(template + i) % len(FRAMEWORK_FRAMES)] for i in range(4)]
+    if rng.random() < 0.2:
+        tail.pop(rng.randrange(len(tail)))
+    if rng.random() < 0.15:
+        tail.append(rng.choice(FRAMEWORK_FRAMES))
+    if rng.random() < 0.1:
+        frames.append(rng.choice(APP_CALLERS))
+    frames += tail
+    lines = [_render_frame(rng, i, frame, style) for i, frame in enumerate(frames)]
+    if style == "vm" and rng.random() < 0.5:
+        lines.insert(rng.randint(1, len(lines)), "<asynchronous suspension>")
+        lines += [_render_frame(rng, len(lines) + i, frame, style) for i, frame in enumerate(ZONE_FRAMES)]
+    return "\n".join(lines)
+
+
+def generate_export(path: Path, events: int, users: int, seed: int, noise: float = 0.02) -> int:
+    """Writes crash events across the templates in both export shapes."""
+    rng = random.Random(seed)
+    start = datetime(2026, 3, 1, tzinfo=timezone.utc).timestamp()
+    weights = [rng.paretovariate(1.2) for _ in TEMPLATES]
+    versions = ("1.4.0+40", "1.4.1+41", "1.5.0+50")
+    written = 0
+    with path.open("w", encoding="utf-8", buffering=1 << 20) as handle:
+        for index in range(events):
+            template = rng.choices(range(len(TEMPLATES)), weights=weights)[0]
+            exception_type, message, _ = TEMPLATES[template]
+            message = message.format(n=rng.randint(1, 99), m=rng.randint(100, 999), id=f"{rng.getrandbits(96):024x}")
+            style = rng.choice(("vm", "vm", "terse", "web"))
+            stack = synthetic_stack(rng, template, style)
+            label = f"t{template}"
+            if rng.random() < noise:
+                # Long tail of one-off crashes; unlabeled so they do not
+                # count against accuracy but do exercise eviction.
+                one_off = rng.getrandbits(40)
+                stack = "\n".join(
+                    _render_frame(rng, i, f"_Widget{one_off:x}.step{i} (package:quiznetic_flutter/gen/w{one_off:x}.dart)", style)
+                    for i in range(3)
+                )
+                label = ""
+            ts = start + index * (7 * 86_400 / max(1, events))
+            version = rng.choices(versions, weights=(2, 3, 5 if template != 2 else 20))[0]
+            route = ROUTES_BY_TEMPLATE[template] if rng.random() < 0.9 else rng.choice(ROUTES_BY_TEMPLATE)
+            uid = f"install-{rng.randrange(users):07d}"
+            if index % 2:
+                display, _, build = version.partition("+")
+                record: dict[str, Any] = {
+                    "event_timestamp": datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(),
+                    "is_fatal": exception_type != "FlutterError",
+                    "issue_id": f"issue-{template}-{rng.randrange(3)}",
+                    "installation_uuid": uid,
+                    "application": {"display_version": display, "build_version": build},
+                    "custom_keys": [{"key": "route", "value": {"string_value": route}}],
+                    "exceptions": [{"type": exception_type, "exception_message": message, "frames": [
+                        {"symbol": frame.partition(" (")[0], "file": frame.partition(" (")[2].rstrip(")"),
+                         "line": rng.randint(20, 900)}
+                        for frame in normalize_stack(stack)
+                    ]}],
+                }
+            else:
+                record = {
+                    "ts": round(ts * 1000),
+                    "name": "crash",
+                    "fatal": exception_type != "FlutterError",
+                    "error": message if message.startswith(exception_type) else f"{exception_type}: {message}",
+                    "stack": stack,
+                    "version": version,
+                    "route": route,
+                    "uid": uid,
+                    "issue_id": f"issue-{template}-{rng.randrange(3)}",
+                }
+            if label:
+                record["synthetic_cluster"] = label
+            handle.write(json.dumps(record, separators=(",", ":")) + "\n")
+            written += 1
+    return written
+
+
+def score_labels(clusterer: CrashClusterer) -> dict[str, Any]:
+    """Purity and splits of found clusters against `synthetic_cluster` labels."""
+    labelled = [c for c in clusterer.clusters.values() if c.labels]
+    events = sum(c.events for c in labelled)
+    majority = sum(c.labels.most_common(1)[0][1] for c in labelled)
+    per_label: Counter[str] = Counter()
+    for cluster in labelled:
+        per_label[cluster.labels.most_common(1)[0][0]] += 1
+    return {
+        "true_clusters": len({label for c in labelled for label in c.labels}),
+        "found_clusters": len(labelled),
+        "purity": round(majority / max(1, events), 4),
+        "max_splits": max(per_label.values(), default=0),
+    }
+
+
+def bench(args: argparse.Namespace) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="crash-clusterer-") as tmp:
+        export = Path(tmp) / "crashes.jsonl"
+        generate_export(export, args.events, args.users, args.seed, args.noise)
+        stats: Counter[str] = Counter()
+        clusterer = CrashClusterer(args.threshold, args.num_perm, args.max_fingerprints, args.seed)
+        elapsed = cluster_stream(read_crashes([export], stats), clusterer)
+        report = build_report(clusterer, stats, elapsed, args.top)
+        report["export_bytes"] = export.stat().st_size
+        report["accuracy"] = score_labels(clusterer)
+        return report
+
+
+# -----------------
+# CLI
+# -----------------
+def render_summary_markdown(report: dict[str, Any], title: str = "Crash Clusters") -> str:
+    lines = [
+        f"## {title}",
+        "",
+        f"- Events: **{report['events']:,}** ({report['skipped_records']:,} non-crash records, "
+        f"{report['invalid_lines']:,} invalid lines) in {report['seconds']}s "
+        f"({report['events_per_second'] or 0:,} events/s, peak RSS {report['peak_rss_mb']} MB)",
+        f"- Clusters: **{report['clusters']:,}** from {report['fingerprints']:,} fingerprints "
+        f"(LSH {report['lsh']['bands']}x{report['lsh']['rows']}, threshold {report['lsh']['threshold']})",
+    ]
+    if report["evicted_events"]:
+        lines.append(
+            f"- Evicted: {report['evicted_clusters']:,} clusters / {report['evicted_events']:,} events; "
+            f"counts may be low by up to {report['max_count_error']:,}"
+        )
+    if "accuracy" in report:
+        accuracy = report["accuracy"]
+        lines.append(
+            f"- Against known root causes: {accuracy['found_clusters']} clusters for "
+            f"{accuracy['true_clusters']} causes, purity **{accuracy['purity']:.1%}**, max splits {accuracy['max_splits']}"
+        )
+    lines += [
+        "",
+        "| # | Events | Users | Exception | Top app frame | Versions | Routes |",
+        "| ---: | ---: | ---: | --- | --- | --- | --- |",
+    ]
+    for rank, cluster in enumerate(report["top"], start=1):
+        versions = ", ".join(f"{v['value']} {v['share']:.0%}" for v in cluster["versions"][:3])
+        routes = ", ".join(f"`{r['value']}` {r['share']:.0%}" for r in cluster["routes"][:3])
+        frame = (cluster["top_app_frame"] or "").replace("|", "\\|")
+        lines.append(
+            f"| {rank} | {cluster['events']:,} | ~{cluster['users_estimate']:,} "
+            f"| `{cluster['exception_type']}` | `{frame}` | {versions} | {routes} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(
+        f"Crash clusters: {report['events']:,} events -> {report['clusters']:,} clusters "
+        f"({report['fingerprints']:,} fingerprints) in {report['seconds']}s"
+    )
+    for rank, cluster in enumerate(report["top"], start=1):
+        versions = ", ".join(f"{v['value']} {v['share']:.0%}" for v in cluster["versions"][:3])
+        routes = ", ".join(f"{r['value']} {r['share']:.0%}" for r in cluster["routes"][:3])
+        print(
+            f"{rank:>3}. [{cluster['events']:,} events, ~{cluster['users_estimate']:,} users] "
+            f"{cluster['exception_type']}: {cluster['message']}"
+        )
+        print(f"     at {cluster['top_app_frame']}")
+        print(f"     versions: {versions}; routes: {routes}; id {cluster['id']}")
+
+
+def add_cluster_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--threshold", type=float, default=0.6, help="Minimum estimated Jaccard to merge traces.")
+    parser.add_argument("--num-perm", type=int, default=64, help="MinHash permutations.")
+    parser.add_argument(
+        "--max-fingerprints",
+        type=int,
+        default=20_000,
+        help="Fingerprints tracked before low-count clusters are evicted.",
+    )
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--summary-file", type=Path)
+    parser.add_argument("--json-file", type=Path)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Cluster exported crash events by normalized Dart stack fingerprint.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    cluster_parser = sub.add_parser("cluster", help="Cluster crash exports and report the top clusters.")
+    cluster_parser.add_argument("inputs", type=Path, nargs="+", help="JSONL exports (`-` for stdin).")
+    add_cluster_arguments(cluster_parser)
+    cluster_parser.add_argument("--clusters-file", type=Path, help="Write every cluster as JSONL.")
+
+    gen = sub.add_parser("generate", help="Write a synthetic crash export.")
+    gen.add_argument("output", type=Path)
+    gen.add_argument("--events", type=int, default=100_000)
+    gen.add_argument("--users", type=int, default=20_000)
+    gen.add_argument("--seed", type=int, default=1)
+    gen.add_argument("--noise", type=float, default=0.02, help="Share of one-off long-tail crashes.")
+
+    bench_parser = sub.add_parser("bench", help="Cluster a synthetic export and score it against its root causes.")
+    bench_parser.add_argument("--events", type=int, default=100_000)
+    bench_parser.add_argument("--users", type=int, default=20_000)
+    bench_parser.add_argument("--noise", type=float, default=0.02, help="Share of one-off long-tail crashes.")
+    add_cluster_arguments(bench_parser)
+    return parser.parse_args()
+
+
+def write_outputs(args: argparse.Namespace, report: dict[str, Any], title: str) -> None:
+    if args.summary_file:
+        args.summary_file.parent.mkdir(parents=True, exist_ok=True)
+        with args.summary_file.open("a", encoding="utf-8") as handle:
+            handle.write(render_summary_markdown(report, title))
+    if args.json_file:
+        args.json_file.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+def main() -> int:
+    args = parse_args()
+
+    if args.command == "generate":
+        written = generate_export(args.output, args.events, args.users, args.seed, args.noise)
+        print(f"Wrote {written:,} crash events to {args.output}")
+        return 0
+
+    if args.command == "bench":
+        report = bench(args)
+        print(render_summary_markdown(report, "Crash Clustering Benchmark"), end="")
+        write_outputs(args, report, "Crash Clustering Benchmark")
+        return 0
+
+    missing = [path for path in args.inputs if str(path) != "-" and not path.exists()]
+    if missing:
+        print(f"ERROR: input not found: {missing[0]}")
+        return 2
+    stats: Counter[str] = Counter()
+    clusterer = CrashClusterer(args.threshold, args.num_perm, args.max_fingerprints, args.seed)
+    elapsed = cluster_stream(read_crashes(args.inputs, stats), clusterer)
+    report = build_report(clusterer, stats, elapsed, args.top)
+    print_report(report)
+    write_outputs(args, report, "Crash Clusters")
+    if args.clusters_file:
+        with args.clusters_file.open("w", encoding="utf-8") as handle:
+            for cluster in clusterer.top(len(clusterer.clusters)):
+                handle.write(json.dumps(cluster.summary(clusterer.events)) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -330,6 +330,26 @@ def extract_function_entries(file_text: str, rel_path: Path) -> list[FunctionDoc
     return out
 
 
+def entry_for_file(file: Path) -> tuple[DocEntry, list[FunctionDocEntry]]:
+    rel = file.relative_to(ROOT)
+    text = read_text(file)
+    header = parse_doc_header(text)
+
+    kind = header.get("doc", detect_kind(rel))
+    title = header.get("title", title_from_stem(file.stem))
+    purpose = header.get("purpose", default_purpose(rel))
+    documented = "doc" in header and "title" in header and "purpose" in header
+
+    entry = DocEntry(
+        rel_path=rel,
+        kind=kind,
+        title=title,
+        purpose=purpose,
+        documented=documented,
+    )
+    return entry, extract_function_entries(text, rel)
+
+
 def collect_entries(filters: list[str]) -> tuple[list[DocEntry], list[FunctionDocEntry]]:
     entries: list[DocEntry] = []
     function_entries: list[FunctionDocEntry] = []
@@ -339,24 +359,9 @@ def collect_entries(filters: list[str]) -> tuple[list[DocEntry], list[FunctionDo
         if not should_include(rel, filters):
             continue
 
-        text = read_text(file)
-        header = parse_doc_header(text)
-
-        kind = header.get("doc", detect_kind(rel))
-        title = header.get("title", title_from_stem(file.stem))
-        purpose = header.get("purpose", default_purpose(rel))
-        documented = "doc" in header and "title" in header and "purpose" in header
-
-        entries.append(
-            DocEntry(
-                rel_path=rel,
-                kind=kind,
-                title=title,
-                purpose=purpose,
-                documented=documented,
-            )
-        )
-        function_entries.extend(extract_function_entries(text, rel))
+        entry, functions = entry_for_file(file)
+        entries.append(entry)
+        function_entries.extend(functions)
 
     return entries, function_entries
 
@@ -0,0 +1,882 @@
+#!/usr/bin/env python3
+"""Static Firestore query/index advisor.
+
+Extracts every Firestore read chain (`.collection()/.doc()/.where()/.orderBy()
+/.limit()` ending in `.get()`, `.snapshots()`, `.count()` or a transaction
+`tx.get(ref)`) from `lib/` and `functions/index.cjs`, derives the composite
+index each query needs, and diffs that set against `firestore.indexes.json`.
+
+Each read site also gets an upper-bound document-read estimate per call.
+`limit()` arguments are resolved through constants, parameter defaults,
+constructor initializers and named call-site arguments (e.g. the band
+service's `_maxRankTracked`), and the result is gated against a checked-in
+baseline so read-cost growth shows up in review.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_SOURCES = [ROOT / "lib", ROOT / "functions" / "index.cjs"]
+DEFAULT_INDEXES = ROOT / "firestore.indexes.json"
+DEFAULT_BASELINE = ROOT / "tools" / "baselines" / "firestore_reads.json"
+SOURCE_SUFFIXES = {".dart", ".js", ".cjs", ".mjs", ".ts"}
+
+# Collections whose size is bounded by the data model rather than by a
+# `limit()`. `users/{uid}/scores` holds one doc per category x difficulty.
+KNOWN_COLLECTION_CAPS = {
+    "users/{}/scores": 6,
+}
+
+TERMINAL_RE = re.compile(r"\.(get|snapshots|count)\s*\(\s*\)")
+TX_GET_RE = re.compile(r"\b(?:tx|txn|transaction)\.get\s*\(\s*([A-Za-z_]\w*)\s*\)")
+IDENT_RE = re.compile(r"[A-Za-z_$][\w$]*")
+STRING_RE = re.compile(r"^(['\"`])(.*)\1$", re.DOTALL)
+INT_RE = re.compile(r"^\d+$")
+# `name(` heads; a head followed by `{` or `=>` after its parameters is a
+# function declaration (Dart functions/methods, JS `function name(`).
+CALLABLE_HEAD_RE = re.compile(r"\b([A-Za-z_$][\w$]*)\s*(?:<[^<>()]*>\s*)?\(")
+BODY_START_RE = re.compile(r"\s*(?:async\s*\*?|sync\s*\*)?\s*(\{|=>)")
+EXPORT_RE = re.compile(r"\b(?:module\.)?exports\.([A-Za-z_$][\w$]*)\s*=")
+BINDING_RE = re.compile(r"([A-Za-z_$][\w$]*)\s*=\s*(?:await\s+)?$")
+NOT_FUNCTION_NAMES = {"if", "for", "while", "switch", "catch", "async", "function", "return", "await"}
+
+DART_WHERE_OPS = {
+    "isEqualTo": "==",
+    "isNotEqualTo": "!=",
+    "isLessThan": "<",
+    "isLessThanOrEqualTo": "<=",
+    "isGreaterThan": ">",
+    "isGreaterThanOrEqualTo": ">=",
+    "arrayContains": "array-contains",
+    "arrayContainsAny": "array-contains-any",
+    "whereIn": "in",
+    "whereNotIn": "not-in",
+}
+EQUALITY_OPS = {"==", "in"}
+ARRAY_OPS = {"array-contains", "array-contains-any"}
+RANGE_OPS = {"<", "<=", ">", ">=", "!=", "not-in"}
+QUERY_METHODS = {
+    "collection",
+    "collectionGroup",
+    "doc",
+    "where",
+    "orderBy",
+    "limit",
+    "limitToLast",
+}
+
+
+@dataclass
+class Filter:
+    field: str
+    op: str
+
+
+@dataclass
+class Order:
+    field: str
+    direction: str  # ASCENDING | DESCENDING
+
+
+@dataclass
+class LimitEstimate:
+    expression: str | None
+    value: int | None
+    sources: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ReadSite:
+    file: str
+    line: int
+    kind: str  # document | query | count
+    path: str
+    collection_group: str
+    scope: str  # COLLECTION | COLLECTION_GROUP
+    filters: list[Filter] = field(default_factory=list)
+    orders: list[Order] = field(default_factory=list)
+    limit: LimitEstimate | None = None
+    reads_per_call: int | None = None
+    index: str = "n/a"  # n/a | single-field | covered | MISSING
+    required_index: dict | None = None
+    function: str = ""
+    transactional: bool = False
+    binding: str = ""  # variable the result is assigned to, if any
+
+    @property
+    def key(self) -> str:
+        """Baseline key: enclosing function plus query signature.
+
+        Line numbers and the order of sites in a file are left out, so adding
+        or moving one query does not rename the others.
+        """
+        kind = f"tx-{self.kind}" if self.transactional else self.kind
+        parts = [self.file, self.function or "<top-level>", kind, self.path]
+        parts += [f"{f.field}{f.op}" for f in self.filters]
+        parts += [f"{o.field}:{o.direction[0]}" for o in self.orders]
+        return "|".join(parts)
+
+
+@dataclass
+class AdvisorReport:
+    sites: list[ReadSite]
+    declared_indexes: list[dict]
+    missing_indexes: list[dict]
+    unused_indexes: list[dict]
+    unbounded: list[str]
+
+
+def read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def write_text(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def strip_comments(text: str) -> str:
+    """Blank out `//` and `/* */` comments, keeping offsets and string bodies."""
+    out = list(text)
+    i, n = 0, len(text)
+    quote: str | None = None
+    while i < n:
+        ch = text[i]
+        if quote:
+            if ch == "\\":
+                i += 2
+                continue
+            if ch == quote:
+                quote = None
+            i += 1
+            continue
+        if ch in "'\"`":
+            quote = ch
+            i += 1
+            continue
+        if text.startswith("//", i):
+            end = text.find("\n", i)
+            end = n if end < 0 else end
+            for j in range(i, end):
+                out[j] = " "
+            i = end
+            continue
+        if text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            for j in range(i, end):
+                if out[j] != "\n":
+                    out[j] = " "
+            i = end
+            continue
+        i += 1
+    return "".join(out)
+
+
+def matching_open(text: str, close_pos: int) -> int:
+    depth = 0
+    for i in range(close_pos, -1, -1):
+        if text[i] == ")":
+            depth += 1
+        elif text[i] == "(":
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+def matching_close(text: str, open_pos: int) -> int:
+    depth = 0
+    for i in range(open_pos, len(text)):
+        if text[i] == "(":
+            depth += 1
+        elif text[i] == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+def chain_start(text: str, end: int) -> int:
+    """Walk backwards from `end` over `a.b(...).c` segments to the chain start."""
+    i = end
+    while True:
+        j = i - 1
+        while j >= 0 and text[j].isspace():
+            j -= 1
+        while j >= 0 and text[j] == ")":
+            j = matching_open(text, j) - 1
+            while j >= 0 and text[j].isspace():
+                j -= 1
+        while j >= 0 and text[j] in "!?":
+            j -= 1
+        k = j
+        while k >= 0 and (text[k].isalnum() or text[k] in "_$"):
+            k -= 1
+        if k == j:
+            return i
+        start = k + 1
+        k -= 1 if k >= 0 and text[k] == "?" else 0
+        m = k
+        while m >= 0 and text[m].isspace():
+            m -= 1
+        if m >= 0 and text[m] == ".":
+            i = m
+            continue
+        return start
+
+
+def split_args(args: str) -> list[str]:
+    parts: list[str] = []
+    depth = 0
+    quote: str | None = None
+    current: list[str] = []
+    for ch in args:
+        if quote:
+            current.append(ch)
+            if ch == quote:
+                quote = None
+            continue
+        if ch in "'\"`":
+            quote = ch
+        elif ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(ch)
+    tail = "".join(current).strip()
+    if tail:
+        parts.append(tail)
+    return parts
+
+
+def parse_chain(chain: str) -> tuple[str, list[tuple[str, list[str]]]]:
+    """Split `base.m1(a).m2(b, c)` into ('base', [('m1', ['a']), ...])."""
+    chain = chain.strip()
+    match = IDENT_RE.match(chain)
+    if not match:
+        return "", []
+    pos = match.end()
+    base = match.group(0)
+    calls: list[tuple[str, list[str]]] = []
+    n = len(chain)
+    while pos < n:
+        while pos < n and (chain[pos].isspace() or chain[pos] in "!?"):
+            pos += 1
+        if pos >= n or chain[pos] != ".":
+            break
+        name = IDENT_RE.match(chain, pos + 1)
+        if not name:
+            break
+        pos = name.end()
+        while pos < n and chain[pos].isspace():
+            pos += 1
+        if pos < n and chain[pos] == "(":
+            close = matching_close(chain, pos)
+            if close < 0:
+                break
+            calls.append((name.group(0), split_args(chain[pos + 1 : close])))
+            pos = close + 1
+        elif not calls:
+            base = f"{base}.{name.group(0)}"
+    return base, calls
+
+
+def string_value(expr: str) -> str | None:
+    match = STRING_RE.match(expr.strip())
+    if match and "$" not in match.group(2):
+        return match.group(2)
+    return None
+
+
+class SourceFile:
+    def __init__(self, path: Path, root: Path) -> None:
+        self.path = path
+        self.rel = path.relative_to(root).as_posix()
+        self.raw = read_text(path)
+        self.text = strip_comments(self.raw)
+        self._line_starts = [0] + [m.end() for m in re.finditer("\n", self.text)]
+        self._functions: list[tuple[int, int, str]] | None = None
+
+    def function_at(self, offset: int) -> str:
+        """Innermost named function (or `exports.name = ...`) containing `offset`."""
+        if self._functions is None:
+            self._functions = self._index_functions()
+        best = ""
+        best_start = -1
+        for start, end, name in self._functions:
+            if start <= offset < end and start > best_start:
+                best, best_start = name, start
+        return best
+
+    def _index_functions(self) -> list[tuple[int, int, str]]:
+        text = self.text
+        out: list[tuple[int, int, str]] = []
+        for match in CALLABLE_HEAD_RE.finditer(text):
+            name = match.group(1)
+            if name in NOT_FUNCTION_NAMES:
+                continue
+            close = matching_close(text, match.end() - 1)
+            body = BODY_START_RE.match(text, close + 1) if close >= 0 else None
+            if body is None:
+                continue
+            if body.group(1) == "{":
+                end = block_end(text, body.start(1))
+            else:
+                end = statement_end(text, body.end())
+            out.append((match.start(), end, name))
+        for match in EXPORT_RE.finditer(text):
+            out.append((match.start(), statement_end(text, match.end()), match.group(1)))
+        return out
+
+    def line_of(self, offset: int) -> int:
+        lo, hi = 0, len(self._line_starts)
+        while lo + 1 < hi:
+            mid = (lo + hi) // 2
+            if self._line_starts[mid] <= offset:
+                lo = mid
+            else:
+                hi = mid
+        return lo + 1
+
+    def assignment(self, name: str, before: int) -> str | None:
+        """RHS of the nearest `final|var|const|let name = ...;` before `before`."""
+        pattern = re.compile(
+            rf"\b(?:final|var|const|let)\s+(?:[A-Z][\w<>?]*\s+)?{re.escape(name)}\s*=\s*"
+        )
+        best: re.Match | None = None
+        for match in pattern.finditer(self.text, 0, before):
+            best = match
+        if best is None:
+            return None
+        end = statement_end(self.text, best.end())
+        return self.text[best.end() : end]
+
+
+def statement_end(text: str, start: int) -> int:
+    depth = 0
+    quote: str | None = None
+    for i in range(start, len(text)):
+        ch = text[i]
+        if quote:
+            if ch == quote:
+                quote = None
+            continue
+        if ch in "'\"`":
+            quote = ch
+        elif ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            if depth == 0:
+                return i
+            depth -= 1
+        elif ch == ";" and depth == 0:
+            return i
+    return len(text)
+
+
+def block_end(text: str, open_pos: int) -> int:
+    """Offset of the `}` closing the block opened at `open_pos`."""
+    depth = 0
+    quote: str | None = None
+    for i in range(open_pos, len(text)):
+        ch = text[i]
+        if quote:
+            if ch == quote:
+                quote = None
+            continue
+        if ch in "'\"`":
+            quote = ch
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(text)
+
+
+class LimitResolver:
+    """Resolves a `limit()` argument to the largest integer it can take."""
+
+    def __init__(self, files: list[SourceFile]) -> None:
+        self.files = files
+
+    def resolve(self, expr: str, origin: SourceFile) -> LimitEstimate:
+        sources: list[str] = []
+        values = self._resolve(expr.strip(), origin, set(), sources)
+        return LimitEstimate(
+            expression=expr.strip(),
+            value=max(values) if values else None,
+            sources=sorted(set(sources)),
+        )
+
+    def _resolve(
+        self,
+        expr: str,
+        origin: SourceFile,
+        seen: set[tuple[str, str]],
+        sources: list[str],
+    ) -> list[int]:
+        expr = expr.strip()
+        if INT_RE.match(expr):
+            return [int(expr)]
+        name = expr.split(".")[-1]
+        if not IDENT_RE.fullmatch(name) or (name, origin.rel) in seen:
+            return []
+        seen.add((name, origin.rel))
+        escaped = re.escape(name)
+
+        values: list[int] = []
+        local = [
+            # const/static/final declarations and parameter defaults
+            rf"\b(?:const|final|int|num|let|var)\s+{escaped}\s*=\s*([\w.]+)",
+            # constructor initializer lists / plain assignments
+            rf"(?<![\w.]){escaped}\s*=\s*([\w.]+)\s*[,;{{]",
+        ]
+        for pattern in local:
+            for match in re.finditer(pattern, origin.text):
+                rhs = match.group(1)
+                if rhs == name:
+                    continue
+                found = self._resolve(rhs, origin, seen, sources)
+                if found:
+                    sources.append(f"{origin.rel}:{origin.line_of(match.start())}")
+                    values.extend(found)
+
+        # Named call-site arguments (`limit: x`): same file first, since
+        # loader closures are invoked by the service that owns them; fall
+        # back to the whole tree only when the file has no such call.
+        named = re.compile(rf"(?<![\w?]){escaped}\s*:\s*([\w.]+)\s*[,)]")
+        same_file = [origin]
+        if not named.search(origin.text):
+            same_file = self.files
+        for source in same_file:
+            for match in named.finditer(source.text):
+                found = self._resolve(match.group(1), source, seen, sources)
+                if found:
+                    sources.append(f"{source.rel}:{source.line_of(match.start())}")
+                    values.extend(found)
+        return values
+
+
+def resolve_chain(source: SourceFile, chain: str, offset: int, depth: int = 0) -> str:
+    """Inline variable-held references (`entriesRef.orderBy(...)`)."""
+    base, _ = parse_chain(chain)
+    if depth > 4 or not base or "." in base:
+        return chain
+    rhs = source.assignment(base, offset)
+    if rhs is None or not re.search(r"\.(?:collection|collectionGroup|doc)\s*\(", rhs):
+        return chain
+    rhs = rhs.strip()
+    if rhs.startswith("await "):
+        rhs = rhs[len("await ") :]
+    inlined = rhs + chain.strip()[len(base) :]
+    return resolve_chain(source, inlined, offset, depth + 1)
+
+
+def build_site(
+    source: SourceFile,
+    chain: str,
+    offset: int,
+    terminal: str,
+    resolver: LimitResolver,
+) -> ReadSite | None:
+    _, calls = parse_chain(chain)
+    if not any(name in ("collection", "collectionGroup") for name, _ in calls):
+        return None
+
+    segments: list[str] = []
+    group = ""
+    scope = "COLLECTION"
+    is_doc = False
+    filters: list[Filter] = []
+    orders: list[Order] = []
+    limit_expr: str | None = None
+    for name, args in calls:
+        if name not in QUERY_METHODS or not args and name != "doc":
+            continue
+        if name in ("collection", "collectionGroup"):
+            literal = string_value(args[0])
+            segments.append(literal if literal is not None else "{}")
+            group = literal or "{}"
+            scope = "COLLECTION_GROUP" if name == "collectionGroup" else "COLLECTION"
+            is_doc = False
+        elif name == "doc":
+            segments.append("{}")
+            is_doc = True
+        elif name == "where":
+            field_name = string_value(args[0]) or args[0]
+            if len(args) >= 3 and string_value(args[1]):
+                filters.append(Filter(field_name, string_value(args[1]) or "=="))
+            else:
+                for arg in args[1:]:
+                    key = arg.split(":", 1)[0].strip()
+                    if key in DART_WHERE_OPS:
+                        filters.append(Filter(field_name, DART_WHERE_OPS[key]))
+        elif name == "orderBy":
+            field_name = string_value(args[0]) or args[0]
+            descending = any(
+                re.match(r"descending\s*:\s*true", arg) or string_value(arg) == "desc"
+                for arg in args[1:]
+            )
+            orders.append(Order(field_name, "DESCENDING" if descending else "ASCENDING"))
+        elif name in ("limit", "limitToLast"):
+            limit_expr = args[0]
+
+    kind = "document" if is_doc else ("count" if terminal == "count" else "query")
+    site = ReadSite(
+        file=source.rel,
+        line=source.line_of(offset),
+        kind=kind,
+        path="/".join(segments),
+        collection_group=group,
+        scope=scope,
+        filters=filters,
+        orders=orders,
+        function=source.function_at(offset),
+    )
+    if kind == "document":
+        site.reads_per_call = 1
+        return site
+
+    if limit_expr is not None:
+        site.limit = resolver.resolve(limit_expr, source)
+        bound = site.limit.value
+    else:
+        bound = KNOWN_COLLECTION_CAPS.get(site.path)
+        if bound is not None:
+            site.limit = LimitEstimate(None, bound, ["KNOWN_COLLECTION_CAPS"])
+    if bound is not None:
+        # count() aggregations bill one read per 1000 index entries.
+        site.reads_per_call = max(1, -(-bound // 1000)) if kind == "count" else max(1, bound)
+    site.required_index = required_index(site)
+    site.index = "single-field" if site.required_index is None else "MISSING"
+    return site
+
+
+def required_index(site: ReadSite) -> dict | None:
+    """Composite index needed for a query, or None if single-field suffices.
+
+    Follows Firestore's planner rules: equality-only queries merge
+    single-field indexes; a single orderBy (or a range filter ordered by its
+    own field) uses the automatic index; anything that combines equality
+    with ordering, orders on several fields, or mixes array-contains with
+    other clauses needs a composite index with equality fields first.
+    """
+    equality = sorted({f.field for f in site.filters if f.op in EQUALITY_OPS})
+    arrays = sorted({f.field for f in site.filters if f.op in ARRAY_OPS})
+    ranges = [f.field for f in site.filters if f.op in RANGE_OPS]
+    orders = list(site.orders)
+    for range_field in ranges:
+        if range_field not in [o.field for o in orders]:
+            orders.insert(0, Order(range_field, "ASCENDING"))
+
+    clauses = len(equality) + len(arrays) + len(orders)
+    if len(orders) <= 1 and not arrays and not (equality and orders):
+        return None
+    if clauses <= 1:
+        return None
+
+    fields: list[dict] = [{"fieldPath": f, "order": "ASCENDING"} for f in equality]
+    fields += [{"fieldPath": f, "arrayConfig": "CONTAINS"} for f in arrays]
+    fields += [{"fieldPath": o.field, "order": o.direction} for o in orders]
+    return {
+        "collectionGroup": site.collection_group,
+        "queryScope": site.scope,
+        "fields": fields,
+    }
+
+
+def index_covers(declared: dict, required: dict, equality_fields: int) -> bool:
+    """True if `declared` serves `required`.
+
+    The first `equality_fields` entries may appear in any order and
+    direction; the ordering suffix must match field for field.
+    """
+    if declared.get("collectionGroup") != required["collectionGroup"]:
+        return False
+    if declared.get("queryScope", "COLLECTION") != required["queryScope"]:
+        return False
+    have = declared.get("fields", [])
+    want = required["fields"]
+    if len(have) != len(want):
+        return False
+    if {f.get("fieldPath") for f in have[:equality_fields]} != {
+        f["fieldPath"] for f in want[:equality_fields]
+    }:
+        return False
+    for h, w in zip(have[equality_fields:], want[equality_fields:]):
+        if h.get("fieldPath") != w["fieldPath"]:
+            return False
+        if h.get("order") != w.get("order") or h.get("arrayConfig") != w.get("arrayConfig"):
+            return False
+    return True
+
+
+def iter_sources(paths: list[Path], root: Path) -> list[SourceFile]:
+    files: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files += sorted(p for p in path.rglob("*") if p.suffix in SOURCE_SUFFIXES)
+        elif path.exists():
+            files.append(path)
+    return [SourceFile(p.resolve(), root) for p in files]
+
+
+def binding_before(text: str, start: int) -> str:
+    """Name a read's result is assigned to (`final snap = await ...`), or ''."""
+    line_start = text.rfind("\n", 0, start) + 1
+    match = BINDING_RE.search(text, line_start, start)
+    return match.group(1) if match else ""
+
+
+def analyze(paths: list[Path], indexes_path: Path, root: Path = ROOT) -> AdvisorReport:
+    sources = iter_sources(paths, root)
+    resolver = LimitResolver(sources)
+    sites: list[ReadSite] = []
+
+    for source in sources:
+        text = source.text
+        for match in TERMINAL_RE.finditer(text):
+            start = chain_start(text, match.start())
+            chain = resolve_chain(source, text[start : match.start()], start)
+            site = build_site(source, chain, match.start(), match.group(1), resolver)
+            if site:
+                site.binding = binding_before(text, start)
+                sites.append(site)
+        for match in TX_GET_RE.finditer(text):
+            chain = resolve_chain(source, match.group(1), match.start())
+            site = build_site(source, chain, match.start(), "get", resolver)
+            if site:
+                site.transactional = True
+                site.binding = binding_before(text, match.start())
+                sites.append(site)
+    sites.sort(key=lambda s: (s.file, s.line))
+
+    declared = json.loads(read_text(indexes_path)).get("indexes", []) if indexes_path.exists() else []
+    used = [False] * len(declared)
+    missing: list[dict] = []
+    for site in sites:
+        if site.required_index is None:
+            continue
+        equality = len({f.field for f in site.filters if f.op in EQUALITY_OPS})
+        for i, index in enumerate(declared):
+            if index_covers(index, site.required_index, equality):
+                used[i] = True
+                site.index = f"covered (#{i})"
+                break
+        else:
+            if site.required_index not in missing:
+                missing.append(site.required_index)
+
+    unbounded = [
+        f"{s.file}:{s.line} {s.path}"
+        for s in sites
+        if s.kind != "document" and s.reads_per_call is None
+    ]
+    return AdvisorReport(
+        sites=sites,
+        declared_indexes=declared,
+        missing_indexes=missing,
+        unused_indexes=[d for d, u in zip(declared, used) if not u],
+        unbounded=unbounded,
+    )
+
+
+def reads_snapshot(report: AdvisorReport) -> dict[str, int | None]:
+    """Reads per call by site key.
+
+    The `limit()` expression is not part of the key, so raising a limit shows
+    up as reads/call growth. It and the result variable only separate
+    otherwise identical reads in one function; a remaining tie gets `#n` in
+    source order, which only depends on sites in that same function.
+    """
+    keys = [site.key for site in report.sites]
+    ambiguous = {key for key in keys if keys.count(key) > 1}
+    snapshot: dict[str, int | None] = {}
+    for site, key in zip(report.sites, keys):
+        if key in ambiguous:
+            if site.limit and site.limit.expression:
+                key = f"{key}|limit({site.limit.expression.strip()})"
+            if site.binding:
+                key = f"{key}|={site.binding}"
+        base = key
+        suffix = 2
+        while key in snapshot:
+            key = f"{base}#{suffix}"
+            suffix += 1
+        snapshot[key] = site.reads_per_call
+    return snapshot
+
+
+def compare_to_baseline(report: AdvisorReport, baseline: dict) -> list[str]:
+    regressions: list[str] = []
+    previous = baseline.get("reads_per_call", {})
+    for key, reads in reads_snapshot(report).items():
+        if key not in previous:
+            if reads is None:
+                regressions.append(f"new unbounded read `{key}`.")
+            continue
+        before = previous[key]
+        if reads is None and before is not None:
+            regressions.append(f"`{key}` lost its limit (was {before} reads/call).")
+        elif reads is not None and before is not None and reads > before:
+            regressions.append(f"`{key}` reads/call grew {before} -> {reads}.")
+    return regressions
+
+
+def format_index(index: dict) -> str:
+    fields = ", ".join(
+        f"{f['fieldPath']} {f.get('order', f.get('arrayConfig', ''))}".strip()
+        for f in index.get("fields", [])
+    )
+    return f"{index.get('collectionGroup')} ({index.get('queryScope', 'COLLECTION')}): {fields}"
+
+
+def describe_query(site: ReadSite) -> str:
+    parts = [f"{f.field} {f.op}" for f in site.filters]
+    parts += [f"orderBy {o.field}{' desc' if o.direction == 'DESCENDING' else ''}" for o in site.orders]
+    return "; ".join(parts) or "-"
+
+
+def render_summary_markdown(report: AdvisorReport, regressions: list[str]) -> str:
+    total = sum(s.reads_per_call or 0 for s in report.sites)
+    lines = [
+        "## Firestore Query/Index Advisor",
+        "",
+        f"- Read sites: **{len(report.sites)}** "
+        f"({sum(1 for s in report.sites if s.kind != 'document')} queries)",
+        f"- Declared composite indexes: **{len(report.declared_indexes)}**",
+        f"- Missing indexes: **{len(report.missing_indexes)}**",
+        f"- Unused declared indexes: **{len(report.unused_indexes)}**",
+        f"- Upper-bound reads if every site runs once: **{total}**",
+        "",
+        "| Site | Path | Clauses | Limit | Reads/call | Index |",
+        "|---|---|---|---|---:|---|",
+    ]
+    for site in report.sites:
+        limit = "-"
+        if site.limit:
+            limit = f"`{site.limit.expression}` = {site.limit.value}" if site.limit.expression else f"cap {site.limit.value}"
+        reads = site.reads_per_call if site.reads_per_call is not None else "unbounded"
+        lines.append(
+            f"| `{site.file}:{site.line}` | `{site.path}` | {describe_query(site)} | "
+            f"{limit} | {reads} | {site.index} |"
+        )
+    for title, items in (
+        ("Missing Indexes", [format_index(i) for i in report.missing_indexes]),
+        ("Unused Declared Indexes", [format_index(i) for i in report.unused_indexes]),
+        ("Unbounded Reads", report.unbounded),
+        ("Read Regressions", regressions),
+    ):
+        if items:
+            lines += ["", f"### {title}", ""]
+            lines += [f"- {item}" for item in items]
+    return "\n".join(lines) + "\n"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Firestore query/index advisor: diffs query chains in lib/ and "
+            "functions/ against firestore.indexes.json and gates read costs."
+        )
+    )
+    parser.add_argument(
+        "--source",
+        type=Path,
+        action="append",
+        help="Source file or directory to scan (repeatable; default lib/ and functions/index.cjs).",
+    )
+    parser.add_argument("--indexes", type=Path, default=DEFAULT_INDEXES)
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help="Baseline reads-per-call JSON used for the read-cost gate.",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write current reads-per-call to --baseline instead of comparing.",
+    )
+    parser.add_argument(
+        "--suggest-file",
+        type=Path,
+        help="Write firestore.indexes.json content with missing indexes added.",
+    )
+    parser.add_argument(
+        "--fail-on-unused",
+        action="store_true",
+        help="Also fail when a declared composite index is not used by any query.",
+    )
+    parser.add_argument("--summary-file", type=Path)
+    parser.add_argument("--json-file", type=Path)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    sources = args.source or DEFAULT_SOURCES
+    report = analyze(sources, args.indexes)
+
+    regressions: list[str] = []
+    if args.update_baseline:
+        write_text(
+            args.baseline,
+            json.dumps({"reads_per_call": reads_snapshot(report)}, indent=2) + "\n",
+        )
+        print(f"Updated baseline {args.baseline}.")
+    elif args.baseline.exists():
+        regressions = compare_to_baseline(report, json.loads(read_text(args.baseline)))
+    else:
+        print(f"No baseline at {args.baseline}; skipping read-cost gate.")
+
+    queries = [s for s in report.sites if s.kind != "document"]
+    print(
+        f"Firestore advisor: {len(report.sites)} read sites ({len(queries)} queries), "
+        f"{len(report.missing_indexes)} missing / {len(report.unused_indexes)} unused indexes."
+    )
+    for site in queries:
+        reads = site.reads_per_call if site.reads_per_call is not None else "unbounded"
+        print(f"- {site.file}:{site.line} {site.path} [{describe_query(site)}] reads/call={reads} index={site.index}")
+    for index in report.missing_indexes:
+        print(f"MISSING INDEX: {format_index(index)}")
+    for index in report.unused_indexes:
+        print(f"UNUSED INDEX: {format_index(index)}")
+    for item in report.unbounded:
+        print(f"UNBOUNDED: {item}")
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+
+    if args.suggest_file:
+        current = json.loads(read_text(args.indexes)) if args.indexes.exists() else {}
+        current.setdefault("indexes", [])
+        current["indexes"] += report.missing_indexes
+        current.setdefault("fieldOverrides", [])
+        write_text(args.suggest_file, json.dumps(current, indent=2) + "\n")
+    if args.summary_file:
+        write_text(args.summary_file, render_summary_markdown(report, regressions))
+    if args.json_file:
+        write_text(args.json_file, json.dumps(asdict(report), indent=2) + "\n")
+
+    failed = bool(report.missing_indexes or regressions)
+    if args.fail_on_unused and report.unused_indexes:
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
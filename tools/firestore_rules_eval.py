@@ -0,0 +1,933 @@
+#!/usr/bin/env python3
+"""Offline evaluator for the subset of the rules language in `firestore.rules`.
+
+Parses `rules_version`, `service cloud.firestore`, nested `match` blocks
+with `{var}` / `{var=**}` segments, `function` declarations (`let` and
+`return`), and `allow <methods>: if <expr>;` statements. Expressions cover
+the operators and values the rules use: `&&`, `||`, `!`, comparisons, `in`,
+`is <type>`, ternaries, `+ - * / %`, lists, maps, member access, and the
+`size()` / `keys()` / `hasAll()` / `hasAny()` / `hasOnly()` / `matches()`
+methods, with `request.auth`, `request.time`, `request.resource.data`, and
+`resource.data` bound per request.
+
+Evaluation errors (missing fields, type mismatches) deny the request, and
+`&&` / `||` absorb an error when the other operand decides the result, as
+the rules runtime does.
+
+Cases live in `firestore_tests/cases/*.json` and are shared with the
+emulator suite, which runs the same files, so offline verdicts are
+cross-checked against the emulator on every CI run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+
+ROOT = Path(__file__).resolve().parents[1]
+RULES_PATH = ROOT / "firestore.rules"
+CASES_DIR = ROOT / "firestore_tests" / "cases"
+
+METHOD_GROUPS = {
+    "read": ("get", "list"),
+    "write": ("create", "update", "delete"),
+    "get": ("get",),
+    "list": ("list",),
+    "create": ("create",),
+    "update": ("update",),
+    "delete": ("delete",),
+}
+SERVER_TIMESTAMP_KEY = "__serverTimestamp__"
+TIMESTAMP_KEY = "__timestamp__"
+
+
+class RulesSyntaxError(Exception):
+    """Raised when `firestore.rules` uses syntax outside the supported subset."""
+
+
+class EvalError(Exception):
+    """Raised for runtime errors; the rules runtime treats these as deny."""
+
+
+@dataclass(frozen=True, order=True)
+class Timestamp:
+    micros: int
+
+    @classmethod
+    def parse(cls, value: str) -> "Timestamp":
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        delta = parsed - datetime(1970, 1, 1, tzinfo=timezone.utc)
+        return cls(delta // timedelta(microseconds=1))
+
+
+# -----------------
+# Lexer
+# -----------------
+TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>\s+|//[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+  | (?P<number>\d+\.\d+|\d+)
+  | (?P<ident>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<op>&&|\|\||==|!=|<=|>=|[-+*/%!<>?:.,;=(){}\[\]])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+@dataclass
+class Token:
+    kind: str
+    value: str
+    pos: int
+
+
+def tokenize(source: str) -> list[Token]:
+    tokens: list[Token] = []
+    pos = 0
+    while pos < len(source):
+        match = TOKEN_RE.match(source, pos)
+        if not match:
+            raise RulesSyntaxError(f"Unexpected character {source[pos]!r} at offset {pos}")
+        kind = match.lastgroup or ""
+        if kind != "ws":
+            tokens.append(Token(kind, match.group(), pos))
+        pos = match.end()
+    tokens.append(Token("eof", "", pos))
+    return tokens
+
+
+# -----------------
+# AST
+# -----------------
+Expr = tuple  # ("kind", ...) nodes keep the evaluator a single dispatch table.
+
+
+@dataclass
+class Function:
+    name: str
+    params: list[str]
+    lets: list[tuple[str, Expr]]
+    body: Expr
+
+
+@dataclass
+class Allow:
+    methods: tuple[str, ...]
+    condition: Expr
+    line: int
+
+
+@dataclass
+class Match:
+    segments: list[str]
+    functions: dict[str, Function] = field(default_factory=dict)
+    allows: list[Allow] = field(default_factory=list)
+    children: list["Match"] = field(default_factory=list)
+
+
+@dataclass
+class Ruleset:
+    version: str
+    root: Match
+    source: str
+
+
+# -----------------
+# Parser
+# -----------------
+class Parser:
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.tokens = tokenize(source)
+        self.index = 0
+
+    # Token helpers
+    def peek(self, offset: int = 0) -> Token:
+        return self.tokens[min(self.index + offset, len(self.tokens) - 1)]
+
+    def next(self) -> Token:
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def accept(self, value: str) -> bool:
+        if self.peek().value == value and self.peek().kind in ("op", "ident"):
+            self.index += 1
+            return True
+        return False
+
+    def expect(self, value: str) -> Token:
+        token = self.next()
+        if token.value != value:
+            raise self.error(token, f"expected {value!r}")
+        return token
+
+    def ident(self) -> str:
+        token = self.next()
+        if token.kind != "ident":
+            raise self.error(token, "expected identifier")
+        return token.value
+
+    def error(self, token: Token, message: str) -> RulesSyntaxError:
+        line = self.source.count("\n", 0, token.pos) + 1
+        return RulesSyntaxError(f"line {line}: {message}, found {token.value!r}")
+
+    def line_of(self, token: Token) -> int:
+        return self.source.count("\n", 0, token.pos) + 1
+
+    # Structure
+    def parse(self) -> Ruleset:
+        version = "1"
+        if self.accept("rules_version"):
+            self.expect("=")
+            version = unquote(self.next().value)
+            self.expect(";")
+        self.expect("service")
+        service = [self.ident()]
+        while self.accept("."):
+            service.append(self.ident())
+        if ".".join(service) != "cloud.firestore":
+            raise RulesSyntaxError(f"Unsupported service {'.'.join(service)}")
+        root = Match(segments=[])
+        self.expect("{")
+        self.block_body(root)
+        self.expect("}")
+        if self.peek().kind != "eof":
+            raise self.error(self.peek(), "unexpected trailing input")
+        return Ruleset(version=version, root=root, source=self.source)
+
+    def block_body(self, match: Match) -> None:
+        while self.peek().value != "}":
+            word = self.peek().value
+            if word == "match":
+                match.children.append(self.match_block())
+            elif word == "function":
+                function = self.function()
+                match.functions[function.name] = function
+            elif word == "allow":
+                match.allows.append(self.allow())
+            else:
+                raise self.error(self.peek(), "expected match, function, or allow")
+
+    def match_block(self) -> Match:
+        self.expect("match")
+        segments: list[str] = []
+        while self.accept("/"):
+            if self.accept("{"):
+                name = self.ident()
+                if self.accept("="):
+                    self.expect("*")
+                    self.expect("*")
+                    segments.append("{" + name + "=**}")
+                else:
+                    segments.append("{" + name + "}")
+                self.expect("}")
+            else:
+                token = self.next()
+                if token.kind not in ("ident", "number"):
+                    raise self.error(token, "expected path segment")
+                segments.append(token.value)
+        match = Match(segments=segments)
+        self.expect("{")
+        self.block_body(match)
+        self.expect("}")
+        return match
+
+    def function(self) -> Function:
+        self.expect("function")
+        name = self.ident()
+        self.expect("(")
+        params: list[str] = []
+        while not self.accept(")"):
+            params.append(self.ident())
+            self.accept(",")
+        self.expect("{")
+        lets: list[tuple[str, Expr]] = []
+        while self.accept("let"):
+            var = self.ident()
+            self.expect("=")
+            lets.append((var, self.expression()))
+            self.expect(";")
+        self.expect("return")
+        body = self.expression()
+        self.accept(";")
+        self.expect("}")
+        return Function(name=name, params=params, lets=lets, body=body)
+
+    def allow(self) -> Allow:
+        token = self.expect("allow")
+        methods: list[str] = []
+        while True:
+            method = self.ident()
+            if method not in METHOD_GROUPS:
+                raise self.error(self.tokens[self.index - 1], "unknown method")
+            methods.extend(METHOD_GROUPS[method])
+            if not self.accept(","):
+                break
+        condition: Expr = ("lit", True)
+        if self.accept(":"):
+            self.expect("if")
+            condition = self.expression()
+        self.expect(";")
+        return Allow(methods=tuple(methods), condition=condition, line=self.line_of(token))
+
+    # Expressions (lowest to highest precedence)
+    def expression(self) -> Expr:
+        condition = self.or_expr()
+        if self.accept("?"):
+            then = self.expression()
+            self.expect(":")
+            otherwise = self.expression()
+            return ("cond", condition, then, otherwise)
+        return condition
+
+    def or_expr(self) -> Expr:
+        left = self.and_expr()
+        while self.accept("||"):
+            left = ("or", left, self.and_expr())
+        return left
+
+    def and_expr(self) -> Expr:
+        left = self.relation()
+        while self.accept("&&"):
+            left = ("and", left, self.relation())
+        return left
+
+    def relation(self) -> Expr:
+        left = self.additive()
+        while True:
+            token = self.peek()
+            if token.value in ("==", "!=", "<", "<=", ">", ">="):
+                self.next()
+                left = ("cmp", token.value, left, self.additive())
+            elif token.kind == "ident" and token.value == "in":
+                self.next()
+                left = ("in", left, self.additive())
+            elif token.kind == "ident" and token.value == "is":
+                self.next()
+                left = ("is", left, self.ident())
+            else:
+                return left
+
+    def additive(self) -> Expr:
+        left = self.multiplicative()
+        while self.peek().value in ("+", "-") and self.peek().kind == "op":
+            op = self.next().value
+            left = ("arith", op, left, self.multiplicative())
+        return left
+
+    def multiplicative(self) -> Expr:
+        left = self.unary()
+        while self.peek().value in ("*", "/", "%") and self.peek().kind == "op":
+            op = self.next().value
+            left = ("arith", op, left, self.unary())
+        return left
+
+    def unary(self) -> Expr:
+        if self.accept("!"):
+            return ("not", self.unary())
+        if self.peek().value == "-" and self.peek().kind == "op":
+            self.next()
+            return ("neg", self.unary())
+        return self.postfix()
+
+    def postfix(self) -> Expr:
+        node = self.primary()
+        while True:
+            if self.accept("."):
+                name = self.ident()
+                if self.accept("("):
+                    node = ("method", node, name, self.arguments())
+                else:
+                    node = ("member", node, name)
+            elif self.accept("["):
+                index = self.expression()
+                self.expect("]")
+                node = ("index", node, index)
+            else:
+                return node
+
+    def arguments(self) -> list[Expr]:
+        args: list[Expr] = []
+        while not self.accept(")"):
+            args.append(self.expression())
+            self.accept(",")
+        return args
+
+    def primary(self) -> Expr:
+        token = self.next()
+        if token.kind == "number":
+            return ("lit", float(token.value) if "." in token.value else int(token.value))
+        if token.kind == "string":
+            return ("lit", unquote(token.value))
+        if token.value == "(":
+            inner = self.expression()
+            self.expect(")")
+            return inner
+        if token.value == "[":
+            items: list[Expr] = []
+            while not self.accept("]"):
+                items.append(self.expression())
+                self.accept(",")
+            return ("list", items)
+        if token.value == "{":
+            entries: list[tuple[Expr, Expr]] = []
+            while not self.accept("}"):
+                key = self.expression()
+                self.expect(":")
+                entries.append((key, self.expression()))
+                self.accept(",")
+            return ("map", entries)
+        if token.kind == "ident":
+            if token.value in ("true", "false"):
+                return ("lit", token.value == "true")
+            if token.value == "null":
+                return ("lit", None)
+            if self.accept("("):
+                return ("call", token.value, self.arguments())
+            return ("var", token.value)
+        raise self.error(token, "unexpected token")
+
+
+def unquote(literal: str) -> str:
+    body = literal[1:-1]
+    return re.sub(r"\\(.)", r"\1", body)
+
+
+def parse_rules(source: str) -> Ruleset:
+    return Parser(source).parse()
+
+
+# -----------------
+# Interpreter
+# -----------------
+TYPE_CHECKS: dict[str, Callable[[Any], bool]] = {
+    "string": lambda v: isinstance(v, str),
+    "int": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "float": lambda v: isinstance(v, float),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "bool": lambda v: isinstance(v, bool),
+    "list": lambda v: isinstance(v, list),
+    "map": lambda v: isinstance(v, dict),
+    "timestamp": lambda v: isinstance(v, Timestamp),
+    "null": lambda v: v is None,
+}
+
+
+def _numeric(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _same_kind(a: Any, b: Any) -> bool:
+    if _numeric(a) and _numeric(b):
+        return True
+    return type(a) is type(b)
+
+
+class Interpreter:
+    def __init__(self, functions: dict[str, Function], bindings: dict[str, Any], depth: int = 0) -> None:
+        self.functions = functions
+        self.bindings = bindings
+        self.depth = depth
+
+    def eval(self, node: Expr) -> Any:
+        return getattr(self, "eval_" + node[0])(node)
+
+    def truthy(self, node: Expr) -> bool:
+        value = self.eval(node)
+        if not isinstance(value, bool):
+            raise EvalError(f"Expected bool, got {type(value).__name__}")
+        return value
+
+    def eval_lit(self, node: Expr) -> Any:
+        return node[1]
+
+    def eval_var(self, node: Expr) -> Any:
+        if node[1] not in self.bindings:
+            raise EvalError(f"Unknown variable {node[1]}")
+        return self.bindings[node[1]]
+
+    def eval_list(self, node: Expr) -> Any:
+        return [self.eval(item) for item in node[1]]
+
+    def eval_map(self, node: Expr) -> Any:
+        return {self.eval(key): self.eval(value) for key, value in node[1]}
+
+    def eval_cond(self, node: Expr) -> Any:
+        return self.eval(node[2]) if self.truthy(node[1]) else self.eval(node[3])
+
+    def eval_and(self, node: Expr) -> bool:
+        try:
+            left = self.truthy(node[1])
+        except EvalError:
+            # `error && false` is false; otherwise the error stands.
+            if self.truthy(node[2]) is False:
+                return False
+            raise
+        return left and self.truthy(node[2])
+
+    def eval_or(self, node: Expr) -> bool:
+        try:
+            left = self.truthy(node[1])
+        except EvalError:
+            if self.truthy(node[2]) is True:
+                return True
+            raise
+        return left or self.truthy(node[2])
+
+    def eval_not(self, node: Expr) -> bool:
+        return not self.truthy(node[1])
+
+    def eval_neg(self, node: Expr) -> Any:
+        value = self.eval(node[1])
+        if not _numeric(value):
+            raise EvalError("Unary minus on non-number")
+        return -value
+
+    def eval_cmp(self, node: Expr) -> bool:
+        op, left, right = node[1], self.eval(node[2]), self.eval(node[3])
+        if op == "==":
+            return _same_kind(left, right) and left == right
+        if op == "!=":
+            return not (_same_kind(left, right) and left == right)
+        if not _same_kind(left, right) or left is None:
+            raise EvalError(f"Cannot compare {type(left).__name__} and {type(right).__name__}")
+        if op == "<":
+            return left < right
+        if op == "<=":
+            return left <= right
+        if op == ">":
+            return left > right
+        return left >= right
+
+    def eval_in(self, node: Expr) -> bool:
+        item, container = self.eval(node[1]), self.eval(node[2])
+        if isinstance(container, dict):
+            return item in container
+        if isinstance(container, list):
+            return any(_same_kind(item, c) and item == c for c in container)
+        raise EvalError("`in` needs a list or map")
+
+    def eval_is(self, node: Expr) -> bool:
+        check = TYPE_CHECKS.get(node[2])
+        if check is None:
+            raise EvalError(f"Unsupported type {node[2]}")
+        return check(self.eval(node[1]))
+
+    def eval_arith(self, node: Expr) -> Any:
+        op, left, right = node[1], self.eval(node[2]), self.eval(node[3])
+        if op == "+" and isinstance(left, str) and isinstance(right, str):
+            return left + right
+        if op == "+" and isinstance(left, list) and isinstance(right, list):
+            return left + right
+        if not (_numeric(left) and _numeric(right)):
+            raise EvalError(f"Invalid operands for {op}")
+        if op == "+":
+            return left + right
+        if op == "-":
+            return left - right
+        if op == "*":
+            return left * right
+        if right == 0:
+            raise EvalError("Division by zero")
+        if op == "/":
+            return left // right if isinstance(left, int) and isinstance(right, int) else left / right
+        return left % right
+
+    def eval_member(self, node: Expr) -> Any:
+        target = self.eval(node[1])
+        if not isinstance(target, dict):
+            raise EvalError(f"Property {node[2]} on {type(target).__name__}")
+        if node[2] not in target:
+            raise EvalError(f"Property {node[2]} is undefined")
+        return target[node[2]]
+
+    def eval_index(self, node: Expr) -> Any:
+        target, key = self.eval(node[1]), self.eval(node[2])
+        try:
+            return target[key]
+        except (KeyError, IndexError, TypeError) as error:
+            raise EvalError(f"Index {key!r} failed") from error
+
+    def eval_method(self, node: Expr) -> Any:
+        target = self.eval(node[1])
+        name = node[2]
+        args = [self.eval(arg) for arg in node[3]]
+        if name == "size" and isinstance(target, (str, list, dict)):
+            return len(target)
+        if isinstance(target, dict):
+            if name == "keys":
+                return list(target)
+            if name == "values":
+                return list(target.values())
+            if name == "get" and len(args) == 2:
+                return target.get(args[0], args[1])
+            target = list(target)
+        if isinstance(target, list) and len(args) == 1 and isinstance(args[0], list):
+            if name == "hasAll":
+                return all(item in target for item in args[0])
+            if name == "hasAny":
+                return any(item in target for item in args[0])
+            if name == "hasOnly":
+                return all(item in args[0] for item in target)
+        if isinstance(target, str):
+            if name == "matches" and len(args) == 1:
+                return re.fullmatch(args[0], target) is not None
+            if name == "lower":
+                return target.lower()
+            if name == "upper":
+                return target.upper()
+        raise EvalError(f"Unsupported method {name} on {type(target).__name__}")
+
+    def eval_call(self, node: Expr) -> Any:
+        function = self.functions.get(node[1])
+        if function is None:
+            raise EvalError(f"Unknown function {node[1]}")
+        if len(node[2]) != len(function.params):
+            raise EvalError(f"{node[1]} expects {len(function.params)} arguments")
+        if self.depth >= 20:
+            raise EvalError("Function call depth exceeded")
+        scope = dict(self.bindings)
+        scope.update(zip(function.params, (self.eval(arg) for arg in node[2])))
+        inner = Interpreter(self.functions, scope, self.depth + 1)
+        for name, expr in function.lets:
+            scope[name] = inner.eval(expr)
+        return inner.eval(function.body)
+
+
+# -----------------
+# Requests
+# -----------------
+@dataclass
+class Request:
+    method: str
+    path: str
+    auth_uid: str | None
+    time: Timestamp
+    existing: dict[str, Any] | None = None
+    data: dict[str, Any] | None = None
+
+
+@dataclass
+class Decision:
+    allowed: bool
+    rule_line: int | None
+    errors: list[str]
+
+
+def match_segments(pattern: list[str], parts: list[str]) -> tuple[dict[str, Any], list[str]] | None:
+    """Matches a pattern prefix; returns `(bindings, remaining parts)`."""
+    bindings: dict[str, Any] = {}
+    for index, segment in enumerate(pattern):
+        if segment.endswith("=**}"):
+            bindings[segment[1:-4]] = "/".join(parts[index:])
+            return bindings, []
+        if index >= len(parts):
+            return None
+        if segment.startswith("{"):
+            bindings[segment[1:-1]] = parts[index]
+        elif segment != parts[index]:
+            return None
+    return bindings, parts[len(pattern):]
+
+
+def candidate_allows(
+    match: Match,
+    parts: list[str],
+    bindings: dict[str, Any],
+    functions: dict[str, Function],
+) -> list[tuple[Allow, dict[str, Any], dict[str, Function]]]:
+    matched = match_segments(match.segments, parts)
+    if matched is None:
+        return []
+    local, rest = matched
+    scope = {**bindings, **local}
+    visible = {**functions, **match.functions}
+    out: list[tuple[Allow, dict[str, Any], dict[str, Function]]] = []
+    if not rest:
+        out.extend((allow, scope, visible) for allow in match.allows)
+    for child in match.children:
+        out.extend(candidate_allows(child, rest, scope, visible))
+    return out
+
+
+class RulesEngine:
+    def __init__(self, ruleset: Ruleset) -> None:
+        self.ruleset = ruleset
+
+    @classmethod
+    def from_file(cls, path: Path = RULES_PATH) -> "RulesEngine":
+        return cls(parse_rules(path.read_text(encoding="utf-8")))
+
+    def evaluate(self, request: Request) -> Decision:
+        parts = ["databases", "(default)", "documents"] + request.path.strip("/").split("/")
+        auth = (
+            {"uid": request.auth_uid, "token": {"firebase": {"sign_in_provider": "custom"}}}
+            if request.auth_uid
+            else None
+        )
+        resource = {"data": request.existing, "id": parts[-1]} if request.existing is not None else None
+        request_resource = (
+            {"data": request.data, "id": parts[-1]} if request.data is not None else None
+        )
+        bindings = {
+            "request": {
+                "auth": auth,
+                "time": request.time,
+                "method": request.method,
+                "path": "/".join(parts),
+                "resource": request_resource,
+            },
+            "resource": resource,
+        }
+        errors: list[str] = []
+        for allow, scope, functions in candidate_allows(self.ruleset.root, parts, bindings, {}):
+            if request.method not in allow.methods:
+                continue
+            try:
+                if Interpreter(functions, scope).truthy(allow.condition):
+                    return Decision(True, allow.line, errors)
+            except EvalError as error:
+                errors.append(f"line {allow.line}: {error}")
+        return Decision(False, None, errors)
+
+
+# -----------------
+# Shared cases
+# -----------------
+def decode_value(value: Any, request_time: Timestamp) -> Any:
+    """Resolves the JSON sentinels shared with the emulator suite."""
+    if isinstance(value, dict):
+        if value.get(SERVER_TIMESTAMP_KEY):
+            return request_time
+        if TIMESTAMP_KEY in value:
+            return Timestamp.parse(value[TIMESTAMP_KEY])
+        return {k: decode_value(v, request_time) for k, v in value.items()}
+    if isinstance(value, list):
+        return [decode_value(v, request_time) for v in value]
+    return value
+
+
+def case_request(case: dict[str, Any], request_time: Timestamp) -> Request:
+    """Maps a client SDK call (`get` / `set` / `delete`) to a rules request."""
+    earlier = Timestamp(request_time.micros - 60_000_000)
+    existing = case.get("existing")
+    existing_data = decode_value(existing, earlier) if existing is not None else None
+    op = case["op"]
+    if op == "get":
+        return Request("get", case["path"], case.get("auth"), request_time, existing_data)
+    if op == "delete":
+        return Request("delete", case["path"], case.get("auth"), request_time, existing_data)
+    if op != "set":
+        raise ValueError(f"Unsupported case op {op!r}")
+    data = decode_value(case.get("data") or {}, request_time)
+    if existing_data is None:
+        return Request("create", case["path"], case.get("auth"), request_time, None, data)
+    merged = {**existing_data, **data} if case.get("merge") else data
+    return Request("update", case["path"], case.get("auth"), request_time, existing_data, merged)
+
+
+def load_cases(directory: Path) -> list[dict[str, Any]]:
+    cases: list[dict[str, Any]] = []
+    for path in sorted(directory.glob("*.json")):
+        for case in json.loads(path.read_text(encoding="utf-8")):
+            case.setdefault("file", path.name)
+            cases.append(case)
+    return cases
+
+
+def run_cases(engine: RulesEngine, cases: list[dict[str, Any]]) -> list[tuple[dict[str, Any], Decision]]:
+    now = Timestamp.parse("2026-01-01T00:00:00Z")
+    return [(case, engine.evaluate(case_request(case, now))) for case in cases]
+
+
+# -----------------
+# Generated cases
+# -----------------
+BASE_PAYLOADS: dict[str, dict[str, Any]] = {
+    "score": {
+        "path": "users/{uid}/scores/flag_easy",
+        "data": {
+            "categoryKey": "flag",
+            "difficulty": "easy",
+            "bestScore": 14,
+            "source": "guest",
+            "updatedAt": {SERVER_TIMESTAMP_KEY: True},
+        },
+    },
+    "leaderboard": {
+        "path": "leaderboard/flag_easy/entries/{uid}",
+        "data": {
+            "categoryKey": "flag",
+            "difficulty": "easy",
+            "score": 14,
+            "isAnonymous": True,
+            "displayName": "Guest-userA",
+            "updatedAt": {SERVER_TIMESTAMP_KEY: True},
+        },
+    },
+    "attempt": {
+        "path": "users/{uid}/attempts/attempt-1",
+        "data": {
+            "attemptId": "attempt-1",
+            "categoryKey": "flag",
+            "difficulty": "easy",
+            "correctCount": 14,
+            "totalQuestions": 15,
+            "status": "accepted",
+            "source": "guest",
+            "createdAt": {SERVER_TIMESTAMP_KEY: True},
+        },
+    },
+}
+MUTATIONS: list[Any] = [
+    None,
+    -1,
+    0,
+    15,
+    16,
+    50,
+    51,
+    "",
+    "flag",
+    "capital",
+    "expert",
+    "account",
+    "flagged",
+    True,
+    1.5,
+    "x" * 121,
+    {TIMESTAMP_KEY: "2000-01-01T00:00:00Z"},
+]
+
+
+def generate_cases(count: int, seed: int) -> list[dict[str, Any]]:
+    """Builds single-field mutations of valid payloads (plus auth/owner flips).
+
+    Verdicts are whatever the offline engine says; exporting them into
+    `firestore_tests/cases/` lets the emulator suite confirm each one.
+    """
+    rng = random.Random(seed)
+    cases: list[dict[str, Any]] = []
+    for index in range(count):
+        kind = rng.choice(sorted(BASE_PAYLOADS))
+        base = BASE_PAYLOADS[kind]
+        owner = "userA"
+        auth = rng.choice(["userA", "userA", "userA", "userB", None])
+        data = json.loads(json.dumps(base["data"]))
+        field_name = rng.choice(sorted(data))
+        mutation = rng.choice(MUTATIONS)
+        if mutation is None:
+            del data[field_name]
+        else:
+            data[field_name] = mutation
+        case: dict[str, Any] = {
+            "name": f"generated {kind} #{index}: {field_name}={json.dumps(mutation)} auth={auth}",
+            "auth": auth,
+            "op": "set",
+            "path": base["path"].format(uid=owner),
+            "data": data,
+        }
+        if kind != "attempt" and rng.random() < 0.3:
+            existing = json.loads(json.dumps(base["data"]))
+            existing["bestScore" if kind == "score" else "score"] = rng.randint(0, 15)
+            case["existing"] = existing
+        cases.append(case)
+    return cases
+
+
+# -----------------
+# CLI
+# -----------------
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Evaluates firestore.rules offline against shared allow/deny cases."
+    )
+    parser.add_argument("--rules", type=Path, default=RULES_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    check = sub.add_parser("check", help="Run the shared cases (default gate).")
+    check.add_argument("--cases-dir", type=Path, default=CASES_DIR)
+    check.add_argument("--verbose", action="store_true")
+
+    bench = sub.add_parser("bench", help="Evaluate generated cases and report throughput.")
+    bench.add_argument("--count", type=int, default=10_000)
+    bench.add_argument("--seed", type=int, default=7)
+
+    export = sub.add_parser(
+        "export", help="Write generated cases with offline verdicts for the emulator suite."
+    )
+    export.add_argument("output", type=Path)
+    export.add_argument("--count", type=int, default=200)
+    export.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        engine = RulesEngine.from_file(args.rules)
+    except RulesSyntaxError as error:
+        print(f"ERROR: {args.rules}: {error}")
+        return 2
+
+    if args.command == "check":
+        cases = load_cases(args.cases_dir)
+        if not cases:
+            print(f"ERROR: no cases found in {args.cases_dir}")
+            return 2
+        started = time.perf_counter()
+        results = run_cases(engine, cases)
+        elapsed = time.perf_counter() - started
+        failures = 0
+        for case, decision in results:
+            verdict = "allow" if decision.allowed else "deny"
+            ok = verdict == case["expect"]
+            failures += 0 if ok else 1
+            if not ok or args.verbose:
+                status = "OK" if ok else "MISMATCH"
+                detail = f" (rule line {decision.rule_line})" if decision.rule_line else ""
+                print(f"[{status}] {case['file']}: {case['name']} -> {verdict}{detail}")
+                if not ok:
+                    for error in decision.errors:
+                        print(f"    {error}")
+        print(
+            f"Rules check: {len(cases)} cases, {failures} mismatches "
+            f"in {elapsed * 1000:.1f}ms."
+        )
+        return 1 if failures else 0
+
+    cases = generate_cases(args.count, args.seed)
+    if args.command == "export":
+        now = Timestamp.parse("2026-01-01T00:00:00Z")
+        for case in cases:
+            case["expect"] = "allow" if engine.evaluate(case_request(case, now)).allowed else "deny"
+        args.output.write_text(json.dumps(cases, indent=2) + "\n", encoding="utf-8")
+        allowed = sum(1 for c in cases if c["expect"] == "allow")
+        print(f"Wrote {len(cases)} cases ({allowed} allow) to {args.output}")
+        return 0
+
+    started = time.perf_counter()
+    results = run_cases(engine, cases)
+    elapsed = time.perf_counter() - started
+    allowed = sum(1 for _, decision in results if decision.allowed)
+    print(
+        f"Rules bench: {len(cases):,} requests in {elapsed:.2f}s "
+        f"({len(cases) / elapsed:,.0f}/s), {allowed:,} allowed."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
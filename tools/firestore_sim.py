@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""In-memory Firestore stand-in with read/write/contention counters.
+
+Shared by the offline simulators in `tools/`. It models the subset of
+Firestore semantics the backend relies on:
+
+- documents addressed by slash paths (`users/{uid}/attempts/{attemptId}`)
+- `set` with optional merge and `SERVER_TIMESTAMP` resolution at commit
+- collection queries with `where`, multi-field `order_by`, and `limit`
+- optimistic transactions that retry when a read document changed
+
+Billing follows Firestore rules: one read per returned document, with a
+minimum of one read per query, and one write per committed `set`/`delete`.
+"""
+
+from __future__ import annotations
+
+import copy
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterable
+
+
+SERVER_TIMESTAMP = object()
+
+WHERE_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "in": lambda a, b: a in b,
+    "not-in": lambda a, b: a not in b,
+    "array-contains": lambda a, b: isinstance(a, list) and b in a,
+    "array-contains-any": lambda a, b: isinstance(a, list) and any(item in a for item in b),
+}
+# Pseudo-field for the document path, as in Firestore's `orderBy(FieldPath.documentId())`.
+DOCUMENT_NAME = "__name__"
+
+
+class TransactionConflict(Exception):
+    """Raised when a transaction exhausts its retry budget."""
+
+
+@dataclass
+class Document:
+    path: str
+    data: dict[str, Any]
+    create_time: float
+    update_time: float
+    version: int = 1
+
+    @property
+    def id(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+
+@dataclass
+class Counters:
+    reads: int = 0
+    writes: int = 0
+    deletes: int = 0
+    queries: int = 0
+    transactions: int = 0
+    contention_retries: int = 0
+    reads_after_writes: int = 0
+    doc_writes: Counter = field(default_factory=Counter)
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "reads": self.reads,
+            "writes": self.writes,
+            "deletes": self.deletes,
+            "queries": self.queries,
+            "transactions": self.transactions,
+            "contention_retries": self.contention_retries,
+            "reads_after_writes": self.reads_after_writes,
+        }
+
+
+def split_path(path: str) -> tuple[str, str]:
+    """Returns `(collection_path, doc_id)` for a document path."""
+    parts = path.strip("/").split("/")
+    if len(parts) % 2 != 0:
+        raise ValueError(f"Not a document path: {path}")
+    return "/".join(parts[:-1]), parts[-1]
+
+
+def sort_value(doc: "Document", name: str) -> Any:
+    return doc.path if name == DOCUMENT_NAME else field_value(doc.data, name)
+
+
+def field_value(data: dict[str, Any], dotted: str) -> Any:
+    value: Any = data
+    for part in dotted.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+class _Descending:
+    """Sort-key wrapper that inverts ordering for descending fields."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+class DocumentStore:
+    def __init__(
+        self,
+        clock: Callable[[], float] | None = None,
+        record_writes: bool = False,
+    ) -> None:
+        self._clock = clock or (lambda: time.time() * 1000.0)
+        self._collections: dict[str, dict[str, Document]] = {}
+        self.counters = Counters()
+        self.write_log: list[tuple[float, str]] | None = [] if record_writes else None
+
+    # -----------------
+    # Clock + lifecycle
+    # -----------------
+    def now_ms(self) -> float:
+        return self._clock()
+
+    def reset(self) -> None:
+        self._collections.clear()
+        self.counters = Counters()
+        if self.write_log is not None:
+            self.write_log = []
+
+    def snapshot(self) -> dict[str, dict[str, Document]]:
+        return copy.deepcopy(self._collections)
+
+    def restore(self, snapshot: dict[str, dict[str, Document]]) -> None:
+        self._collections = copy.deepcopy(snapshot)
+
+    def collections(self) -> list[str]:
+        return sorted(self._collections)
+
+    def document_count(self) -> int:
+        return sum(len(docs) for docs in self._collections.values())
+
+    # -----------------
+    # Uncounted helpers
+    # -----------------
+    def peek(self, path: str) -> Document | None:
+        collection, doc_id = split_path(path)
+        return self._collections.get(collection, {}).get(doc_id)
+
+    def iter_collection(self, collection: str) -> Iterable[Document]:
+        return list(self._collections.get(collection.strip("/"), {}).values())
+
+    # -----------------
+    # Counted operations
+    # -----------------
+    def get(self, path: str) -> Document | None:
+        self.counters.reads += 1
+        return self.peek(path)
+
+    def set(self, path: str, data: dict[str, Any], merge: bool = False) -> Document:
+        self.counters.writes += 1
+        self.counters.doc_writes[path] += 1
+        if self.write_log is not None:
+            self.write_log.append((self.now_ms(), path))
+        return self._apply_set(path, data, merge)
+
+    def delete(self, path: str) -> None:
+        self.counters.deletes += 1
+        collection, doc_id = split_path(path)
+        self._collections.get(collection, {}).pop(doc_id, None)
+
+    def query(
+        self,
+        collection: str,
+        where: Iterable[tuple[str, str, Any]] = (),
+        order_by: Iterable[tuple[str, bool]] = (),
+        limit: int | None = None,
+        offset: int = 0,
+        group: bool = False,
+    ) -> list[Document]:
+        """Runs a collection query; `order_by` items are `(field, descending)`.
+
+        With `group`, `collection` is `parent/collectionId` and every
+        `collectionId` collection under `parent` (at any depth) is queried,
+        as in a collection-group query scoped to a parent.
+        """
+        self.counters.queries += 1
+        docs = self._match(collection, list(where), list(order_by), limit, offset, group)
+        self.counters.reads += max(1, len(docs))
+        return docs
+
+    def count(
+        self,
+        collection: str,
+        where: Iterable[tuple[str, str, Any]] = (),
+    ) -> int:
+        """Aggregation count; billed as one read per 1000 matched entries."""
+        self.counters.queries += 1
+        matched = len(self._match(collection, list(where), [], None, 0, False))
+        self.counters.reads += max(1, (matched + 999) // 1000)
+        return matched
+
+    async def run_transaction(
+        self,
+        fn: Callable[["Transaction"], Awaitable[Any]],
+        max_attempts: int = 5,
+    ) -> Any:
+        self.counters.transactions += 1
+        for _ in range(max_attempts):
+            tx = Transaction(self)
+            result = await fn(tx)
+            if tx.commit():
+                return result
+            self.counters.contention_retries += 1
+        raise TransactionConflict(f"Transaction aborted after {max_attempts} attempts.")
+
+    # -----------------
+    # Internals
+    # -----------------
+    def _resolve(self, value: Any, now: float) -> Any:
+        if value is SERVER_TIMESTAMP:
+            return now
+        if isinstance(value, dict):
+            return {k: self._resolve(v, now) for k, v in value.items()}
+        return value
+
+    def _apply_set(self, path: str, data: dict[str, Any], merge: bool) -> Document:
+        collection, doc_id = split_path(path)
+        now = self.now_ms()
+        resolved = self._resolve(data, now)
+        docs = self._collections.setdefault(collection, {})
+        existing = docs.get(doc_id)
+        if existing is None:
+            doc = Document(path=path, data=resolved, create_time=now, update_time=now)
+            docs[doc_id] = doc
+            return doc
+        existing.data = {**existing.data, **resolved} if merge else resolved
+        existing.update_time = now
+        existing.version += 1
+        return existing
+
+    def _match(
+        self,
+        collection: str,
+        where: list[tuple[str, str, Any]],
+        order_by: list[tuple[str, bool]],
+        limit: int | None,
+        offset: int,
+        group: bool,
+    ) -> list[Document]:
+        collection = collection.strip("/")
+        if group:
+            parent, _, collection_id = collection.rpartition("/")
+            prefix = parent + "/" if parent else ""
+            docs = [
+                doc
+                for path, members in self._collections.items()
+                if path.startswith(prefix) and path.rsplit("/", 1)[-1] == collection_id
+                for doc in members.values()
+            ]
+        else:
+            docs = list(self._collections.get(collection, {}).values())
+        filtered = [
+            doc
+            for doc in docs
+            if all(
+                (value := sort_value(doc, name)) is not None
+                and WHERE_OPERATORS[op](value, operand)
+                for name, op, operand in where
+            )
+        ]
+        if order_by:
+            # Firestore drops documents missing an ordered field.
+            filtered = [
+                doc
+                for doc in filtered
+                if all(sort_value(doc, name) is not None for name, _ in order_by)
+            ]
+            filtered.sort(
+                key=lambda doc: tuple(
+                    _Descending(sort_value(doc, name))
+                    if descending
+                    else sort_value(doc, name)
+                    for name, descending in order_by
+                )
+                + (doc.path,)
+            )
+        elif group:
+            filtered.sort(key=lambda doc: doc.path)
+        end = offset + limit if limit is not None else None
+        return filtered[offset:end]
+
+
+class Transaction:
+    """Optimistic transaction: reads record versions, commit re-validates them.
+
+    Server SDKs reject a `get` issued after a `set` in the same transaction.
+    The stand-in allows it so existing call patterns can be replayed, and
+    counts each occurrence in `Counters.reads_after_writes`.
+    """
+
+    def __init__(self, store: DocumentStore) -> None:
+        self._store = store
+        self._read_versions: dict[str, int] = {}
+        self._writes: list[tuple[str, dict[str, Any], bool]] = []
+
+    def get(self, path: str) -> Document | None:
+        if self._writes:
+            self._store.counters.reads_after_writes += 1
+        doc = self._store.get(path)
+        self._read_versions[path] = doc.version if doc else 0
+        return copy.deepcopy(doc)
+
+    def set(self, path: str, data: dict[str, Any], merge: bool = False) -> None:
+        self._writes.append((path, data, merge))
+
+    def commit(self) -> bool:
+        for path, version in self._read_versions.items():
+            current = self._store.peek(path)
+            if (current.version if current else 0) != version:
+                return False
+        for path, data, merge in self._writes:
+            self._store.set(path, data, merge=merge)
+        return True
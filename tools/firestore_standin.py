@@ -0,0 +1,1298 @@
+#!/usr/bin/env python3
+"""In-memory stand-in for the Firestore emulator's REST API.
+
+Serves the subset of `/v1/projects/{project}/databases/{database}/documents`
+the app's data model needs (`users/{uid}`, `users/{uid}/scores`,
+`users/{uid}/attempts`, `leaderboard/{scope}/entries`) on top of
+`firestore_sim.DocumentStore`:
+
+- `GET`/`PATCH`/`DELETE` on a document (`updateMask.fieldPaths`,
+  `currentDocument.exists` / `currentDocument.updateTime` preconditions)
+- `GET` (list, `pageSize`/`pageToken`) and `POST` (create) on a collection
+- `:commit` with `update` / `delete` / `transform` writes and field
+  transforms (`REQUEST_TIME` server timestamps, `increment`, `maximum`,
+  `minimum`, `appendMissingElements`, `removeAllFromArray`), applied
+  atomically with one commit time
+- `:beginTransaction` / `:rollback`; commits abort (409 `ABORTED`) when a
+  document read in the transaction changed, like the emulator's contention
+- `:batchGet` and `:runQuery` (`from` with `allDescendants`, `AND` filters,
+  multi-field `orderBy` with the implicit `__name__` tie-break, `limit`,
+  `offset`, `select`)
+- `DELETE /emulator/v1/projects/{p}/databases/{d}/documents` resets data,
+  as on the emulator; `POST .../snapshots/{name}` saves and
+  `POST .../snapshots/{name}:restore` restores a named snapshot
+
+Anything outside the subset (cursors, `OR` filters, listeners, security
+rules) is answered with 400 `INVALID_ARGUMENT` instead of being ignored.
+
+The HTTP layer is a small HTTP/1.1 keep-alive loop on `socketserver`
+rather than `http.server`: importing `http.server` (via `email`) costs
+more than the rest of startup combined.
+
+Subcommands:
+- `serve`: run the stand-in (default port 8080, like the emulator).
+- `wait`: block until a `serve --ready-file` appears.
+- `check`: exercise the API end to end and measure startup.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import copy
+import json
+import math
+import os
+import re
+import signal
+import socketserver
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, NamedTuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from firestore_sim import DOCUMENT_NAME, Document, DocumentStore
+from ready_file import wait_for_ready_file, write_ready_file
+
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_PORT = 8080
+DEFAULT_PROJECT = "demo-quiznetic"
+DEFAULT_STARTUP_BUDGET_MS = 100.0
+
+DOCUMENTS_ROUTE = re.compile(
+    r"^/v1/projects/(?P<project>[^/]+)/databases/(?P<database>[^/]+)/documents"
+    r"(?:/(?P<path>[^:]*))?(?::(?P<verb>[A-Za-z]+))?$"
+)
+EMULATOR_ROUTE = re.compile(
+    r"^/emulator/v1/projects/(?P<project>[^/]+)/databases/(?P<database>[^/]+)/"
+    r"(?:(?P<documents>documents)|snapshots/(?P<snapshot>[^:/]+)(?::(?P<verb>restore))?)$"
+)
+TIMESTAMP_PATTERN = re.compile(
+    r"^(?P<base>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(?P<fraction>\d+))?"
+    r"(?P<zone>Z|[+-]\d{2}:\d{2})$"
+)
+
+FIELD_OPERATORS = {
+    "EQUAL": "==",
+    "NOT_EQUAL": "!=",
+    "LESS_THAN": "<",
+    "LESS_THAN_OR_EQUAL": "<=",
+    "GREATER_THAN": ">",
+    "GREATER_THAN_OR_EQUAL": ">=",
+    "IN": "in",
+    "NOT_IN": "not-in",
+    "ARRAY_CONTAINS": "array-contains",
+    "ARRAY_CONTAINS_ANY": "array-contains-any",
+}
+INEQUALITY_OPERATORS = {"!=", "<", "<=", ">", ">=", "not-in"}
+STATUS_NAMES = {
+    400: "INVALID_ARGUMENT",
+    404: "NOT_FOUND",
+    405: "UNIMPLEMENTED",
+    409: "ALREADY_EXISTS",
+}
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 409: "Conflict"}
+
+
+class ApiError(Exception):
+    def __init__(self, code: int, message: str, status: str | None = None) -> None:
+        super().__init__(message)
+        self.code = code
+        self.status = status or STATUS_NAMES.get(code, "UNKNOWN")
+
+    def payload(self) -> dict[str, Any]:
+        return {"error": {"code": self.code, "message": str(self), "status": self.status}}
+
+
+def unsupported(what: str) -> ApiError:
+    return ApiError(400, f"{what} is not supported by the Firestore stand-in.")
+
+
+# -----------------
+# Values
+# -----------------
+class Reference(str):
+    """A `referenceValue`: the full resource name of a document."""
+
+
+class GeoPoint(NamedTuple):
+    latitude: float
+    longitude: float
+
+
+def format_timestamp(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def parse_timestamp(text: str) -> datetime:
+    match = TIMESTAMP_PATTERN.match(text)
+    if not match:
+        raise ApiError(400, f"Invalid timestamp: {text!r}")
+    # Firestore keeps microseconds; nanosecond digits are truncated.
+    fraction = (match["fraction"] or "")[:6].ljust(6, "0")
+    zone = "+00:00" if match["zone"] == "Z" else match["zone"]
+    return datetime.fromisoformat(f"{match['base']}.{fraction}{zone}")
+
+
+def ms_to_datetime(ms: float) -> datetime:
+    return datetime.fromtimestamp(ms / 1000.0, tz=timezone.utc)
+
+
+def decode_value(value: dict[str, Any]) -> Any:
+    if "nullValue" in value:
+        return None
+    if "booleanValue" in value:
+        return bool(value["booleanValue"])
+    if "integerValue" in value:
+        return int(value["integerValue"])
+    if "doubleValue" in value:
+        return float(value["doubleValue"])
+    if "timestampValue" in value:
+        return parse_timestamp(value["timestampValue"])
+    if "stringValue" in value:
+        return value["stringValue"]
+    if "bytesValue" in value:
+        return base64.b64decode(value["bytesValue"])
+    if "referenceValue" in value:
+        return Reference(value["referenceValue"])
+    if "geoPointValue" in value:
+        point = value["geoPointValue"]
+        return GeoPoint(float(point.get("latitude", 0.0)), float(point.get("longitude", 0.0)))
+    if "arrayValue" in value:
+        return [decode_value(item) for item in value["arrayValue"].get("values", [])]
+    if "mapValue" in value:
+        return decode_fields(value["mapValue"].get("fields", {}))
+    raise ApiError(400, f"Unsupported value: {json.dumps(value)[:80]}")
+
+
+def encode_value(value: Any) -> dict[str, Any]:
+    if value is None:
+        return {"nullValue": None}
+    if isinstance(value, bool):
+        return {"booleanValue": value}
+    if isinstance(value, int):
+        return {"integerValue": str(value)}
+    if isinstance(value, float):
+        if math.isnan(value):
+            return {"doubleValue": "NaN"}
+        if math.isinf(value):
+            return {"doubleValue": "Infinity" if value > 0 else "-Infinity"}
+        return {"doubleValue": value}
+    if isinstance(value, datetime):
+        return {"timestampValue": format_timestamp(value)}
+    if isinstance(value, Reference):
+        return {"referenceValue": str(value)}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    if isinstance(value, bytes):
+        return {"bytesValue": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, GeoPoint):
+        return {"geoPointValue": {"latitude": value.latitude, "longitude": value.longitude}}
+    if isinstance(value, list):
+        return {"arrayValue": {"values": [encode_value(item) for item in value]}}
+    if isinstance(value, dict):
+        return {"mapValue": {"fields": encode_fields(value)}}
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def decode_fields(fields: dict[str, Any]) -> dict[str, Any]:
+    return {name: decode_value(value) for name, value in fields.items()}
+
+
+def encode_fields(data: dict[str, Any]) -> dict[str, Any]:
+    return {name: encode_value(value) for name, value in data.items()}
+
+
+def is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# -----------------
+# Field paths
+# -----------------
+def split_field_path(path: str) -> list[str]:
+    """`a.b` -> ["a", "b"]; backtick-quoted segments may contain dots."""
+    parts: list[str] = []
+    current: list[str] = []
+    quoted = False
+    index = 0
+    while index < len(path):
+        char = path[index]
+        if char == "`":
+            quoted = not quoted
+        elif char == "\\" and quoted and index + 1 < len(path):
+            index += 1
+            current.append(path[index])
+        elif char == "." and not quoted:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+        index += 1
+    parts.append("".join(current))
+    return parts
+
+
+def get_in(data: dict[str, Any], parts: list[str]) -> tuple[bool, Any]:
+    value: Any = data
+    for part in parts:
+        if not isinstance(value, dict) or part not in value:
+            return False, None
+        value = value[part]
+    return True, value
+
+
+def set_in(data: dict[str, Any], parts: list[str], value: Any) -> None:
+    for part in parts[:-1]:
+        child = data.get(part)
+        if not isinstance(child, dict):
+            child = data[part] = {}
+        data = child
+    data[parts[-1]] = value
+
+
+def delete_in(data: dict[str, Any], parts: list[str]) -> None:
+    for part in parts[:-1]:
+        data = data.get(part)
+        if not isinstance(data, dict):
+            return
+    data.pop(parts[-1], None)
+
+
+def project_fields(data: dict[str, Any], field_paths: list[str]) -> dict[str, Any]:
+    projected: dict[str, Any] = {}
+    for path in field_paths:
+        parts = split_field_path(path)
+        found, value = get_in(data, parts)
+        if found:
+            set_in(projected, parts, value)
+    return projected
+
+
+# -----------------
+# Stand-in
+# -----------------
+class FirestoreStandIn:
+    """One `DocumentStore` per (project, database), behind a single lock."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.stores: dict[tuple[str, str], DocumentStore] = {}
+        self.snapshots: dict[tuple[str, str, str], dict[str, dict[str, Document]]] = {}
+        self.transactions: dict[str, tuple[tuple[str, str], dict[str, int]]] = {}
+        self._next_transaction = 0
+        self._last_ms = 0.0
+        self._commit_ms: float | None = None
+        self.requests = 0
+
+    # -----------------
+    # Lifecycle
+    # -----------------
+    def store(self, project: str, database: str = "(default)") -> DocumentStore:
+        key = (project, database)
+        store = self.stores.get(key)
+        if store is None:
+            store = self.stores[key] = DocumentStore(clock=self._clock)
+        return store
+
+    def reset(self, project: str, database: str = "(default)") -> None:
+        self.store(project, database).reset()
+        self.transactions = {
+            tx: state for tx, state in self.transactions.items() if state[0] != (project, database)
+        }
+
+    def save_snapshot(self, project: str, name: str, database: str = "(default)") -> int:
+        store = self.store(project, database)
+        self.snapshots[(project, database, name)] = store.snapshot()
+        return store.document_count()
+
+    def restore_snapshot(self, project: str, name: str, database: str = "(default)") -> int:
+        saved = self.snapshots.get((project, database, name))
+        if saved is None:
+            raise ApiError(404, f"Snapshot {name!r} not found.")
+        store = self.store(project, database)
+        store.restore(saved)
+        return store.document_count()
+
+    def _clock(self) -> float:
+        if self._commit_ms is not None:
+            return self._commit_ms
+        return self.tick()
+
+    def tick(self) -> float:
+        # Strictly increasing, so update times order writes like Firestore's.
+        self._last_ms = max(time.time() * 1000.0, self._last_ms + 0.001)
+        return self._last_ms
+
+    # -----------------
+    # Dispatch
+    # -----------------
+    def dispatch(self, method: str, target: str, body: bytes) -> tuple[int, Any]:
+        """Returns `(status, payload)`; payload is JSON-able or a plain string."""
+        with self.lock:
+            self.requests += 1
+            try:
+                return 200, self._route(method, target, body)
+            except ApiError as error:
+                return error.code, error.payload()
+            except (TypeError, ValueError, KeyError) as error:
+                return 400, ApiError(400, f"Invalid request: {error}").payload()
+
+    def _route(self, method: str, target: str, body: bytes) -> Any:
+        parts = urlsplit(target)
+        path = unquote(parts.path)
+        params = parse_qs(parts.query)
+        payload = json.loads(body) if body.strip() else {}
+        if path == "/" and method == "GET":
+            return "Ok"
+
+        route = EMULATOR_ROUTE.match(path)
+        if route:
+            project, database = route["project"], route["database"]
+            if route["documents"] and method == "DELETE":
+                self.reset(project, database)
+                return {}
+            if route["snapshot"] and method == "POST":
+                if route["verb"] == "restore":
+                    count = self.restore_snapshot(project, route["snapshot"], database)
+                else:
+                    count = self.save_snapshot(project, route["snapshot"], database)
+                return {"name": route["snapshot"], "documents": count}
+            raise ApiError(405, f"{method} {path} is not supported.")
+
+        route = DOCUMENTS_ROUTE.match(path)
+        if not route:
+            raise ApiError(404, f"Unknown path: {path}")
+        scope = Scope(self, route["project"], route["database"])
+        doc_path = (route["path"] or "").strip("/")
+        verb = route["verb"]
+        if verb:
+            if method != "POST":
+                raise ApiError(405, f"{method} is not supported for :{verb}.")
+            handler = {
+                "commit": scope.commit,
+                "beginTransaction": scope.begin_transaction,
+                "rollback": scope.rollback,
+                "batchGet": scope.batch_get,
+                "runQuery": scope.run_query,
+            }.get(verb)
+            if handler is None:
+                raise unsupported(f":{verb}")
+            return handler(doc_path, payload)
+
+        segments = doc_path.split("/") if doc_path else []
+        if len(segments) % 2 == 0 and segments:
+            if method == "GET":
+                return scope.get_document(doc_path, params)
+            if method == "PATCH":
+                return scope.patch_document(doc_path, params, payload)
+            if method == "DELETE":
+                return scope.delete_document(doc_path, params)
+        elif segments:
+            if method == "GET":
+                return scope.list_documents(doc_path, params)
+            if method == "POST":
+                return scope.create_document(doc_path, params, payload)
+        raise ApiError(405, f"{method} {path} is not supported.")
+
+
+class Scope:
+    """Request handlers bound to one (project, database)."""
+
+    def __init__(self, standin: FirestoreStandIn, project: str, database: str) -> None:
+        self.standin = standin
+        self.key = (project, database)
+        self.store = standin.store(project, database)
+        self.prefix = f"projects/{project}/databases/{database}/documents"
+
+    # -----------------
+    # Names + rendering
+    # -----------------
+    def name(self, path: str) -> str:
+        return f"{self.prefix}/{path}"
+
+    def path_of(self, name: str) -> str:
+        marker = self.prefix + "/"
+        if not name.startswith(marker):
+            raise ApiError(400, f"Document name {name!r} is outside {self.prefix}.")
+        return name[len(marker):].strip("/")
+
+    def render(self, doc: Document, mask: list[str] | None = None) -> dict[str, Any]:
+        data = project_fields(doc.data, mask) if mask is not None else doc.data
+        return {
+            "name": self.name(doc.path),
+            "fields": encode_fields(data),
+            "createTime": format_timestamp(ms_to_datetime(doc.create_time)),
+            "updateTime": format_timestamp(ms_to_datetime(doc.update_time)),
+        }
+
+    def read_time(self) -> str:
+        return format_timestamp(ms_to_datetime(self.standin.tick()))
+
+    def record_read(self, transaction: str | None, path: str, doc: Document | None) -> None:
+        if not transaction:
+            return
+        state = self.standin.transactions.get(transaction)
+        if state is None or state[0] != self.key:
+            raise ApiError(400, "Transaction is invalid or has expired.")
+        state[1].setdefault(path, doc.version if doc else 0)
+
+    # -----------------
+    # Documents + collections
+    # -----------------
+    def get_document(self, path: str, params: dict[str, list[str]]) -> dict[str, Any]:
+        doc = self.store.get(path)
+        self.record_read(first(params, "transaction"), path, doc)
+        if doc is None:
+            raise ApiError(404, f"Document {self.name(path)} not found.")
+        return self.render(doc, params.get("mask.fieldPaths"))
+
+    def patch_document(
+        self, path: str, params: dict[str, list[str]], payload: dict[str, Any]
+    ) -> dict[str, Any]:
+        write: dict[str, Any] = {"update": {"name": self.name(path), "fields": payload.get("fields", {})}}
+        if "updateMask.fieldPaths" in params:
+            write["updateMask"] = {"fieldPaths": params["updateMask.fieldPaths"]}
+        precondition = precondition_from(params)
+        if precondition:
+            write["currentDocument"] = precondition
+        self.apply_writes([write])
+        return self.render(self.store.peek(path), params.get("mask.fieldPaths"))
+
+    def delete_document(self, path: str, params: dict[str, list[str]]) -> dict[str, Any]:
+        write: dict[str, Any] = {"delete": self.name(path)}
+        precondition = precondition_from(params)
+        if precondition:
+            write["currentDocument"] = precondition
+        self.apply_writes([write])
+        return {}
+
+    def create_document(
+        self, collection: str, params: dict[str, list[str]], payload: dict[str, Any]
+    ) -> dict[str, Any]:
+        doc_id = first(params, "documentId") or auto_id()
+        path = f"{collection}/{doc_id}"
+        self.apply_writes([
+            {
+                "update": {"name": self.name(path), "fields": payload.get("fields", {})},
+                "currentDocument": {"exists": False},
+            }
+        ])
+        return self.render(self.store.peek(path), params.get("mask.fieldPaths"))
+
+    def list_documents(self, collection: str, params: dict[str, list[str]]) -> dict[str, Any]:
+        if "orderBy" in params or "showMissing" in params:
+            raise unsupported("ListDocuments orderBy/showMissing")
+        page_size = int(first(params, "pageSize") or 0) or None
+        offset = int(first(params, "pageToken") or 0)
+        docs = self.store.query(
+            collection, order_by=[(DOCUMENT_NAME, False)], limit=page_size, offset=offset,
+        )
+        result: dict[str, Any] = {}
+        if docs:
+            result["documents"] = [self.render(doc, params.get("mask.fieldPaths")) for doc in docs]
+        if page_size is not None and len(docs) == page_size:
+            result["nextPageToken"] = str(offset + page_size)
+        return result
+
+    # -----------------
+    # Batch endpoints
+    # -----------------
+    def begin_transaction(self, _: str, payload: dict[str, Any]) -> dict[str, Any]:
+        self.standin._next_transaction += 1
+        transaction = base64.b64encode(
+            f"tx-{self.standin._next_transaction}".encode()
+        ).decode("ascii")
+        self.standin.transactions[transaction] = (self.key, {})
+        return {"transaction": transaction}
+
+    def rollback(self, _: str, payload: dict[str, Any]) -> dict[str, Any]:
+        self.standin.transactions.pop(payload.get("transaction", ""), None)
+        return {}
+
+    def commit(self, _: str, payload: dict[str, Any]) -> dict[str, Any]:
+        transaction = payload.get("transaction")
+        if transaction:
+            state = self.standin.transactions.pop(transaction, None)
+            if state is None or state[0] != self.key:
+                raise ApiError(400, "Transaction is invalid or has expired.")
+            for path, version in state[1].items():
+                current = self.store.peek(path)
+                if (current.version if current else 0) != version:
+                    raise ApiError(
+                        409,
+                        "Transaction aborted: a document read in it was modified.",
+                        "ABORTED",
+                    )
+        commit_time, results = self.apply_writes(payload.get("writes", []))
+        return {"writeResults": results, "commitTime": commit_time}
+
+    def batch_get(self, _: str, payload: dict[str, Any]) -> list[dict[str, Any]]:
+        if "newTransaction" in payload:
+            raise unsupported("batchGet newTransaction")
+        mask = payload.get("mask", {}).get("fieldPaths")
+        read_time = self.read_time()
+        results = []
+        for name in payload.get("documents", []):
+            path = self.path_of(name)
+            doc = self.store.get(path)
+            self.record_read(payload.get("transaction"), path, doc)
+            if doc is None:
+                results.append({"missing": name, "readTime": read_time})
+            else:
+                results.append({"found": self.render(doc, mask), "readTime": read_time})
+        return results
+
+    def run_query(self, parent: str, payload: dict[str, Any]) -> list[dict[str, Any]]:
+        query = payload.get("structuredQuery")
+        if query is None:
+            raise ApiError(400, "runQuery requires structuredQuery.")
+        if "newTransaction" in payload:
+            raise unsupported("runQuery newTransaction")
+        for key in ("startAt", "endAt", "findNearest"):
+            if key in query:
+                raise unsupported(f"structuredQuery.{key}")
+        sources = query.get("from", [])
+        if len(sources) != 1:
+            raise ApiError(400, "structuredQuery.from must name exactly one collection.")
+        source = sources[0]
+        collection = f"{parent}/{source['collectionId']}" if parent else source["collectionId"]
+        where = self.parse_filter(query["where"]) if "where" in query else []
+
+        order_by = [
+            (item["field"]["fieldPath"], item.get("direction", "ASCENDING") == "DESCENDING")
+            for item in query.get("orderBy", [])
+        ]
+        if not order_by:
+            inequality = next((name for name, op, _ in where if op in INEQUALITY_OPERATORS), None)
+            if inequality is not None and inequality != DOCUMENT_NAME:
+                order_by.append((inequality, False))
+        if not any(name == DOCUMENT_NAME for name, _ in order_by):
+            # Firestore breaks ties by document name in the last direction used.
+            order_by.append((DOCUMENT_NAME, order_by[-1][1] if order_by else False))
+
+        limit = query.get("limit")
+        if isinstance(limit, dict):
+            limit = limit.get("value")
+        docs = self.store.query(
+            collection,
+            where=where,
+            order_by=order_by,
+            limit=int(limit) if limit is not None else None,
+            offset=int(query.get("offset", 0)),
+            group=bool(source.get("allDescendants")),
+        )
+        mask = None
+        if "select" in query:
+            mask = [item["fieldPath"] for item in query["select"].get("fields", [])]
+        read_time = self.read_time()
+        for doc in docs:
+            self.record_read(payload.get("transaction"), doc.path, doc)
+        if not docs:
+            return [{"readTime": read_time}]
+        return [{"document": self.render(doc, mask), "readTime": read_time} for doc in docs]
+
+    def parse_filter(self, node: dict[str, Any]) -> list[tuple[str, str, Any]]:
+        if "compositeFilter" in node:
+            composite = node["compositeFilter"]
+            if composite.get("op") != "AND":
+                raise unsupported(f"compositeFilter op {composite.get('op')}")
+            return [clause for child in composite.get("filters", []) for clause in self.parse_filter(child)]
+        if "fieldFilter" in node:
+            field_filter = node["fieldFilter"]
+            name = field_filter["field"]["fieldPath"]
+            op = FIELD_OPERATORS.get(field_filter["op"])
+            if op is None:
+                raise unsupported(f"fieldFilter op {field_filter['op']}")
+            operand = decode_value(field_filter["value"])
+            if name == DOCUMENT_NAME:
+                operand = (
+                    [self.path_of(item) for item in operand]
+                    if isinstance(operand, list)
+                    else self.path_of(operand)
+                )
+            return [(name, op, operand)]
+        if "unaryFilter" in node:
+            unary = node["unaryFilter"]
+            if unary.get("op") != "IS_NOT_NULL":
+                raise unsupported(f"unaryFilter op {unary.get('op')}")
+            # The store treats null as missing, so `!= None` keeps present fields.
+            return [(unary["field"]["fieldPath"], "!=", None)]
+        raise ApiError(400, f"Unknown filter: {json.dumps(node)[:80]}")
+
+    # -----------------
+    # Writes
+    # -----------------
+    def apply_writes(self, writes: list[dict[str, Any]]) -> tuple[str, list[dict[str, Any]]]:
+        """Validates every write, then applies them all with one commit time."""
+        standin = self.standin
+        commit_ms = standin.tick()
+        commit_dt = ms_to_datetime(commit_ms)
+        staged: dict[str, dict[str, Any] | None] = {}
+        results: list[dict[str, Any]] = []
+        for write in writes:
+            if "update" in write:
+                path = self.path_of(write["update"]["name"])
+            elif "delete" in write:
+                path = self.path_of(write["delete"])
+            elif "transform" in write:
+                path = self.path_of(write["transform"]["document"])
+            else:
+                raise unsupported(f"write {sorted(write)}")
+            current = staged[path] if path in staged else self._data(path)
+            self.check_precondition(path, current, write.get("currentDocument"))
+
+            if "delete" in write:
+                staged[path] = None
+                results.append({"updateTime": format_timestamp(commit_dt)})
+                continue
+            if "update" in write:
+                fields = decode_fields(write["update"].get("fields", {}))
+                mask = write.get("updateMask", {}).get("fieldPaths")
+                if mask is None:
+                    data = fields
+                else:
+                    data = copy.deepcopy(current) if current is not None else {}
+                    for field_path in mask:
+                        parts = split_field_path(field_path)
+                        found, value = get_in(fields, parts)
+                        if found:
+                            set_in(data, parts, value)
+                        else:
+                            delete_in(data, parts)
+                transforms = write.get("updateTransforms", [])
+            else:
+                if current is None:
+                    raise ApiError(404, f"Document {write['transform']['document']} not found.")
+                data = copy.deepcopy(current)
+                transforms = write["transform"].get("fieldTransforms", [])
+            transform_results = [
+                encode_value(apply_transform(data, transform, commit_dt)) for transform in transforms
+            ]
+            staged[path] = data
+            result: dict[str, Any] = {"updateTime": format_timestamp(commit_dt)}
+            if transform_results:
+                result["transformResults"] = transform_results
+            results.append(result)
+
+        standin._commit_ms = commit_ms
+        try:
+            for path, data in staged.items():
+                if data is None:
+                    self.store.delete(path)
+                else:
+                    self.store.set(path, data)
+        finally:
+            standin._commit_ms = None
+        return format_timestamp(commit_dt), results
+
+    def _data(self, path: str) -> dict[str, Any] | None:
+        doc = self.store.peek(path)
+        return doc.data if doc else None
+
+    def check_precondition(
+        self, path: str, current: dict[str, Any] | None, precondition: dict[str, Any] | None
+    ) -> None:
+        if not precondition:
+            return
+        if "exists" in precondition:
+            if precondition["exists"] and current is None:
+                raise ApiError(404, f"Document {self.name(path)} not found.")
+            if not precondition["exists"] and current is not None:
+                raise ApiError(409, f"Document {self.name(path)} already exists.")
+        if "updateTime" in precondition:
+            doc = self.store.peek(path)
+            expected = format_timestamp(parse_timestamp(precondition["updateTime"]))
+            actual = format_timestamp(ms_to_datetime(doc.update_time)) if doc else None
+            if actual != expected:
+                raise ApiError(400, "Precondition updateTime does not match.", "FAILED_PRECONDITION")
+
+
+def apply_transform(data: dict[str, Any], transform: dict[str, Any], commit_time: datetime) -> Any:
+    parts = split_field_path(transform["fieldPath"])
+    _, current = get_in(data, parts)
+    if "setToServerValue" in transform:
+        if transform["setToServerValue"] != "REQUEST_TIME":
+            raise unsupported(f"setToServerValue {transform['setToServerValue']}")
+        value: Any = commit_time
+    elif "increment" in transform:
+        operand = decode_value(transform["increment"])
+        value = current + operand if is_number(current) else operand
+    elif "maximum" in transform:
+        operand = decode_value(transform["maximum"])
+        value = max(current, operand) if is_number(current) else operand
+    elif "minimum" in transform:
+        operand = decode_value(transform["minimum"])
+        value = min(current, operand) if is_number(current) else operand
+    elif "appendMissingElements" in transform:
+        value = list(current) if isinstance(current, list) else []
+        for item in decode_value({"arrayValue": transform["appendMissingElements"]}):
+            if item not in value:
+                value.append(item)
+    elif "removeAllFromArray" in transform:
+        removed = decode_value({"arrayValue": transform["removeAllFromArray"]})
+        value = [item for item in current if item not in removed] if isinstance(current, list) else []
+    else:
+        raise unsupported(f"field transform {sorted(transform)}")
+    set_in(data, parts, value)
+    return value
+
+
+def first(params: dict[str, list[str]], name: str) -> str | None:
+    values = params.get(name)
+    return values[0] if values else None
+
+
+def precondition_from(params: dict[str, list[str]]) -> dict[str, Any]:
+    precondition: dict[str, Any] = {}
+    exists = first(params, "currentDocument.exists")
+    if exists is not None:
+        precondition["exists"] = exists.lower() == "true"
+    update_time = first(params, "currentDocument.updateTime")
+    if update_time is not None:
+        precondition["updateTime"] = update_time
+    return precondition
+
+
+def auto_id() -> str:
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+    return "".join(alphabet[byte % len(alphabet)] for byte in os.urandom(20))
+
+
+# -----------------
+# HTTP
+# -----------------
+class RestHandler(socketserver.StreamRequestHandler):
+    """Minimal HTTP/1.1 keep-alive loop: request line, headers, JSON body."""
+
+    disable_nagle_algorithm = True
+    server: "StandInServer"
+
+    def handle(self) -> None:
+        while True:
+            line = self.rfile.readline(65537)
+            if not line:
+                return
+            if not line.strip():
+                continue
+            try:
+                method, target, version = line.decode("latin-1").split()
+            except ValueError:
+                self.send(400, ApiError(400, "Malformed request line.").payload(), keep_alive=False)
+                return
+            headers: dict[str, str] = {}
+            while True:
+                header = self.rfile.readline(65537)
+                if not header.strip():
+                    break
+                name, _, value = header.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if headers.get("transfer-encoding", "").lower() == "chunked":
+                body = self.read_chunked()
+            else:
+                body = self.rfile.read(int(headers.get("content-length") or 0))
+            if headers.get("expect", "").lower() == "100-continue":
+                self.wfile.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+            status, payload = self.server.standin.dispatch(method, target, body)
+            keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+            self.send(status, payload, keep_alive, head=method == "HEAD")
+            if self.server.verbose:
+                print(f"{method} {target} -> {status}", flush=True)
+            if not keep_alive:
+                return
+
+    def read_chunked(self) -> bytes:
+        chunks = []
+        while True:
+            size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                while self.rfile.readline().strip():
+                    pass
+                return b"".join(chunks)
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+
+    def send(self, status: int, payload: Any, keep_alive: bool, head: bool = False) -> None:
+        if isinstance(payload, str):
+            body = payload.encode("utf-8")
+            content_type = "text/plain; charset=utf-8"
+        else:
+            body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        head_lines = (
+            f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        self.wfile.write(head_lines.encode("latin-1") + (b"" if head else body))
+
+
+class StandInServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], standin: FirestoreStandIn, verbose: bool = False) -> None:
+        super().__init__(address, RestHandler)
+        self.standin = standin
+        self.verbose = verbose
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_in_thread(host: str = "127.0.0.1", port: int = 0) -> StandInServer:
+    """Starts a stand-in on a daemon thread (for Python-driven suites)."""
+    server = StandInServer((host, port), FirestoreStandIn())
+    threading.Thread(target=server.serve_forever, name="firestore-standin", daemon=True).start()
+    return server
+
+
+def serve(args: argparse.Namespace) -> int:
+    # CI stops the background server with SIGTERM; clean up the ready file too.
+    # Installed before the ready file exists so an early SIGTERM is handled.
+    def stop(signum: int, frame: object) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    server = StandInServer((args.host, args.port), FirestoreStandIn(), verbose=args.verbose)
+    if args.ready_file:
+        write_ready_file(args.ready_file, {"url": server.url, "pid": os.getpid()})
+    print(
+        f"Firestore stand-in listening at {server.url} "
+        f"(FIRESTORE_EMULATOR_HOST={args.host}:{server.server_address[1]})",
+        flush=True,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.ready_file:
+            args.ready_file.unlink(missing_ok=True)
+    return 0
+
+
+def wait(args: argparse.Namespace) -> int:
+    payload = wait_for_ready_file(args.ready_file, args.timeout)
+    if payload is None:
+        print(f"ERROR: Firestore stand-in not ready after {args.timeout:.0f}s ({args.ready_file}).")
+        return 1
+    print(f"Firestore stand-in ready at {payload['url']}.")
+    return 0
+
+
+# -----------------
+# Check
+# -----------------
+class RestClient:
+    """Keep-alive JSON client for the stand-in (used by `check` and other tools)."""
+
+    def __init__(self, url: str, project: str) -> None:
+        # Imported here so `serve` does not pay for `http.client` at startup.
+        import http.client
+
+        host, _, port = urlsplit(url).netloc.partition(":")
+        self.connection = http.client.HTTPConnection(host, int(port), timeout=10)
+        self.database = f"projects/{project}/databases/(default)"
+        self.prefix = f"{self.database}/documents"
+        self.requests = 0
+
+    def call(self, method: str, path: str, body: Any = None) -> tuple[int, Any]:
+        self.requests += 1
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        self.connection.request(method, path, body=payload, headers=headers)
+        response = self.connection.getresponse()
+        raw = response.read()
+        if response.getheader("Content-Type", "").startswith("application/json"):
+            return response.status, json.loads(raw)
+        return response.status, raw.decode()
+
+    def doc_url(self, path: str, query: str = "") -> str:
+        return f"/v1/{self.prefix}/{path}" + (f"?{query}" if query else "")
+
+    def name(self, path: str) -> str:
+        return f"{self.prefix}/{path}"
+
+    def commit(self, writes: list[dict[str, Any]], transaction: str | None = None) -> tuple[int, Any]:
+        body: dict[str, Any] = {"writes": writes}
+        if transaction:
+            body["transaction"] = transaction
+        return self.call("POST", f"/v1/{self.prefix}:commit", body)
+
+    def run_query(self, parent: str, query: dict[str, Any]) -> list[dict[str, Any]]:
+        url = f"/v1/{self.prefix}/{parent}:runQuery" if parent else f"/v1/{self.prefix}:runQuery"
+        status, rows = self.call("POST", url, {"structuredQuery": query})
+        if status != 200:
+            raise AssertionError(f"runQuery -> {status}: {rows}")
+        return [row["document"] for row in rows if "document" in row]
+
+    def emulator(self, method: str, suffix: str) -> tuple[int, Any]:
+        return self.call(method, f"/emulator/v1/{self.database}/{suffix}")
+
+
+def update_write(client: RestClient, path: str, data: dict[str, Any], **extra: Any) -> dict[str, Any]:
+    return {"update": {"name": client.name(path), "fields": encode_fields(data)}, **extra}
+
+
+def server_time(*fields: str) -> list[dict[str, Any]]:
+    return [{"fieldPath": field, "setToServerValue": "REQUEST_TIME"} for field in fields]
+
+
+def run_checks(client: RestClient) -> list[tuple[str, bool, str]]:
+    """Replays the app's write/read patterns; returns `(name, passed, detail)`."""
+    results: list[tuple[str, bool, str]] = []
+
+    def check(name: str, passed: bool, detail: str = "") -> None:
+        results.append((name, bool(passed), detail))
+
+    status, _ = client.emulator("DELETE", "documents")
+    check("reset", status == 200)
+
+    # UserChecker.createAnonymousUser: set with two server timestamps.
+    status, body = client.commit([
+        update_write(
+            client,
+            "users/u1",
+            {"isAnonymous": True, "displayName": "Guest u1"},
+            updateTransforms=server_time("createdAt", "lastSeen"),
+        )
+    ])
+    status, user = client.call("GET", client.doc_url("users/u1"))
+    check(
+        "server timestamps resolve to the commit time",
+        status == 200
+        and user["fields"]["createdAt"] == {"timestampValue": body["commitTime"]}
+        and user["updateTime"] == body["commitTime"],
+        str(user.get("fields", {}).get("createdAt")),
+    )
+
+    # ScoreService._saveScoreDirect: transactional attempt + merged best score.
+    _, tx = client.call("POST", f"/v1/{client.prefix}:beginTransaction", {})
+    transaction = tx["transaction"]
+    attempt_path = "users/u1/attempts/a1"
+    status, _ = client.call("GET", client.doc_url(attempt_path, f"transaction={transaction}"))
+    check("missing attempt reads as 404 inside a transaction", status == 404)
+    status, _ = client.call(
+        "GET", client.doc_url("users/u1/scores/flags_easy", f"transaction={transaction}")
+    )
+    merge = {"updateMask": {"fieldPaths": ["categoryKey", "difficulty", "bestScore", "source"]}}
+    status, body = client.commit(
+        [
+            update_write(
+                client,
+                attempt_path,
+                {"attemptId": "a1", "correctCount": 8, "totalQuestions": 10, "status": "accepted"},
+                updateTransforms=server_time("createdAt"),
+            ),
+            update_write(
+                client,
+                "users/u1/scores/flags_easy",
+                {"categoryKey": "flags", "difficulty": "easy", "bestScore": 8, "source": "guest"},
+                updateTransforms=server_time("updatedAt"),
+                **merge,
+            ),
+        ],
+        transaction,
+    )
+    check("transactional commit", status == 200 and len(body["writeResults"]) == 2, str(body)[:120])
+
+    _, tx = client.call("POST", f"/v1/{client.prefix}:beginTransaction", {})
+    client.call("GET", client.doc_url("users/u1/scores/flags_easy", f"transaction={tx['transaction']}"))
+    client.call(
+        "PATCH",
+        client.doc_url("users/u1/scores/flags_easy", "updateMask.fieldPaths=bestScore"),
+        {"fields": encode_fields({"bestScore": 9})},
+    )
+    status, body = client.commit(
+        [update_write(client, "users/u1/scores/flags_easy", {"bestScore": 10}, updateMask={"fieldPaths": ["bestScore"]})],
+        tx["transaction"],
+    )
+    check("contended transaction aborts", status == 409 and body["error"]["status"] == "ABORTED")
+
+    _, score = client.call("GET", client.doc_url("users/u1/scores/flags_easy"))
+    check(
+        "updateMask merges instead of replacing",
+        score["fields"]["bestScore"] == {"integerValue": "9"} and "updatedAt" in score["fields"],
+    )
+
+    status, _ = client.commit([update_write(client, "users/u1", {}, currentDocument={"exists": False})])
+    check("exists=false precondition on an existing document", status == 409)
+
+    status, body = client.commit([
+        {
+            "transform": {
+                "document": client.name("users/u1"),
+                "fieldTransforms": [
+                    {"fieldPath": "stats.games", "increment": {"integerValue": "1"}},
+                    {"fieldPath": "stats.games", "increment": {"integerValue": "2"}},
+                    {"fieldPath": "badges", "appendMissingElements": {"values": [{"stringValue": "first"}]}},
+                ],
+            }
+        }
+    ])
+    _, user = client.call("GET", client.doc_url("users/u1", "mask.fieldPaths=stats&mask.fieldPaths=badges"))
+    check(
+        "increment / arrayUnion transforms and field masks",
+        user["fields"] == encode_fields({"stats": {"games": 3}, "badges": ["first"]}),
+        str(user["fields"]),
+    )
+
+    # Leaderboard: orderBy score desc, updatedAt asc, limit (LeaderboardService).
+    rows = []
+    writes = []
+    for index in range(30):
+        uid = f"p{index:02d}"
+        score_value = 10 - index % 7
+        updated = datetime(2026, 1, 1, tzinfo=timezone.utc).replace(minute=(index * 13) % 60)
+        rows.append((uid, score_value, updated))
+        writes.append(
+            update_write(
+                client,
+                f"leaderboard/flags_easy/entries/{uid}",
+                {"categoryKey": "flags", "difficulty": "easy", "score": score_value, "updatedAt": updated},
+            )
+        )
+    client.commit(writes)
+    docs = client.run_query(
+        "leaderboard/flags_easy",
+        {
+            "from": [{"collectionId": "entries"}],
+            "orderBy": [
+                {"field": {"fieldPath": "score"}, "direction": "DESCENDING"},
+                {"field": {"fieldPath": "updatedAt"}, "direction": "ASCENDING"},
+            ],
+            "limit": 10,
+        },
+    )
+    expected = [uid for uid, *_ in sorted(rows, key=lambda row: (-row[1], row[2], row[0]))[:10]]
+    actual = [doc["name"].rsplit("/", 1)[-1] for doc in docs]
+    check("leaderboard orderBy score desc, updatedAt asc, limit 10", actual == expected, " ".join(actual))
+
+    docs = client.run_query(
+        "leaderboard/flags_easy",
+        {
+            "from": [{"collectionId": "entries"}],
+            "orderBy": [{"field": {"fieldPath": "score"}, "direction": "DESCENDING"}],
+            "limit": {"value": 3},
+            "select": {"fields": [{"fieldPath": "score"}]},
+        },
+    )
+    tied = sorted((uid for uid, value, _ in rows if value == 10), reverse=True)[:3]
+    check(
+        "ties break by name in the last direction; select projects fields",
+        [doc["name"].rsplit("/", 1)[-1] for doc in docs] == tied and set(docs[0]["fields"]) == {"score"},
+    )
+
+    docs = client.run_query(
+        "",
+        {
+            "from": [{"collectionId": "scores", "allDescendants": True}],
+            "where": {
+                "compositeFilter": {
+                    "op": "AND",
+                    "filters": [
+                        {"fieldFilter": {"field": {"fieldPath": "difficulty"}, "op": "EQUAL", "value": {"stringValue": "easy"}}},
+                        {"fieldFilter": {"field": {"fieldPath": "bestScore"}, "op": "GREATER_THAN", "value": {"integerValue": "5"}}},
+                    ],
+                }
+            },
+        },
+    )
+    check("collection-group query with AND filters", [doc["name"] for doc in docs] == [client.name("users/u1/scores/flags_easy")])
+
+    status, body = client.call("GET", client.doc_url("leaderboard/flags_easy/entries", "pageSize=25"))
+    status, rest = client.call("GET", client.doc_url("leaderboard/flags_easy/entries", f"pageSize=25&pageToken={body['nextPageToken']}"))
+    check("list documents pages", len(body["documents"]) == 25 and len(rest["documents"]) == 5 and "nextPageToken" not in rest)
+
+    status, body = client.call(
+        "POST",
+        f"/v1/{client.prefix}:batchGet",
+        {"documents": [client.name("users/u1"), client.name("users/nobody")]},
+    )
+    check("batchGet found + missing", status == 200 and "found" in body[0] and body[1].get("missing") == client.name("users/nobody"))
+
+    status, body = client.call(
+        "POST",
+        f"/v1/{client.prefix}:runQuery",
+        {"structuredQuery": {"from": [{"collectionId": "users"}], "startAt": {"values": []}}},
+    )
+    check("unsupported features are rejected", status == 400 and "not supported" in body["error"]["message"])
+
+    # Snapshot / restore / reset between tests.
+    status, body = client.emulator("POST", "snapshots/seeded")
+    seeded = body.get("documents")
+    client.call("DELETE", client.doc_url("users/u1"))
+    status, _ = client.call("GET", client.doc_url("users/u1"))
+    check("delete", status == 404)
+    status, body = client.emulator("POST", "snapshots/seeded:restore")
+    status_after, _ = client.call("GET", client.doc_url("users/u1"))
+    check("snapshot restore", status == 200 and body["documents"] == seeded and status_after == 200, f"{seeded} docs")
+    client.emulator("DELETE", "documents")
+    status, _ = client.call("GET", client.doc_url("users/u1"))
+    check("reset clears data", status == 404)
+    return results
+
+
+def measure_startup(runs: int) -> tuple[float, float]:
+    """Fastest ms from spawn to ready file for `serve`, and for a bare interpreter.
+
+    Minimums, not medians: startup noise on shared runners only ever adds time.
+    """
+    import subprocess
+    import sys
+    import tempfile
+
+    spawn: list[float] = []
+    bare: list[float] = []
+    with tempfile.TemporaryDirectory(prefix="firestore-standin-") as tmp:
+        for index in range(runs):
+            ready = Path(tmp) / f"ready-{index}.json"
+            started = time.perf_counter()
+            process = subprocess.Popen(
+                [sys.executable, str(Path(__file__).resolve()), "serve", "--port", "0", "--ready-file", str(ready)],
+                stdout=subprocess.DEVNULL,
+            )
+            try:
+                while not ready.exists():
+                    if process.poll() is not None:
+                        raise RuntimeError("stand-in exited during startup")
+                    time.sleep(0.001)
+                spawn.append((time.perf_counter() - started) * 1000)
+            finally:
+                process.terminate()
+                process.wait(timeout=10)
+            started = time.perf_counter()
+            subprocess.run([sys.executable, "-c", "pass"], check=True)
+            bare.append((time.perf_counter() - started) * 1000)
+    return min(spawn), min(bare)
+
+
+def render_summary_markdown(
+    results: list[tuple[str, bool, str]],
+    startup_ms: float,
+    interpreter_ms: float,
+    budget_ms: float,
+    requests: int,
+    elapsed_ms: float,
+) -> str:
+    overhead = startup_ms - interpreter_ms
+    lines = [
+        "## Firestore Stand-in",
+        "",
+        f"- Checks: **{sum(passed for _, passed, _ in results)}/{len(results)}** passed",
+        f"- Startup to ready: **{startup_ms:.0f} ms** ({interpreter_ms:.0f} ms interpreter, "
+        f"**{overhead:.0f} ms** stand-in; budget {budget_ms:.0f} ms)",
+        f"- Check requests: {requests} in {elapsed_ms:.0f} ms "
+        f"({elapsed_ms / max(1, requests):.2f} ms/request)",
+        "",
+        "| Check | Result |",
+        "|---|---|",
+    ]
+    for name, passed, detail in results:
+        lines.append(f"| {name} | {'pass' if passed else 'FAIL ' + detail} |")
+    return "\n".join(lines) + "\n"
+
+
+def run_check(args: argparse.Namespace) -> int:
+    server = start_in_thread()
+    try:
+        client = RestClient(server.url, args.project)
+        started = time.perf_counter()
+        results = run_checks(client)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    finally:
+        server.shutdown()
+        server.server_close()
+    startup_ms, interpreter_ms = measure_startup(args.startup_runs)
+    overhead = startup_ms - interpreter_ms
+
+    for name, passed, detail in results:
+        print(f"{'PASS' if passed else 'FAIL'} {name}" + ("" if passed or not detail else f": {detail}"))
+    print(
+        f"Startup to ready: {startup_ms:.0f} ms (best of {args.startup_runs} runs; "
+        f"{interpreter_ms:.0f} ms bare interpreter, {overhead:.0f} ms stand-in)."
+    )
+    print(f"{client.requests} requests in {elapsed_ms:.0f} ms.")
+
+    summary = render_summary_markdown(
+        results, startup_ms, interpreter_ms, args.startup_budget_ms, client.requests, elapsed_ms,
+    )
+    if args.summary_file:
+        args.summary_file.parent.mkdir(parents=True, exist_ok=True)
+        with args.summary_file.open("a", encoding="utf-8") as handle:
+            handle.write(summary)
+    if args.json_file:
+        args.json_file.write_text(
+            json.dumps(
+                {
+                    "checks": [{"name": n, "passed": p, "detail": d} for n, p, d in results],
+                    "startup_ms": startup_ms,
+                    "interpreter_ms": interpreter_ms,
+                    "requests": client.requests,
+                    "elapsed_ms": elapsed_ms,
+                },
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+
+    failed = [name for name, passed, _ in results if not passed]
+    if failed:
+        print(f"ERROR: {len(failed)} check(s) failed.")
+        return 1
+    if overhead > args.startup_budget_ms:
+        print(f"ERROR: stand-in startup {overhead:.0f} ms exceeds the {args.startup_budget_ms:.0f} ms budget.")
+        return 1
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="In-memory stand-in for the Firestore emulator REST API.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = sub.add_parser("serve", help="Run the stand-in.")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 picks a free port.")
+    serve_parser.add_argument("--ready-file", type=Path, help="Write {url, pid} here once listening.")
+    serve_parser.add_argument("--verbose", action="store_true", help="Log every request.")
+
+    wait_parser = sub.add_parser("wait", help="Block until a ready file is written.")
+    wait_parser.add_argument("--ready-file", type=Path, required=True)
+    wait_parser.add_argument("--timeout", type=float, default=10.0)
+
+    check_parser = sub.add_parser("check", help="Exercise the API and measure startup.")
+    check_parser.add_argument("--project", default=DEFAULT_PROJECT)
+    check_parser.add_argument("--startup-runs", type=int, default=5)
+    check_parser.add_argument(
+        "--startup-budget-ms",
+        type=float,
+        default=DEFAULT_STARTUP_BUDGET_MS,
+        help="Fail when spawn-to-ready exceeds a bare interpreter start by more than this.",
+    )
+    check_parser.add_argument("--summary-file", type=Path)
+    check_parser.add_argument("--json-file", type=Path)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.command == "serve":
+        return serve(args)
+    if args.command == "wait":
+        return wait(args)
+    return run_check(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
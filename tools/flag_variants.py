@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""Resolution-aware density variants for `assets/flags/`.
+
+Every flag ships as one 64x64 PNG, so high-DPI devices upscale it. Flutter
+picks `assets/flags/2.0x/<name>.png` and `3.0x/<name>.png` automatically
+when the main asset is declared. This tool generates those variants from
+higher-resolution masters:
+
+- masters live in `assets_src/flags/<name>.png`. That directory is not
+  declared in `pubspec.yaml`, so masters are never bundled.
+- each variant is `base size x density` (`base` comes from the checked-in
+  1.0x file) and is downscaled from the master on a process pool
+  (`png_raster`, box filter in premultiplied alpha)
+- `tools/baselines/flag_variants.json` records each master's hash, the
+  target size, and the resampler version. A variant is rebuilt only when
+  one of those changed or its output no longer matches the recorded hash.
+- masters smaller than a target are skipped, so a variant is never upscaled
+
+The `assets/flags/` directory entry in `pubspec.yaml` already bundles the
+density subdirectories as variants. Listing `assets/flags/2.0x/` there
+would register every variant as a main asset (a duplicate quiz question),
+so `build` removes such entries and `verify` reports them.
+
+Subcommands:
+- `build`: generate stale or missing variants and update the state file.
+- `verify`: check variants, state, and asset declarations; non-zero on drift.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import png_raster
+
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DENSITIES = (2.0, 3.0)
+STATE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class VariantJob:
+    name: str
+    density: str
+    source: Path
+    target: Path
+    width: int
+    height: int
+
+
+def density_dir(density: float) -> str:
+    return f"{density:.1f}x"
+
+
+def sha256_file(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def load_state(path: Path) -> dict[str, Any]:
+    if path.exists():
+        state = json.loads(path.read_text(encoding="utf-8"))
+        if state.get("version") == STATE_VERSION:
+            return state
+    return {"version": STATE_VERSION, "resampler": png_raster.RESAMPLER_VERSION, "flags": {}}
+
+
+def render_variant(job: VariantJob) -> dict[str, Any]:
+    """Decode, downscale, and write one variant (worker process)."""
+    started = time.perf_counter()
+    image = png_raster.decode(job.source.read_bytes())
+    data = png_raster.encode(png_raster.resize(image, job.width, job.height))
+    job.target.parent.mkdir(parents=True, exist_ok=True)
+    partial = job.target.with_name(f".{job.target.name}.{os.getpid()}")
+    partial.write_bytes(data)
+    os.replace(partial, job.target)
+    return {
+        "name": job.name,
+        "density": job.density,
+        "size": [job.width, job.height],
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "bytes": len(data),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def plan(
+    flags_dir: Path,
+    sources_dir: Path,
+    densities: list[float],
+    state: dict[str, Any],
+    force: bool,
+) -> tuple[list[VariantJob], dict[str, Any], dict[str, int]]:
+    """Jobs for stale variants, the next state, and skip counters."""
+    counts = {"up_to_date": 0, "missing_source": 0, "source_too_small": 0, "unreadable": 0}
+    resampler_changed = state.get("resampler") != png_raster.RESAMPLER_VERSION
+    previous = state.get("flags", {})
+    next_flags: dict[str, Any] = {}
+    jobs: list[VariantJob] = []
+    for base in sorted(flags_dir.glob("*.png")):
+        source = sources_dir / base.name
+        if not source.exists():
+            counts["missing_source"] += 1
+            continue
+        try:
+            base_width, base_height = png_raster.png_size(base.read_bytes()[:32])
+            source_width, source_height = png_raster.png_size(source.read_bytes()[:32])
+        except ValueError:
+            counts["unreadable"] += 1
+            continue
+        source_hash = sha256_file(source)
+        old = previous.get(base.name, {})
+        entry = {"source_sha256": source_hash, "variants": {}}
+        for density in densities:
+            label = density_dir(density)
+            width, height = round(base_width * density), round(base_height * density)
+            if width > source_width or height > source_height:
+                counts["source_too_small"] += 1
+                continue
+            target = flags_dir / label / base.name
+            recorded = old.get("variants", {}).get(label)
+            fresh = (
+                not force
+                and not resampler_changed
+                and recorded is not None
+                and old.get("source_sha256") == source_hash
+                and recorded.get("size") == [width, height]
+                and target.exists()
+                and sha256_file(target) == recorded.get("sha256")
+            )
+            if fresh:
+                counts["up_to_date"] += 1
+                entry["variants"][label] = recorded
+            else:
+                jobs.append(VariantJob(base.name, label, source, target, width, height))
+        next_flags[base.name] = entry
+    return jobs, next_flags, counts
+
+
+# -----------------
+# pubspec asset declarations
+# -----------------
+def declaration_problems(pubspec: str, flags_prefix: str) -> list[str]:
+    problems = []
+    if not re.search(rf"^\s*-\s*{re.escape(flags_prefix)}\s*$", pubspec, re.MULTILINE):
+        problems.append(f"pubspec.yaml does not declare `{flags_prefix}`")
+    for match in re.finditer(rf"^\s*-\s*({re.escape(flags_prefix)}\d+(?:\.\d+)?x/?)\s*$", pubspec, re.MULTILINE):
+        problems.append(f"pubspec.yaml declares density directory `{match[1]}` as a main asset")
+    return problems
+
+
+def fix_declarations(pubspec: str, flags_prefix: str) -> str:
+    pattern = rf"^\s*-\s*{re.escape(flags_prefix)}\d+(?:\.\d+)?x/?\s*\n"
+    return re.sub(pattern, "", pubspec, flags=re.MULTILINE)
+
+
+# -----------------
+# Verify
+# -----------------
+def verify(
+    flags_dir: Path,
+    sources_dir: Path,
+    densities: list[float],
+    state: dict[str, Any],
+    pubspec: Path,
+    flags_prefix: str,
+) -> list[str]:
+    problems = declaration_problems(pubspec.read_text(encoding="utf-8"), flags_prefix) if pubspec.exists() else []
+    jobs, _, _ = plan(flags_dir, sources_dir, densities, state, force=False)
+    for job in jobs:
+        problems.append(f"{job.density}/{job.name}: stale or missing; run build")
+    known = set(state.get("flags", {}))
+    for density in densities:
+        directory = flags_dir / density_dir(density)
+        if not directory.exists():
+            continue
+        for path in sorted(directory.glob("*.png")):
+            if not (flags_dir / path.name).exists():
+                problems.append(f"{density_dir(density)}/{path.name}: variant without a main asset")
+                continue
+            if path.name not in known:
+                problems.append(f"{density_dir(density)}/{path.name}: not recorded in state")
+                continue
+            try:
+                image = png_raster.decode(path.read_bytes())
+            except ValueError as error:
+                problems.append(f"{density_dir(density)}/{path.name}: {error}")
+                continue
+            recorded = state["flags"][path.name]["variants"].get(density_dir(density), {})
+            if [image.width, image.height] != recorded.get("size"):
+                problems.append(f"{density_dir(density)}/{path.name}: size {image.width}x{image.height} != {recorded.get('size')}")
+    return problems
+
+
+# -----------------
+# CLI
+# -----------------
+def render_summary_markdown(report: dict[str, Any]) -> str:
+    skipped = report["skipped"]
+    return "\n".join(
+        [
+            "## Flag Density Variants",
+            "",
+            f"- Densities: {', '.join(report['densities'])}",
+            f"- Built: **{report['built']}** variants ({report['bytes_written']:,} bytes) "
+            f"in {report['seconds']}s on {report['workers']} workers",
+            f"- Up to date: {skipped['up_to_date']}; flags without a master: {skipped['missing_source']}; "
+            f"master too small: {skipped['source_too_small']}; unreadable: {skipped['unreadable']}",
+            f"- Removed stale variants: {report['removed']}",
+            "",
+        ]
+    )
+
+
+def parse_densities(raw: str) -> list[float]:
+    densities = sorted({float(item) for item in raw.split(",") if item.strip()})
+    if not densities or any(density <= 1.0 for density in densities):
+        raise ValueError("densities must be greater than 1.0 (1.0x is the checked-in asset)")
+    return densities
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate resolution-aware flag image variants.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (
+        ("build", "Generate stale or missing variants."),
+        ("verify", "Check variants, state, and pubspec declarations."),
+    ):
+        command = sub.add_parser(name, help=help_text)
+        command.add_argument("--flags-dir", type=Path, default=ROOT / "assets" / "flags")
+        command.add_argument("--sources-dir", type=Path, default=ROOT / "assets_src" / "flags")
+        command.add_argument("--state", type=Path, default=ROOT / "tools" / "baselines" / "flag_variants.json")
+        command.add_argument("--pubspec", type=Path, default=ROOT / "pubspec.yaml")
+        command.add_argument("--densities", default=",".join(str(d) for d in DEFAULT_DENSITIES))
+    build = sub.choices["build"]
+    build.add_argument("--workers", type=int, default=max(1, os.cpu_count() or 1))
+    build.add_argument("--force", action="store_true", help="Rebuild every variant.")
+    build.add_argument("--summary-file", type=Path)
+    build.add_argument("--json-file", type=Path)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        densities = parse_densities(args.densities)
+    except ValueError as error:
+        print(f"ERROR: {error}")
+        return 2
+    if not args.flags_dir.exists():
+        print(f"ERROR: flags directory not found: {args.flags_dir}")
+        return 2
+    flags_prefix = "assets/flags/"
+    state = load_state(args.state)
+
+    if args.command == "verify":
+        problems = verify(args.flags_dir, args.sources_dir, densities, state, args.pubspec, flags_prefix)
+        for problem in problems:
+            print(f"ERROR: {problem}")
+        if problems:
+            return 1
+        print("Flag density variants are up to date.")
+        return 0
+
+    if args.workers < 1:
+        print("ERROR: --workers must be positive.")
+        return 2
+    started = time.perf_counter()
+    jobs, next_flags, skipped = plan(args.flags_dir, args.sources_dir, densities, state, args.force)
+    results = []
+    if jobs:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(render_variant, jobs, chunksize=max(1, len(jobs) // (args.workers * 4))))
+    for result in results:
+        next_flags[result["name"]]["variants"][result["density"]] = {
+            "size": result["size"],
+            "sha256": result["sha256"],
+        }
+
+    # Variants whose master or density went away would otherwise linger.
+    removed = 0
+    wanted = {(label, name) for name, entry in next_flags.items() for label in entry["variants"]}
+    for directory in sorted(args.flags_dir.glob("*x")):
+        if not re.fullmatch(r"\d+(?:\.\d+)?x", directory.name) or not directory.is_dir():
+            continue
+        for path in directory.glob("*.png"):
+            if (directory.name, path.name) not in wanted:
+                path.unlink()
+                removed += 1
+        if not any(directory.iterdir()):
+            directory.rmdir()
+
+    args.state.parent.mkdir(parents=True, exist_ok=True)
+    args.state.write_text(
+        json.dumps(
+            {
+                "version": STATE_VERSION,
+                "resampler": png_raster.RESAMPLER_VERSION,
+                "densities": [density_dir(d) for d in densities],
+                "flags": {name: entry for name, entry in sorted(next_flags.items()) if entry["variants"]},
+            },
+            indent=2,
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    if args.pubspec.exists():
+        text = args.pubspec.read_text(encoding="utf-8")
+        fixed = fix_declarations(text, flags_prefix)
+        if fixed != text:
+            args.pubspec.write_text(fixed, encoding="utf-8")
+            print("Removed density directory entries from pubspec.yaml (variants are bundled via assets/flags/).")
+        for problem in declaration_problems(fixed, flags_prefix):
+            print(f"WARN: {problem}")
+
+    report = {
+        "densities": [density_dir(d) for d in densities],
+        "built": len(results),
+        "bytes_written": sum(result["bytes"] for result in results),
+        "skipped": skipped,
+        "removed": removed,
+        "workers": args.workers,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+    print(render_summary_markdown(report), end="")
+    if args.summary_file:
+        args.summary_file.parent.mkdir(parents=True, exist_ok=True)
+        with args.summary_file.open("a", encoding="utf-8") as handle:
+            handle.write(render_summary_markdown(report))
+    if args.json_file:
+        args.json_file.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,707 @@
+#!/usr/bin/env python3
+"""Streaming evaluator for the KPI thresholds in the alert-routing policy.
+
+Reads exported analytics + diagnostic events (JSONL, one event per line)
+and evaluates the `docs/ALERT_ROUTING_AND_KPI_THRESHOLDS.md` triggers as
+event time advances, printing each SEV-1/SEV-2 transition when it happens.
+
+Expected event shape (BigQuery-style aliases are accepted):
+
+    {"ts": "2026-03-01T12:00:00Z", "name": "score_submit_failed",
+     "uid": "abc", "params": {...}}
+
+- `ts` / `timestamp` / `event_timestamp`: ISO-8601, or epoch s/ms/us
+- `name` / `event_name`: analytics event name (see `RATE_KPIS`)
+- `uid` / `user_id` / `user_pseudo_id` / `installation_uuid`
+- crash records use `name: "crash"` with `fatal`/`is_fatal`, `issue_id`,
+  and optional `route` / `startup` (core-loop / startup classification)
+
+Memory is bounded regardless of input size: rate KPIs keep fixed ring
+buffers of per-minute counters, crash-free users keep one HyperLogLog
+sketch per hour of the 24h window, and files are merged by timestamp as
+streams. Each event is O(1).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import random
+import re
+import sys
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator
+
+
+SEVERITY_ORDER = {"OK": 0, "SEV-2": 1, "SEV-1": 2}
+HOUR_S = 3600
+DAY_S = 24 * HOUR_S
+ACTIVE_EVENTS = frozenset({"session_start", "app_open", "quiz_started"})
+CRASH_EVENTS = frozenset({"crash"})
+# Route names from `static const routeName` in lib/screens/.
+CORE_LOOP_ROUTES = frozenset({"/quiz", "/result", "/difficulty"})
+CORE_ROUTES = CORE_LOOP_ROUTES | frozenset(
+    {"/splash", "/entry", "/home", "/login", "/leaderboard", "/profile", "/upgrade"}
+)
+
+
+@dataclass(frozen=True)
+class RateKpi:
+    name: str
+    success_events: frozenset[str]
+    failure_events: frozenset[str]
+    sev2_below: float = 0.985
+    sev2_window_s: int = HOUR_S
+    sev1_below: float = 0.97
+    sev1_window_s: int = 30 * 60
+    min_events: int = 400
+    clear_margin: float = 0.002
+
+
+# Mirrors the rolling success-rate rows of the KPI table.
+RATE_KPIS = (
+    RateKpi(
+        name="auth_success_rate",
+        success_events=frozenset(
+            {"auth_signed_in", "auth_guest_continue_success", "auth_upgrade_completed"}
+        ),
+        failure_events=frozenset(
+            {"auth_signin_failed", "auth_guest_continue_failed", "auth_upgrade_failed"}
+        ),
+    ),
+    RateKpi(
+        name="score_save_success_rate",
+        success_events=frozenset({"score_submit_success"}),
+        failure_events=frozenset({"score_submit_failed"}),
+    ),
+    RateKpi(
+        name="leaderboard_load_success_rate",
+        success_events=frozenset({"leaderboard_load_success"}),
+        failure_events=frozenset({"leaderboard_load_failed"}),
+    ),
+)
+
+
+@dataclass
+class Event:
+    ts: float
+    name: str
+    uid: str
+    params: dict
+
+
+@dataclass
+class Transition:
+    ts: str
+    kpi: str
+    previous: str
+    severity: str
+    value: float | None
+    detail: str
+
+
+# -----------------
+# Input
+# -----------------
+def parse_ts(raw: object) -> float | None:
+    if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+        value = float(raw)
+        if value > 1e17:
+            return value / 1e9
+        if value > 1e14:
+            return value / 1e6
+        if value > 1e11:
+            return value / 1e3
+        return value
+    if isinstance(raw, str) and raw:
+        if raw.isdigit():
+            return parse_ts(int(raw))
+        try:
+            parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    return None
+
+
+def to_event(record: dict) -> Event | None:
+    ts = parse_ts(record.get("ts", record.get("timestamp", record.get("event_timestamp"))))
+    name = record.get("name") or record.get("event_name")
+    if ts is None or not isinstance(name, str):
+        return None
+    uid = (
+        record.get("uid")
+        or record.get("user_id")
+        or record.get("user_pseudo_id")
+        or record.get("installation_uuid")
+        or ""
+    )
+    params = record.get("params") or record.get("event_params") or {}
+    if not isinstance(params, dict):
+        params = {}
+    for key in ("fatal", "is_fatal", "issue_id", "route", "startup"):
+        if key in record and key not in params:
+            params[key] = record[key]
+    return Event(ts=ts, name=name, uid=str(uid), params=params)
+
+
+def tracked_names() -> set[str]:
+    names = set(ACTIVE_EVENTS | CRASH_EVENTS)
+    for kpi in RATE_KPIS:
+        names |= kpi.success_events | kpi.failure_events
+    return names
+
+
+def iter_file(path: Path, prefilter: re.Pattern[bytes], stats: dict[str, int]) -> Iterator[Event]:
+    """Yields tracked events; lines without a tracked name skip JSON parsing."""
+    with path.open("rb", buffering=1 << 20) as handle:
+        for line in handle:
+            stats["lines"] += 1
+            if not prefilter.search(line):
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                stats["malformed"] += 1
+                continue
+            event = to_event(record) if isinstance(record, dict) else None
+            if event is None:
+                stats["malformed"] += 1
+                continue
+            yield event
+
+
+def merged_events(paths: list[Path], stats: dict[str, int]) -> Iterator[Event]:
+    names = sorted(tracked_names(), key=len, reverse=True)
+    prefilter = re.compile(b'"(?:' + b"|".join(re.escape(n.encode()) for n in names) + b')"')
+    streams = [iter_file(path, prefilter, stats) for path in paths]
+    if len(streams) == 1:
+        return streams[0]
+    return heapq.merge(*streams, key=lambda event: event.ts)
+
+
+# -----------------
+# Windows
+# -----------------
+class SlidingCounter:
+    """Success/failure totals over a trailing window of fixed-size buckets."""
+
+    def __init__(self, window_s: int, bucket_s: int = 60) -> None:
+        self.bucket_s = bucket_s
+        self.size = max(1, window_s // bucket_s)
+        self.ok = [0] * self.size
+        self.bad = [0] * self.size
+        self.total_ok = 0
+        self.total_bad = 0
+        self.head: int | None = None
+        self.late = 0
+
+    def advance(self, ts: float) -> None:
+        bucket = int(ts // self.bucket_s)
+        if self.head is None:
+            self.head = bucket
+            return
+        steps = bucket - self.head
+        if steps <= 0:
+            return
+        # Clearing is bounded by the ring size, so a long gap stays O(1).
+        for offset in range(1, min(steps, self.size) + 1):
+            slot = (self.head + offset) % self.size
+            self.total_ok -= self.ok[slot]
+            self.total_bad -= self.bad[slot]
+            self.ok[slot] = 0
+            self.bad[slot] = 0
+        self.head = bucket
+
+    def add(self, ts: float, success: bool) -> None:
+        self.advance(ts)
+        bucket = int(ts // self.bucket_s)
+        assert self.head is not None
+        if bucket <= self.head - self.size:
+            self.late += 1
+            return
+        slot = bucket % self.size
+        if success:
+            self.ok[slot] += 1
+            self.total_ok += 1
+        else:
+            self.bad[slot] += 1
+            self.total_bad += 1
+
+    def rate(self, min_events: int) -> float | None:
+        total = self.total_ok + self.total_bad
+        if total < min_events:
+            return None
+        return self.total_ok / total
+
+
+class HyperLogLog:
+    """Distinct-count sketch (~1.6% standard error at precision 12)."""
+
+    def __init__(self, precision: int = 12) -> None:
+        self.p = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+
+    def add(self, value: str) -> None:
+        digest = int.from_bytes(
+            hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        index = digest >> (64 - self.p)
+        rest = digest & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> float:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            return self.m * math.log(self.m / zeros)
+        return estimate
+
+
+# -----------------
+# KPI state
+# -----------------
+@dataclass
+class RateKpiState:
+    kpi: RateKpi
+    sev2: SlidingCounter = field(init=False)
+    sev1: SlidingCounter = field(init=False)
+    level: str = "OK"
+
+    def __post_init__(self) -> None:
+        self.sev2 = SlidingCounter(self.kpi.sev2_window_s)
+        self.sev1 = SlidingCounter(self.kpi.sev1_window_s)
+
+    def observe(self, event: Event) -> None:
+        success = event.name in self.kpi.success_events
+        self.sev2.add(event.ts, success)
+        self.sev1.add(event.ts, success)
+
+    def advance(self, ts: float) -> None:
+        self.sev2.advance(ts)
+        self.sev1.advance(ts)
+
+    def severity(self) -> tuple[str, float | None, str]:
+        """Returns the window severity; leaving a level needs `clear_margin` headroom."""
+        short = self.sev1.rate(self.kpi.min_events)
+        long = self.sev2.rate(self.kpi.min_events)
+        sev1_limit = self.kpi.sev1_below + (self.kpi.clear_margin if self.level == "SEV-1" else 0)
+        sev2_limit = self.kpi.sev2_below + (self.kpi.clear_margin if self.level != "OK" else 0)
+        if short is not None and short < sev1_limit:
+            self.level = "SEV-1"
+            return "SEV-1", short, f"< {self.kpi.sev1_below:.1%} over {self.kpi.sev1_window_s // 60}m"
+        if long is not None and long < sev2_limit:
+            self.level = "SEV-2"
+            return "SEV-2", long, f"< {self.kpi.sev2_below:.1%} over {self.kpi.sev2_window_s // 60}m"
+        self.level = "OK"
+        return "OK", long, ""
+
+
+class CrashFreeUsersState:
+    """Crash-free users over 24h, evaluated at each scheduled check."""
+
+    name = "crash_free_users_24h"
+
+    def __init__(self, sev2_below: float = 0.995, sev1_below: float = 0.985, min_users: int = 200) -> None:
+        self.sev2_below = sev2_below
+        self.sev1_below = sev1_below
+        self.min_users = min_users
+        self.hours: deque[tuple[int, HyperLogLog, HyperLogLog]] = deque()
+        self.consecutive_below = 0
+
+    def _bucket(self, ts: float) -> tuple[int, HyperLogLog, HyperLogLog] | None:
+        hour = int(ts // HOUR_S)
+        if self.hours and hour < self.hours[-1][0]:
+            for entry in reversed(self.hours):
+                if entry[0] == hour:
+                    return entry
+            return None
+        if not self.hours or self.hours[-1][0] != hour:
+            self.hours.append((hour, HyperLogLog(), HyperLogLog()))
+        self._expire(hour)
+        return self.hours[-1]
+
+    def _expire(self, hour: int) -> None:
+        while self.hours and self.hours[0][0] <= hour - 24:
+            self.hours.popleft()
+
+    def observe(self, event: Event) -> None:
+        if not event.uid:
+            return
+        bucket = self._bucket(event.ts)
+        if bucket is None:
+            return
+        bucket[1].add(event.uid)
+        if event.name in CRASH_EVENTS and is_fatal(event):
+            bucket[2].add(event.uid)
+
+    def check(self, ts: float) -> tuple[str, float | None, str]:
+        self._expire(int(ts // HOUR_S))
+        active = HyperLogLog()
+        crashed = HyperLogLog()
+        for _, users, crashes in self.hours:
+            active.merge(users)
+            crashed.merge(crashes)
+        users = active.count()
+        if users < self.min_users:
+            return "OK", None, ""
+        value = max(0.0, 1.0 - crashed.count() / users)
+        if value < self.sev2_below:
+            self.consecutive_below += 1
+        else:
+            self.consecutive_below = 0
+        if value < self.sev1_below:
+            return "SEV-1", value, f"< {self.sev1_below:.1%} at check"
+        if self.consecutive_below >= 2:
+            return "SEV-2", value, f"< {self.sev2_below:.1%} for {self.consecutive_below} checks"
+        return "OK", value, ""
+
+
+class FatalIssuesState:
+    """New fatal Crashlytics issues seen in the trailing 24h."""
+
+    name = "fatal_crash_issues_24h"
+
+    def __init__(self) -> None:
+        # issue_id -> first_seen_ts; ids expire with `recent` so memory stays
+        # bounded by the issues first seen in the last 24h.
+        self.seen: dict[str, float] = {}
+        # (first_seen_ts, issue_id, on_core_route, startup_or_core_loop)
+        self.recent: deque[tuple[float, str, bool, bool]] = deque()
+
+    def observe(self, event: Event) -> None:
+        if event.name not in CRASH_EVENTS or not is_fatal(event):
+            return
+        issue = str(event.params.get("issue_id") or "")
+        if not issue:
+            return
+        self._expire(event.ts)
+        if issue in self.seen:
+            return
+        self.seen[issue] = event.ts
+        route = str(event.params.get("route") or "")
+        blocking = bool(event.params.get("startup")) or route in CORE_LOOP_ROUTES
+        self.recent.append((event.ts, issue, route in CORE_ROUTES, blocking))
+
+    def _expire(self, ts: float) -> None:
+        while self.recent and self.recent[0][0] <= ts - DAY_S:
+            _, issue, _, _ = self.recent.popleft()
+            self.seen.pop(issue, None)
+
+    def severity(self, ts: float) -> tuple[str, float | None, str]:
+        self._expire(ts)
+        core = sum(1 for entry in self.recent if entry[2] or entry[3])
+        if any(entry[3] for entry in self.recent):
+            return "SEV-1", float(core), "startup/core-loop fatal issue"
+        if core >= 2:
+            return "SEV-2", float(core), ">= 2 new fatal issues on core routes"
+        return "OK", float(core), ""
+
+
+def is_fatal(event: Event) -> bool:
+    value = event.params.get("fatal", event.params.get("is_fatal", True))
+    return value in (True, 1, "true", "1")
+
+
+# -----------------
+# Evaluator
+# -----------------
+class KpiEvaluator:
+    def __init__(self, check_interval_s: int, min_events: int, min_users: int) -> None:
+        self.rates = {
+            kpi.name: RateKpiState(
+                replace(kpi, min_events=min_events)
+            )
+            for kpi in RATE_KPIS
+        }
+        self.by_event: dict[str, RateKpiState] = {}
+        for state in self.rates.values():
+            for name in state.kpi.success_events | state.kpi.failure_events:
+                self.by_event[name] = state
+        self.crash_free = CrashFreeUsersState(min_users=min_users)
+        self.fatal = FatalIssuesState()
+        self.check_interval_s = check_interval_s
+        self.next_check: float | None = None
+        self.current: dict[str, str] = {name: "OK" for name in self.rates}
+        self.current[self.crash_free.name] = "OK"
+        self.current[self.fatal.name] = "OK"
+        self.transitions: list[Transition] = []
+        self.events = 0
+        self.first_ts: float | None = None
+        self.last_ts: float | None = None
+
+    def feed(self, event: Event) -> Iterator[Transition]:
+        self.events += 1
+        if self.first_ts is None:
+            self.first_ts = event.ts
+            self.next_check = (event.ts // self.check_interval_s + 1) * self.check_interval_s
+        if self.last_ts is None or event.ts > self.last_ts:
+            self.last_ts = event.ts
+
+        assert self.next_check is not None
+        while event.ts >= self.next_check:
+            yield from self._emit(
+                self.crash_free.name, self.next_check, self.crash_free.check(self.next_check)
+            )
+            self.next_check += self.check_interval_s
+
+        state = self.by_event.get(event.name)
+        if state is not None:
+            state.observe(event)
+            yield from self._emit(state.kpi.name, event.ts, state.severity())
+        if event.name in ACTIVE_EVENTS or event.name in CRASH_EVENTS:
+            self.crash_free.observe(event)
+        if event.name in CRASH_EVENTS:
+            self.fatal.observe(event)
+            yield from self._emit(self.fatal.name, event.ts, self.fatal.severity(event.ts))
+
+    def finish(self) -> Iterator[Transition]:
+        """Closes windows at the last event time so recoveries are reported."""
+        if self.last_ts is None:
+            return
+        for state in self.rates.values():
+            state.advance(self.last_ts)
+            yield from self._emit(state.kpi.name, self.last_ts, state.severity())
+        yield from self._emit(self.fatal.name, self.last_ts, self.fatal.severity(self.last_ts))
+
+    def _emit(
+        self, kpi: str, ts: float, result: tuple[str, float | None, str]
+    ) -> Iterator[Transition]:
+        severity, value, detail = result
+        previous = self.current[kpi]
+        if severity == previous:
+            return
+        self.current[kpi] = severity
+        transition = Transition(
+            ts=datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec="seconds"),
+            kpi=kpi,
+            previous=previous,
+            severity=severity,
+            value=round(value, 5) if value is not None else None,
+            detail=detail or "recovered",
+        )
+        self.transitions.append(transition)
+        yield transition
+
+
+# -----------------
+# Synthetic input
+# -----------------
+def generate_events(
+    path: Path,
+    events: int,
+    hours: float,
+    users: int,
+    incident_start_h: float,
+    incident_hours: float,
+    incident_failure_rate: float,
+    seed: int,
+) -> None:
+    """Writes a time-ordered synthetic export with one score-save incident."""
+    rng = random.Random(seed)
+    span = hours * HOUR_S
+    start = datetime(2026, 3, 1, tzinfo=timezone.utc).timestamp()
+    names = (
+        ["quiz_started"] * 30
+        + ["quiz_completed"] * 25
+        + ["score_submit_success"] * 25
+        + ["auth_signed_in"] * 4
+        + ["entry_choice_selected"] * 10
+        + ["ad_impression"] * 6
+    )
+    step = span / events
+    with path.open("w", encoding="utf-8", buffering=1 << 20) as handle:
+        ts = start
+        for index in range(events):
+            ts += step
+            name = rng.choice(names)
+            uid = f"u{rng.randrange(users)}"
+            hour = (ts - start) / HOUR_S
+            params: dict = {}
+            if name == "score_submit_success":
+                in_incident = incident_start_h <= hour < incident_start_h + incident_hours
+                failure_rate = incident_failure_rate if in_incident else 0.004
+                if rng.random() < failure_rate:
+                    name = "score_submit_failed"
+                    params = {"rejection_code": "unavailable"}
+            elif name == "auth_signed_in" and rng.random() < 0.003:
+                name = "auth_signin_failed"
+            if index % 20000 == 0 and rng.random() < 0.02:
+                handle.write(
+                    json.dumps(
+                        {
+                            "ts": round(ts * 1000),
+                            "name": "crash",
+                            "uid": uid,
+                            "fatal": True,
+                            "issue_id": f"issue-{rng.randrange(40)}",
+                            "route": "/profile",
+                        }
+                    )
+                    + "\n"
+                )
+            handle.write(
+                json.dumps({"ts": round(ts * 1000), "name": name, "uid": uid, "params": params})
+                + "\n"
+            )
+
+
+# -----------------
+# CLI
+# -----------------
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Evaluates alert-routing KPI thresholds over exported JSONL events "
+            "and prints SEV transitions."
+        )
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("evaluate", help="Evaluate one or more JSONL exports.")
+    run.add_argument("inputs", type=Path, nargs="+")
+    run.add_argument(
+        "--check-interval-hours",
+        type=float,
+        default=4.0,
+        help="Cadence for check-based KPIs (crash-free users).",
+    )
+    run.add_argument(
+        "--min-events",
+        type=int,
+        default=400,
+        help="Minimum events in a rate window before it can alert.",
+    )
+    run.add_argument("--min-users", type=int, default=200, help="Minimum users for crash-free users.")
+    run.add_argument(
+        "--fail-on",
+        choices=["none", "sev2", "sev1"],
+        default="sev1",
+        help="Exit non-zero when any KPI is at or above this severity at end of input.",
+    )
+    run.add_argument("--transitions-file", type=Path, help="Write transitions as JSONL.")
+    run.add_argument("--summary-file", type=Path)
+
+    gen = sub.add_parser("generate", help="Write a synthetic export for benchmarking.")
+    gen.add_argument("output", type=Path)
+    gen.add_argument("--events", type=int, default=1_000_000)
+    gen.add_argument("--hours", type=float, default=72.0)
+    gen.add_argument("--users", type=int, default=50_000)
+    gen.add_argument("--incident-start-hours", type=float, default=30.0)
+    gen.add_argument("--incident-hours", type=float, default=2.0)
+    gen.add_argument("--incident-failure-rate", type=float, default=0.05)
+    gen.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def render_summary_markdown(evaluator: KpiEvaluator, stats: dict[str, int], elapsed: float) -> str:
+    lines = [
+        "## KPI Stream Evaluation",
+        "",
+        f"- Lines read: **{stats['lines']:,}** ({stats['malformed']:,} malformed)",
+        f"- Tracked events: **{evaluator.events:,}** in {elapsed:.1f}s",
+        "",
+        "| KPI | Final state |",
+        "| --- | --- |",
+    ]
+    for kpi, severity in evaluator.current.items():
+        lines.append(f"| `{kpi}` | {severity} |")
+    lines.append("")
+    if evaluator.transitions:
+        lines += ["| Time (UTC) | KPI | Transition | Value | Detail |", "| --- | --- | --- | --- | --- |"]
+        for t in evaluator.transitions:
+            value = f"{t.value:.4f}" if t.value is not None else "-"
+            lines.append(
+                f"| {t.ts} | `{t.kpi}` | {t.previous} -> {t.severity} | {value} | {t.detail} |"
+            )
+        lines.append("")
+    return "\n".join(lines)
+
+
+def evaluate(args: argparse.Namespace) -> int:
+    missing = [path for path in args.inputs if not path.exists()]
+    if missing:
+        print(f"ERROR: input not found: {missing[0]}")
+        return 2
+
+    stats = {"lines": 0, "malformed": 0}
+    evaluator = KpiEvaluator(
+        check_interval_s=int(args.check_interval_hours * HOUR_S),
+        min_events=args.min_events,
+        min_users=args.min_users,
+    )
+    out = args.transitions_file.open("w", encoding="utf-8") if args.transitions_file else None
+    started = time.perf_counter()
+
+    def report(transitions: Iterable[Transition]) -> None:
+        for transition in transitions:
+            print(
+                f"[{transition.severity}] {transition.ts} {transition.kpi} "
+                f"({transition.previous} -> {transition.severity}) "
+                f"value={transition.value} {transition.detail}"
+            )
+            if out:
+                out.write(json.dumps(asdict(transition)) + "\n")
+
+    try:
+        for event in merged_events(args.inputs, stats):
+            report(evaluator.feed(event))
+        report(evaluator.finish())
+    finally:
+        if out:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    rate = stats["lines"] / elapsed if elapsed else 0.0
+    print(
+        f"KPI stream: {stats['lines']:,} lines, {evaluator.events:,} tracked events, "
+        f"{len(evaluator.transitions)} transitions in {elapsed:.1f}s ({rate:,.0f} lines/s)."
+    )
+    if args.summary_file:
+        args.summary_file.write_text(
+            render_summary_markdown(evaluator, stats, elapsed), encoding="utf-8"
+        )
+
+    if args.fail_on == "none":
+        return 0
+    limit = SEVERITY_ORDER["SEV-1" if args.fail_on == "sev1" else "SEV-2"]
+    worst = max(SEVERITY_ORDER[s] for s in evaluator.current.values())
+    return 1 if worst >= limit else 0
+
+
+def main() -> int:
+    args = parse_args()
+    if args.command == "generate":
+        generate_events(
+            args.output,
+            events=args.events,
+            hours=args.hours,
+            users=args.users,
+            incident_start_h=args.incident_start_hours,
+            incident_hours=args.incident_hours,
+            incident_failure_rate=args.incident_failure_rate,
+            seed=args.seed,
+        )
+        print(f"Wrote {args.events:,} synthetic events to {args.output}")
+        return 0
+    return evaluate(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""Reference rank-band engine for `leaderboard/{scope}` backed by a Fenwick tree.
+
+`LeaderboardBandService.getBandForScore` fetches up to `_maxRankTracked`
+entries per call and ranks the candidate client-side. This engine keeps a
+Fenwick tree of entry counts per score bucket plus a tie-break-ordered list
+per bucket, so rank-for-score is O(log n) without listing entries. It also
+derives the per-scope band thresholds (the entry currently at rank 10, 20,
+and 100) that can be published as one small document per scope, letting
+clients resolve their band with a single read.
+
+Ordering matches `compareLeaderboardEntries`: score desc, updatedAt asc,
+uid asc.
+
+Subcommands:
+- `bench`: compare read cost and latency with the current query pattern.
+- `thresholds`: build threshold documents from an exported entries file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import heapq
+import json
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+
+DEFAULT_BANDS = (("top10", 10), ("top20", 20), ("top100", 100))
+DEFAULT_MAX_SCORE = 50
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+
+class FenwickTree:
+    """Binary indexed tree over `size` buckets with prefix sums and k-th search."""
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._tree = [0] * (size + 1)
+
+    @classmethod
+    def from_counts(cls, counts: list[int]) -> "FenwickTree":
+        tree = cls(len(counts))
+        for index, count in enumerate(counts, start=1):
+            tree._tree[index] += count
+            parent = index + (index & -index)
+            if parent <= tree._size:
+                tree._tree[parent] += tree._tree[index]
+        return tree
+
+    def add(self, index: int, delta: int) -> None:
+        index += 1
+        while index <= self._size:
+            self._tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, index: int) -> int:
+        """Sum of buckets `0..index` inclusive (0 when index < 0)."""
+        total = 0
+        index += 1
+        while index > 0:
+            total += self._tree[index]
+            index -= index & -index
+        return total
+
+    def find_kth(self, k: int) -> int:
+        """Smallest bucket whose prefix sum reaches `k` (1-based)."""
+        position = 0
+        step = 1 << self._size.bit_length()
+        while step:
+            candidate = position + step
+            if candidate <= self._size and self._tree[candidate] < k:
+                position = candidate
+                k -= self._tree[candidate]
+            step >>= 1
+        return position
+
+
+@dataclass(frozen=True)
+class RankedEntry:
+    uid: str
+    score: int
+    updated_at: float
+
+
+class ScopeRankIndex:
+    """Order-statistics index for one `leaderboard/{scope}/entries` collection.
+
+    Buckets are stored highest score first, so the Fenwick prefix sum up to a
+    bucket is the number of entries that outrank every entry in it.
+    """
+
+    def __init__(self, max_score: int = DEFAULT_MAX_SCORE) -> None:
+        self.max_score = max_score
+        self._counts = FenwickTree(max_score + 1)
+        self._buckets: list[list[tuple[float, str]]] = [[] for _ in range(max_score + 1)]
+        self._entries: dict[str, tuple[int, float]] = {}
+
+    @classmethod
+    def bulk_load(
+        cls,
+        entries: Iterable[RankedEntry],
+        max_score: int = DEFAULT_MAX_SCORE,
+    ) -> "ScopeRankIndex":
+        index = cls(max_score)
+        for entry in entries:
+            score = index._clamp(entry.score)
+            index._entries[entry.uid] = (score, entry.updated_at)
+            index._buckets[index._bucket(score)].append((entry.updated_at, entry.uid))
+        for bucket in index._buckets:
+            bucket.sort()
+        index._counts = FenwickTree.from_counts([len(b) for b in index._buckets])
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _clamp(self, score: int) -> int:
+        return max(0, min(self.max_score, int(score)))
+
+    def _bucket(self, score: int) -> int:
+        return self.max_score - score
+
+    def upsert(self, uid: str, score: int, updated_at: float) -> None:
+        self.remove(uid)
+        score = self._clamp(score)
+        bucket = self._bucket(score)
+        bisect.insort(self._buckets[bucket], (updated_at, uid))
+        self._counts.add(bucket, 1)
+        self._entries[uid] = (score, updated_at)
+
+    def remove(self, uid: str) -> None:
+        existing = self._entries.pop(uid, None)
+        if existing is None:
+            return
+        score, updated_at = existing
+        bucket = self._bucket(score)
+        items = self._buckets[bucket]
+        items.pop(bisect.bisect_left(items, (updated_at, uid)))
+        self._counts.add(bucket, -1)
+
+    def entry_fields(self, uid: str) -> dict[str, Any] | None:
+        existing = self._entries.get(uid)
+        if existing is None:
+            return None
+        return {"score": existing[0], "updatedAt": existing[1]}
+
+    def rank_for(self, score: int, updated_at: float, uid: str) -> int:
+        """1-based rank a candidate would hold, ignoring its own current entry."""
+        score = self._clamp(score)
+        bucket = self._bucket(score)
+        ahead = self._counts.prefix_sum(bucket - 1)
+        ahead += bisect.bisect_left(self._buckets[bucket], (updated_at, uid))
+        existing = self._entries.get(uid)
+        if existing and (-existing[0], existing[1], uid) < (-score, updated_at, uid):
+            ahead -= 1
+        return ahead + 1
+
+    def entry_at_rank(self, rank: int) -> RankedEntry | None:
+        if rank < 1 or rank > len(self._entries):
+            return None
+        bucket = self._counts.find_kth(rank)
+        offset = rank - self._counts.prefix_sum(bucket - 1) - 1
+        updated_at, uid = self._buckets[bucket][offset]
+        return RankedEntry(uid=uid, score=self.max_score - bucket, updated_at=updated_at)
+
+    def thresholds_document(
+        self,
+        scope: str,
+        bands: tuple[tuple[str, int], ...] = DEFAULT_BANDS,
+    ) -> dict[str, Any]:
+        """Small per-scope document describing the entries at each band edge.
+
+        Each band stores the entry at rank N and at rank N+1; the second one is
+        the effective edge for a player whose own entry already sits inside
+        the band.
+        """
+        thresholds: dict[str, Any] = {}
+        for name, limit in bands:
+            thresholds[name] = {
+                "rank": limit,
+                "edge": _entry_fields(self.entry_at_rank(limit)),
+                "next": _entry_fields(self.entry_at_rank(limit + 1)),
+            }
+        return {"scope": scope, "entryCount": len(self._entries), "thresholds": thresholds}
+
+
+def _entry_fields(entry: RankedEntry | None) -> dict[str, Any] | None:
+    if entry is None:
+        return None
+    return {"score": entry.score, "updatedAt": entry.updated_at, "uid": entry.uid}
+
+
+def _sort_key(fields: dict[str, Any]) -> tuple[int, float, str]:
+    return (-fields["score"], fields["updatedAt"], fields["uid"])
+
+
+def band_from_thresholds(
+    document: dict[str, Any],
+    score: int,
+    updated_at: float,
+    uid: str,
+    existing: dict[str, Any] | None = None,
+) -> str:
+    """Resolves a band from a published thresholds document (one read).
+
+    A candidate that sorts ahead of the entry at rank N lands at rank <= N.
+    `existing` is the player's current entry (`score`, `updatedAt`), which the
+    client already holds in its local best-score projection; when that entry
+    is inside the band, the entry at rank N+1 becomes the edge.
+    """
+    key = (-score, updated_at, uid)
+    own = _sort_key({**existing, "uid": uid}) if existing else None
+    for name, threshold in document["thresholds"].items():
+        edge = threshold["edge"]
+        if edge is not None and own is not None and own <= _sort_key(edge):
+            edge = threshold["next"]
+        if edge is None or key < _sort_key(edge):
+            return name
+    return "outsideTop100"
+
+
+def band_for_rank(rank: int) -> str:
+    if rank <= 10:
+        return "top10"
+    if rank <= 20:
+        return "top20"
+    if rank <= 100:
+        return "top100"
+    return "outsideTop100"
+
+
+def current_pattern_rank(
+    top_entries: list[RankedEntry],
+    score: int,
+    updated_at: float,
+    uid: str,
+) -> int:
+    """Mirrors `getBandForScore`: filter the fetched page, add, sort, find."""
+    comparable = [e for e in top_entries if e.uid != uid]
+    comparable.append(RankedEntry(uid=uid, score=score, updated_at=updated_at))
+    comparable.sort(key=lambda e: (-e.score, e.updated_at, e.uid))
+    return next(i for i, e in enumerate(comparable, start=1) if e.uid == uid)
+
+
+def synthetic_entries(count: int, max_score: int, rng: random.Random) -> list[RankedEntry]:
+    return [
+        RankedEntry(
+            uid=f"u{index:08d}",
+            score=min(max_score, max(0, round(rng.gauss(max_score * 0.6, max_score * 0.18)))),
+            updated_at=rng.uniform(0, 30 * 86_400_000),
+        )
+        for index in range(count)
+    ]
+
+
+def bench_size(
+    size: int,
+    queries: int,
+    updates: int,
+    max_rank: int,
+    max_score: int,
+    rng: random.Random,
+) -> dict[str, Any]:
+    entries = synthetic_entries(size, max_score, rng)
+
+    started = time.perf_counter()
+    index = ScopeRankIndex.bulk_load(entries, max_score)
+    build_s = time.perf_counter() - started
+
+    top_page = heapq.nsmallest(max_rank, entries, key=lambda e: (-e.score, e.updated_at, e.uid))
+    now = 31 * 86_400_000.0
+    probes = [
+        (rng.randint(0, max_score), f"probe{i}" if i % 2 else entries[rng.randrange(size)].uid)
+        for i in range(queries)
+    ]
+
+    started = time.perf_counter()
+    current_ranks = [current_pattern_rank(top_page, s, now, uid) for s, uid in probes]
+    current_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    index_ranks = [index.rank_for(s, now, uid) for s, uid in probes]
+    index_s = time.perf_counter() - started
+
+    document = index.thresholds_document("bench")
+    started = time.perf_counter()
+    threshold_bands = [
+        band_from_thresholds(document, s, now, uid, index.entry_fields(uid))
+        for s, uid in probes
+    ]
+    threshold_s = time.perf_counter() - started
+
+    # The index is exact; threshold lookups must agree with it. The current
+    # pattern can disagree when the candidate's own entry is in the fetched
+    # page: dropping it leaves only N-1 rivals, so rank N+1 reads as rank N.
+    mismatches = sum(
+        1 for idx, thr in zip(index_ranks, threshold_bands) if band_for_rank(idx) != thr
+    )
+    current_errors = sum(
+        1
+        for cur, idx in zip(current_ranks, index_ranks)
+        if band_for_rank(cur) != band_for_rank(idx)
+    )
+
+    # Best-score updates: how often would the published thresholds change?
+    threshold_writes = 0
+    started = time.perf_counter()
+    for step in range(updates):
+        uid = entries[rng.randrange(size)].uid
+        score = min(max_score, index._entries[uid][0] + rng.randint(1, 5))
+        index.upsert(uid, score, now + step)
+        refreshed = index.thresholds_document("bench")
+        if refreshed["thresholds"] != document["thresholds"]:
+            threshold_writes += 1
+            document = refreshed
+    update_s = time.perf_counter() - started
+
+    return {
+        "entries": size,
+        "build_ms": round(build_s * 1000, 2),
+        "current_reads_per_lookup": min(size, max_rank),
+        "index_reads_per_lookup": 1,
+        "current_us_per_lookup": round(current_s / queries * 1e6, 2),
+        "index_us_per_lookup": round(index_s / queries * 1e6, 2),
+        "thresholds_us_per_lookup": round(threshold_s / queries * 1e6, 2),
+        "band_mismatches": mismatches,
+        "current_pattern_band_errors": current_errors,
+        "update_us": round(update_s / max(1, updates) * 1e6, 2),
+        "threshold_doc_writes_per_update": round(threshold_writes / max(1, updates), 4),
+    }
+
+
+def load_export(path: Path) -> dict[str, list[RankedEntry]]:
+    """Reads `{scope, uid, score, updatedAt}` rows from JSON array or JSONL."""
+    text = path.read_text(encoding="utf-8").strip()
+    rows = json.loads(text) if text.startswith("[") else [
+        json.loads(line) for line in text.splitlines() if line.strip()
+    ]
+    by_scope: dict[str, list[RankedEntry]] = {}
+    for row in rows:
+        by_scope.setdefault(str(row["scope"]), []).append(
+            RankedEntry(
+                uid=str(row["uid"]),
+                score=int(row["score"]),
+                updated_at=float(row.get("updatedAt") or 0),
+            )
+        )
+    return by_scope
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Fenwick-tree leaderboard rank-band engine and benchmark.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    bench = sub.add_parser("bench", help="Compare with the current top-N query pattern.")
+    bench.add_argument("--sizes", type=int, nargs="*", default=list(DEFAULT_SIZES))
+    bench.add_argument("--queries", type=int, default=2_000)
+    bench.add_argument("--updates", type=int, default=2_000)
+    bench.add_argument("--max-rank", type=int, default=100)
+    bench.add_argument("--max-score", type=int, default=DEFAULT_MAX_SCORE)
+    bench.add_argument("--seed", type=int, default=11)
+    bench.add_argument("--json-file", type=Path)
+
+    thresholds = sub.add_parser("thresholds", help="Build per-scope threshold documents.")
+    thresholds.add_argument("export", type=Path, help="Entries export (JSON or JSONL).")
+    thresholds.add_argument("--max-score", type=int, default=DEFAULT_MAX_SCORE)
+    thresholds.add_argument("--output", type=Path, help="Write documents as JSON here.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    if args.command == "thresholds":
+        if not args.export.exists():
+            print(f"ERROR: export not found: {args.export}")
+            return 2
+        documents = {
+            scope: ScopeRankIndex.bulk_load(entries, args.max_score).thresholds_document(scope)
+            for scope, entries in sorted(load_export(args.export).items())
+        }
+        payload = json.dumps(documents, indent=2)
+        if args.output:
+            args.output.write_text(payload + "\n", encoding="utf-8")
+            print(f"Wrote {len(documents)} threshold document(s) to {args.output}.")
+        else:
+            print(payload)
+        return 0
+
+    rng = random.Random(args.seed)
+    results = [
+        bench_size(size, args.queries, args.updates, args.max_rank, args.max_score, rng)
+        for size in args.sizes
+    ]
+    print(
+        f"{'entries':>10} {'build ms':>10} {'reads now':>10} {'reads idx':>10} "
+        f"{'us now':>8} {'us idx':>8} {'us thr':>8} {'upd us':>8} {'thr w/upd':>10} "
+        f"{'mismatch':>9} {'now errs':>9}"
+    )
+    for r in results:
+        print(
+            f"{r['entries']:>10,} {r['build_ms']:>10.1f} {r['current_reads_per_lookup']:>10} "
+            f"{r['index_reads_per_lookup']:>10} {r['current_us_per_lookup']:>8.1f} "
+            f"{r['index_us_per_lookup']:>8.1f} {r['thresholds_us_per_lookup']:>8.1f} "
+            f"{r['update_us']:>8.1f} {r['threshold_doc_writes_per_update']:>10.4f} "
+            f"{r['band_mismatches']:>9} {r['current_pattern_band_errors']:>9}"
+        )
+    if args.json_file:
+        args.json_file.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 1 if any(r["band_mismatches"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
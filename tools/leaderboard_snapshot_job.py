@@ -0,0 +1,591 @@
+#!/usr/bin/env python3
+"""Materialized top-N snapshot documents for `leaderboard/{scope}`.
+
+`LeaderboardService.load` reads `limit` (100) entry documents per screen
+open. This job keeps one compact document per scope at `leaderboard/{scope}`
+holding the ranked top N (`uid`, `score`, `updatedAt`, `displayName`,
+`isAnonymous`), so a view costs one read.
+
+Snapshots are maintained incrementally from best-score projections. Each
+scope keeps a window of the top `N + reserve` entries in memory:
+
+- an entry already in the window is re-placed (best scores only improve)
+- an entry outside the window enters only if it sorts ahead of the last one
+- a deletion that drops the window below N refills it with one ranked query
+- the document is rewritten only when its top N actually changes
+
+Ordering matches `compareLeaderboardEntries`: score desc, updatedAt asc,
+uid asc.
+
+Sources: an entries export (JSON array or JSONL of `{scope, uid, score,
+updatedAt, displayName?, isAnonymous?}`) or a running Firestore stand-in
+(`tools/firestore_standin.py`), whose documents are read and written over
+REST.
+
+Subcommands:
+- `build`: compute every scope's snapshot from scratch.
+- `stream`: apply a JSONL stream of projections (`"op": "delete"` removes).
+- `bench`: reads per view and update cost under a synthetic submission stream.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import heapq
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+
+DEFAULT_TOP = 100
+DEFAULT_RESERVE = 20
+DEFAULT_PROJECT = "demo-quiznetic"
+
+
+@dataclass(frozen=True)
+class EntryRow:
+    uid: str
+    score: int
+    updated_at: float
+    display_name: str | None = None
+    is_anonymous: bool = False
+
+    @property
+    def key(self) -> tuple[int, float, str]:
+        return (-self.score, self.updated_at, self.uid)
+
+    def fields(self) -> dict[str, Any]:
+        return {
+            "uid": self.uid,
+            "score": self.score,
+            "updatedAt": self.updated_at,
+            "displayName": self.display_name,
+            "isAnonymous": self.is_anonymous,
+        }
+
+
+def row_from_json(row: dict[str, Any]) -> EntryRow:
+    return EntryRow(
+        uid=str(row["uid"]),
+        score=int(row["score"]),
+        updated_at=round(float(row.get("updatedAt") or 0), 3),
+        display_name=row.get("displayName"),
+        is_anonymous=bool(row.get("isAnonymous", False)),
+    )
+
+
+def read_rows(path: Path) -> Iterator[dict[str, Any]]:
+    """JSON array or JSONL rows; `-` reads JSONL from stdin."""
+    if str(path) == "-":
+        for line in sys.stdin:
+            if line.strip():
+                yield json.loads(line)
+        return
+    text = path.read_text(encoding="utf-8").strip()
+    if text.startswith("["):
+        yield from json.loads(text)
+        return
+    for line in text.splitlines():
+        if line.strip():
+            yield json.loads(line)
+
+
+class ScopeWindow:
+    """Top `top + reserve` entries of one scope, ordered by `EntryRow.key`.
+
+    `exhaustive` means the window holds every entry in the scope, so
+    anything may enter it; otherwise entries ranked below the window are
+    unknown and only entries that beat the last one can join.
+    """
+
+    def __init__(self, top: int, reserve: int) -> None:
+        self.top = top
+        self.capacity = top + reserve
+        self.keys: list[tuple[int, float, str]] = []
+        self.rows: dict[str, EntryRow] = {}
+        self.exhaustive = True
+
+    def load(self, ranked: list[EntryRow], exhaustive: bool) -> None:
+        self.keys = [row.key for row in ranked]
+        self.rows = {row.uid: row for row in ranked}
+        self.exhaustive = exhaustive
+
+    def published(self) -> list[EntryRow]:
+        return [self.rows[key[2]] for key in self.keys[: self.top]]
+
+    def needs_refill(self) -> bool:
+        return not self.exhaustive and len(self.keys) < self.top
+
+    def upsert(self, row: EntryRow) -> None:
+        self._drop(row.uid)
+        if not self.exhaustive and self.keys and row.key > self.keys[-1]:
+            # Unknown entries may sit between the window's tail and this one.
+            return
+        bisect.insort(self.keys, row.key)
+        self.rows[row.uid] = row
+        if len(self.keys) > self.capacity:
+            evicted = self.keys.pop()
+            del self.rows[evicted[2]]
+            self.exhaustive = False
+
+    def remove(self, uid: str) -> None:
+        self._drop(uid)
+
+    def _drop(self, uid: str) -> None:
+        existing = self.rows.pop(uid, None)
+        if existing is not None:
+            self.keys.pop(bisect.bisect_left(self.keys, existing.key))
+
+
+def snapshot_document(scope: str, rows: list[EntryRow], version: int) -> dict[str, Any]:
+    return {
+        "scope": scope,
+        "size": len(rows),
+        "version": version,
+        "entries": [row.fields() for row in rows],
+    }
+
+
+# -----------------
+# Sources
+# -----------------
+class MemorySource:
+    """Entries held in memory (exports, benchmarks); snapshot writes collected."""
+
+    def __init__(self) -> None:
+        self.entries: dict[str, dict[str, EntryRow]] = {}
+        self.documents: dict[str, dict[str, Any]] = {}
+        self.reads = 0
+        self.writes = 0
+
+    def scopes(self) -> list[str]:
+        return sorted(self.entries)
+
+    def put_entry(self, scope: str, row: EntryRow) -> None:
+        self.entries.setdefault(scope, {})[row.uid] = row
+
+    def delete_entry(self, scope: str, uid: str) -> None:
+        self.entries.get(scope, {}).pop(uid, None)
+
+    def ranked(self, scope: str, limit: int) -> tuple[list[EntryRow], bool]:
+        """Top `limit` entries, and whether that is every entry in the scope."""
+        rows = list(self.entries.get(scope, {}).values())
+        top = heapq.nsmallest(limit, rows, key=lambda row: row.key)
+        self.reads += max(1, len(top))
+        return top, len(rows) <= limit
+
+    def write_snapshot(self, scope: str, document: dict[str, Any]) -> None:
+        self.writes += 1
+        self.documents[scope] = document
+
+
+class StandInSource:
+    """Entries and snapshot documents in a running Firestore stand-in."""
+
+    def __init__(self, url: str, project: str) -> None:
+        from firestore_standin import RestClient
+
+        self.client = RestClient(url, project)
+        self.reads = 0
+        self.writes = 0
+
+    def scopes(self) -> list[str]:
+        docs = self.client.run_query(
+            "", {"from": [{"collectionId": "entries", "allDescendants": True}], "select": {"fields": []}}
+        )
+        self.reads += max(1, len(docs))
+        scopes = set()
+        for doc in docs:
+            parts = doc["name"][len(self.client.prefix) + 1 :].split("/")
+            if len(parts) == 4 and parts[0] == "leaderboard":
+                scopes.add(parts[1])
+        return sorted(scopes)
+
+    def put_entry(self, scope: str, row: EntryRow) -> None:
+        from firestore_standin import encode_fields
+
+        fields = row.fields()
+        del fields["uid"]
+        fields["updatedAt"] = datetime.fromtimestamp(row.updated_at / 1000.0, tz=timezone.utc)
+        status, body = self.client.call(
+            "PATCH",
+            self.client.doc_url(f"leaderboard/{scope}/entries/{row.uid}"),
+            {"fields": encode_fields(fields)},
+        )
+        if status != 200:
+            raise RuntimeError(f"entry write failed ({status}): {body}")
+
+    def delete_entry(self, scope: str, uid: str) -> None:
+        self.client.call("DELETE", self.client.doc_url(f"leaderboard/{scope}/entries/{uid}"))
+
+    def ranked(self, scope: str, limit: int) -> tuple[list[EntryRow], bool]:
+        from firestore_standin import decode_fields
+
+        # Same query as LeaderboardService; one extra row tells whether the
+        # scope has more entries than the window.
+        docs = self.client.run_query(
+            f"leaderboard/{scope}",
+            {
+                "from": [{"collectionId": "entries"}],
+                "orderBy": [
+                    {"field": {"fieldPath": "score"}, "direction": "DESCENDING"},
+                    {"field": {"fieldPath": "updatedAt"}, "direction": "ASCENDING"},
+                ],
+                "limit": limit + 1,
+            },
+        )
+        self.reads += max(1, len(docs))
+        rows = []
+        for doc in docs[:limit]:
+            data = decode_fields(doc.get("fields", {}))
+            updated = data.get("updatedAt")
+            rows.append(
+                EntryRow(
+                    uid=doc["name"].rsplit("/", 1)[-1],
+                    score=int(data.get("score") or 0),
+                    # Firestore timestamps keep microseconds: round like `row_from_json`.
+                    updated_at=round(
+                        updated.timestamp() * 1000.0 if isinstance(updated, datetime) else float(updated or 0),
+                        3,
+                    ),
+                    display_name=data.get("displayName"),
+                    is_anonymous=bool(data.get("isAnonymous", False)),
+                )
+            )
+        return rows, len(docs) <= limit
+
+    def write_snapshot(self, scope: str, document: dict[str, Any]) -> None:
+        from firestore_standin import encode_fields
+
+        fields = dict(document)
+        fields["entries"] = [
+            {**entry, "updatedAt": datetime.fromtimestamp(entry["updatedAt"] / 1000.0, tz=timezone.utc)}
+            for entry in document["entries"]
+        ]
+        status, body = self.client.commit([
+            {
+                "update": {"name": self.client.name(f"leaderboard/{scope}"), "fields": encode_fields(fields)},
+                "updateTransforms": [{"fieldPath": "publishedAt", "setToServerValue": "REQUEST_TIME"}],
+            }
+        ])
+        if status != 200:
+            raise RuntimeError(f"snapshot write failed ({status}): {body}")
+        self.writes += 1
+
+
+# -----------------
+# Job
+# -----------------
+class SnapshotJob:
+    def __init__(self, source: MemorySource | StandInSource, top: int, reserve: int) -> None:
+        self.source = source
+        self.top = top
+        self.reserve = reserve
+        self.windows: dict[str, ScopeWindow] = {}
+        self.versions: dict[str, int] = {}
+        self.published: dict[str, list[EntryRow]] = {}
+        self.refills = 0
+        self.events = 0
+        self.snapshot_writes = 0
+
+    def window(self, scope: str) -> ScopeWindow:
+        window = self.windows.get(scope)
+        if window is None:
+            window = self.windows[scope] = ScopeWindow(self.top, self.reserve)
+            self._refill(scope, window)
+            self.published[scope] = window.published()
+        return window
+
+    def build_all(self) -> None:
+        for scope in self.source.scopes():
+            self.window(scope)
+            self._publish(scope, force=True)
+
+    def apply(self, scope: str, row: EntryRow | None, uid: str | None = None) -> bool:
+        """Applies one projection (`row`) or deletion (`uid`); True if republished."""
+        self.events += 1
+        window = self.window(scope)
+        if row is not None:
+            window.upsert(row)
+        else:
+            window.remove(uid or "")
+        if window.needs_refill():
+            self._refill(scope, window)
+        return self._publish(scope)
+
+    def _refill(self, scope: str, window: ScopeWindow) -> None:
+        self.refills += 1
+        ranked, exhaustive = self.source.ranked(scope, window.capacity)
+        window.load(ranked, exhaustive)
+
+    def _publish(self, scope: str, force: bool = False) -> bool:
+        rows = self.windows[scope].published()
+        if not force and rows == self.published.get(scope):
+            return False
+        self.published[scope] = rows
+        self.versions[scope] = self.versions.get(scope, 0) + 1
+        self.source.write_snapshot(scope, snapshot_document(scope, rows, self.versions[scope]))
+        self.snapshot_writes += 1
+        return True
+
+
+def load_memory_source(path: Path) -> MemorySource:
+    source = MemorySource()
+    for row in read_rows(path):
+        source.put_entry(str(row["scope"]), row_from_json(row))
+    return source
+
+
+def apply_events(job: SnapshotJob, events: Iterable[dict[str, Any]], write_entries: bool) -> int:
+    """Feeds events to the job; with `write_entries` the source is updated first."""
+    count = 0
+    for event in events:
+        scope = str(event["scope"])
+        if event.get("op") == "delete":
+            if write_entries:
+                job.source.delete_entry(scope, str(event["uid"]))
+            job.apply(scope, None, str(event["uid"]))
+        else:
+            row = row_from_json(event)
+            if write_entries:
+                job.source.put_entry(scope, row)
+            job.apply(scope, row)
+        count += 1
+    return count
+
+
+# -----------------
+# Benchmark
+# -----------------
+def synthetic_stream(
+    rng: random.Random,
+    scopes: list[str],
+    users: int,
+    submissions: int,
+    max_score: int,
+    delete_share: float,
+) -> Iterator[dict[str, Any]]:
+    """Submissions that pass `shouldUpdateBestScore`, plus occasional account deletions."""
+    best: dict[tuple[str, str], int] = {}
+    weights = [1.0 / (rank + 1) for rank in range(len(scopes))]
+    now = 1_767_225_600_000.0
+    for step in range(submissions):
+        now += rng.expovariate(1 / 900.0)
+        scope = rng.choices(scopes, weights)[0]
+        # Squaring skews activity toward a core of frequent players.
+        uid = f"u{int(users * rng.random() ** 2):07d}"
+        if rng.random() < delete_share and (scope, uid) in best:
+            del best[(scope, uid)]
+            yield {"scope": scope, "uid": uid, "op": "delete"}
+            continue
+        score = min(max_score, max(0, round(rng.gauss(max_score * 0.55, max_score * 0.2))))
+        if score <= best.get((scope, uid), -1):
+            continue
+        best[(scope, uid)] = score
+        yield {
+            "scope": scope,
+            "uid": uid,
+            "score": score,
+            "updatedAt": now,
+            "displayName": f"Player {uid[-4:]}",
+            "isAnonymous": step % 3 == 0,
+        }
+
+
+def bench(args: argparse.Namespace) -> dict[str, Any]:
+    rng = random.Random(args.seed)
+    scopes = [
+        f"{category}_{difficulty}"
+        for category in ("flag", "capital", "logo", "mixed")
+        for difficulty in ("easy", "intermediate", "expert")
+    ]
+    events = list(
+        synthetic_stream(rng, scopes, args.users, args.submissions, args.max_score, args.delete_share)
+    )
+
+    source = MemorySource()
+    job = SnapshotJob(source, args.top, args.reserve)
+    job_seconds = 0.0
+    for event in events:
+        scope = str(event["scope"])
+        if event.get("op") == "delete":
+            source.delete_entry(scope, str(event["uid"]))
+            started = time.perf_counter()
+            job.apply(scope, None, str(event["uid"]))
+        else:
+            row = row_from_json(event)
+            source.put_entry(scope, row)
+            started = time.perf_counter()
+            job.apply(scope, row)
+        job_seconds += time.perf_counter() - started
+
+    # Rebuilding from scratch must give the same documents.
+    mismatches = [
+        scope
+        for scope in source.scopes()
+        if job.published.get(scope, []) != heapq.nsmallest(
+            args.top, source.entries[scope].values(), key=lambda row: row.key
+        )
+    ]
+    entries = sum(len(rows) for rows in source.entries.values())
+    # Views follow submission traffic, so weight each scope's page size by it.
+    traffic: dict[str, int] = {}
+    for event in events:
+        traffic[event["scope"]] = traffic.get(event["scope"], 0) + 1
+    current_reads = sum(
+        count * min(args.top, len(source.entries.get(scope, {}))) for scope, count in traffic.items()
+    ) / max(1, len(events))
+    document_bytes = max(
+        len(json.dumps(document, separators=(",", ":"))) for document in source.documents.values()
+    )
+    views = round(len(events) * args.views_per_submission)
+    return {
+        "scopes": len(source.entries),
+        "entries": entries,
+        "events": len(events),
+        "deletions": sum(1 for event in events if event.get("op") == "delete"),
+        "current_reads_per_view": round(current_reads, 1),
+        "snapshot_reads_per_view": 1,
+        "snapshot_writes": job.snapshot_writes,
+        "snapshot_writes_per_event": round(job.snapshot_writes / max(1, len(events)), 4),
+        "refills": job.refills,
+        "refill_reads": source.reads,
+        "update_us_per_event": round(job_seconds / max(1, len(events)) * 1e6, 2),
+        "max_document_bytes": document_bytes,
+        "views": views,
+        "current_view_reads": round(current_reads * views),
+        "snapshot_total_ops": views + job.snapshot_writes + source.reads,
+        "mismatched_scopes": mismatches,
+    }
+
+
+def render_summary_markdown(result: dict[str, Any], top: int, reserve: int) -> str:
+    saved = 1 - result["snapshot_total_ops"] / max(1, result["current_view_reads"])
+    lines = [
+        "## Leaderboard Snapshot Job",
+        "",
+        f"- Stream: **{result['events']:,}** projections ({result['deletions']} deletions) over "
+        f"{result['scopes']} scopes, {result['entries']:,} entries; top {top} + {reserve} reserve",
+        f"- Reads per view: **{result['current_reads_per_view']}** now -> **1** with snapshots",
+        f"- Snapshot writes per projection: **{result['snapshot_writes_per_event']}** "
+        f"({result['snapshot_writes']:,} writes); refills: {result['refills']} ({result['refill_reads']:,} reads)",
+        f"- Job cost: **{result['update_us_per_event']} us** per projection; largest document "
+        f"{result['max_document_bytes']:,} bytes",
+        f"- {result['views']:,} views: {result['current_view_reads']:,} reads now vs "
+        f"{result['snapshot_total_ops']:,} reads+writes with snapshots ({saved:.1%} fewer operations)",
+        f"- Scopes differing from a full rebuild: **{len(result['mismatched_scopes'])}**",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+# -----------------
+# CLI
+# -----------------
+def open_source(args: argparse.Namespace) -> MemorySource | StandInSource:
+    if args.standin:
+        return StandInSource(args.standin, args.project)
+    if args.export is None:
+        return MemorySource()
+    return load_memory_source(args.export)
+
+
+def write_documents(args: argparse.Namespace, source: MemorySource | StandInSource, job: SnapshotJob) -> None:
+    status_stream = sys.stdout
+    if isinstance(source, MemorySource):
+        payload = json.dumps(source.documents, indent=2, sort_keys=True)
+        if args.output:
+            args.output.write_text(payload + "\n", encoding="utf-8")
+        elif not args.quiet:
+            print(payload)
+            status_stream = sys.stderr
+    print(
+        f"{len(job.published)} scope(s): {job.events} event(s), {job.snapshot_writes} snapshot write(s), "
+        f"{job.refills} refill(s), {source.reads} entry read(s).",
+        file=status_stream,
+    )
+
+
+def add_source_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--export", type=Path, help="Entries export (JSON array or JSONL).")
+    parser.add_argument("--standin", help="Firestore stand-in URL, e.g. http://127.0.0.1:8080.")
+    parser.add_argument("--project", default=DEFAULT_PROJECT)
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+    parser.add_argument("--reserve", type=int, default=DEFAULT_RESERVE)
+    parser.add_argument("--output", type=Path, help="Write snapshot documents as JSON here (export mode).")
+    parser.add_argument("--quiet", action="store_true", help="Do not print documents.")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Maintain per-scope top-N leaderboard snapshot documents.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = sub.add_parser("build", help="Compute every scope's snapshot from scratch.")
+    add_source_arguments(build_parser)
+
+    stream_parser = sub.add_parser("stream", help="Apply a JSONL stream of best-score projections.")
+    stream_parser.add_argument("events", type=Path, help="Projection events (JSONL, `-` for stdin).")
+    add_source_arguments(stream_parser)
+    stream_parser.add_argument(
+        "--write-entries",
+        action="store_true",
+        help="Also write each projection to the entries collection (simulates the backend).",
+    )
+
+    bench_parser = sub.add_parser("bench", help="Reads per view and update cost on a synthetic stream.")
+    bench_parser.add_argument("--users", type=int, default=50_000)
+    bench_parser.add_argument("--submissions", type=int, default=200_000)
+    bench_parser.add_argument("--max-score", type=int, default=50)
+    bench_parser.add_argument("--delete-share", type=float, default=0.001)
+    bench_parser.add_argument("--views-per-submission", type=float, default=3.0)
+    bench_parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+    bench_parser.add_argument("--reserve", type=int, default=DEFAULT_RESERVE)
+    bench_parser.add_argument("--seed", type=int, default=23)
+    bench_parser.add_argument("--summary-file", type=Path)
+    bench_parser.add_argument("--json-file", type=Path)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    if args.command == "bench":
+        result = bench(args)
+        summary = render_summary_markdown(result, args.top, args.reserve)
+        print(summary, end="")
+        if args.summary_file:
+            args.summary_file.parent.mkdir(parents=True, exist_ok=True)
+            with args.summary_file.open("a", encoding="utf-8") as handle:
+                handle.write(summary)
+        if args.json_file:
+            args.json_file.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        return 1 if result["mismatched_scopes"] else 0
+
+    if args.export and not args.export.exists():
+        print(f"ERROR: export not found: {args.export}")
+        return 2
+    if args.export and args.standin:
+        print("ERROR: use either --export or --standin, not both.")
+        return 2
+    source = open_source(args)
+    job = SnapshotJob(source, args.top, args.reserve)
+    if args.command == "build":
+        job.build_all()
+    else:
+        if str(args.events) != "-" and not args.events.exists():
+            print(f"ERROR: events not found: {args.events}")
+            return 2
+        apply_events(job, read_rows(args.events), args.write_entries or isinstance(source, MemorySource))
+    write_documents(args, source, job)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""MinHash signatures and LSH banding shared by the near-duplicate tools.
+
+`crash_clusterer.py` (stack traces) and `check_flag_description_coverage.py`
+(description text) both estimate Jaccard similarity between token sets and
+look up candidates by banding signatures. Two signature schemes are offered
+because the inputs differ in size:
+
+- `MinHasher`: `num_perm` independent hashes per token. Accurate on the
+  small sets a stack trace gives (a few dozen frames), cost tokens x perms.
+- `one_permutation_signature`: every token is hashed once into one of
+  `bins` bins, with densification for empty bins. Linear in the token
+  count, so it stays fast on 100k descriptions with ~100 shingles each.
+
+Signatures from either scheme go through the same `lsh_shape`, `band_keys`,
+and `similarity`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+from array import array
+from typing import Sequence
+
+
+MERSENNE_61 = (1 << 61) - 1
+EMPTY_BIN = (1 << 64) - 1
+DENSIFY_OFFSET = 1 << 58
+
+
+def token_hash(token: str) -> int:
+    """Stable 64-bit hash; builtin `hash` is salted per process."""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class MinHasher:
+    """`num_perm` universal hashes `(a*x + b) mod (2^61 - 1)` over 64-bit token hashes."""
+
+    def __init__(self, num_perm: int, seed: int) -> None:
+        rng = random.Random(seed)
+        self.params = [
+            (rng.randrange(1, MERSENNE_61), rng.randrange(0, MERSENNE_61)) for _ in range(num_perm)
+        ]
+
+    def signature(self, tokens: set[str]) -> array:
+        hashes = [token_hash(token) for token in tokens]
+        return array("Q", (min((a * h + b) % MERSENNE_61 for h in hashes) for a, b in self.params))
+
+
+def one_permutation_signature(
+    tokens: set[str],
+    bins: int,
+    hash_cache: dict[str, int] | None = None,
+) -> tuple[int, ...]:
+    """One-permutation MinHash with rotation densification.
+
+    Each token is hashed once and kept as the minimum of its bin. Empty bins
+    borrow the next filled bin's value (offset by distance) so that short
+    inputs still produce comparable signatures. `hash_cache` lets callers
+    that see the same tokens repeatedly skip rehashing them.
+    """
+    values = [EMPTY_BIN] * bins
+    for token in tokens:
+        value = hash_cache.get(token) if hash_cache is not None else None
+        if value is None:
+            value = token_hash(token)
+            if hash_cache is not None:
+                hash_cache[token] = value
+        slot, rank = value % bins, value // bins
+        if rank < values[slot]:
+            values[slot] = rank
+    if EMPTY_BIN in values and len(set(values)) > 1:
+        filled = values[:]
+        for slot, rank in enumerate(filled):
+            if rank != EMPTY_BIN:
+                continue
+            for distance in range(1, bins):
+                borrowed = filled[(slot + distance) % bins]
+                if borrowed != EMPTY_BIN:
+                    values[slot] = borrowed + distance * DENSIFY_OFFSET
+                    break
+    return tuple(values)
+
+
+def lsh_shape(num_perm: int, threshold: float) -> tuple[int, int]:
+    """`(bands, rows)` whose S-curve midpoint `(1/b)^(1/r)` is closest to, and not above, `threshold`.
+
+    `bands` is `num_perm // rows`; when `rows` does not divide `num_perm`
+    the trailing signature values are not banded.
+    """
+    shapes = [(num_perm // rows, rows) for rows in range(1, num_perm + 1)]
+    below = [shape for shape in shapes if (1 / shape[0]) ** (1 / shape[1]) <= threshold]
+    return max(below or shapes[:1], key=lambda shape: (1 / shape[0]) ** (1 / shape[1]))
+
+
+def band_keys(signature: Sequence[int], bands: int, rows: int) -> list[tuple[int, int]]:
+    """One bucket key per band; equal keys make two signatures LSH candidates."""
+    return [
+        (band, hash(tuple(signature[band * rows : (band + 1) * rows])))
+        for band in range(bands)
+    ]
+
+
+def similarity(left: Sequence[int], right: Sequence[int]) -> float:
+    """Estimated Jaccard similarity: the share of equal signature values."""
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""Minimal stdlib PNG decode / resize / encode for the asset generators.
+
+The image tools under tools/ run where Pillow is not installed (CI images,
+the release preflight), so this covers exactly what they need:
+
+- decode non-interlaced PNGs of any color type at bit depth 8 or 16
+  (palette and `tRNS` transparency included) into 8-bit RGBA
+- resize with a separable box/triangle filter in premultiplied alpha, so
+  downscaled edges do not pick up dark fringes from transparent pixels
+- encode 8-bit RGBA (or RGB for targets that reject alpha) with a per-row
+  filter heuristic and deterministic zlib settings, so identical pixels
+  always give identical bytes
+- flatten onto a background color and compare rasters, for verifying
+  checked-in outputs against a fresh render
+
+Inputs this module cannot read raise `ValueError` with the reason.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+import zlib
+from dataclasses import dataclass
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+# Bump when resampling output changes so cached variants are rebuilt.
+RESAMPLER_VERSION = "box-premultiplied-v1"
+
+
+@dataclass
+class Raster:
+    width: int
+    height: int
+    rgba: bytearray
+
+    def pixel(self, x: int, y: int) -> tuple[int, int, int, int]:
+        offset = (y * self.width + x) * 4
+        return tuple(self.rgba[offset : offset + 4])  # type: ignore[return-value]
+
+
+def png_size(data: bytes) -> tuple[int, int]:
+    """`(width, height)` from the IHDR chunk without decoding pixels."""
+    if not data.startswith(PNG_SIGNATURE) or data[12:16] != b"IHDR":
+        raise ValueError("not a PNG file")
+    return struct.unpack(">II", data[16:24])
+
+
+def _chunks(data: bytes):
+    offset = len(PNG_SIGNATURE)
+    while offset + 8 <= len(data):
+        length, kind = struct.unpack(">I4s", data[offset : offset + 8])
+        payload = data[offset + 8 : offset + 8 + length]
+        offset += 12 + length
+        yield kind, payload
+        if kind == b"IEND":
+            return
+
+
+def _unfilter(raw: bytes, height: int, stride: int, bpp: int) -> bytearray:
+    out = bytearray(height * stride)
+    previous = bytearray(stride)
+    position = 0
+    for y in range(height):
+        kind = raw[position]
+        line = bytearray(raw[position + 1 : position + 1 + stride])
+        position += 1 + stride
+        if kind == 1:
+            for i in range(bpp, stride):
+                line[i] = (line[i] + line[i - bpp]) & 0xFF
+        elif kind == 2:
+            line = bytearray((a + b) & 0xFF for a, b in zip(line, previous))
+        elif kind == 3:
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + ((left + previous[i]) >> 1)) & 0xFF
+        elif kind == 4:
+            for i in range(stride):
+                a = line[i - bpp] if i >= bpp else 0
+                b = previous[i]
+                c = previous[i - bpp] if i >= bpp else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                predictor = a if pa <= pb and pa <= pc else (b if pb <= pc else c)
+                line[i] = (line[i] + predictor) & 0xFF
+        elif kind != 0:
+            raise ValueError(f"unknown PNG filter type {kind}")
+        out[y * stride : (y + 1) * stride] = line
+        previous = line
+    return out
+
+
+def decode(data: bytes) -> Raster:
+    width, height = png_size(data)
+    bit_depth, color_type, _, _, interlace = data[24:29]
+    if interlace:
+        raise ValueError("interlaced PNGs are not supported")
+    if color_type not in CHANNELS:
+        raise ValueError(f"unsupported PNG color type {color_type}")
+    if bit_depth not in (8, 16) and not (color_type == 3 and bit_depth in (1, 2, 4)):
+        raise ValueError(f"unsupported PNG bit depth {bit_depth} for color type {color_type}")
+
+    palette = b""
+    transparency = b""
+    idat = bytearray()
+    for kind, payload in _chunks(data):
+        if kind == b"PLTE":
+            palette = payload
+        elif kind == b"tRNS":
+            transparency = payload
+        elif kind == b"IDAT":
+            idat += payload
+
+    channels = CHANNELS[color_type]
+    bits_per_pixel = channels * bit_depth
+    stride = (width * bits_per_pixel + 7) // 8
+    pixels = _unfilter(zlib.decompress(bytes(idat)), height, stride, max(1, bits_per_pixel // 8))
+
+    if bit_depth == 16:
+        pixels = pixels[0::2]  # keep the high byte of each sample
+    elif bit_depth < 8:
+        per_byte = 8 // bit_depth
+        mask = (1 << bit_depth) - 1
+        unpacked = bytearray()
+        for y in range(height):
+            row = pixels[y * stride : (y + 1) * stride]
+            values = [
+                (byte >> (8 - bit_depth * (k + 1))) & mask for byte in row for k in range(per_byte)
+            ]
+            unpacked += bytes(values[:width])
+        pixels = unpacked
+
+    count = width * height
+    rgba = bytearray(count * 4)
+    if color_type == 6:
+        rgba[:] = pixels
+    elif color_type == 2:
+        rgba[0::4], rgba[1::4], rgba[2::4] = pixels[0::3], pixels[1::3], pixels[2::3]
+        rgba[3::4] = b"\xff" * count
+        if len(transparency) == 6:
+            key = bytes(transparency[i] for i in (1, 3, 5))
+            for i in range(count):
+                if pixels[i * 3 : i * 3 + 3] == key:
+                    rgba[i * 4 + 3] = 0
+    elif color_type == 0:
+        rgba[0::4] = rgba[1::4] = rgba[2::4] = pixels
+        rgba[3::4] = b"\xff" * count
+        if len(transparency) == 2:
+            key = transparency[1]
+            for i in range(count):
+                if pixels[i] == key:
+                    rgba[i * 4 + 3] = 0
+    elif color_type == 4:
+        rgba[0::4] = rgba[1::4] = rgba[2::4] = pixels[0::2]
+        rgba[3::4] = pixels[1::2]
+    else:
+        if not palette:
+            raise ValueError("palette PNG without PLTE chunk")
+        alpha = transparency + b"\xff" * (256 - len(transparency))
+        lookup = [palette[i * 3 : i * 3 + 3] + alpha[i : i + 1] for i in range(len(palette) // 3)]
+        rgba = bytearray(b"".join(lookup[index] for index in pixels))
+    return Raster(width, height, rgba)
+
+
+def _weights(source: int, target: int) -> list[list[tuple[int, float]]]:
+    """Per output index, `(input_index, weight)` taps summing to 1."""
+    scale = source / target
+    support = max(1.0, scale)  # box for downscale, triangle for upscale
+    taps = []
+    for out in range(target):
+        center = (out + 0.5) * scale
+        start = max(0, int(math.floor(center - support)))
+        stop = min(source, int(math.ceil(center + support)))
+        row = []
+        for index in range(start, stop):
+            distance = abs(index + 0.5 - center) / support
+            weight = max(0.0, 1.0 - distance) if scale < 1 else _box_overlap(index, center, scale)
+            if weight > 0:
+                row.append((index, weight))
+        total = sum(weight for _, weight in row) or 1.0
+        taps.append([(index, weight / total) for index, weight in row])
+    return taps
+
+
+def _box_overlap(index: int, center: float, scale: float) -> float:
+    left, right = center - scale / 2, center + scale / 2
+    return max(0.0, min(index + 1, right) - max(index, left))
+
+
+def premultiply(image: Raster) -> list[float]:
+    """Float RGBA with color scaled by alpha; reusable across `resize` calls."""
+    src = image.rgba
+    premultiplied = [0.0] * (image.width * image.height * 4)
+    for i in range(image.width * image.height):
+        alpha = src[i * 4 + 3] / 255.0
+        premultiplied[i * 4] = src[i * 4] * alpha
+        premultiplied[i * 4 + 1] = src[i * 4 + 1] * alpha
+        premultiplied[i * 4 + 2] = src[i * 4 + 2] * alpha
+        premultiplied[i * 4 + 3] = float(src[i * 4 + 3])
+    return premultiplied
+
+
+def resize(image: Raster, width: int, height: int, premultiplied: list[float] | None = None) -> Raster:
+    if (width, height) == (image.width, image.height):
+        return Raster(width, height, bytearray(image.rgba))
+    # Premultiply so transparent pixels do not bleed their color.
+    if premultiplied is None:
+        premultiplied = premultiply(image)
+
+    columns = _weights(image.width, width)
+    horizontal = [0.0] * (width * image.height * 4)
+    for y in range(image.height):
+        row_base = y * image.width * 4
+        out_base = y * width * 4
+        for x, taps in enumerate(columns):
+            r = g = b = a = 0.0
+            for index, weight in taps:
+                offset = row_base + index * 4
+                r += premultiplied[offset] * weight
+                g += premultiplied[offset + 1] * weight
+                b += premultiplied[offset + 2] * weight
+                a += premultiplied[offset + 3] * weight
+            offset = out_base + x * 4
+            horizontal[offset : offset + 4] = (r, g, b, a)
+
+    rows = _weights(image.height, height)
+    out = bytearray(width * height * 4)
+    stride = width * 4
+    for y, taps in enumerate(rows):
+        for x in range(width):
+            r = g = b = a = 0.0
+            for index, weight in taps:
+                offset = index * stride + x * 4
+                r += horizontal[offset] * weight
+                g += horizontal[offset + 1] * weight
+                b += horizontal[offset + 2] * weight
+                a += horizontal[offset + 3] * weight
+            offset = y * stride + x * 4
+            if a > 0.5:
+                scale = 255.0 / a
+                out[offset] = min(255, int(r * scale + 0.5))
+                out[offset + 1] = min(255, int(g * scale + 0.5))
+                out[offset + 2] = min(255, int(b * scale + 0.5))
+                out[offset + 3] = min(255, int(a + 0.5))
+    return Raster(width, height, out)
+
+
+def solid(width: int, height: int, rgba: tuple[int, int, int, int]) -> Raster:
+    return Raster(width, height, bytearray(bytes(rgba) * (width * height)))
+
+
+def flatten(image: Raster, background: tuple[int, int, int]) -> Raster:
+    """Composites onto an opaque background (for targets that reject alpha)."""
+    out = bytearray(image.rgba)
+    for i in range(0, len(out), 4):
+        alpha = out[i + 3]
+        if alpha != 255:
+            for channel in range(3):
+                out[i + channel] = (out[i + channel] * alpha + background[channel] * (255 - alpha) + 127) // 255
+            out[i + 3] = 255
+    return Raster(image.width, image.height, out)
+
+
+def mean_abs_diff(left: Raster, right: Raster) -> float:
+    """Mean per-channel absolute difference (0-255); `inf` if sizes differ."""
+    if (left.width, left.height) != (right.width, right.height):
+        return math.inf
+    total = sum(abs(a - b) for a, b in zip(left.rgba, right.rgba))
+    return total / max(1, len(left.rgba))
+
+
+def _filter_cost(line: bytes) -> int:
+    return sum(value if value < 128 else 256 - value for value in line)
+
+
+def encode(image: Raster, level: int = 9, alpha: bool = True) -> bytes:
+    """8-bit RGBA PNG, or RGB when `alpha=False` (alpha is dropped, not blended)."""
+    channels = 4 if alpha else 3
+    pixels = image.rgba
+    if not alpha:
+        pixels = bytearray(image.width * image.height * 3)
+        pixels[0::3], pixels[1::3], pixels[2::3] = image.rgba[0::4], image.rgba[1::4], image.rgba[2::4]
+    stride = image.width * channels
+    previous = bytes(stride)
+    raw = bytearray()
+    for y in range(image.height):
+        line = bytes(pixels[y * stride : (y + 1) * stride])
+        sub = bytes((line[i] - (line[i - channels] if i >= channels else 0)) & 0xFF for i in range(stride))
+        up = bytes((a - b) & 0xFF for a, b in zip(line, previous))
+        kind, best = min(((0, line), (1, sub), (2, up)), key=lambda item: _filter_cost(item[1]))
+        raw.append(kind)
+        raw += best
+        previous = line
+
+    def chunk(kind: bytes, payload: bytes) -> bytes:
+        return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload))
+
+    return b"".join(
+        (
+            PNG_SIGNATURE,
+            chunk(b"IHDR", struct.pack(">IIBBBBB", image.width, image.height, 8, 6 if alpha else 2, 0, 0, 0)),
+            chunk(b"IDAT", zlib.compress(bytes(raw), level)),
+            chunk(b"IEND", b""),
+        )
+    )
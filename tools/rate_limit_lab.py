@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""Benchmark lab for `submitScore` rate-limit strategies.
+
+`isRateLimited` in `functions/index.cjs` enforces 20 attempts per user per
+10 minutes with a range query over `users/{uid}/attempts` before every
+submit, billing up to 20 reads. This lab replays submission traces against
+that approach and alternatives, each running on the in-memory store from
+`firestore_sim.py` so reads, writes, and transaction contention are counted:
+
+- `sliding_query`: the current query over attempts, outside the transaction.
+- `token_bucket`: one `users/{uid}/limits/submit` doc holding tokens that
+  refill at 20 per 10 minutes, updated in the submit transaction.
+- `fixed_window`: one counter doc per user per aligned 10-minute window.
+- `sliding_log`: one doc holding the accepted timestamps still inside the
+  window, compacted on every accept.
+
+Every decision is graded against the contract: a submit at `t` may be
+accepted iff fewer than 20 of the strategy's own previously accepted attempts
+have `createdAt >= t - 10min`. Submits that land in the same tick run
+concurrently (asyncio, as in `submit_score_simulator.py`) and are graded as
+a group, so races show up as false accepts rather than ordering noise.
+
+Costs exclude the attempt document itself, which every strategy writes.
+
+Subcommands:
+- `bench`: run every strategy over the synthetic traces (or `--trace-file`).
+- `trace`: write a synthetic trace as JSONL (`{"t": ms, "uid": ...}`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable
+
+from firestore_sim import DocumentStore, Transaction, TransactionConflict
+from submit_score_simulator import (
+    DEFAULT_READ_PRICE,
+    DEFAULT_WRITE_PRICE,
+    RATE_LIMIT_ATTEMPTS,
+    RATE_LIMIT_WINDOW_MS,
+)
+
+
+TRACE_NAMES = ("steady", "grinders", "bursts", "boundary", "mixed")
+DEFAULT_TICK_MS = 250.0
+
+
+@dataclass(frozen=True)
+class Limit:
+    attempts: int = RATE_LIMIT_ATTEMPTS
+    window_ms: float = RATE_LIMIT_WINDOW_MS
+
+    @property
+    def refill_per_ms(self) -> float:
+        return self.attempts / self.window_ms
+
+
+# -----------------
+# Strategies
+# -----------------
+# Each strategy decides one submit and, when it accepts, writes the attempt
+# document in its transaction, like `submitScore`. The duplicate check on the
+# attempt document is left out: it costs the same read for every strategy.
+async def _yield() -> None:
+    # Lets concurrent submits interleave between store round trips.
+    await asyncio.sleep(0)
+
+
+def attempt_path(uid: str, attempt_id: str) -> str:
+    return f"users/{uid}/attempts/{attempt_id}"
+
+
+def limit_path(uid: str, name: str = "submit") -> str:
+    return f"users/{uid}/limits/{name}"
+
+
+async def sliding_query(store: DocumentStore, limit: Limit, uid: str, attempt_id: str) -> bool:
+    now = store.now_ms()
+    await _yield()
+    recent = store.query(
+        f"users/{uid}/attempts",
+        where=[("createdAt", ">=", now - limit.window_ms)],
+        limit=limit.attempts,
+    )
+    if len(recent) >= limit.attempts:
+        return False
+
+    async def body(tx: Transaction) -> bool:
+        await _yield()
+        tx.set(attempt_path(uid, attempt_id), {"createdAt": now})
+        return True
+
+    return await store.run_transaction(body)
+
+
+async def token_bucket(store: DocumentStore, limit: Limit, uid: str, attempt_id: str) -> bool:
+    now = store.now_ms()
+
+    async def body(tx: Transaction) -> bool:
+        await _yield()
+        snapshot = tx.get(limit_path(uid))
+        await _yield()
+        if snapshot:
+            elapsed = max(0.0, now - snapshot.data["refilledAt"])
+            tokens = min(limit.attempts, snapshot.data["tokens"] + elapsed * limit.refill_per_ms)
+        else:
+            tokens = float(limit.attempts)
+        if tokens < 1:
+            return False
+        tx.set(limit_path(uid), {"tokens": tokens - 1, "refilledAt": now})
+        tx.set(attempt_path(uid, attempt_id), {"createdAt": now})
+        return True
+
+    return await store.run_transaction(body)
+
+
+async def fixed_window(store: DocumentStore, limit: Limit, uid: str, attempt_id: str) -> bool:
+    now = store.now_ms()
+    path = limit_path(uid, f"window_{int(now // limit.window_ms)}")
+
+    async def body(tx: Transaction) -> bool:
+        await _yield()
+        snapshot = tx.get(path)
+        await _yield()
+        count = snapshot.data["count"] if snapshot else 0
+        if count >= limit.attempts:
+            return False
+        tx.set(path, {"count": count + 1})
+        tx.set(attempt_path(uid, attempt_id), {"createdAt": now})
+        return True
+
+    return await store.run_transaction(body)
+
+
+async def sliding_log(store: DocumentStore, limit: Limit, uid: str, attempt_id: str) -> bool:
+    now = store.now_ms()
+
+    async def body(tx: Transaction) -> bool:
+        await _yield()
+        snapshot = tx.get(limit_path(uid))
+        await _yield()
+        cutoff = now - limit.window_ms
+        log = [t for t in (snapshot.data["log"] if snapshot else []) if t >= cutoff]
+        if len(log) >= limit.attempts:
+            return False
+        tx.set(limit_path(uid), {"log": log + [now]})
+        tx.set(attempt_path(uid, attempt_id), {"createdAt": now})
+        return True
+
+    return await store.run_transaction(body)
+
+
+Strategy = Callable[[DocumentStore, Limit, str, str], Awaitable[bool]]
+
+STRATEGIES: dict[str, Strategy] = {
+    "sliding_query": sliding_query,
+    "token_bucket": token_bucket,
+    "fixed_window": fixed_window,
+    "sliding_log": sliding_log,
+}
+
+
+# -----------------
+# Traces
+# -----------------
+@dataclass
+class TraceConfig:
+    users: int = 500
+    minutes: float = 60.0
+    grinder_share: float = 0.05
+    burst_share: float = 0.05
+    seed: int = 11
+
+
+def _steady(rng: random.Random, uid: str, horizon: float, events: list[tuple[float, str]]) -> None:
+    # A quiz every few minutes; stays well under the limit.
+    t = rng.uniform(0, horizon * 0.2)
+    while t < horizon:
+        events.append((t, uid))
+        t += rng.uniform(60_000, 150_000) + rng.expovariate(1 / 180_000)
+
+
+def _grinder(rng: random.Random, uid: str, horizon: float, events: list[tuple[float, str]]) -> None:
+    # Back-to-back short quizzes, 15-40s apart; sits on the limit for hours.
+    t = rng.uniform(0, horizon * 0.1)
+    while t < horizon:
+        events.append((t, uid))
+        t += rng.uniform(15_000, 40_000)
+
+
+def _bursts(rng: random.Random, uid: str, horizon: float, events: list[tuple[float, str]]) -> None:
+    # Offline queue flushes and double-tap retries: 5-40 submits within a
+    # couple of seconds, several landing in the same tick.
+    t = rng.uniform(0, horizon * 0.3)
+    while t < horizon:
+        for _ in range(rng.randint(5, 40)):
+            events.append((t + rng.uniform(0, 2_000), uid))
+        t += rng.uniform(5 * 60_000, 25 * 60_000)
+
+
+def _boundary(rng: random.Random, uid: str, horizon: float, limit: Limit, events: list[tuple[float, str]]) -> None:
+    # Adversarial: a full quota just before an aligned window edge, another
+    # just after, then a steady drip that probes refill behaviour.
+    edge = limit.window_ms * rng.randint(1, max(1, int(horizon // limit.window_ms) - 1))
+    for _ in range(limit.attempts):
+        events.append((edge - rng.uniform(1_000, 20_000), uid))
+    for _ in range(limit.attempts):
+        events.append((edge + rng.uniform(1_000, 20_000), uid))
+    t = edge + 30_000
+    while t < min(horizon, edge + 3 * limit.window_ms):
+        events.append((t, uid))
+        t += rng.uniform(10_000, 60_000)
+
+
+def generate_trace(name: str, config: TraceConfig, limit: Limit) -> list[tuple[float, str]]:
+    """Builds `(time_ms, uid)` submits sorted by time for one trace profile."""
+    rng = random.Random(f"{config.seed}:{name}")
+    horizon = config.minutes * 60_000
+    events: list[tuple[float, str]] = []
+    for index in range(config.users):
+        uid = f"user{index:07d}"
+        if name == "steady":
+            _steady(rng, uid, horizon, events)
+        elif name == "grinders":
+            _grinder(rng, uid, horizon, events)
+        elif name == "bursts":
+            _bursts(rng, uid, horizon, events)
+        elif name == "boundary":
+            _boundary(rng, uid, horizon, limit, events)
+        else:
+            roll = rng.random()
+            if roll < config.grinder_share:
+                _grinder(rng, uid, horizon, events)
+            elif roll < config.grinder_share + config.burst_share:
+                _bursts(rng, uid, horizon, events)
+            else:
+                _steady(rng, uid, horizon, events)
+    events.sort()
+    return events
+
+
+def read_trace(path: Path) -> list[tuple[float, str]]:
+    """Reads a JSONL trace of `{"t": ms, "uid": ...}` (`-` for stdin)."""
+    handle = sys.stdin if str(path) == "-" else path.open(encoding="utf-8")
+    try:
+        events = [
+            (float(row["t"]), str(row["uid"]))
+            for row in (json.loads(line) for line in handle if line.strip())
+        ]
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+    events.sort()
+    return events
+
+
+# -----------------
+# Replay + grading
+# -----------------
+@dataclass
+class StrategyResult:
+    strategy: str
+    submits: int = 0
+    accepted: int = 0
+    allowed: int = 0
+    false_accepts: int = 0
+    false_rejects: int = 0
+    reads: int = 0
+    writes: int = 0
+    queries: int = 0
+    contention_retries: int = 0
+    aborted: int = 0
+    limiter_docs: int = 0
+    elapsed_s: float = 0.0
+
+    def rates(self, read_price: float, write_price: float) -> dict[str, Any]:
+        submits = max(1, self.submits)
+        reads = self.reads / submits
+        writes = self.writes / submits
+        return {
+            **asdict(self),
+            "reads_per_submit": round(reads, 3),
+            "writes_per_submit": round(writes, 3),
+            "cost_per_million_submits_usd": round(
+                (reads * read_price + writes * write_price) * 10, 2
+            ),
+            "false_accept_rate": round(self.false_accepts / submits, 5),
+            "false_reject_rate": round(self.false_rejects / submits, 5),
+            "aborted_rate": round(self.aborted / submits, 5),
+            "contention_per_submit": round(self.contention_retries / submits, 4),
+        }
+
+
+async def _decide(strategy: Strategy, store: DocumentStore, limit: Limit, uid: str, attempt_id: str) -> bool | None:
+    try:
+        return await strategy(store, limit, uid, attempt_id)
+    except TransactionConflict:
+        return None
+
+
+async def replay(
+    name: str,
+    events: list[tuple[float, str]],
+    limit: Limit,
+    tick_ms: float,
+) -> StrategyResult:
+    strategy = STRATEGIES[name]
+    clock = {"now": 0.0}
+    store = DocumentStore(clock=lambda: clock["now"])
+    result = StrategyResult(name, submits=len(events))
+    accepted: dict[str, deque[float]] = defaultdict(deque)
+    started = time.perf_counter()
+
+    index = 0
+    while index < len(events):
+        window_end = events[index][0] + tick_ms
+        batch: list[str] = []
+        while index < len(events) and events[index][0] < window_end:
+            batch.append(events[index][1])
+            index += 1
+        now = clock["now"] = events[index - len(batch)][0]
+        decisions = await asyncio.gather(
+            *(
+                _decide(strategy, store, limit, uid, f"a{index - len(batch) + offset}")
+                for offset, uid in enumerate(batch)
+            )
+        )
+
+        per_user: dict[str, list[bool | None]] = defaultdict(list)
+        for uid, decision in zip(batch, decisions):
+            per_user[uid].append(decision)
+        for uid, user_decisions in per_user.items():
+            history = accepted[uid]
+            while history and history[0] < now - limit.window_ms:
+                history.popleft()
+            capacity = max(0, limit.attempts - len(history))
+            allowed = min(len(user_decisions), capacity)
+            taken = sum(1 for decision in user_decisions if decision)
+            refused = sum(1 for decision in user_decisions if decision is False)
+            result.aborted += len(user_decisions) - taken - refused
+            result.allowed += allowed
+            result.accepted += taken
+            result.false_accepts += max(0, taken - allowed)
+            # Aborted transactions surface as errors, not `rate_limited`.
+            result.false_rejects += min(refused, max(0, allowed - taken))
+            history.extend([now] * taken)
+
+    result.elapsed_s = round(time.perf_counter() - started, 3)
+    counters = store.counters
+    result.reads = counters.reads
+    # Attempt documents are written by every strategy; bill only the limiter.
+    result.writes = counters.writes - result.accepted
+    result.queries = counters.queries
+    result.contention_retries = counters.contention_retries
+    result.limiter_docs = sum(
+        len(list(store.iter_collection(collection)))
+        for collection in store.collections()
+        if collection.endswith("/limits")
+    )
+    return result
+
+
+def recommend(results: list[dict[str, Any]], max_false_accept: float, max_false_reject: float) -> str | None:
+    """Cheapest strategy whose error rates stay within bounds on every trace."""
+    worst: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for row in results:
+        stats = worst[row["strategy"]]
+        stats["false_accept_rate"] = max(stats["false_accept_rate"], row["false_accept_rate"])
+        stats["false_reject_rate"] = max(stats["false_reject_rate"], row["false_reject_rate"])
+        stats["cost"] += row["cost_per_million_submits_usd"] * row["submits"]
+    eligible = [
+        (stats["cost"], name)
+        for name, stats in worst.items()
+        if stats["false_accept_rate"] <= max_false_accept
+        and stats["false_reject_rate"] <= max_false_reject
+    ]
+    return min(eligible)[1] if eligible else None
+
+
+def bench(args: argparse.Namespace) -> dict[str, Any]:
+    limit = Limit(args.attempts, args.window_minutes * 60_000)
+    config = TraceConfig(
+        users=args.users,
+        minutes=args.minutes,
+        grinder_share=args.grinder_share,
+        burst_share=args.burst_share,
+        seed=args.seed,
+    )
+    if args.trace_file:
+        traces = {args.trace_file.name: read_trace(args.trace_file)}
+    else:
+        traces = {name: generate_trace(name, config, limit) for name in args.traces}
+
+    rows: list[dict[str, Any]] = []
+    for trace, events in traces.items():
+        for name in args.strategies:
+            outcome = asyncio.run(replay(name, events, limit, args.tick_ms))
+            rows.append(
+                {"trace": trace, **outcome.rates(args.read_price, args.write_price)}
+            )
+            if not args.quiet:
+                row = rows[-1]
+                print(
+                    f"{trace:>10} {name:<14} reads={row['reads_per_submit']:.2f} "
+                    f"writes={row['writes_per_submit']:.2f} "
+                    f"false_accept={row['false_accept_rate']:.3%} "
+                    f"false_reject={row['false_reject_rate']:.3%} "
+                    f"aborted={row['aborted_rate']:.3%} "
+                    f"retries={row['contention_retries']} ({row['elapsed_s']}s)",
+                    file=sys.stderr,
+                )
+    return {
+        "limit": {"attempts": limit.attempts, "window_ms": limit.window_ms},
+        "config": asdict(config),
+        "tick_ms": args.tick_ms,
+        "prices": {"read": args.read_price, "write": args.write_price},
+        "thresholds": {
+            "max_false_accept_rate": args.max_false_accept,
+            "max_false_reject_rate": args.max_false_reject,
+        },
+        "results": rows,
+        "recommended": recommend(rows, args.max_false_accept, args.max_false_reject),
+    }
+
+
+def render_summary_markdown(report: dict[str, Any]) -> str:
+    limit = report["limit"]
+    lines = [
+        "## Rate Limit Strategy Lab",
+        "",
+        f"- Contract: **{limit['attempts']} submits / {limit['window_ms'] / 60_000:g} min** per user; "
+        f"same-tick window {report['tick_ms']:g} ms",
+        "- Reads/writes exclude the attempt document every strategy writes.",
+        "",
+        "| Trace | Strategy | Submits | Reads/submit | Writes/submit | $ / 1M submits "
+        "| False accept | False reject | Aborted | Contention retries | Limiter docs |",
+        "|---|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    for row in report["results"]:
+        lines.append(
+            f"| {row['trace']} | `{row['strategy']}` | {row['submits']:,} "
+            f"| {row['reads_per_submit']:.2f} | {row['writes_per_submit']:.2f} "
+            f"| {row['cost_per_million_submits_usd']:.2f} "
+            f"| {row['false_accept_rate']:.3%} | {row['false_reject_rate']:.3%} "
+            f"| {row['aborted_rate']:.3%} | {row['contention_retries']:,} | {row['limiter_docs']:,} |"
+        )
+    lines.append("")
+    recommended = report["recommended"]
+    if recommended:
+        lines.append(f"Cheapest strategy within the error thresholds: **`{recommended}`**")
+    else:
+        lines.append("No strategy met the error thresholds on every trace.")
+    return "\n".join(lines) + "\n"
+
+
+# -----------------
+# CLI
+# -----------------
+def add_trace_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--minutes", type=float, default=60.0)
+    parser.add_argument("--grinder-share", type=float, default=0.05, help="Grinders in the `mixed` trace.")
+    parser.add_argument("--burst-share", type=float, default=0.05, help="Bursty users in the `mixed` trace.")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--attempts", type=int, default=RATE_LIMIT_ATTEMPTS)
+    parser.add_argument(
+        "--window-minutes",
+        type=float,
+        default=RATE_LIMIT_WINDOW_MS / 60_000,
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare submitScore rate-limit strategies on replayed submission traces.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    bench_parser = sub.add_parser("bench", help="Run every strategy over the traces and grade it.")
+    add_trace_arguments(bench_parser)
+    bench_parser.add_argument("--traces", nargs="+", choices=TRACE_NAMES, default=list(TRACE_NAMES))
+    bench_parser.add_argument("--trace-file", type=Path, help="Replay a JSONL trace instead (`-` for stdin).")
+    bench_parser.add_argument("--strategies", nargs="+", choices=sorted(STRATEGIES), default=list(STRATEGIES))
+    bench_parser.add_argument(
+        "--tick-ms",
+        type=float,
+        default=DEFAULT_TICK_MS,
+        help="Submits within one tick run concurrently.",
+    )
+    bench_parser.add_argument("--read-price", type=float, default=DEFAULT_READ_PRICE)
+    bench_parser.add_argument("--write-price", type=float, default=DEFAULT_WRITE_PRICE)
+    bench_parser.add_argument("--max-false-accept", type=float, default=0.0)
+    bench_parser.add_argument("--max-false-reject", type=float, default=0.0)
+    bench_parser.add_argument("--quiet", action="store_true", help="Do not print per-run progress.")
+    bench_parser.add_argument("--summary-file", type=Path)
+    bench_parser.add_argument("--json-file", type=Path)
+
+    trace_parser = sub.add_parser("trace", help="Write a synthetic trace as JSONL.")
+    trace_parser.add_argument("output", type=Path, help="Output path (`-` for stdout).")
+    trace_parser.add_argument("--trace", choices=TRACE_NAMES, default="mixed")
+    add_trace_arguments(trace_parser)
+    return parser.parse_args()
+
+
+def write_trace(events: Iterable[tuple[float, str]], output: Path) -> None:
+    lines = (json.dumps({"t": round(t, 3), "uid": uid}) + "\n" for t, uid in events)
+    if str(output) == "-":
+        sys.stdout.writelines(lines)
+        return
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", encoding="utf-8") as handle:
+        handle.writelines(lines)
+
+
+def main() -> int:
+    args = parse_args()
+
+    if args.command == "trace":
+        config = TraceConfig(
+            users=args.users,
+            minutes=args.minutes,
+            grinder_share=args.grinder_share,
+            burst_share=args.burst_share,
+            seed=args.seed,
+        )
+        limit = Limit(args.attempts, args.window_minutes * 60_000)
+        write_trace(generate_trace(args.trace, config, limit), args.output)
+        return 0
+
+    if args.trace_file and str(args.trace_file) != "-" and not args.trace_file.exists():
+        print(f"ERROR: trace not found: {args.trace_file}")
+        return 2
+    report = bench(args)
+    summary = render_summary_markdown(report)
+    print(summary, end="")
+    if args.summary_file:
+        args.summary_file.parent.mkdir(parents=True, exist_ok=True)
+        with args.summary_file.open("a", encoding="utf-8") as handle:
+            handle.write(summary)
+    if args.json_file:
+        args.json_file.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
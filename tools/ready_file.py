@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Readiness handshake for background servers started by CI steps.
+
+A server writes `{url, pid, ...}` to a ready file once its socket is
+listening; the CI step blocks on that file instead of polling the port.
+Kept import-light because servers write the file on their startup path.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+
+def write_ready_file(path: Path, payload: dict) -> None:
+    """Writes atomically so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(payload) + "\n", encoding="utf-8")
+    tmp.replace(path)
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def wait_for_ready_file(path: Path, timeout: float) -> dict | None:
+    """Payload of `path` once it exists and names a live process; None on timeout."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if path.exists():
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            if "pid" in payload and pid_alive(int(payload["pid"])):
+                return payload
+        time.sleep(0.02)
+    return None
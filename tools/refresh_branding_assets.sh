@@ -1,13 +1,7 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
-echo "Resolving dependencies..."
-flutter pub get
-
-echo "Generating launcher icons..."
-dart run flutter_launcher_icons
-
-echo "Generating native splash screens..."
-dart run flutter_native_splash:create
+echo "Generating launcher icons and native splash screens..."
+python3 tools/branding_assets.py build "$@"
 
 echo "Branding assets refreshed."
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Immutable, lazily-loaded view of the repository shared by in-process agents.
+
+One `os.walk` fixes the file list when the snapshot is built; file contents
+are read on first access and cached, and `pubspec.yaml` is parsed once. The
+agents keep their own `read_text`/walk helpers for standalone use; `bound`
+swaps those module attributes for snapshot-backed ones for the duration of
+an in-process run (see `tools/quiznetic all`).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import fnmatch
+import os
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Iterator
+
+import readme_agent
+from readme_agent import PubspecInfo, parse_environment, parse_pubspec_minimal
+
+
+ROOT = Path(__file__).resolve().parents[1]
+PRUNED_DIRS = {
+    ".git",
+    ".dart_tool",
+    ".cache",
+    "__pycache__",
+    "build",
+    "node_modules",
+    "Pods",
+}
+
+
+class RepoSnapshot:
+    """File list fixed at construction; contents cached on first read."""
+
+    def __init__(self, root: Path = ROOT) -> None:
+        self.root = root.resolve()
+        files: list[str] = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(d for d in dirnames if d not in PRUNED_DIRS)
+            rel_dir = Path(dirpath).relative_to(self.root)
+            for name in sorted(filenames):
+                files.append((rel_dir / name).as_posix())
+        self.files: tuple[str, ...] = tuple(files)
+        self._members = frozenset(files)
+        self._texts: dict[str, str] = {}
+        self._pubspec: PubspecInfo | None = None
+        self.reads = 0
+        self.hits = 0
+
+    def rel(self, path: Path | str) -> str:
+        path = Path(path)
+        if path.is_absolute():
+            try:
+                return path.relative_to(self.root).as_posix()
+            except ValueError:
+                return path.as_posix()
+        return path.as_posix()
+
+    def exists(self, path: Path | str) -> bool:
+        return self.rel(path) in self._members
+
+    def read_text(self, path: Path | str) -> str:
+        rel = self.rel(path)
+        cached = self._texts.get(rel)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.reads += 1
+        # Paths outside the snapshot (absolute paths elsewhere, files created
+        # after the walk) are read through but not cached.
+        full = Path(path) if Path(path).is_absolute() else self.root / rel
+        text = full.read_text(encoding="utf-8")
+        if rel in self._members:
+            self._texts[rel] = text
+        return text
+
+    def glob(self, pattern: str) -> list[Path]:
+        """Absolute paths of snapshot files whose relative path matches.
+
+        `fnmatch` semantics: `*` also crosses `/`, so `lib/*.dart` matches
+        nested files the way `rglob` would. Sorted like `sorted(rglob(...))`.
+        """
+        return sorted(self.root / rel for rel in self.files if fnmatch.fnmatchcase(rel, pattern))
+
+    @property
+    def pubspec(self) -> PubspecInfo:
+        if self._pubspec is None:
+            path = self.root / "pubspec.yaml"
+            if self.exists(path):
+                with bound(self, readme_agent):
+                    info = parse_pubspec_minimal(path)
+                    info.environment = parse_environment(path)
+            else:
+                info = PubspecInfo()
+            self._pubspec = info
+        return self._pubspec
+
+
+@contextlib.contextmanager
+def bound(snapshot: RepoSnapshot, module: ModuleType, **overrides: Any) -> Iterator[None]:
+    """Temporarily route `module.read_text` (and any `overrides`) to the snapshot."""
+    replacements: dict[str, Any] = {"read_text": snapshot.read_text, **overrides}
+    saved = {name: getattr(module, name) for name in replacements}
+    for name, value in replacements.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(module, name, value)
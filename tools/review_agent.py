@@ -2,10 +2,17 @@
 from __future__ import annotations
 
 import argparse
+import fnmatch
+import functools
 import json
+import mmap
+import random
 import re
+import tempfile
+import time
 from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Callable, Iterable
 
 
 @dataclass
@@ -18,12 +25,40 @@ class Finding:
   suggestion: str
 
 
+# Inputs at least this large are memory-mapped for rules that scan bytes
+# (`Rule.byte_scan`) instead of being decoded whole; 0 disables mapping.
+MMAP_THRESHOLD_BYTES = 1 << 20
+
+Source = str | mmap.mmap
+NEWLINE_BYTES = re.compile(rb"\n")
+_BYTE_PATTERNS: dict[re.Pattern[str], re.Pattern[bytes]] = {}
+
+
 def read_text(path: Path) -> str:
   return path.read_text(encoding="utf-8")
 
 
-def line_for_index(text: str, index: int) -> int:
-  return text.count("\n", 0, index) + 1
+def line_for_index(text: Source, index: int) -> int:
+  if isinstance(text, str):
+    return text.count("\n", 0, index) + 1
+  # Counts in place; slicing the map would copy the whole prefix.
+  return len(NEWLINE_BYTES.findall(text, 0, index)) + 1
+
+
+def pattern_for(text: Source, pattern: re.Pattern[str]) -> re.Pattern[str] | re.Pattern[bytes]:
+  """`pattern` for decoded text, or its ASCII bytes twin for a mapped file."""
+  if isinstance(text, str):
+    return pattern
+  compiled = _BYTE_PATTERNS.get(pattern)
+  if compiled is None:
+    compiled = re.compile(pattern.pattern.encode("ascii"), pattern.flags & ~re.UNICODE)
+    _BYTE_PATTERNS[pattern] = compiled
+  return compiled
+
+
+def window(value: str | bytes) -> str:
+  """Decodes only a matched span of a mapped file."""
+  return value if isinstance(value, str) else value.decode("utf-8", "replace")
 
 
 def relative_path(root: Path, path: Path) -> str:
@@ -83,12 +118,16 @@ def extract_function_body(text: str, function_name: str) -> tuple[str | None, in
   return None, start_line
 
 
-def scan_firestore_timestamp_rules(root: Path, findings: list[Finding]) -> None:
+def scan_firestore_timestamp_rules(
+  root: Path,
+  findings: list[Finding],
+  sources: dict[Path, str],
+) -> None:
   rules_path = root / "firestore.rules"
-  if not rules_path.exists():
+  text = sources.get(rules_path)
+  if text is None:
     return
 
-  text = read_text(rules_path)
   required = {
     "validUserScore": "request.resource.data.updatedAt == request.time",
     "validLeaderboardEntry": "request.resource.data.updatedAt == request.time",
@@ -129,12 +168,16 @@ def scan_firestore_timestamp_rules(root: Path, findings: list[Finding]) -> None:
       )
 
 
-def scan_runzonedguarded_async_handler(root: Path, findings: list[Finding]) -> None:
+def scan_runzonedguarded_async_handler(
+  root: Path,
+  findings: list[Finding],
+  sources: dict[Path, str],
+) -> None:
   main_path = root / "lib/main.dart"
-  if not main_path.exists():
+  text = sources.get(main_path)
+  if text is None:
     return
 
-  text = read_text(main_path)
   pattern = re.compile(
     r"runZonedGuarded\s*\([\s\S]*?,\s*\(\s*[^)]*\)\s*async\s*\{",
     re.MULTILINE,
@@ -155,19 +198,18 @@ def scan_runzonedguarded_async_handler(root: Path, findings: list[Finding]) -> N
     )
 
 
-def scan_snackbar_exception_leaks(root: Path, findings: list[Finding]) -> None:
-  screens_dir = root / "lib" / "screens"
-  if not screens_dir.exists():
-    return
-
+def scan_snackbar_exception_leaks(
+  root: Path,
+  findings: list[Finding],
+  sources: dict[Path, str],
+) -> None:
   pattern = re.compile(
     r"SnackBar\s*\([\s\S]{0,260}?Text\s*\(\s*['\"][^'\"]*"
     r"\$(?:\{)?(?:e|error|exception)\b",
     re.MULTILINE,
   )
 
-  for path in sorted(screens_dir.glob("*.dart")):
-    text = read_text(path)
+  for path, text in sources.items():
     for match in pattern.finditer(text):
       add_finding(
         findings,
@@ -183,12 +225,16 @@ def scan_snackbar_exception_leaks(root: Path, findings: list[Finding]) -> None:
       )
 
 
-def scan_repeated_quiz_feedback_calls(root: Path, findings: list[Finding]) -> None:
+def scan_repeated_quiz_feedback_calls(
+  root: Path,
+  findings: list[Finding],
+  sources: dict[Path, str],
+) -> None:
   quiz_path = root / "lib" / "screens" / "quiz_screen.dart"
-  if not quiz_path.exists():
+  text = sources.get(quiz_path)
+  if text is None:
     return
 
-  text = read_text(quiz_path)
   token = "_answerFeedbackFor(q)"
   occurrences = [m.start() for m in re.finditer(re.escape(token), text)]
   if len(occurrences) <= 1:
@@ -209,17 +255,23 @@ def scan_repeated_quiz_feedback_calls(root: Path, findings: list[Finding]) -> No
   )
 
 
-def scan_xcode_asset_symbol_setting(root: Path, findings: list[Finding]) -> None:
+XCODE_ASSET_SYMBOL_SETTING = re.compile(
+  r"ASSETCATALOG_COMPILER_GENERATE_SWIFT_ASSET_SYMBOL_EXTENSIONS\s*=\s*([^;]+);",
+)
+
+
+def scan_xcode_asset_symbol_setting(
+  root: Path,
+  findings: list[Finding],
+  sources: dict[Path, Source],
+) -> None:
   pbxproj = root / "ios" / "Runner.xcodeproj" / "project.pbxproj"
-  if not pbxproj.exists():
+  text = sources.get(pbxproj)
+  if text is None:
     return
 
-  text = read_text(pbxproj)
-  pattern = re.compile(
-    r"ASSETCATALOG_COMPILER_GENERATE_SWIFT_ASSET_SYMBOL_EXTENSIONS\s*=\s*([^;]+);",
-  )
-  for match in pattern.finditer(text):
-    value = match.group(1).strip()
+  for match in pattern_for(text, XCODE_ASSET_SYMBOL_SETTING).finditer(text):
+    value = window(match.group(1)).strip()
     if value in {"YES", "NO"}:
       continue
     add_finding(
@@ -237,13 +289,13 @@ def scan_xcode_asset_symbol_setting(root: Path, findings: list[Finding]) -> None
     )
 
 
-def scan_workflow_job_if_secrets(root: Path, findings: list[Finding]) -> None:
-  workflow_dir = root / ".github" / "workflows"
-  if not workflow_dir.exists():
-    return
-
-  for path in sorted(workflow_dir.glob("*.yml")):
-    lines = read_text(path).splitlines()
+def scan_workflow_job_if_secrets(
+  root: Path,
+  findings: list[Finding],
+  sources: dict[Path, str],
+) -> None:
+  for path, text in sources.items():
+    lines = text.splitlines()
     for index, line in enumerate(lines):
       if not re.match(r"^\s{4}if:\s*", line):
         continue
@@ -283,12 +335,16 @@ def scan_workflow_job_if_secrets(root: Path, findings: list[Finding]) -> None:
       )
 
 
-def scan_banner_double_dispose(root: Path, findings: list[Finding]) -> None:
+def scan_banner_double_dispose(
+  root: Path,
+  findings: list[Finding],
+  sources: dict[Path, str],
+) -> None:
   banner_path = root / "lib" / "widgets" / "monetized_banner_ad.dart"
-  if not banner_path.exists():
+  text = sources.get(banner_path)
+  if text is None:
     return
 
-  text = read_text(banner_path)
   pattern = re.compile(
     r"onAdFailedToLoad\s*:\s*\(\s*ad\s*,\s*error\s*\)\s*\{([\s\S]*?)\}",
     re.MULTILINE,
@@ -315,13 +371,18 @@ def scan_banner_double_dispose(root: Path, findings: list[Finding]) -> None:
       )
 
 
-def scan_ads_policy_guard(root: Path, findings: list[Finding]) -> None:
+def scan_ads_policy_guard(
+  root: Path,
+  findings: list[Finding],
+  sources: dict[Path, str],
+) -> None:
   app_config_path = root / "lib" / "config" / "app_config.dart"
   ads_service_path = root / "lib" / "services" / "ads_service.dart"
-  if not app_config_path.exists() or not ads_service_path.exists():
+  app_config_text = sources.get(app_config_path)
+  ads_service_text = sources.get(ads_service_path)
+  if app_config_text is None or ads_service_text is None:
     return
 
-  app_config_text = read_text(app_config_path)
   if "ALLOW_LIVE_AD_UNITS_IN_DEBUG" not in app_config_text:
     add_finding(
       findings,
@@ -340,7 +401,6 @@ def scan_ads_policy_guard(root: Path, findings: list[Finding]) -> None:
       root=root,
     )
 
-  ads_service_text = read_text(ads_service_path)
   required_tokens = [
     "_allowLiveAdUnitsInDebug",
     "kReleaseMode",
@@ -368,6 +428,341 @@ def scan_ads_policy_guard(root: Path, findings: list[Finding]) -> None:
     )
 
 
+# -----------------
+# Flutter performance rule pack
+# -----------------
+# Heuristics over Dart source with comments and string contents blanked out
+# (`mask_dart`), so braces and tokens inside literals never count. A "hot
+# region" is code that runs once per item or per frame: loop bodies,
+# iteration callbacks (`.map(...)`, `.where(...)`, ...), `build` methods,
+# and the bodies of same-file functions called from any of those.
+DART_KEYWORDS = {
+  "if", "for", "while", "switch", "catch", "return", "assert", "await",
+  "throw", "new", "super", "this", "else", "do", "try", "on", "case",
+}
+DART_LOOP = re.compile(r"\b(?:for|while)\s*\(")
+DART_DO_LOOP = re.compile(r"\bdo\s*\{")
+DART_ITERATION_CALL = re.compile(
+  r"\.(?:map|where|forEach|expand|fold|any|every|firstWhere|lastWhere|reduce|"
+  r"sort|removeWhere|retainWhere|takeWhile|skipWhile)\s*(?:<[^>()]*>)?\s*\(",
+)
+DART_BUILD_METHOD = re.compile(r"\bWidget\s+build\s*\(\s*BuildContext\s+\w+\s*\)\s*\{")
+DART_FUNCTION_HEAD = re.compile(
+  r"(?m)^[ \t]*(?:[A-Za-z_][\w<>?,\[\]. \t]*?[ \t>?\]])?([A-Za-z_]\w*)\s*(?:<[^>()]*>)?\s*\(",
+)
+DART_REGEXP_NEW = re.compile(r"\bRegExp\s*\(")
+DART_LIST_COPY = re.compile(r"\bList\s*(?:<[^>()]*>)?\s*\.\s*(?:from|of)\s*\(")
+DART_TOLIST_REORDER = re.compile(r"\.toList\s*\(\s*\)\s*\.\.\s*(?:shuffle|sort)\s*\(")
+DART_JSON_ENCODE = re.compile(r"\bjsonEncode\s*\(")
+DART_PERSIST_CALL = re.compile(r"\b(?:set(?:String|StringList)|writeAsString(?:Sync)?)\s*\(")
+DART_MAIN = re.compile(r"\bmain\s*\(\s*(?:List<String>\s+\w+)?\s*\)\s*(?:async\s*)?\{")
+
+
+@dataclass(frozen=True)
+class HotRegion:
+  start: int
+  end: int
+  reason: str
+  origin: str
+
+
+DART_LITERAL_OR_COMMENT = re.compile(
+  r"//[^\n]*"
+  r"|/\*.*?(?:\*/|\Z)"
+  r"|(?<!\w)r(?:'''.*?'''|\"\"\".*?\"\"\"|'[^'\n]*'|\"[^\"\n]*\")"
+  r"|'''(?:\\.|.)*?'''|\"\"\"(?:\\.|.)*?\"\"\""
+  r"|'(?:\\.|[^'\\\n])*'|\"(?:\\.|[^\"\\\n])*\"",
+  re.DOTALL,
+)
+DART_BRACKET = re.compile(r"[(){}\[\]]")
+DART_CALL = re.compile(r"(?<![\w.])([A-Za-z_]\w*)\s*\(")
+DART_BODY_OPEN = re.compile(r"\s*(?:async\*?|sync\*)?\s*(\{|=>)")
+DART_BLOCK_OPEN = re.compile(r"\s*\{")
+NON_NEWLINE = re.compile(r"[^\n]")
+
+
+def _blank_token(match: re.Match[str]) -> str:
+  token = match.group()
+  if token.startswith("/"):
+    return NON_NEWLINE.sub(" ", token)
+  prefix = 1 if token.startswith("r") else 0
+  quote = 3 if token[prefix : prefix + 3] in ("'''", '"""') else 1
+  head = token[: prefix + quote]
+  tail = token[len(token) - quote :]
+  return head + NON_NEWLINE.sub(" ", token[len(head) : len(token) - quote]) + tail
+
+
+@functools.lru_cache(maxsize=64)
+def mask_dart(text: str) -> str:
+  """Blanks comments and string contents, keeping offsets and newlines."""
+  return DART_LITERAL_OR_COMMENT.sub(_blank_token, text)
+
+
+@functools.lru_cache(maxsize=64)
+def _bracket_pairs(masked: str) -> dict[int, int]:
+  pairs: dict[int, int] = {}
+  stack: list[int] = []
+  closers = {")": "(", "}": "{", "]": "["}
+  for match in DART_BRACKET.finditer(masked):
+    ch = match.group()
+    index = match.start()
+    if ch in closers:
+      while stack and masked[stack[-1]] != closers[ch]:
+        stack.pop()
+      if stack:
+        pairs[stack.pop()] = index
+    else:
+      stack.append(index)
+  return pairs
+
+
+def matching_close(masked: str, open_index: int) -> int:
+  """Index of the bracket closing `masked[open_index]` (or len when unbalanced)."""
+  return _bracket_pairs(masked).get(open_index, len(masked))
+
+
+def statement_end(masked: str, index: int) -> int:
+  """End of the brace-less statement or collection element starting at `index`."""
+  pairs = _bracket_pairs(masked)
+  while index < len(masked):
+    ch = masked[index]
+    if ch in "([{":
+      index = pairs.get(index, len(masked)) + 1
+    elif ch in ";,)]}":
+      return index
+    else:
+      index += 1
+  return index
+
+
+def function_bodies(masked: str) -> list[tuple[str, int, int, int]]:
+  """(name, declaration offset, body start, body end) for each definition."""
+  out: list[tuple[str, int, int, int]] = []
+  for match in DART_FUNCTION_HEAD.finditer(masked):
+    name = match.group(1)
+    if name in DART_KEYWORDS:
+      continue
+    close = matching_close(masked, match.end() - 1)
+    cursor = close + 1
+    tail = DART_BODY_OPEN.match(masked, cursor)
+    if tail is None:
+      continue
+    body_start = tail.start(1)
+    if tail.group(1) == "{":
+      body_end = matching_close(masked, body_start)
+    else:
+      body_end = statement_end(masked, body_start + 2)
+    out.append((name, match.start(1), body_start, body_end))
+  return out
+
+
+@functools.lru_cache(maxsize=64)
+def hot_regions(masked: str) -> tuple[HotRegion, ...]:
+  regions: list[HotRegion] = []
+  for match in DART_LOOP.finditer(masked):
+    header_end = matching_close(masked, match.end() - 1)
+    body = DART_BLOCK_OPEN.match(masked, header_end + 1)
+    end = matching_close(masked, body.end() - 1) if body else (
+      statement_end(masked, header_end + 1)
+    )
+    regions.append(HotRegion(match.start(), end, "a loop body", "a loop body"))
+  for match in DART_DO_LOOP.finditer(masked):
+    end = matching_close(masked, match.end() - 1)
+    regions.append(HotRegion(match.start(), end, "a loop body", "a loop body"))
+  for match in DART_ITERATION_CALL.finditer(masked):
+    method = re.match(r"\.(\w+)", match.group()).group(1)
+    reason = f"a `.{method}(...)` callback"
+    end = matching_close(masked, match.end() - 1)
+    regions.append(HotRegion(match.end() - 1, end, reason, reason))
+  for match in DART_BUILD_METHOD.finditer(masked):
+    end = matching_close(masked, match.end() - 1)
+    regions.append(HotRegion(match.start(), end, "`build`", "`build`"))
+
+  # Same-file functions called from hot code are hot too (to a fixpoint).
+  functions = function_bodies(masked)
+  calls: dict[str, list[int]] = {}
+  for call in DART_CALL.finditer(masked):
+    calls.setdefault(call.group(1), []).append(call.start())
+  hot_names: set[str] = set()
+  changed = True
+  while changed:
+    changed = False
+    for name, declared_at, body_start, body_end in functions:
+      if name in hot_names or name == "build":
+        continue
+      for call_at in calls.get(name, ()):
+        if call_at == declared_at:
+          continue
+        caller = innermost(regions, call_at)
+        if caller is None:
+          continue
+        hot_names.add(name)
+        line = line_for_index(masked, call_at)
+        reason = f"`{name}` (called from {caller.origin} at line {line})"
+        regions.append(HotRegion(body_start, body_end, reason, caller.origin))
+        changed = True
+        break
+  return tuple(regions)
+
+
+def innermost(regions: Iterable[HotRegion], index: int) -> HotRegion | None:
+  best: HotRegion | None = None
+  for region in regions:
+    if region.start <= index <= region.end and (
+      best is None or region.end - region.start < best.end - best.start
+    ):
+      best = region
+  return best
+
+
+def hot_matches(
+  text: str,
+  patterns: tuple[tuple[str, re.Pattern[str]], ...],
+) -> dict[tuple[str, HotRegion], list[int]]:
+  """Offsets of each pattern's matches, grouped by kind and innermost hot region."""
+  masked = mask_dart(text)
+  grouped: dict[tuple[str, HotRegion], list[int]] = {}
+  regions = hot_regions(masked)
+  if not regions:
+    return grouped
+  for kind, pattern in patterns:
+    for match in pattern.finditer(masked):
+      region = innermost(regions, match.start())
+      if region is not None:
+        grouped.setdefault((kind, region), []).append(match.start())
+  return grouped
+
+
+def scan_perf_regexp_in_hot_paths(
+  root: Path,
+  findings: list[Finding],
+  sources: dict[Path, Source],
+) -> None:
+  for path, text in sources.items():
+    for (_, region), offsets in hot_matches(text, (("regexp", DART_REGEXP_NEW),)).items():
+      count = len(offsets)
+      add_finding(
+        findings,
+        level="warning",
+        rule_id="perf-regexp-in-hot-path",
+        path=path,
+        line=line_for_index(text, min(offsets)),
+        message=(
+          f"{count} `RegExp` object{'s are' if count > 1 else ' is'} compiled on "
+          f"every pass through {region.reason}."
+        ),
+        suggestion="Hoist the pattern into a top-level or `static final` field.",
+        root=root,
+      )
+
+
+def scan_perf_list_copies_in_hot_paths(
+  root: Path,
+  findings: list[Finding],
+  sources: dict[Path, Source],
+) -> None:
+  patterns = (("copied", DART_LIST_COPY), ("copied and reordered", DART_TOLIST_REORDER))
+  for path, text in sources.items():
+    for (action, region), offsets in hot_matches(text, patterns).items():
+      add_finding(
+        findings,
+        level="warning",
+        rule_id="perf-list-copy-in-hot-path",
+        path=path,
+        line=line_for_index(text, min(offsets)),
+        message=f"A whole list is {action} on every pass through {region.reason}.",
+        suggestion=(
+          "Copy once outside the loop (or sample indices with `Random`) instead "
+          "of copying per item or per frame."
+        ),
+        root=root,
+      )
+
+
+def scan_perf_json_encode_on_save(
+  root: Path,
+  findings: list[Finding],
+  sources: dict[Path, Source],
+) -> None:
+  for path, text in sources.items():
+    masked = mask_dart(text)
+    for name, _, body_start, body_end in function_bodies(masked):
+      body = masked[body_start:body_end]
+      if not DART_PERSIST_CALL.search(body):
+        continue
+      for match in DART_JSON_ENCODE.finditer(body):
+        open_index = body_start + match.end() - 1
+        argument = masked[open_index : matching_close(masked, open_index)]
+        if not re.search(r"\.(?:map|values|toList)\b", argument):
+          continue
+        add_finding(
+          findings,
+          level="warning",
+          rule_id="perf-json-encode-full-collection",
+          path=path,
+          line=line_for_index(text, body_start + match.start()),
+          message=(
+            f"`{name}` re-encodes an entire collection with `jsonEncode` on every save."
+          ),
+          suggestion=(
+            "Debounce or batch saves, or persist only the changed entries "
+            "(per-key storage or an append-only log)."
+          ),
+          root=root,
+        )
+
+
+def scan_perf_sequential_awaits_in_main(
+  root: Path,
+  findings: list[Finding],
+  sources: dict[Path, Source],
+) -> None:
+  for path, text in sources.items():
+    masked = mask_dart(text)
+    for match in DART_MAIN.finditer(masked):
+      body_start = match.end() - 1
+      body = masked[body_start + 1 : matching_close(masked, body_start)]
+      depth = 0
+      run: list[int] = []
+      runs: list[list[int]] = []
+      offset = body_start + 1
+      for line in body.splitlines(keepends=True):
+        stripped = line.strip()
+        top_level = depth == 0
+        depth += line.count("{") + line.count("(") - line.count("}") - line.count(")")
+        if not stripped:
+          offset += len(line)
+          continue
+        single = top_level and depth == 0 and stripped.endswith(";")
+        if single and re.match(r"await\s+[\w.]+\s*\([^;]*\)\s*;$", stripped):
+          run.append(offset + len(line) - len(line.lstrip()))
+        else:
+          if len(run) >= 2:
+            runs.append(run)
+          run = []
+        offset += len(line)
+      if len(run) >= 2:
+        runs.append(run)
+
+      for awaits in runs:
+        add_finding(
+          findings,
+          level="warning",
+          rule_id="perf-sequential-awaits-in-main",
+          path=path,
+          line=line_for_index(text, awaits[0]),
+          message=(
+            f"`main()` awaits {len(awaits)} independent-looking calls one after "
+            "another before the first frame."
+          ),
+          suggestion=(
+            "Start independent initializers together with `Future.wait([...])`, "
+            "or defer non-critical ones until after `runApp`."
+          ),
+          root=root,
+        )
+
+
 def escape_annotation(text: str) -> str:
   return text.replace("%", "%25").replace("\r", "%0D").replace("\n", "%0A")
 
@@ -422,24 +817,411 @@ def should_fail(findings: list[Finding], fail_on: str) -> bool:
   return any(f.level == "error" for f in findings)
 
 
-def run(root: Path) -> list[Finding]:
-  findings: list[Finding] = []
-  scan_firestore_timestamp_rules(root, findings)
-  scan_runzonedguarded_async_handler(root, findings)
-  scan_snackbar_exception_leaks(root, findings)
-  scan_repeated_quiz_feedback_calls(root, findings)
-  scan_xcode_asset_symbol_setting(root, findings)
-  scan_workflow_job_if_secrets(root, findings)
-  scan_banner_double_dispose(root, findings)
-  scan_ads_policy_guard(root, findings)
+Scan = Callable[[Path, list[Finding], dict[Path, Source]], None]
+
+
+@dataclass(frozen=True)
+class Rule:
+  """A scan with the repo-relative globs it reads and the literals it needs.
 
+  A file is dispatched to `scan` only if it contains every literal, so
+  `literals` must be necessary for any finding; list the rarest first.
+  Rules that report missing code (absence checks) leave `literals` empty
+  and see every matched file. `byte_scan` rules also accept an `mmap`
+  (via `pattern_for`/`window`) for files of `MMAP_THRESHOLD_BYTES` or more.
+  Callers that track file changes (tools/agent_daemon.py) use `globs` to
+  re-run only the affected rules.
+  """
+
+  scan: Scan
+  globs: tuple[str, ...]
+  literals: tuple[str, ...] = ()
+  byte_scan: bool = False
+
+  @property
+  def name(self) -> str:
+    return self.scan.__name__
+
+
+@dataclass
+class ScanStats:
+  files_read: int = 0
+  bytes_read: int = 0
+  files_mapped: int = 0
+  bytes_mapped: int = 0
+  prefilter_bytes: int = 0
+  dispatched: int = 0
+  skipped: int = 0
+  regex_bytes: int = 0
+  prefilter_seconds: float = 0.0
+  regex_seconds: float = 0.0
+
+
+class LiteralIndex:
+  """Memoized "does this file contain this literal" lookups for one run.
+
+  A rule's literals are probed in declared order (rarest first) and the
+  probe stops at the first miss, so most files cost one `in` check. Each
+  probe is CPython's C substring search, which stops at the first hit; it
+  outruns both a pure-Python Aho-Corasick automaton and a regex alternation
+  of all literals, and a (file, literal) pair is never searched twice even
+  when several rules share it.
+  """
+
+  def __init__(self, stats: ScanStats) -> None:
+    self.stats = stats
+    self._hits: dict[tuple[Path, str], bool] = {}
+
+  def contains_all(self, path: Path, text: Source, literals: tuple[str, ...]) -> bool:
+    for literal in literals:
+      key = (path, literal)
+      hit = self._hits.get(key)
+      if hit is None:
+        if isinstance(text, str):
+          hit = literal in text
+        else:
+          hit = text.find(literal.encode("utf-8")) != -1
+        self._hits[key] = hit
+        self.stats.prefilter_bytes += len(text)
+      if not hit:
+        return False
+    return True
+
+
+RULES: list[Rule] = [
+  Rule(scan_firestore_timestamp_rules, ("firestore.rules",)),
+  Rule(
+    scan_runzonedguarded_async_handler,
+    ("lib/main.dart",),
+    ("runZonedGuarded", "async"),
+  ),
+  Rule(scan_snackbar_exception_leaks, ("lib/screens/*.dart",), ("SnackBar", "Text")),
+  Rule(
+    scan_repeated_quiz_feedback_calls,
+    ("lib/screens/quiz_screen.dart",),
+    ("_answerFeedbackFor(q)",),
+  ),
+  Rule(
+    scan_xcode_asset_symbol_setting,
+    ("ios/Runner.xcodeproj/project.pbxproj",),
+    ("ASSETCATALOG_COMPILER_GENERATE_SWIFT_ASSET_SYMBOL_EXTENSIONS",),
+    byte_scan=True,
+  ),
+  Rule(scan_workflow_job_if_secrets, (".github/workflows/*.yml",), ("secrets.", "if:")),
+  Rule(
+    scan_banner_double_dispose,
+    ("lib/widgets/monetized_banner_ad.dart",),
+    ("onAdFailedToLoad", "ad.dispose()", "_disposeBannerAd("),
+  ),
+  Rule(
+    scan_ads_policy_guard,
+    ("lib/config/app_config.dart", "lib/services/ads_service.dart"),
+  ),
+  # Flutter performance rule pack.
+  Rule(scan_perf_regexp_in_hot_paths, ("lib/*.dart", "lib/**/*.dart"), ("RegExp",)),
+  # "List" is in both `List.from`/`List.of` and `.toList()`.
+  Rule(scan_perf_list_copies_in_hot_paths, ("lib/*.dart", "lib/**/*.dart"), ("List",)),
+  Rule(
+    scan_perf_json_encode_on_save,
+    ("lib/*.dart", "lib/**/*.dart"),
+    ("jsonEncode",),
+  ),
+  Rule(scan_perf_sequential_awaits_in_main, ("lib/main.dart",), ("main", "await")),
+]
+
+
+def rules_for_paths(paths: list[str]) -> list[Rule]:
+  return [
+    rule
+    for rule in RULES
+    if any(fnmatch.fnmatch(path, pattern) for path in paths for pattern in rule.globs)
+  ]
+
+
+def sort_findings(findings: list[Finding]) -> list[Finding]:
   level_rank = {"error": 0, "warning": 1, "notice": 2}
-  findings.sort(
+  return sorted(
+    findings,
     key=lambda f: (level_rank.get(f.level, 3), f.path.lower(), f.line, f.rule_id),
   )
+
+
+def rule_files(root: Path, rule: Rule) -> list[Path]:
+  matched = {path for pattern in rule.globs for path in root.glob(pattern) if path.is_file()}
+  return sorted(matched, key=str)
+
+
+def run_rules(
+  root: Path,
+  rules: list[Rule],
+  *,
+  prefilter: bool = True,
+  mmap_threshold: int = MMAP_THRESHOLD_BYTES,
+  stats: ScanStats | None = None,
+) -> list[Finding]:
+  """Reads each input file once and hands each rule only the files it needs."""
+  stats = stats if stats is not None else ScanStats()
+  index = LiteralIndex(stats)
+  texts: dict[Path, str] = {}
+  maps: dict[Path, mmap.mmap] = {}
+  findings: list[Finding] = []
+
+  def load(path: Path, byte_scan: bool) -> Source:
+    if byte_scan and mmap_threshold > 0 and path not in texts:
+      mapped = maps.get(path)
+      if mapped is not None:
+        return mapped
+      size = path.stat().st_size
+      if size >= mmap_threshold:
+        with path.open("rb") as handle:
+          mapped = maps[path] = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        stats.files_mapped += 1
+        stats.bytes_mapped += size
+        return mapped
+    text = texts.get(path)
+    if text is None:
+      text = texts[path] = read_text(path)
+      stats.files_read += 1
+      stats.bytes_read += len(text)
+    return text
+
+  try:
+    for rule in rules:
+      sources: dict[Path, Source] = {}
+      for path in rule_files(root, rule):
+        text = load(path, rule.byte_scan)
+        if prefilter and rule.literals:
+          started = time.perf_counter()
+          keep = index.contains_all(path, text, rule.literals)
+          stats.prefilter_seconds += time.perf_counter() - started
+          if not keep:
+            stats.skipped += 1
+            continue
+        sources[path] = text
+        stats.dispatched += 1
+        stats.regex_bytes += len(text)
+      started = time.perf_counter()
+      rule.scan(root, findings, sources)
+      stats.regex_seconds += time.perf_counter() - started
+  finally:
+    for mapped in maps.values():
+      mapped.close()
+
   return findings
 
 
+def run(
+  root: Path,
+  *,
+  prefilter: bool = True,
+  mmap_threshold: int = MMAP_THRESHOLD_BYTES,
+  stats: ScanStats | None = None,
+) -> list[Finding]:
+  return sort_findings(
+    run_rules(root, RULES, prefilter=prefilter, mmap_threshold=mmap_threshold, stats=stats),
+  )
+
+
+# -----------------
+# Rule fixtures
+# -----------------
+FIXTURE_EXPECT = re.compile(r"(?://|#)\s*expect:\s*([\w-]+(?:\s*,\s*[\w-]+)*)")
+
+
+def expected_fixture_findings(case_root: Path) -> set[tuple[str, int, str]]:
+  expected: set[tuple[str, int, str]] = set()
+  for path in sorted(case_root.rglob("*"), key=str):
+    if not path.is_file():
+      continue
+    for number, line in enumerate(read_text(path).splitlines(), start=1):
+      match = FIXTURE_EXPECT.search(line)
+      if match is None:
+        continue
+      for rule_id in match.group(1).split(","):
+        expected.add((relative_path(case_root, path), number, rule_id.strip()))
+  return expected
+
+
+def check_fixtures(fixtures_dir: Path) -> int:
+  """Runs every rule on each fixture tree and compares with `expect:` markers.
+
+  Each subdirectory is a miniature repository root. A finding is expected
+  exactly where a line carries `// expect: <rule-id>`; any other finding,
+  or a marker without one, fails the check.
+  """
+  failed = False
+  cases = sorted(path for path in fixtures_dir.iterdir() if path.is_dir())
+  for case_root in cases:
+    actual = {(f.path, f.line, f.rule_id) for f in run(case_root)}
+    expected = expected_fixture_findings(case_root)
+    missing = sorted(expected - actual)
+    unexpected = sorted(actual - expected)
+    if not missing and not unexpected:
+      print(f"[PASS] {case_root.name}: {len(actual)} expected findings")
+      continue
+    failed = True
+    print(f"[FAIL] {case_root.name}")
+    for path, line, rule_id in missing:
+      print(f"  missing    {rule_id} {path}:{line}")
+    for path, line, rule_id in unexpected:
+      print(f"  unexpected {rule_id} {path}:{line}")
+  if not cases:
+    print(f"ERROR: no fixture cases under {fixtures_dir}")
+    return 2
+  return 1 if failed else 0
+
+
+# -----------------
+# Prefilter benchmark
+# -----------------
+BENCH_COPIED_FILES = (
+  "firestore.rules",
+  "lib/config/app_config.dart",
+  "lib/services/ads_service.dart",
+  "lib/widgets/monetized_banner_ad.dart",
+  "lib/screens/quiz_screen.dart",
+)
+
+
+def build_bench_tree(root: Path, source_root: Path, files: int, seed: int = 7) -> None:
+  """Synthetic tree: `files` screens (2% leak exceptions into SnackBars,
+  10% use SnackBar safely), one workflow per 20 screens (10% with a
+  job-level `if` on secrets), and a large pbxproj with one bad setting."""
+  rng = random.Random(seed)
+  for rel in BENCH_COPIED_FILES:
+    source = source_root / rel
+    if source.exists():
+      target = root / rel
+      target.parent.mkdir(parents=True, exist_ok=True)
+      target.write_text(read_text(source), encoding="utf-8")
+
+  screens = root / "lib" / "screens"
+  screens.mkdir(parents=True, exist_ok=True)
+  for index in range(files):
+    widgets = "\n".join(
+      f"        Text('Row {index}-{row} {rng.randint(0, 9999)}'),"
+      for row in range(rng.randint(20, 60))
+    )
+    snackbar = ""
+    if index % 50 == 0:
+      snackbar = (
+        "    ScaffoldMessenger.of(context).showSnackBar(\n"
+        "      SnackBar(content: Text('Failed: $e')),\n    );\n"
+      )
+    elif index % 10 == 0:
+      snackbar = (
+        "    ScaffoldMessenger.of(context).showSnackBar(\n"
+        "      const SnackBar(content: Text('Something went wrong')),\n    );\n"
+      )
+    (screens / f"screen_{index:05d}.dart").write_text(
+      "import 'package:flutter/material.dart';\n\n"
+      f"class Screen{index} extends StatelessWidget {{\n"
+      f"  const Screen{index}({{super.key}});\n\n"
+      "  void _onError(BuildContext context, Object e) {\n"
+      f"{snackbar}"
+      "  }\n\n"
+      "  @override\n"
+      "  Widget build(BuildContext context) {\n"
+      "    return Column(\n      children: [\n"
+      f"{widgets}\n"
+      "      ],\n    );\n  }\n}\n",
+      encoding="utf-8",
+    )
+
+  (root / "lib" / "main.dart").write_text(
+    "void main() {\n"
+    "  runZonedGuarded(() => runApp(const App()), (error, stack) {\n"
+    "    unawaited(report(error, stack));\n  });\n}\n",
+    encoding="utf-8",
+  )
+
+  workflows = root / ".github" / "workflows"
+  workflows.mkdir(parents=True, exist_ok=True)
+  for index in range(max(1, files // 20)):
+    guard = "    if: ${{ secrets.DEPLOY_TOKEN != '' }}\n" if index % 10 == 0 else (
+      "    if: github.event_name == 'push'\n"
+    )
+    steps = "".join(
+      f"      - name: Step {step}\n        run: echo {rng.randint(0, 9999)}\n"
+      for step in range(rng.randint(5, 20))
+    )
+    (workflows / f"workflow_{index:04d}.yml").write_text(
+      f"name: Workflow {index}\non: [push]\njobs:\n  build:\n"
+      f"{guard}    runs-on: ubuntu-latest\n    steps:\n{steps}",
+      encoding="utf-8",
+    )
+
+  pbxproj = root / "ios" / "Runner.xcodeproj" / "project.pbxproj"
+  pbxproj.parent.mkdir(parents=True, exist_ok=True)
+  objects = [
+    f"\t\t{rng.getrandbits(96):024X} /* File{n}.swift */ = {{isa = PBXFileReference; "
+    f"path = File{n}.swift; sourceTree = \"<group>\"; }};\n"
+    for n in range(files * 10)
+  ]
+  objects.insert(
+    len(objects) // 2,
+    "\t\tASSETCATALOG_COMPILER_GENERATE_SWIFT_ASSET_SYMBOL_EXTENSIONS = \"$(SYMBOLS)\";\n",
+  )
+  pbxproj.write_text(
+    "// !$*UTF8*$!\n{\n\tobjects = {\n"
+    f"{''.join(objects)}"
+    "\t\tASSETCATALOG_COMPILER_GENERATE_SWIFT_ASSET_SYMBOL_EXTENSIONS = YES;\n\t};\n}\n",
+    encoding="utf-8",
+  )
+
+
+BENCH_MODES = (
+  ("full regex", False, 0),
+  ("prefilter", True, 0),
+  ("prefilter+mmap", True, MMAP_THRESHOLD_BYTES),
+)
+
+
+def bench(source_root: Path, files: int, repeat: int = 3) -> int:
+  with tempfile.TemporaryDirectory(prefix="review-agent-bench-") as tmp:
+    root = Path(tmp)
+    build_bench_tree(root, source_root, files)
+    results: list[tuple[str, float, ScanStats, list[Finding]]] = []
+    for label, prefilter, threshold in BENCH_MODES:
+      best = float("inf")
+      stats = ScanStats()
+      findings: list[Finding] = []
+      for _ in range(repeat):
+        stats = ScanStats()
+        started = time.perf_counter()
+        findings = run(root, prefilter=prefilter, mmap_threshold=threshold, stats=stats)
+        best = min(best, time.perf_counter() - started)
+      results.append((label, best, stats, findings))
+
+  _, base_time, base, base_findings = results[0]
+  _, _, fast, _ = results[1]
+  print(f"Review agent prefilter bench: {files} screens, {base.files_read} files, "
+        f"{base.bytes_read / 1e6:.1f} MB (best of {repeat})")
+  print(
+    f"{'':>14} {'dispatched':>11} {'regex MB':>9} {'regex s':>8} {'prefilter s':>12} "
+    f"{'decoded MB':>11} {'mapped MB':>10} {'total s':>8}"
+  )
+  for label, elapsed, stats, _ in results:
+    print(
+      f"{label:>14} {stats.dispatched:>11} {stats.regex_bytes / 1e6:>9.2f} "
+      f"{stats.regex_seconds:>8.3f} {stats.prefilter_seconds:>12.3f} "
+      f"{stats.bytes_read / 1e6:>11.2f} {stats.bytes_mapped / 1e6:>10.2f} {elapsed:>8.3f}"
+    )
+  print(
+    f"Regex input reduced {100 * (1 - fast.regex_bytes / max(1, base.regex_bytes)):.1f}% "
+    f"({fast.skipped} of {base.dispatched} rule-file pairs skipped); regex time "
+    f"{base.regex_seconds:.3f}s -> {fast.regex_seconds + fast.prefilter_seconds:.3f}s "
+    "including the prefilter."
+  )
+  expected = [asdict(f) for f in base_findings]
+  for label, _, _, findings in results[1:]:
+    if [asdict(f) for f in findings] != expected:
+      print(f"ERROR: {label} findings differ from the full regex run.")
+      return 1
+  print(f"Findings identical: {len(base_findings)}.")
+  return 0
+
+
 def main() -> int:
   default_root = Path(__file__).resolve().parents[1]
   parser = argparse.ArgumentParser(
@@ -449,6 +1231,30 @@ def main() -> int:
   parser.add_argument("--emit-annotations", action="store_true")
   parser.add_argument("--summary-file", type=Path)
   parser.add_argument("--json-file", type=Path)
+  parser.add_argument(
+    "--no-prefilter",
+    action="store_true",
+    help="Run every rule regex on every matched file (skip the literal prefilter).",
+  )
+  parser.add_argument(
+    "--mmap-threshold",
+    type=int,
+    default=MMAP_THRESHOLD_BYTES,
+    metavar="BYTES",
+    help="Memory-map byte-scan inputs of at least this size (0 disables).",
+  )
+  parser.add_argument(
+    "--check-fixtures",
+    type=Path,
+    metavar="DIR",
+    help="Verify rules against the `expect:` markers in each fixture tree under DIR and exit.",
+  )
+  parser.add_argument(
+    "--bench",
+    type=int,
+    metavar="FILES",
+    help="Benchmark the prefilter on a synthetic tree with FILES screens and exit.",
+  )
   parser.add_argument(
     "--fail-on",
     choices=["none", "error", "warning"],
@@ -458,7 +1264,12 @@ def main() -> int:
   args = parser.parse_args()
 
   root = args.root.resolve()
-  findings = run(root)
+  if args.check_fixtures:
+    return check_fixtures(args.check_fixtures)
+  if args.bench:
+    return bench(root, args.bench)
+
+  findings = run(root, prefilter=not args.no_prefilter, mmap_threshold=args.mmap_threshold)
 
   errors = sum(1 for f in findings if f.level == "error")
   warnings = sum(1 for f in findings if f.level == "warning")
@@ -0,0 +1,62 @@
+import 'dart:math';
+
+// Hoisted patterns are compiled once and must not be reported.
+final RegExp _separator = RegExp(r'[_-]+');
+
+class Question {
+  const Question(this.answer, this.options);
+
+  final String answer;
+  final List<String> options;
+}
+
+List<String> titles(List<String> paths) {
+  return paths.map((path) {
+    final name = path.split('/').last;
+    return name.split(RegExp(r'[_-]+')).join(' '); // expect: perf-regexp-in-hot-path
+  }).toList();
+}
+
+List<String> keys(List<String> names) {
+  final out = <String>[];
+  for (final name in names) {
+    out.add(_normalizeKey(name));
+  }
+  return out;
+}
+
+String _normalizeKey(String raw) {
+  return raw
+      .toLowerCase()
+      .replaceAll(RegExp(r'[^a-z0-9]+'), ' ') // expect: perf-regexp-in-hot-path
+      .trim()
+      .replaceAll(RegExp(r'\s+'), ' ');
+}
+
+// Never called from hot code: a per-call RegExp here is fine.
+bool looksLikePath(String raw) => RegExp(r'^assets/').hasMatch(raw);
+
+List<String> hoisted(List<String> paths) {
+  return paths.map((path) => path.split(_separator).join(' ')).toList();
+}
+
+List<Question> prepare(List<Question> all) {
+  final rand = Random();
+  final pool = List<Question>.from(all)..shuffle(rand);
+
+  return pool.map((q) {
+    final wrongs = all.where((f) => f.answer != q.answer).toList() // expect: perf-list-copy-in-hot-path
+      ..shuffle(rand);
+    final nested = q.options.where((o) => o.isNotEmpty).toList();
+    return Question(q.answer, [q.answer, wrongs.first.answer, ...nested]);
+  }).toList();
+}
+
+String describe(List<String> items) {
+  // Tokens inside comments and strings are ignored: RegExp(r'x') List.from(items)
+  final buffer = StringBuffer();
+  for (final item in items) {
+    buffer.write('RegExp(r"$item") List.from(items)');
+  }
+  return buffer.toString();
+}
@@ -0,0 +1,23 @@
+import 'dart:async';
+
+import 'package:flutter/material.dart';
+
+// Spaced on purpose: the rule literals must not require a paren right after main.
+Future<void> main () async {
+  WidgetsFlutterBinding.ensureInitialized();
+  await Firebase.initializeApp();
+  final analytics = AnalyticsService.instance;
+  await analytics.initialize(); // expect: perf-sequential-awaits-in-main
+  await AdsService.instance.initialize();
+  await IapService.instance.initialize();
+
+  final config = await RemoteConfig.load();
+  await Future.wait([
+    EntitlementService.instance.initialize(),
+    CacheService.instance.warmUp(),
+  ]);
+
+  runZonedGuarded(() => runApp(App(config: config)), (error, stack) {
+    unawaited(analytics.recordError(error, stack));
+  });
+}
@@ -0,0 +1,23 @@
+import 'dart:convert';
+
+import 'package:shared_preferences/shared_preferences.dart';
+
+class ScoreStore {
+  ScoreStore(this._prefs);
+
+  final SharedPreferences _prefs;
+
+  Future<void> saveAll(Map<String, int> scores, List<String> log) async {
+    final encodedLog = jsonEncode(log.map((e) => e.trim()).toList()); // expect: perf-json-encode-full-collection
+    await _prefs.setString('log', encodedLog);
+    await _prefs.setString('scores', jsonEncode(scores.values.toList())); // expect: perf-json-encode-full-collection
+  }
+
+  // A single small record is fine to encode on save.
+  Future<void> saveLast(String key, int value) async {
+    await _prefs.setString('last', jsonEncode({'key': key, 'value': value}));
+  }
+
+  // Encoding without persisting (for example for a request body) is fine.
+  String export(List<int> values) => jsonEncode(values.map((v) => v * 2).toList());
+}
@@ -0,0 +1,32 @@
+import 'package:flutter/material.dart';
+
+class ScoreList extends StatelessWidget {
+  const ScoreList({super.key, required this.scores});
+
+  static final RegExp _digits = RegExp(r'\d+');
+
+  final List<int> scores;
+
+  List<int> _sorted(List<int> values) {
+    final sorted = List<int>.from(values); // expect: perf-list-copy-in-hot-path
+    sorted.sort();
+    return sorted;
+  }
+
+  @override
+  Widget build(BuildContext context) {
+    final label = RegExp(r'^score'); // expect: perf-regexp-in-hot-path
+    return FutureBuilder<List<int>>(
+      future: Future.value(scores),
+      builder: (context, snap) {
+        final ordered = _sorted(snap.data ?? const []);
+        return Column(
+          children: [
+            for (final value in ordered)
+              Text(label.hasMatch('score') ? '$value' : _digits.pattern),
+          ],
+        );
+      },
+    );
+  }
+}
@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+"""Replay harness for the `LocalFirstScoreRepository` pending-score queue.
+
+Models `lib/services/score_repository.dart` as it behaves today:
+
+- every `saveScore` decodes `score_attempts_v1` + `score_projection_v1`,
+  appends the attempt, persists, runs one sync pass, and persists again
+- every persist re-encodes the whole attempts list and projections map
+- a sync pass retries each due attempt serially and reschedules failures
+  with `_retryDelay` (`startup`/`resume`/`auth-state` triggers force-retry)
+
+A long offline session is replayed on a virtual clock, then connectivity
+returns and the harness measures how long the queue takes to drain under
+each backoff curve. Alongside the current full-rewrite persistence it runs
+the proposed append-only journal (see `ScoreJournal`) over the same events,
+checks that replaying the journal reproduces the queue, and reports bytes
+and encode cost per save for both.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable
+
+
+CATEGORIES = ("flag", "capital")
+TOTAL_QUESTIONS = {"easy": 15, "intermediate": 30, "expert": 50}
+SESSION_START = datetime(2026, 1, 5, 9, 0, 0)
+CONNECTIVITY_ERROR = (
+    "[cloud_firestore/unavailable] The service is currently unavailable. "
+    "This is a most likely a transient condition and may be corrected by "
+    "retrying with a backoff."
+)
+JOURNAL_SEGMENT_OPS = 64
+JOURNAL_COMPACT_MIN_OPS = 256
+JOURNAL_COMPACT_RATIO = 2.0
+
+
+def current_retry_delay(attempt: int, connectivity: bool) -> float:
+    """Mirrors `_retryDelay` in score_repository.dart (seconds)."""
+    bounded = max(1, attempt)
+    if connectivity:
+        return {1: 2, 2: 5, 3: 10, 4: 20}.get(bounded, 30) * 60.0
+    return float({1: 30, 2: 60, 3: 120, 4: 300}.get(bounded, 600))
+
+
+def exponential_delay(base_s: float, cap_s: float) -> Callable[[int, bool], float]:
+    def delay(attempt: int, connectivity: bool) -> float:
+        return min(cap_s, base_s * 2 ** (max(1, attempt) - 1))
+
+    return delay
+
+
+BACKOFF_CURVES: dict[str, Callable[[int, bool], float]] = {
+    "current": current_retry_delay,
+    "fixed-60s": lambda attempt, connectivity: 60.0,
+    "exp-15s-cap-15m": exponential_delay(15.0, 15 * 60.0),
+    "exp-60s-cap-6h": exponential_delay(60.0, 6 * 3600.0),
+}
+
+
+def iso(moment: datetime) -> str:
+    """Matches Dart `DateTime.toIso8601String()` for local microsecond times."""
+    return moment.isoformat(timespec="microseconds")
+
+
+def dart_json(value: Any) -> str:
+    """Matches Dart `jsonEncode` spacing."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+@dataclass
+class SessionConfig:
+    attempts: int = 2000
+    save_interval_s: float = 120.0
+    resume_interval_s: float = 0.0
+    remote_ok_ms: float = 180.0
+    offline_fail_ms: float = 250.0
+    max_drain_hours: float = 72.0
+    checkpoints: int = 8
+    seed: int = 7
+
+
+@dataclass
+class Checkpoint:
+    queued: int
+    stored_bytes: int
+    full_encode_ms: float
+    full_decode_ms: float
+    journal_encode_ms: float
+    journal_stored_bytes: int
+    journal_replay_ms: float
+
+
+@dataclass
+class PersistStats:
+    persists: int = 0
+    bytes_written: int = 0
+    max_write_bytes: int = 0
+
+    def record(self, size: int) -> None:
+        self.persists += 1
+        self.bytes_written += size
+        self.max_write_bytes = max(self.max_write_bytes, size)
+
+
+@dataclass
+class ReplayResult:
+    curve: str
+    attempts: int
+    offline_remote_calls: int
+    offline_blocked_s: float
+    max_sync_pass_s: float
+    drain_s: float | None
+    drain_remote_calls: int
+    final_stored_bytes: int
+    full: PersistStats
+    journal: PersistStats
+    journal_compactions: int
+    journal_replay_matches: bool
+    checkpoints: list[Checkpoint] = field(default_factory=list)
+
+
+class FullRewriteStore:
+    """Current persistence: whole lists re-encoded into two prefs strings.
+
+    Byte counts are exact without re-encoding on every save: each record's
+    encoded length is cached and only recomputed when the record changes.
+    """
+
+    def __init__(self) -> None:
+        self.record_bytes: dict[str, int] = {}
+        self.projection_bytes = 2
+        self.stats = PersistStats()
+
+    def attempts_bytes(self) -> int:
+        count = len(self.record_bytes)
+        return 2 + sum(self.record_bytes.values()) + max(0, count - 1)
+
+    def update_record(self, record: dict[str, Any]) -> None:
+        self.record_bytes[record["id"]] = len(dart_json(record).encode("utf-8"))
+
+    def remove_record(self, attempt_id: str) -> None:
+        self.record_bytes.pop(attempt_id, None)
+
+    def update_projections(self, projections: dict[str, dict[str, Any]]) -> None:
+        self.projection_bytes = len(dart_json(list(projections.values())).encode("utf-8"))
+
+    def persist(self, attempts: bool = True, projections: bool = True) -> None:
+        size = (self.attempts_bytes() if attempts else 0) + (
+            self.projection_bytes if projections else 0
+        )
+        self.stats.record(size)
+
+    def stored_bytes(self) -> int:
+        return self.attempts_bytes() + self.projection_bytes
+
+
+class ScoreJournal:
+    """Proposed append-only journal kept in segmented prefs strings.
+
+    Ops are newline-delimited JSON:
+
+    - `{"o":"a","r":{...}}` enqueue a full attempt record
+    - `{"o":"f","i":id,"n":syncAttempts,"t":lastTriedAt,"r":nextRetryAt,"e":error}`
+    - `{"o":"s","i":id}` attempt synced (or dropped) and leaves the queue
+    - `{"o":"p","k":key,"v":{...}}` projection upsert
+
+    Only the tail segment (at most `JOURNAL_SEGMENT_OPS` ops) is rewritten
+    per persist, and old ops are never re-encoded. When dead ops outnumber
+    live records by `JOURNAL_COMPACT_RATIO`, the journal is rewritten as one
+    snapshot of live records and projections.
+    """
+
+    def __init__(self) -> None:
+        self.segments: list[list[str]] = [[]]
+        self.pending: list[str] = []
+        self.stats = PersistStats()
+        self.compactions = 0
+        self.encode_s = 0.0
+
+    def append(self, op: dict[str, Any]) -> None:
+        started = time.perf_counter()
+        self.pending.append(dart_json(op))
+        self.encode_s += time.perf_counter() - started
+
+    def op_count(self) -> int:
+        return sum(len(segment) for segment in self.segments)
+
+    def persist(self) -> None:
+        if not self.pending:
+            return
+        written = 0
+        for line in self.pending:
+            if len(self.segments[-1]) >= JOURNAL_SEGMENT_OPS:
+                written += self._segment_bytes(self.segments[-1])
+                self.segments.append([])
+            self.segments[-1].append(line)
+        written += self._segment_bytes(self.segments[-1])
+        self.pending = []
+        self.stats.record(written)
+
+    def maybe_compact(
+        self,
+        records: dict[str, dict[str, Any]],
+        projections: dict[str, dict[str, Any]],
+    ) -> None:
+        ops = self.op_count()
+        live = len(records) + len(projections)
+        if ops < JOURNAL_COMPACT_MIN_OPS or ops < live * JOURNAL_COMPACT_RATIO:
+            return
+        started = time.perf_counter()
+        lines = [dart_json({"o": "a", "r": record}) for record in records.values()]
+        lines += [dart_json({"o": "p", "k": k, "v": v}) for k, v in projections.items()]
+        self.encode_s += time.perf_counter() - started
+        self.segments = [
+            lines[i : i + JOURNAL_SEGMENT_OPS]
+            for i in range(0, len(lines), JOURNAL_SEGMENT_OPS)
+        ] or [[]]
+        self.pending = []
+        self.compactions += 1
+        self.stats.record(self.stored_bytes())
+
+    def stored_bytes(self) -> int:
+        return sum(self._segment_bytes(segment) for segment in self.segments)
+
+    def replay(self) -> tuple[list[dict[str, Any]], dict[str, dict[str, Any]]]:
+        records: dict[str, dict[str, Any]] = {}
+        projections: dict[str, dict[str, Any]] = {}
+        for segment in self.segments:
+            for line in segment:
+                op = json.loads(line)
+                kind = op["o"]
+                if kind == "a":
+                    records[op["r"]["id"]] = op["r"]
+                elif kind == "f":
+                    record = records.get(op["i"])
+                    if record is not None:
+                        record.update(
+                            syncState="retry_wait",
+                            syncAttempts=op["n"],
+                            lastTriedAt=op["t"],
+                            nextRetryAt=op["r"],
+                            lastSyncError=op["e"],
+                        )
+                elif kind == "s":
+                    records.pop(op["i"], None)
+                elif kind == "p":
+                    projections[op["k"]] = op["v"]
+        return list(records.values()), projections
+
+    @staticmethod
+    def _segment_bytes(segment: list[str]) -> int:
+        return sum(len(line.encode("utf-8")) + 1 for line in segment)
+
+
+class QueueModel:
+    """Replays repository calls against both persistence strategies."""
+
+    def __init__(
+        self,
+        config: SessionConfig,
+        curve: Callable[[int, bool], float],
+        rng: random.Random,
+    ) -> None:
+        self.config = config
+        self.curve = curve
+        self.rng = rng
+        self.records: dict[str, dict[str, Any]] = {}
+        self.projections: dict[str, dict[str, Any]] = {}
+        self.retry_heap: list[tuple[datetime, int, str]] = []
+        self.full = FullRewriteStore()
+        self.journal = ScoreJournal()
+        self.online = False
+        self.remote_calls = 0
+        self.max_sync_pass_s = 0.0
+        self._id_seq = 0
+
+    def save_score(self, now: datetime) -> float:
+        """Returns the seconds this `saveScore` call spends in remote writes."""
+        difficulty = self.rng.choice(tuple(TOTAL_QUESTIONS))
+        category = self.rng.choice(CATEGORIES)
+        total = TOTAL_QUESTIONS[difficulty]
+        score = self.rng.randint(total // 3, total)
+        self._id_seq += 1
+        record = {
+            "id": str(int(now.timestamp() * 1_000_000) + self._id_seq),
+            "categoryKey": category,
+            "difficulty": difficulty,
+            "score": score,
+            "totalQuestions": total,
+            "playedAt": iso(now),
+            "syncState": "pending",
+            "syncAttempts": 0,
+            "lastSyncError": None,
+            "lastTriedAt": None,
+            "nextRetryAt": None,
+        }
+        self._upsert_projection(category, difficulty, score, now, synced=False)
+        self.records[record["id"]] = record
+        self.full.update_record(record)
+        self.journal.append({"o": "a", "r": dict(record)})
+        heapq.heappush(self.retry_heap, (now, self._id_seq, record["id"]))
+        self._persist()
+        spent = self.sync_pending(now, force=False)
+        self._persist()
+        return spent
+
+    def sync_pending(self, now: datetime, force: bool) -> float:
+        due: list[str]
+        if force:
+            due = list(self.records)
+            self.retry_heap = []
+        else:
+            due = []
+            while self.retry_heap and self.retry_heap[0][0] <= now:
+                _, _, attempt_id = heapq.heappop(self.retry_heap)
+                if attempt_id in self.records:
+                    due.append(attempt_id)
+
+        spent = 0.0
+        for attempt_id in due:
+            record = self.records[attempt_id]
+            self.remote_calls += 1
+            if self.online:
+                spent += self.config.remote_ok_ms / 1000.0
+                self._upsert_projection(
+                    record["categoryKey"],
+                    record["difficulty"],
+                    record["score"],
+                    now,
+                    synced=True,
+                )
+                del self.records[attempt_id]
+                self.full.remove_record(attempt_id)
+                self.journal.append({"o": "s", "i": attempt_id})
+                continue
+
+            spent += self.config.offline_fail_ms / 1000.0
+            attempts = record["syncAttempts"] + 1
+            next_retry = now + timedelta(seconds=self.curve(attempts, True))
+            record.update(
+                syncState="retry_wait",
+                syncAttempts=attempts,
+                lastSyncError=CONNECTIVITY_ERROR,
+                lastTriedAt=iso(now),
+                nextRetryAt=iso(next_retry),
+            )
+            self.full.update_record(record)
+            self.journal.append(
+                {
+                    "o": "f",
+                    "i": attempt_id,
+                    "n": attempts,
+                    "t": record["lastTriedAt"],
+                    "r": record["nextRetryAt"],
+                    "e": CONNECTIVITY_ERROR,
+                }
+            )
+            self._id_seq += 1
+            heapq.heappush(self.retry_heap, (next_retry, self._id_seq, attempt_id))
+        self.max_sync_pass_s = max(self.max_sync_pass_s, spent)
+        return spent
+
+    def force_sync(self, now: datetime) -> float:
+        spent = self.sync_pending(now, force=True)
+        # A forced pass reschedules every record it touched; keep the heap
+        # covering the survivors.
+        for attempt_id, record in self.records.items():
+            self._id_seq += 1
+            next_retry = datetime.fromisoformat(record["nextRetryAt"] or iso(now))
+            heapq.heappush(self.retry_heap, (next_retry, self._id_seq, attempt_id))
+        self._persist()
+        return spent
+
+    def checkpoint(self, repeat: int = 3) -> Checkpoint:
+        attempts = list(self.records.values())
+        projections = list(self.projections.values())
+        encode = _best_of(repeat, lambda: (dart_json(attempts), dart_json(projections)))
+        encoded = dart_json(attempts)
+        decode = _best_of(repeat, lambda: json.loads(encoded))
+        replay_s = _best_of(1, self.journal.replay)
+        return Checkpoint(
+            queued=len(attempts),
+            stored_bytes=self.full.stored_bytes(),
+            # `saveScore` persists twice, so one save pays two encodes.
+            full_encode_ms=round(encode * 2000.0, 3),
+            full_decode_ms=round(decode * 1000.0, 3),
+            journal_encode_ms=0.0,
+            journal_stored_bytes=self.journal.stored_bytes(),
+            journal_replay_ms=round(replay_s * 1000.0, 3),
+        )
+
+    def journal_matches(self) -> bool:
+        records, projections = self.journal.replay()
+        return records == list(self.records.values()) and projections == self.projections
+
+    def _upsert_projection(
+        self,
+        category: str,
+        difficulty: str,
+        score: int,
+        now: datetime,
+        synced: bool,
+    ) -> None:
+        key = f"{category}::{difficulty}"
+        current = self.projections.get(key) or {
+            "categoryKey": category,
+            "difficulty": difficulty,
+            "bestScoreLocal": 0,
+            "bestScoreSynced": 0,
+            "updatedAt": iso(now),
+        }
+        updated = dict(current)
+        updated["bestScoreLocal"] = max(current["bestScoreLocal"], score)
+        if synced:
+            updated["bestScoreSynced"] = max(current["bestScoreSynced"], score)
+        updated["updatedAt"] = iso(now)
+        self.projections[key] = updated
+        self.full.update_projections(self.projections)
+        self.journal.append({"o": "p", "k": key, "v": dict(updated)})
+
+    def _persist(self) -> None:
+        self.full.persist()
+        self.journal.persist()
+        self.journal.maybe_compact(self.records, self.projections)
+
+
+def _best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def replay_session(config: SessionConfig, curve_name: str) -> ReplayResult:
+    rng = random.Random(config.seed)
+    model = QueueModel(config, BACKOFF_CURVES[curve_name], rng)
+    checkpoint_every = max(1, config.attempts // max(1, config.checkpoints))
+    checkpoints: list[Checkpoint] = []
+
+    now = SESSION_START
+    offline_blocked = 0.0
+    next_resume = (
+        now + timedelta(seconds=config.resume_interval_s)
+        if config.resume_interval_s > 0
+        else None
+    )
+    journal_encode_mark = 0.0
+    for index in range(config.attempts):
+        now += timedelta(seconds=config.save_interval_s)
+        if next_resume is not None and next_resume <= now:
+            offline_blocked += model.force_sync(next_resume)
+            next_resume += timedelta(seconds=config.resume_interval_s)
+        offline_blocked += model.save_score(now)
+        if (index + 1) % checkpoint_every == 0 or index + 1 == config.attempts:
+            point = model.checkpoint()
+            saves = index + 1 - (len(checkpoints) * checkpoint_every)
+            point.journal_encode_ms = round(
+                (model.journal.encode_s - journal_encode_mark) * 1000.0 / max(1, saves), 4
+            )
+            journal_encode_mark = model.journal.encode_s
+            checkpoints.append(point)
+
+    matches = model.journal_matches()
+    offline_calls = model.remote_calls
+    final_stored = model.full.stored_bytes()
+
+    # Connectivity returns; triggers keep firing at the same pace.
+    model.online = True
+    reconnect = now
+    backlog = set(model.records)
+    deadline = reconnect + timedelta(hours=config.max_drain_hours)
+    drain_s: float | None = None
+    next_save = now + timedelta(seconds=config.save_interval_s)
+    while backlog & set(model.records) and now < deadline:
+        if next_resume is not None and next_resume <= next_save:
+            now = next_resume
+            spent = model.force_sync(now)
+            next_resume += timedelta(seconds=config.resume_interval_s)
+        else:
+            now = next_save
+            spent = model.save_score(now)
+            next_save += timedelta(seconds=config.save_interval_s)
+        if not backlog & set(model.records):
+            drain_s = (now - reconnect).total_seconds() + spent
+
+    return ReplayResult(
+        curve=curve_name,
+        attempts=config.attempts,
+        offline_remote_calls=offline_calls,
+        offline_blocked_s=round(offline_blocked, 1),
+        max_sync_pass_s=round(model.max_sync_pass_s, 1),
+        drain_s=round(drain_s, 1) if drain_s is not None else None,
+        drain_remote_calls=model.remote_calls - offline_calls,
+        final_stored_bytes=final_stored,
+        full=model.full.stats,
+        journal=model.journal.stats,
+        journal_compactions=model.journal.compactions,
+        journal_replay_matches=matches and model.journal_matches(),
+        checkpoints=checkpoints,
+    )
+
+
+def render_report(results: list[ReplayResult]) -> str:
+    lines = [
+        "## Pending-score queue replay",
+        "",
+        "| Attempts | Curve | Offline calls | Blocked in sync (s) | Longest pass (s) "
+        "| Drain (s) | Stored bytes | Full-rewrite bytes written | Journal bytes written "
+        "| Compactions | Journal replay ok |",
+        "| --- | --- | --- | --- | --- | --- | --- | --- | --- | --- | --- |",
+    ]
+    for r in results:
+        drain = f"{r.drain_s:,.0f}" if r.drain_s is not None else "not drained"
+        lines.append(
+            f"| {r.attempts:,} | {r.curve} | {r.offline_remote_calls:,} "
+            f"| {r.offline_blocked_s:,.0f} | {r.max_sync_pass_s:,.1f} | {drain} "
+            f"| {r.final_stored_bytes:,} | {r.full.bytes_written:,} "
+            f"| {r.journal.bytes_written:,} | {r.journal_compactions} "
+            f"| {'yes' if r.journal_replay_matches else 'NO'} |"
+        )
+
+    seen: set[int] = set()
+    for r in results:
+        if r.attempts in seen:
+            continue
+        seen.add(r.attempts)
+        lines += [
+            "",
+            f"### Growth over {r.attempts:,} offline saves ({r.curve})",
+            "",
+            "| Queued | Stored bytes | Full encode ms/save | Full decode ms "
+            "| Journal encode ms/save | Journal bytes | Journal replay ms |",
+            "| --- | --- | --- | --- | --- | --- | --- |",
+        ]
+        for point in r.checkpoints:
+            lines.append(
+                f"| {point.queued:,} | {point.stored_bytes:,} | {point.full_encode_ms:.3f} "
+                f"| {point.full_decode_ms:.3f} | {point.journal_encode_ms:.4f} "
+                f"| {point.journal_stored_bytes:,} | {point.journal_replay_ms:.3f} |"
+            )
+    lines.append("")
+    return "\n".join(lines)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Replays long offline sessions through a model of "
+            "LocalFirstScoreRepository and compares full-rewrite persistence "
+            "with an append-only journal."
+        )
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument(
+        "--curves",
+        nargs="+",
+        choices=sorted(BACKOFF_CURVES),
+        default=list(BACKOFF_CURVES),
+    )
+    parser.add_argument("--save-interval-s", type=float, default=120.0)
+    parser.add_argument(
+        "--resume-interval-s",
+        type=float,
+        default=0.0,
+        help="Forced sync (app resume) interval; 0 disables forced triggers.",
+    )
+    parser.add_argument("--remote-ok-ms", type=float, default=180.0)
+    parser.add_argument("--offline-fail-ms", type=float, default=250.0)
+    parser.add_argument("--checkpoints", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--summary-file", type=Path)
+    parser.add_argument("--json-file", type=Path)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    results: list[ReplayResult] = []
+    for size in args.sizes:
+        for curve in args.curves:
+            config = SessionConfig(
+                attempts=size,
+                save_interval_s=args.save_interval_s,
+                resume_interval_s=args.resume_interval_s,
+                remote_ok_ms=args.remote_ok_ms,
+                offline_fail_ms=args.offline_fail_ms,
+                checkpoints=args.checkpoints,
+                seed=args.seed,
+            )
+            started = time.perf_counter()
+            result = replay_session(config, curve)
+            results.append(result)
+            print(
+                f"{size:>6} attempts  {curve:<16} stored={result.final_stored_bytes:>10,}B "
+                f"full_written={result.full.bytes_written:>14,}B "
+                f"journal_written={result.journal.bytes_written:>12,}B "
+                f"drain={result.drain_s}s "
+                f"({time.perf_counter() - started:.1f}s wall)"
+            )
+
+    report = render_report(results)
+    print()
+    print(report)
+    if args.summary_file:
+        args.summary_file.write_text(report, encoding="utf-8")
+    if args.json_file:
+        args.json_file.write_text(
+            json.dumps([asdict(r) for r in results], indent=2), encoding="utf-8"
+        )
+    return 0 if all(r.journal_replay_matches for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,13 +7,9 @@ import argparse
 import hashlib
 import json
 import pathlib
-import re
 import sys
 
-
-def normalize_key(raw: str) -> str:
-    key = re.sub(r"[^a-z0-9]+", " ", raw.lower()).strip()
-    return re.sub(r"\s+", " ", key)
+from tool_helpers import normalize_key
 
 
 BASELINE_TEMPLATES = (
@@ -25,6 +21,18 @@ BASELINE_TEMPLATES = (
 )
 
 
+def seed_entries(metadata: dict[str, str], asset_keys: list[str]) -> int:
+    added = 0
+    for key in asset_keys:
+        if key in metadata:
+            continue
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        template_idx = int(digest[:8], 16) % len(BASELINE_TEMPLATES)
+        metadata[key] = BASELINE_TEMPLATES[template_idx]
+        added += 1
+    return added
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Add baseline descriptions for missing flag metadata keys.",
@@ -65,14 +73,7 @@ def main() -> int:
         }
     )
 
-    added = 0
-    for key in asset_keys:
-        if key in metadata:
-            continue
-        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
-        template_idx = int(digest[:8], 16) % len(BASELINE_TEMPLATES)
-        metadata[key] = BASELINE_TEMPLATES[template_idx]
-        added += 1
+    added = seed_entries(metadata, asset_keys)
 
     metadata_path.write_text(json.dumps(dict(sorted(metadata.items())), indent=2) + "\n")
 
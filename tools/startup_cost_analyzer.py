@@ -0,0 +1,636 @@
+#!/usr/bin/env python3
+"""Static startup-cost analyzer for the `lib/main.dart` initialization chain.
+
+Walks the Dart import graph from `lib/main.dart`, measures the transitive
+source size pulled in per named route, lists awaited initializers that block
+the first frame, and flags deferred-import and `Future.wait` candidates.
+Source bytes are a proxy for compiled code size; they move in the same
+direction and are cheap to compute without a Flutter toolchain.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = ROOT / "lib"
+PUBSPEC = ROOT / "pubspec.yaml"
+DEFAULT_ENTRY = LIB_DIR / "main.dart"
+DEFAULT_BASELINE = ROOT / "tools" / "baselines" / "startup_cost.json"
+
+DIRECTIVE_RE = re.compile(
+    r"^\s*(import|export|part)\s+['\"]([^'\"]+)['\"]([^;]*);",
+    re.MULTILINE,
+)
+CLASS_RE = re.compile(r"^(?:abstract\s+)?class\s+([A-Za-z_]\w*)", re.MULTILINE)
+ROUTE_RE = re.compile(
+    r"([A-Z]\w*)\.routeName\s*:\s*\([^)]*\)\s*=>([\s\S]*?)"
+    r"(?=\n\s*[A-Z]\w*\.routeName\s*:|\n\s*\},)",
+)
+WIDGET_CALL_RE = re.compile(r"\b([A-Z]\w*)\s*\(")
+# Widgets that wrap the route's screen (`AuthGuard(child: HomeScreen())`).
+WRAPPER_CALL_RE = re.compile(r"\b([A-Z]\w*)\s*\([^()]*\bchild\s*:")
+INITIAL_ROUTE_RE = re.compile(r"initialRoute\s*:\s*([A-Z]\w*)\.routeName")
+AWAIT_RE = re.compile(r"await\s+([A-Za-z_][\w.]*)\s*(?:\.(\w+))?\s*\(")
+ASSIGNMENT_RE = re.compile(
+    r"(?:final|var|late\s+final)\s+(\w+)\s*=\s*([A-Z]\w*)(?:\.instance|\s*\()",
+)
+
+
+@dataclass
+class DartModule:
+    rel_path: str
+    size_bytes: int
+    lines: int
+    imports: list[str] = field(default_factory=list)
+    deferred_imports: list[str] = field(default_factory=list)
+    packages: list[str] = field(default_factory=list)
+
+
+@dataclass
+class RouteCost:
+    route: str
+    widgets: list[str]
+    screens: list[str]
+    files: int
+    size_bytes: int
+    added_bytes: int
+
+
+@dataclass
+class Initializer:
+    line: int
+    expression: str
+    receiver: str
+    service_class: str | None
+    service_path: str | None
+
+
+@dataclass
+class DeferredCandidate:
+    route: str
+    screen: str
+    import_path: str
+    removable_bytes: int
+    deferrable_bytes: int
+    eager_importers: list[str]
+    suggestion: str
+
+
+@dataclass
+class StartupReport:
+    entry: str
+    generated_at: float
+    modules: int
+    startup_bytes: int
+    startup_lines: int
+    external_packages: list[str]
+    initial_route: str | None
+    routes: list[RouteCost]
+    blocking_initializers: list[Initializer]
+    parallel_waves: list[list[str]]
+    deferred_candidates: list[DeferredCandidate]
+
+
+def read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def write_text(path: Path, content: str) -> None:
+    path.write_text(content, encoding="utf-8")
+
+
+def package_name() -> str:
+    if not PUBSPEC.exists():
+        return "app"
+    match = re.search(
+        r"(?m)^\s*name\s*:\s*([a-zA-Z0-9_]+)\s*$",
+        read_text(PUBSPEC),
+    )
+    return match.group(1) if match else "app"
+
+
+def line_for_index(text: str, index: int) -> int:
+    return text.count("\n", 0, index) + 1
+
+
+def resolve_uri(uri: str, source: Path, pkg: str) -> tuple[Path | None, str | None]:
+    """Returns `(local_path, external_package)` for one directive URI."""
+    if uri.startswith("dart:"):
+        return None, None
+    if uri.startswith("package:"):
+        name, _, rest = uri[len("package:") :].partition("/")
+        if name == pkg:
+            return (LIB_DIR / rest).resolve(), None
+        return None, name
+    return (source.parent / uri).resolve(), None
+
+
+def build_graph(entry: Path, pkg: str) -> dict[str, DartModule]:
+    graph: dict[str, DartModule] = {}
+    pending = [entry.resolve()]
+    while pending:
+        path = pending.pop()
+        rel = path.relative_to(ROOT).as_posix()
+        if rel in graph or not path.exists():
+            continue
+
+        text = read_text(path)
+        module = DartModule(
+            rel_path=rel,
+            size_bytes=len(text.encode("utf-8")),
+            lines=text.count("\n") + 1,
+        )
+        packages: set[str] = set()
+        for match in DIRECTIVE_RE.finditer(text):
+            local, external = resolve_uri(match.group(2), path, pkg)
+            if external:
+                packages.add(external)
+            if local is None:
+                continue
+            target = local.relative_to(ROOT).as_posix()
+            if re.search(r"\bdeferred\s+as\b", match.group(3)):
+                module.deferred_imports.append(target)
+            else:
+                module.imports.append(target)
+            pending.append(local)
+        module.packages = sorted(packages)
+        graph[rel] = module
+    return graph
+
+
+def closure(
+    graph: dict[str, DartModule],
+    starts: list[str],
+    skip_edge: tuple[str, str] | None = None,
+    stop_at: set[str] | None = None,
+) -> set[str]:
+    """Returns every module eagerly reachable from `starts`.
+
+    `skip_edge` drops one `(importer, imported)` edge, which models turning
+    that single import into a deferred import. Modules in `stop_at` are never
+    entered.
+    """
+    seen: set[str] = set()
+    stack = [s for s in starts if s in graph]
+    while stack:
+        rel = stack.pop()
+        if rel in seen or (stop_at and rel in stop_at):
+            continue
+        seen.add(rel)
+        stack.extend(
+            target
+            for target in graph[rel].imports
+            if (rel, target) != skip_edge
+        )
+    return seen
+
+
+def bytes_of(graph: dict[str, DartModule], modules: set[str]) -> int:
+    return sum(graph[m].size_bytes for m in modules)
+
+
+def index_classes(graph: dict[str, DartModule]) -> dict[str, str]:
+    out: dict[str, str] = {}
+    for rel in sorted(graph):
+        for match in CLASS_RE.finditer(read_text(ROOT / rel)):
+            out.setdefault(match.group(1), rel)
+    return out
+
+
+def extract_block(text: str, opening_brace: int) -> str:
+    depth = 0
+    for idx in range(opening_brace, len(text)):
+        ch = text[idx]
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[opening_brace + 1 : idx]
+    return text[opening_brace + 1 :]
+
+
+def analyze_routes(
+    entry_text: str,
+    graph: dict[str, DartModule],
+    classes: dict[str, str],
+    entry_rel: str,
+) -> tuple[list[RouteCost], str | None]:
+    initial = INITIAL_ROUTE_RE.search(entry_text)
+    initial_route = initial.group(1) if initial else None
+    route_modules: dict[str, set[str]] = {}
+    widgets_by_route: dict[str, list[str]] = {}
+    screens_by_route: dict[str, list[str]] = {}
+
+    for match in ROUTE_RE.finditer(entry_text):
+        # A route is charged for what its builder constructs; the route class
+        # itself may only supply `routeName` (UpgradeAccountScreen builds
+        # HomeScreen).
+        route = match.group(1)
+        builder = match.group(2)
+        widgets = sorted(
+            {
+                name
+                for name in WIDGET_CALL_RE.findall(builder)
+                if name in classes and classes[name] != entry_rel
+            }
+        )
+        wrappers = set(WRAPPER_CALL_RE.findall(builder))
+        widgets_by_route[route] = widgets
+        screens_by_route[route] = [w for w in widgets if w not in wrappers] or widgets
+        route_modules[route] = closure(graph, [classes[w] for w in widgets])
+
+    # The shell is what main.dart needs regardless of route: services,
+    # config, and shared widgets, without walking into any route screen.
+    # Added bytes are what a route costs on top of that.
+    route_files = {classes[w] for screens in screens_by_route.values() for w in screens}
+    shell = closure(graph, [entry_rel], stop_at=route_files)
+
+    costs = [
+        RouteCost(
+            route=route,
+            widgets=widgets_by_route[route],
+            screens=screens_by_route[route],
+            files=len(modules),
+            size_bytes=bytes_of(graph, modules),
+            added_bytes=bytes_of(graph, modules - shell),
+        )
+        for route, modules in route_modules.items()
+    ]
+    costs.sort(key=lambda c: (-c.size_bytes, c.route))
+    return costs, initial_route
+
+
+def analyze_initializers(
+    entry_text: str,
+    classes: dict[str, str],
+) -> list[Initializer]:
+    match = re.search(r"\bmain\s*\([^)]*\)\s*(?:async\s*)?\{", entry_text)
+    if not match:
+        return []
+    body_start = match.end() - 1
+    body = extract_block(entry_text, body_start)
+    first_frame = min(
+        [i for i in (body.find("runApp("), body.find("runZonedGuarded(")) if i >= 0]
+        or [len(body)]
+    )
+
+    receivers = {m.group(1): m.group(2) for m in ASSIGNMENT_RE.finditer(body)}
+    out: list[Initializer] = []
+    for await_match in AWAIT_RE.finditer(body, 0, first_frame):
+        target = await_match.group(1)
+        receiver = target.split(".", 1)[0]
+        service_class = receivers.get(receiver, receiver if receiver in classes else None)
+        statement_end = body.find(";", await_match.start())
+        expression = re.sub(
+            r"\s+",
+            " ",
+            body[await_match.start() : statement_end if statement_end >= 0 else None],
+        ).strip()
+        out.append(
+            Initializer(
+                line=line_for_index(entry_text, body_start + 1 + await_match.start()),
+                expression=expression,
+                receiver=receiver,
+                service_class=service_class,
+                service_path=classes.get(service_class) if service_class else None,
+            )
+        )
+    return out
+
+
+def parallel_waves(
+    initializers: list[Initializer],
+    graph: dict[str, DartModule],
+) -> list[list[str]]:
+    """Groups awaited initializers into waves that could run under `Future.wait`.
+
+    The first awaited call is treated as a barrier (`Firebase.initializeApp`
+    must finish before any plugin touches Firebase). After that, a service
+    lands one wave after any other initialized service it imports.
+    """
+    if not initializers:
+        return []
+
+    waves: list[list[str]] = [[initializers[0].receiver]]
+    remaining = initializers[1:]
+    by_path = {i.service_path: i.receiver for i in remaining if i.service_path}
+    level: dict[str, int] = {}
+
+    def resolve_level(init: Initializer, trail: frozenset[str]) -> int:
+        if init.receiver in level:
+            return level[init.receiver]
+        deps = [
+            next(i for i in remaining if i.receiver == by_path[rel])
+            for rel in closure(graph, [init.service_path] if init.service_path else [])
+            if rel in by_path and rel != init.service_path and by_path[rel] not in trail
+        ]
+        value = 1 + max(
+            (resolve_level(dep, trail | {init.receiver}) for dep in deps),
+            default=0,
+        )
+        level[init.receiver] = value
+        return value
+
+    for init in remaining:
+        resolve_level(init, frozenset())
+    for wave in sorted(set(level.values())):
+        waves.append([r for r in (i.receiver for i in remaining) if level[r] == wave])
+    return waves
+
+
+def deferred_candidates(
+    routes: list[RouteCost],
+    graph: dict[str, DartModule],
+    entry_rel: str,
+    classes: dict[str, str],
+    initial_route: str | None,
+    min_bytes: int,
+) -> list[DeferredCandidate]:
+    """Flags route screens worth loading through a deferred import.
+
+    `removable_bytes` is what leaves the eager set once every eager import of
+    the screen is deferred: the modules reachable from main.dart only through
+    it. `deferrable_bytes` is what deferring only main.dart's import drops
+    today; when other eager modules import the screen it stays 0 and
+    `eager_importers` lists the edges to cut first. Routes that build the
+    same screen share one candidate.
+    """
+    startup = closure(graph, [entry_rel])
+    initial = next((r for r in routes if r.route == initial_route), None)
+    initial_screens = set(initial.screens) if initial else set()
+    routes_by_screen: dict[str, list[str]] = {}
+    for route in routes:
+        if route.route == initial_route:
+            continue
+        for screen in route.screens:
+            if screen not in initial_screens:
+                routes_by_screen.setdefault(screen, []).append(route.route)
+
+    out: list[DeferredCandidate] = []
+    for screen, screen_routes in routes_by_screen.items():
+        import_path = classes[screen]
+        if import_path not in graph[entry_rel].imports:
+            continue
+        removable = bytes_of(graph, startup - closure(graph, [entry_rel], stop_at={import_path}))
+        if removable < min_bytes:
+            continue
+        remaining = closure(graph, [entry_rel], skip_edge=(entry_rel, import_path))
+        importers = sorted(
+            rel
+            for rel in remaining
+            if rel != entry_rel and import_path in graph[rel].imports
+        )
+        alias = re.sub(r"(?<!^)(?=[A-Z])", "_", screen).lower()
+        out.append(
+            DeferredCandidate(
+                route=", ".join(sorted(screen_routes)),
+                screen=screen,
+                import_path=import_path,
+                removable_bytes=removable,
+                deferrable_bytes=bytes_of(graph, startup - remaining),
+                eager_importers=importers,
+                suggestion=(
+                    f"import '{import_path.removeprefix('lib/')}' deferred as {alias}; "
+                    f"await {alias}.loadLibrary() before pushing the route."
+                ),
+            )
+        )
+    out.sort(key=lambda c: (-c.deferrable_bytes, -c.removable_bytes, c.screen))
+    return out
+
+
+def analyze(entry: Path, min_deferred_bytes: int) -> StartupReport:
+    pkg = package_name()
+    graph = build_graph(entry, pkg)
+    entry_rel = entry.resolve().relative_to(ROOT).as_posix()
+    entry_text = read_text(entry)
+    classes = index_classes(graph)
+
+    startup = closure(graph, [entry_rel])
+    routes, initial_route = analyze_routes(entry_text, graph, classes, entry_rel)
+    initializers = analyze_initializers(entry_text, classes)
+
+    return StartupReport(
+        entry=entry_rel,
+        generated_at=time.time(),
+        modules=len(startup),
+        startup_bytes=bytes_of(graph, startup),
+        startup_lines=sum(graph[m].lines for m in startup),
+        external_packages=sorted({p for m in startup for p in graph[m].packages}),
+        initial_route=initial_route,
+        routes=routes,
+        blocking_initializers=initializers,
+        parallel_waves=parallel_waves(initializers, graph),
+        deferred_candidates=deferred_candidates(
+            routes,
+            graph,
+            entry_rel,
+            classes,
+            initial_route,
+            min_deferred_bytes,
+        ),
+    )
+
+
+def compare_to_baseline(
+    report: StartupReport,
+    baseline: dict,
+    max_growth: float,
+) -> list[str]:
+    regressions: list[str] = []
+    base_bytes = int(baseline.get("startup_bytes", 0))
+    if base_bytes and report.startup_bytes > base_bytes * (1 + max_growth):
+        regressions.append(
+            f"startup bytes grew {base_bytes} -> {report.startup_bytes} "
+            f"(> {max_growth * 100:.1f}% budget)."
+        )
+
+    base_blocking = len(baseline.get("blocking_initializers", []))
+    if len(report.blocking_initializers) > base_blocking:
+        regressions.append(
+            "awaited initializers before first frame increased "
+            f"{base_blocking} -> {len(report.blocking_initializers)}."
+        )
+
+    base_routes = {r["route"]: r for r in baseline.get("routes", [])}
+    for route in report.routes:
+        previous = base_routes.get(route.route)
+        if not previous or not previous.get("size_bytes"):
+            continue
+        if route.size_bytes > previous["size_bytes"] * (1 + max_growth):
+            regressions.append(
+                f"route `{route.route}` grew {previous['size_bytes']} -> "
+                f"{route.size_bytes} bytes."
+            )
+    return regressions
+
+
+def render_summary_markdown(report: StartupReport, regressions: list[str]) -> str:
+    lines = [
+        "## Startup Cost Report",
+        "",
+        f"- Entry: `{report.entry}`",
+        f"- Eagerly imported modules: **{report.modules}**",
+        f"- Eager source size: **{report.startup_bytes:,} bytes** "
+        f"({report.startup_lines:,} lines)",
+        f"- External packages: {len(report.external_packages)}",
+        "",
+        "### Awaited Before First Frame",
+        "",
+    ]
+    if report.blocking_initializers:
+        for init in report.blocking_initializers:
+            lines.append(f"- L{init.line}: `{init.expression}`")
+    else:
+        lines.append("- None.")
+
+    if len(report.parallel_waves) > 1:
+        lines += ["", "### Future.wait Candidates", ""]
+        for index, wave in enumerate(report.parallel_waves):
+            label = "barrier" if index == 0 else f"wave {index}"
+            lines.append(f"- {label}: {', '.join(f'`{r}`' for r in wave)}")
+
+    lines += [
+        "",
+        "### Routes",
+        "",
+        "| Route | Files | Bytes | Added over shell |",
+        "| --- | --- | --- | --- |",
+    ]
+    for route in report.routes:
+        lines.append(
+            f"| `{route.route}` | {route.files} | {route.size_bytes:,} | "
+            f"{route.added_bytes:,} |"
+        )
+
+    if report.deferred_candidates:
+        lines += ["", "### Deferred Import Candidates", ""]
+        for candidate in report.deferred_candidates:
+            lines.append(
+                f"- `{candidate.screen}` (`{candidate.import_path}`, routes: {candidate.route}): "
+                f"{candidate.removable_bytes:,} bytes removable, "
+                f"{candidate.deferrable_bytes:,} bytes deferrable today. "
+                f"{candidate.suggestion}"
+            )
+            if candidate.eager_importers:
+                importers = ", ".join(f"`{i}`" for i in candidate.eager_importers)
+                lines.append(f"  - Also eagerly imported by: {importers}")
+
+    if regressions:
+        lines += ["", "### Regressions", ""]
+        lines += [f"- {r}" for r in regressions]
+    lines.append("")
+    return "\n".join(lines)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Startup cost analyzer: measures the import graph behind "
+            "lib/main.dart and gates regressions against a baseline."
+        )
+    )
+    parser.add_argument("--entry", type=Path, default=DEFAULT_ENTRY)
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help="Baseline report JSON used for the regression gate.",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the current report to --baseline instead of comparing.",
+    )
+    parser.add_argument(
+        "--max-growth",
+        type=float,
+        default=0.05,
+        help="Allowed fractional growth in startup/route bytes (default 0.05).",
+    )
+    parser.add_argument(
+        "--min-deferred-bytes",
+        type=int,
+        default=4096,
+        help="Minimum bytes a deferred import must remove before a screen is a candidate.",
+    )
+    parser.add_argument(
+        "--history-file",
+        type=Path,
+        help="Append a one-line JSON summary to this file for trend tracking.",
+    )
+    parser.add_argument("--summary-file", type=Path)
+    parser.add_argument("--json-file", type=Path)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    entry = args.entry.resolve()
+    if not entry.exists():
+        print(f"ERROR: entry file not found: {entry}")
+        return 2
+
+    report = analyze(entry, args.min_deferred_bytes)
+    payload = asdict(report)
+
+    regressions: list[str] = []
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        baseline_payload = {k: v for k, v in payload.items() if k != "generated_at"}
+        write_text(args.baseline, json.dumps(baseline_payload, indent=2) + "\n")
+        print(f"Updated baseline {args.baseline}.")
+    elif args.baseline.exists():
+        baseline = json.loads(read_text(args.baseline))
+        regressions = compare_to_baseline(report, baseline, args.max_growth)
+    else:
+        print(f"No baseline at {args.baseline}; skipping regression gate.")
+
+    print(
+        f"Startup cost: {report.modules} modules, {report.startup_bytes:,} bytes, "
+        f"{len(report.blocking_initializers)} awaited initializers before first frame."
+    )
+    for candidate in report.deferred_candidates:
+        print(
+            f"- deferred candidate {candidate.screen}: "
+            f"{candidate.removable_bytes:,} bytes removable, "
+            f"{candidate.deferrable_bytes:,} deferrable today"
+        )
+    if len(report.parallel_waves) > 1:
+        waves = " | ".join(", ".join(w) for w in report.parallel_waves)
+        print(f"- Future.wait waves: {waves}")
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+
+    if args.summary_file:
+        write_text(args.summary_file, render_summary_markdown(report, regressions))
+    if args.json_file:
+        write_text(args.json_file, json.dumps(payload, indent=2) + "\n")
+    if args.history_file:
+        with args.history_file.open("a", encoding="utf-8") as handle:
+            handle.write(
+                json.dumps(
+                    {
+                        "generated_at": report.generated_at,
+                        "modules": report.modules,
+                        "startup_bytes": report.startup_bytes,
+                        "blocking_initializers": len(report.blocking_initializers),
+                        "deferred_candidates": len(report.deferred_candidates),
+                    }
+                )
+                + "\n"
+            )
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
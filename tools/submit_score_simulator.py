@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""Local load simulator for the `submitScore` callable.
+
+Replays the validation, idempotency, 20-per-10-minute rate limit, and
+best-score projection semantics of `functions/index.cjs` against the
+in-memory store from `firestore_sim.py`, then reports reads, writes, and
+latency percentiles per submit plus the hottest documents.
+
+Time is virtual: submits are generated on a simulated timeline and run
+concurrently through asyncio, and latency comes from a per-operation model
+instead of wall-clock sleeps, so thousands of users simulate in seconds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from firestore_sim import SERVER_TIMESTAMP, DocumentStore, Transaction
+from tool_helpers import percentile
+
+
+# Mirrors functions/index.cjs.
+ALLOWED_CATEGORIES = {"flag", "capital"}
+EXPECTED_TOTAL_QUESTIONS = {"easy": 15, "intermediate": 30, "expert": 50}
+MIN_DURATION_MS = 5_000
+MAX_DURATION_MS = 30 * 60_000
+RATE_LIMIT_ATTEMPTS = 20
+RATE_LIMIT_WINDOW_MS = 10 * 60_000
+TOO_FAST_PERFECT_MS = 8_000
+
+# Firestore list prices (USD per 100k operations); override for your region.
+DEFAULT_READ_PRICE = 0.06
+DEFAULT_WRITE_PRICE = 0.18
+# Sustained writes above ~1/sec to one document start to contend.
+HOT_DOC_WRITES_PER_SECOND = 1
+
+
+@dataclass
+class LatencyModel:
+    read_ms: float = 8.0
+    query_ms: float = 14.0
+    commit_ms: float = 22.0
+    invoke_ms: float = 35.0
+    jitter_sigma: float = 0.35
+
+    def sample(self, base: float, rng: random.Random) -> float:
+        return base * rng.lognormvariate(0.0, self.jitter_sigma)
+
+
+@dataclass
+class SubmitOutcome:
+    status: str
+    reads: int
+    writes: int
+    latency_ms: float
+    rejection_code: str | None = None
+
+
+@dataclass
+class Meter:
+    """Per-submit operation meter; counts what this call alone was billed."""
+
+    store: DocumentStore
+    model: LatencyModel
+    rng: random.Random
+    reads: int = 0
+    writes: int = 0
+    latency_ms: float = 0.0
+
+    async def _io(self, base: float) -> None:
+        self.latency_ms += self.model.sample(base, self.rng)
+        # Yield so concurrent submits interleave between operations.
+        await asyncio.sleep(0)
+
+    async def get(self, path: str):
+        await self._io(self.model.read_ms)
+        self.reads += 1
+        return self.store.get(path)
+
+    async def query(self, collection: str, **kwargs):
+        await self._io(self.model.query_ms)
+        docs = self.store.query(collection, **kwargs)
+        self.reads += max(1, len(docs))
+        return docs
+
+    async def run_transaction(self, fn):
+        attempt_writes = [0]
+
+        async def wrapped(tx: Transaction):
+            attempt_writes[0] = 0
+            return await fn(MeteredTransaction(self, tx, attempt_writes))
+
+        result = await self.store.run_transaction(wrapped)
+        await self._io(self.model.commit_ms)
+        self.writes += attempt_writes[0]
+        return result
+
+
+@dataclass
+class MeteredTransaction:
+    meter: Meter
+    tx: Transaction
+    attempt_writes: list[int] = field(default_factory=lambda: [0])
+
+    async def get(self, path: str):
+        await self.meter._io(self.meter.model.read_ms)
+        self.meter.reads += 1
+        return self.tx.get(path)
+
+    def set(self, path: str, data: dict[str, Any], merge: bool = False) -> None:
+        self.attempt_writes[0] += 1
+        self.tx.set(path, data, merge=merge)
+
+
+def to_trimmed_string(value: Any) -> str:
+    return value.strip() if isinstance(value, str) else ""
+
+
+def to_int(value: Any) -> int | None:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def validate_payload(payload: dict[str, Any]) -> tuple[str | None, dict[str, Any]]:
+    """Returns `(rejection_code, normalized_fields)` like `submitScore`."""
+    attempt_id = to_trimmed_string(payload.get("attemptId"))
+    category = to_trimmed_string(payload.get("categoryKey"))
+    difficulty = to_trimmed_string(payload.get("difficulty"))
+    correct = to_int(payload.get("correctCount"))
+    total = to_int(payload.get("totalQuestions"))
+    started = payload.get("startedAt")
+    finished = payload.get("finishedAt")
+    fields = {
+        "attemptId": attempt_id,
+        "categoryKey": category,
+        "difficulty": difficulty,
+        "correctCount": correct,
+        "totalQuestions": total,
+    }
+
+    if not 1 <= len(attempt_id) <= 120:
+        return "invalid_attempt_id", fields
+    if category not in ALLOWED_CATEGORIES:
+        return "unsupported_category", fields
+    if difficulty not in EXPECTED_TOTAL_QUESTIONS:
+        return "unsupported_difficulty", fields
+    if total != EXPECTED_TOTAL_QUESTIONS[difficulty]:
+        return "invalid_total_questions", fields
+    if correct is None or correct < 0 or correct > total:
+        return "invalid_score_bounds", fields
+    if not isinstance(started, (int, float)) or not isinstance(finished, (int, float)):
+        return "invalid_timestamps", fields
+    duration = finished - started
+    if duration <= 0:
+        return "invalid_timestamps", fields
+    if duration < MIN_DURATION_MS or duration > MAX_DURATION_MS:
+        return "invalid_duration", fields
+    fields["durationMs"] = duration
+    return None, fields
+
+
+async def is_rate_limited(meter: Meter, uid: str, now_ms: float) -> bool:
+    docs = await meter.query(
+        f"users/{uid}/attempts",
+        where=[("createdAt", ">=", now_ms - RATE_LIMIT_WINDOW_MS)],
+        limit=RATE_LIMIT_ATTEMPTS,
+    )
+    return len(docs) >= RATE_LIMIT_ATTEMPTS
+
+
+async def submit_score(meter: Meter, uid: str, payload: dict[str, Any]) -> SubmitOutcome:
+    meter.latency_ms += meter.model.sample(meter.model.invoke_ms, meter.rng)
+    code, fields = validate_payload(payload)
+    if code:
+        return SubmitOutcome("rejected", meter.reads, meter.writes, meter.latency_ms, code)
+
+    scope = f"{fields['categoryKey']}_{fields['difficulty']}"
+    score_path = f"users/{uid}/scores/{scope}"
+    attempt_path = f"users/{uid}/attempts/{fields['attemptId']}"
+    leaderboard_path = f"leaderboard/{scope}/entries/{uid}"
+
+    if await meter.get(attempt_path):
+        await meter.get(score_path)
+        return SubmitOutcome("duplicate", meter.reads, meter.writes, meter.latency_ms)
+
+    if await is_rate_limited(meter, uid, meter.store.now_ms()):
+        return SubmitOutcome(
+            "rate_limited", meter.reads, meter.writes, meter.latency_ms, "rate_limited"
+        )
+
+    correct = fields["correctCount"]
+    risky = (
+        correct == fields["totalQuestions"]
+        and fields["durationMs"] < TOO_FAST_PERFECT_MS
+    )
+    attempt_status = "flagged" if risky else "accepted"
+
+    async def body(tx: MeteredTransaction) -> str:
+        if await tx.get(attempt_path):
+            await tx.get(score_path)
+            return "duplicate"
+        tx.set(
+            attempt_path,
+            {**fields, "status": attempt_status, "createdAt": SERVER_TIMESTAMP},
+        )
+        # index.cjs reads the score doc after writing the attempt; the store
+        # counts this so the report can flag it.
+        snapshot = await tx.get(score_path)
+        previous = int(snapshot.data.get("bestScore", 0)) if snapshot else 0
+        if correct > previous:
+            tx.set(
+                score_path,
+                {"bestScore": correct, "updatedAt": SERVER_TIMESTAMP},
+                merge=True,
+            )
+            tx.set(
+                leaderboard_path,
+                {"score": correct, "updatedAt": SERVER_TIMESTAMP},
+                merge=True,
+            )
+        return attempt_status
+
+    status = await meter.run_transaction(body)
+    return SubmitOutcome(status, meter.reads, meter.writes, meter.latency_ms)
+
+
+@dataclass
+class TrafficConfig:
+    users: int = 5000
+    minutes: float = 60.0
+    grinder_share: float = 0.02
+    retry_share: float = 0.05
+    invalid_share: float = 0.01
+    seed: int = 7
+
+
+def sample_correct(rng: random.Random, total: int, skill: float) -> int:
+    return sum(1 for _ in range(total) if rng.random() < skill)
+
+
+def generate_traffic(config: TrafficConfig) -> list[tuple[float, str, dict[str, Any]]]:
+    """Builds `(time_ms, uid, payload)` submissions sorted by time.
+
+    Regular players finish a quiz every few minutes; grinders resubmit about
+    every 20 seconds and hit the rate limit; some submits are retried with
+    the same attemptId (duplicates) and a few payloads are malformed.
+    """
+    rng = random.Random(config.seed)
+    horizon = config.minutes * 60_000
+    events: list[tuple[float, str, dict[str, Any]]] = []
+    for index in range(config.users):
+        uid = f"user{index:07d}"
+        grinder = rng.random() < config.grinder_share
+        skill = rng.betavariate(4, 2)
+        t = rng.uniform(0, horizon * 0.2)
+        attempt = 0
+        while t < horizon:
+            difficulty = rng.choices(
+                ["easy", "intermediate", "expert"], weights=[5, 3, 2]
+            )[0]
+            total = EXPECTED_TOTAL_QUESTIONS[difficulty]
+            duration = (
+                rng.uniform(6_000, 12_000)
+                if grinder
+                else total * rng.uniform(2_500, 7_000)
+            )
+            duration = min(duration, MAX_DURATION_MS - 1)
+            finished = t + duration
+            payload = {
+                "attemptId": f"{uid}-{attempt}",
+                "categoryKey": rng.choice(sorted(ALLOWED_CATEGORIES)),
+                "difficulty": difficulty,
+                "correctCount": sample_correct(rng, total, skill),
+                "totalQuestions": total,
+                "startedAt": t,
+                "finishedAt": finished,
+            }
+            if rng.random() < config.invalid_share:
+                payload["totalQuestions"] = total + 1
+            events.append((finished, uid, payload))
+            if rng.random() < config.retry_share:
+                events.append((finished + rng.uniform(200, 5_000), uid, dict(payload)))
+            attempt += 1
+            gap = rng.uniform(2_000, 10_000) if grinder else rng.expovariate(1 / 240_000)
+            t = finished + gap
+    events.sort(key=lambda e: e[0])
+    return events
+
+
+def hot_documents(
+    write_log: list[tuple[float, str]],
+    top: int,
+) -> list[dict[str, Any]]:
+    per_second: Counter = Counter()
+    totals: Counter = Counter()
+    for t, path in write_log:
+        per_second[(path, int(t // 1000))] += 1
+        totals[path] += 1
+    peak: dict[str, int] = defaultdict(int)
+    for (path, _), count in per_second.items():
+        peak[path] = max(peak[path], count)
+    ranked = sorted(peak.items(), key=lambda item: (-item[1], -totals[item[0]], item[0]))
+    return [
+        {
+            "path": path,
+            "peak_writes_per_second": count,
+            "total_writes": totals[path],
+            "over_limit": count > HOT_DOC_WRITES_PER_SECOND,
+        }
+        for path, count in ranked[:top]
+    ]
+
+
+async def simulate(
+    config: TrafficConfig,
+    model: LatencyModel,
+    tick_ms: float,
+) -> tuple[list[SubmitOutcome], DocumentStore]:
+    clock = {"now": 0.0}
+    store = DocumentStore(clock=lambda: clock["now"], record_writes=True)
+    rng = random.Random(config.seed + 1)
+    events = generate_traffic(config)
+
+    outcomes: list[SubmitOutcome] = []
+    index = 0
+    while index < len(events):
+        window_end = events[index][0] + tick_ms
+        batch = []
+        while index < len(events) and events[index][0] < window_end:
+            batch.append(events[index])
+            index += 1
+        clock["now"] = batch[0][0]
+        outcomes.extend(
+            await asyncio.gather(
+                *(submit_score(Meter(store, model, rng), uid, payload) for _, uid, payload in batch)
+            )
+        )
+    return outcomes, store
+
+
+def summarize(
+    outcomes: list[SubmitOutcome],
+    store: DocumentStore,
+    read_price: float,
+    write_price: float,
+    top_hot: int,
+) -> dict[str, Any]:
+    latencies = sorted(o.latency_ms for o in outcomes)
+    by_status: dict[str, list[SubmitOutcome]] = defaultdict(list)
+    for outcome in outcomes:
+        by_status[outcome.status].append(outcome)
+
+    total_reads = sum(o.reads for o in outcomes)
+    total_writes = sum(o.writes for o in outcomes)
+    submits = max(1, len(outcomes))
+    cost_per_million = (
+        total_reads / submits * 1_000_000 / 100_000 * read_price
+        + total_writes / submits * 1_000_000 / 100_000 * write_price
+    )
+    return {
+        "submits": len(outcomes),
+        "store": store.counters.snapshot(),
+        "reads_per_submit": total_reads / submits,
+        "writes_per_submit": total_writes / submits,
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+        "by_status": {
+            status: {
+                "count": len(items),
+                "reads_per_submit": sum(o.reads for o in items) / len(items),
+                "writes_per_submit": sum(o.writes for o in items) / len(items),
+                "p95_latency_ms": percentile(sorted(o.latency_ms for o in items), 95),
+            }
+            for status, items in sorted(by_status.items())
+        },
+        "rejection_codes": dict(
+            Counter(o.rejection_code for o in outcomes if o.rejection_code)
+        ),
+        "firestore_cost_per_million_submits_usd": round(cost_per_million, 2),
+        "hot_documents": hot_documents(store.write_log or [], top_hot),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Simulate submitScore traffic against an in-memory Firestore "
+            "stand-in and report per-submit cost and latency."
+        )
+    )
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--minutes", type=float, default=60.0)
+    parser.add_argument("--grinder-share", type=float, default=0.02)
+    parser.add_argument("--retry-share", type=float, default=0.05)
+    parser.add_argument("--invalid-share", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--tick-ms",
+        type=float,
+        default=250.0,
+        help="Submits within one tick run concurrently.",
+    )
+    parser.add_argument("--read-price", type=float, default=DEFAULT_READ_PRICE)
+    parser.add_argument("--write-price", type=float, default=DEFAULT_WRITE_PRICE)
+    parser.add_argument("--top-hot", type=int, default=10)
+    parser.add_argument("--json-file", type=Path)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    config = TrafficConfig(
+        users=args.users,
+        minutes=args.minutes,
+        grinder_share=args.grinder_share,
+        retry_share=args.retry_share,
+        invalid_share=args.invalid_share,
+        seed=args.seed,
+    )
+    model = LatencyModel()
+    outcomes, store = asyncio.run(simulate(config, model, args.tick_ms))
+    report = summarize(outcomes, store, args.read_price, args.write_price, args.top_hot)
+    report["config"] = asdict(config)
+
+    print(f"Simulated submits: {report['submits']:,} from {config.users:,} users")
+    print(
+        f"Per submit: {report['reads_per_submit']:.2f} reads, "
+        f"{report['writes_per_submit']:.2f} writes"
+    )
+    latency = report["latency_ms"]
+    print(
+        f"Latency ms: p50={latency['p50']:.1f} p95={latency['p95']:.1f} "
+        f"p99={latency['p99']:.1f} max={latency['max']:.1f}"
+    )
+    for status, stats in report["by_status"].items():
+        print(
+            f"- {status}: {stats['count']:,} "
+            f"({stats['reads_per_submit']:.2f} reads, "
+            f"{stats['writes_per_submit']:.2f} writes, "
+            f"p95 {stats['p95_latency_ms']:.1f} ms)"
+        )
+    print(
+        "Firestore cost per 1M submits: "
+        f"${report['firestore_cost_per_million_submits_usd']:.2f}"
+    )
+    counters = report["store"]
+    if counters["contention_retries"]:
+        print(f"Transaction contention retries: {counters['contention_retries']:,}")
+    if counters["reads_after_writes"]:
+        print(
+            "WARNING: transaction reads after writes: "
+            f"{counters['reads_after_writes']:,} (server SDKs reject this ordering)."
+        )
+    hot = [doc for doc in report["hot_documents"] if doc["over_limit"]]
+    for doc in hot:
+        print(
+            f"HOT: {doc['path']} peaked at {doc['peak_writes_per_second']} writes/sec"
+        )
+
+    if args.json_file:
+        args.json_file.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
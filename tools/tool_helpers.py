@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""Small helpers shared by several tools under tools/.
+
+- `normalize_key`: the country/content key rules of `normalizeCountryKey`
+  in the Dart loaders, so Python tools agree with the app on which keys
+  name the same flag or item.
+- `percentile`: nearest-rank percentile over an already sorted list.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+
+
+def normalize_key(raw: str) -> str:
+    """Lowercase; runs of non-alphanumerics become one space; trimmed."""
+    key = re.sub(r"[^a-z0-9]+", " ", raw.lower()).strip()
+    return re.sub(r"\s+", " ", key)
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Smallest value with at least `pct`% of the values at or below it; 0.0 when empty."""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
@@ -0,0 +1,704 @@
+#!/usr/bin/env python3
+"""Static server for the Flutter web build used by the Playwright e2e stage.
+
+`python3 -m http.server` speaks HTTP/1.0 (one TCP connection per request),
+never compresses, and only offers `Last-Modified` revalidation, so every
+spec re-downloads `main.dart.js` and `canvaskit.wasm` in full over fresh
+connections. This server:
+
+- loads the build once and gzips compressible files in a background thread
+  after it is listening (never per request); gzip bodies are served to
+  clients that accept them as soon as they exist
+- answers with correct MIME types (`application/wasm`, `text/javascript`,
+  fonts), a strong `ETag`, and `Cache-Control: immutable` for everything
+  except the entry points (`index.html`, service worker, `version.json`)
+- keeps HTTP/1.1 connections alive and serves them from a thread pool;
+  connections idle for `--idle-timeout` are closed to free their worker
+- supports `Range` requests (identity encoding) and `HEAD`
+- signals readiness by writing `--ready-file` (JSON with url/pid) once the
+  socket is listening; `wait` blocks on that file instead of curl polling
+
+Subcommands:
+- `serve`: serve a directory (e.g. `build/web`).
+- `wait`: block until a ready file appears and its server process is alive.
+- `bench`: compare simulated spec page loads against `python3 -m http.server`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from ready_file import wait_for_ready_file, write_ready_file
+
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_PORT = 7357
+DEFAULT_MAX_AGE = 31_536_000
+MIN_GZIP_BYTES = 1024
+# Each open connection holds a pool worker, so idle keep-alive sockets are
+# closed after this long and the pool is sized well above what a Playwright
+# run opens (6 per browser context).
+DEFAULT_IDLE_TIMEOUT_S = 5.0
+DEFAULT_THREADS = 64
+
+MIME_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+    ".mjs": "text/javascript; charset=utf-8",
+    ".json": "application/json",
+    ".map": "application/json",
+    ".css": "text/css; charset=utf-8",
+    ".wasm": "application/wasm",
+    ".svg": "image/svg+xml",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".ico": "image/x-icon",
+    ".otf": "font/otf",
+    ".ttf": "font/ttf",
+    ".woff": "font/woff",
+    ".woff2": "font/woff2",
+    ".txt": "text/plain; charset=utf-8",
+    ".bin": "application/octet-stream",
+    ".frag": "application/octet-stream",
+}
+COMPRESSIBLE_SUFFIXES = {
+    ".html", ".js", ".mjs", ".json", ".map", ".css", ".wasm", ".svg",
+    ".otf", ".ttf", ".txt", ".bin", ".frag",
+}
+# Entry points must revalidate so a new build is picked up; everything they
+# reference is served immutable for the lifetime of a CI run.
+REVALIDATE_NAMES = {
+    "index.html",
+    "flutter_service_worker.js",
+    "flutter_bootstrap.js",
+    "version.json",
+    "manifest.json",
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class Asset:
+    body: bytes
+    gzip_body: bytes | None
+    etag: str
+    content_type: str
+    cache_control: str
+
+
+class StaticSite:
+    """Every file under `root`, loaded once; gzip variants added by `compress`."""
+
+    def __init__(self, root: Path, max_age: int = DEFAULT_MAX_AGE) -> None:
+        self.root = root.resolve()
+        self.assets: dict[str, Asset] = {}
+        self.raw_bytes = 0
+        self.gzip_bytes = 0
+        for path in sorted(self.root.rglob("*")):
+            if not path.is_file():
+                continue
+            body = path.read_bytes()
+            cache_control = (
+                "no-cache" if path.name in REVALIDATE_NAMES
+                else f"public, max-age={max_age}, immutable"
+            )
+            self.assets["/" + path.relative_to(self.root).as_posix()] = Asset(
+                body=body,
+                gzip_body=None,
+                etag='"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"',
+                content_type=MIME_TYPES.get(path.suffix.lower(), "application/octet-stream"),
+                cache_control=cache_control,
+            )
+            self.raw_bytes += len(body)
+        self.gzip_bytes = self.raw_bytes
+
+    def compress(self, level: int = 6) -> None:
+        """Add gzip variants where they pay off.
+
+        Safe to run while serving: each entry is swapped in whole, and until
+        then the identity body is served.
+        """
+        for rel, asset in list(self.assets.items()):
+            suffix = Path(rel).suffix.lower()
+            if suffix not in COMPRESSIBLE_SUFFIXES or len(asset.body) < MIN_GZIP_BYTES:
+                continue
+            packed = gzip.compress(asset.body, compresslevel=level, mtime=0)
+            if len(packed) < len(asset.body) * 0.9:
+                self.assets[rel] = dataclasses.replace(asset, gzip_body=packed)
+                self.gzip_bytes -= len(asset.body) - len(packed)
+
+    def lookup(self, raw_path: str) -> Asset | None:
+        path = unquote(urlsplit(raw_path).path) or "/"
+        if path.endswith("/"):
+            path += "index.html"
+        asset = self.assets.get(path)
+        if asset is None and not path.endswith("/index.html"):
+            asset = self.assets.get(path.rstrip("/") + "/index.html")
+        return asset
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """First range of a `bytes=` header as inclusive (start, end); None if unsatisfiable."""
+    if not header.startswith("bytes="):
+        return None
+    first = header[len("bytes="):].split(",")[0].strip()
+    start_text, _, end_text = first.partition("-")
+    try:
+        if not start_text:
+            length = int(end_text)
+            if length <= 0:
+                return None
+            return max(0, size - length), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def accepts_gzip(header: str | None) -> bool:
+    if not header:
+        return False
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0")
+    return False
+
+
+class StaticHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; with Nagle on, keep-alive
+    # responses stall on the peer's delayed ACK (~40 ms each).
+    disable_nagle_algorithm = True
+    server: "StaticServer"
+
+    def setup(self) -> None:
+        # Read by StreamRequestHandler.setup; an idle read then ends the connection.
+        self.timeout = self.server.idle_timeout
+        super().setup()
+
+    def do_GET(self) -> None:
+        self._respond(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self._respond(send_body=False)
+
+    def _respond(self, send_body: bool) -> None:
+        asset = self.server.site.lookup(self.path)
+        if asset is None:
+            body = b"Not found\n"
+            self.send_response(HTTPStatus.NOT_FOUND)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+            return
+
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match and asset.etag in (tag.strip() for tag in if_none_match.split(",")):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._common_headers(asset)
+            self.end_headers()
+            return
+
+        range_header = self.headers.get("Range")
+        if range_header:
+            span = parse_range(range_header, len(asset.body))
+            if span is None:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{len(asset.body)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            start, end = span
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self._common_headers(asset)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(asset.body)}")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(memoryview(asset.body)[start : end + 1])
+            return
+
+        body = asset.body
+        self.send_response(HTTPStatus.OK)
+        self._common_headers(asset)
+        if asset.gzip_body is not None and accepts_gzip(self.headers.get("Accept-Encoding")):
+            body = asset.gzip_body
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _common_headers(self, asset: Asset) -> None:
+        self.send_header("Content-Type", asset.content_type)
+        self.send_header("ETag", asset.etag)
+        self.send_header("Cache-Control", asset.cache_control)
+        self.send_header("Accept-Ranges", "bytes")
+        if asset.gzip_body is not None:
+            self.send_header("Vary", "Accept-Encoding")
+
+    def log_message(self, format: str, *args: object) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class StaticServer(HTTPServer):
+    """HTTP/1.1 server handing each accepted connection to a fixed thread pool."""
+
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        site: StaticSite,
+        threads: int,
+        verbose: bool = False,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT_S,
+    ) -> None:
+        super().__init__(address, StaticHandler)
+        self.site = site
+        self.verbose = verbose
+        self.idle_timeout = idle_timeout
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="static")
+
+    def process_request(self, request: socket.socket, client_address: tuple[str, int]) -> None:
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request: socket.socket, client_address: tuple[str, int]) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def serve(args: argparse.Namespace) -> int:
+    if not args.directory.is_dir():
+        print(f"ERROR: directory not found: {args.directory}")
+        return 2
+
+    # CI stops the background server with SIGTERM; clean up the ready file too.
+    # Installed before the ready file exists so an early SIGTERM is handled.
+    def stop(signum: int, frame: object) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    started = time.perf_counter()
+    site = StaticSite(args.directory, max_age=args.max_age)
+    server = StaticServer(
+        (args.host, args.port),
+        site,
+        threads=args.threads,
+        verbose=args.verbose,
+        idle_timeout=args.idle_timeout,
+    )
+    url = f"http://{args.host}:{server.server_address[1]}"
+    print(
+        f"Serving {len(site.assets)} files ({site.raw_bytes / 1e6:.1f} MB) from "
+        f"{args.directory} at {url}; ready in {(time.perf_counter() - started) * 1000:.0f} ms",
+        flush=True,
+    )
+    ready = {"url": url, "pid": os.getpid(), "files": len(site.assets), "compressed": False}
+    if args.ready_file:
+        write_ready_file(args.ready_file, ready)
+
+    def precompress() -> None:
+        compress_started = time.perf_counter()
+        site.compress(args.gzip_level)
+        print(
+            f"Precompressed to {site.gzip_bytes / 1e6:.1f} MB in "
+            f"{(time.perf_counter() - compress_started) * 1000:.0f} ms",
+            flush=True,
+        )
+        if args.ready_file:
+            write_ready_file(args.ready_file, {**ready, "compressed": True})
+
+    if args.gzip_level:
+        threading.Thread(target=precompress, name="precompress", daemon=True).start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.ready_file:
+            args.ready_file.unlink(missing_ok=True)
+    return 0
+
+
+def wait(args: argparse.Namespace) -> int:
+    payload = wait_for_ready_file(args.ready_file, args.timeout)
+    if payload is None:
+        print(f"ERROR: static server not ready after {args.timeout:.0f}s ({args.ready_file}).")
+        return 1
+    print(f"Static server ready at {payload['url']} ({payload['files']} files).")
+    return 0
+
+
+# -----------------
+# Benchmark
+# -----------------
+def build_synthetic_site(root: Path, seed: int = 5) -> None:
+    """Roughly the shape of `flutter build web --release` for this app."""
+    rng = random.Random(seed)
+    words = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz$_") for _ in range(rng.randint(2, 9)))
+        for _ in range(4000)
+    ]
+
+    def js(size: int) -> bytes:
+        parts: list[str] = []
+        total = 0
+        while total < size:
+            line = (
+                f"{rng.choice(words)}:function({rng.choice(words)},{rng.choice(words)})"
+                f"{{return this.{rng.choice(words)}({rng.randint(0, 9999)})}},"
+            )
+            parts.append(line)
+            total += len(line)
+        return "".join(parts).encode()
+
+    def wasm(size: int) -> bytes:
+        # Real wasm compresses to ~40-45%; mix opcode-like runs with noise.
+        chunks = bytearray(b"\0asm\x01\0\0\0")
+        while len(chunks) < size:
+            if rng.random() < 0.5:
+                chunks.extend(rng.randbytes(64))
+            else:
+                chunks.extend(bytes(rng.choice(range(0x20, 0x45)) for _ in range(8)) * 8)
+        return bytes(chunks[:size])
+
+    files = {
+        "index.html": b"<!DOCTYPE html><html><head><script src=\"flutter_bootstrap.js\" async></script>"
+        + b" " * 1200 + b"</head><body></body></html>",
+        "flutter_bootstrap.js": js(12_000),
+        "flutter.js": js(10_000),
+        "main.dart.js": js(2_800_000),
+        "version.json": b'{"app_name":"quiznetic_flutter","version":"1.0.0"}',
+        "manifest.json": b'{"name":"QuizNetic","short_name":"QuizNetic"}',
+        "canvaskit/canvaskit.js": js(90_000),
+        "canvaskit/canvaskit.wasm": wasm(6_800_000),
+        "assets/FontManifest.json": b'[{"family":"MaterialIcons","fonts":[{"asset":"fonts/MaterialIcons-Regular.otf"}]}]',
+        "assets/fonts/MaterialIcons-Regular.otf": wasm(1_600_000),
+        "assets/AssetManifest.bin": js(40_000),
+    }
+    for index in range(120):
+        files[f"assets/assets/flags/flag_{index:03d}.png"] = rng.randbytes(rng.randint(2_000, 9_000))
+    for rel, body in files.items():
+        target = root / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(body)
+
+
+def spec_load(
+    host: str,
+    port: int,
+    paths: list[str],
+    workers: int,
+    cache: dict[str, dict[str, str]] | None,
+) -> tuple[float, int]:
+    """One spec's page load: `workers` parallel connections, like a browser.
+
+    With `cache`, requests revalidate (If-None-Match / If-Modified-Since) and
+    immutable entries are not requested at all.
+    """
+    lock = threading.Lock()
+    queue = list(paths)
+    transferred = 0
+
+    def worker() -> None:
+        nonlocal transferred
+        connection = http.client.HTTPConnection(host, port, timeout=30)
+        while True:
+            with lock:
+                if not queue:
+                    break
+                path = queue.pop(0)
+            headers = {"Accept-Encoding": "gzip, deflate, br"}
+            if cache is not None:
+                known = cache.get(path, {})
+                if "immutable" in known.get("cache-control", ""):
+                    continue
+                if "etag" in known:
+                    headers["If-None-Match"] = known["etag"]
+                elif "last-modified" in known:
+                    headers["If-Modified-Since"] = known["last-modified"]
+            for attempt in range(2):
+                try:
+                    connection.request("GET", path, headers=headers)
+                    response = connection.getresponse()
+                    body = response.read()
+                    break
+                except (http.client.HTTPException, ConnectionError):
+                    # HTTP/1.0 servers close after each response.
+                    connection.close()
+                    connection = http.client.HTTPConnection(host, port, timeout=30)
+                    if attempt:
+                        raise
+            if response.getheader("Content-Encoding") == "gzip":
+                gzip.decompress(body)
+            if response.getheader("Connection", "").lower() == "close" or response.version == 10:
+                connection.close()
+                connection = http.client.HTTPConnection(host, port, timeout=30)
+            with lock:
+                transferred += len(body)
+                if response.status == 200 and cache is not None:
+                    cache[path] = {
+                        key.lower(): value
+                        for key, value in response.getheaders()
+                        if key.lower() in ("etag", "last-modified", "cache-control")
+                    }
+        connection.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started, transferred
+
+
+def idle_connections_case(site_root: Path, threads: int, idle_timeout: float) -> dict[str, float]:
+    """Parks `threads + 4` idle keep-alive connections, then times a new client.
+
+    Without the idle timeout the new client waits until an idle peer leaves;
+    with it, the request is served once the oldest idle connections time out.
+    """
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable, str(Path(__file__).resolve()), "serve", str(site_root),
+            "--host", "127.0.0.1", "--port", str(port), "--gzip-level", "0",
+            "--threads", str(threads), "--idle-timeout", str(idle_timeout),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    idle: list[http.client.HTTPConnection] = []
+    try:
+        wait_for_port(port)
+        for _ in range(threads + 4):
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            connection.request("GET", "/index.html")
+            connection.getresponse().read()
+            idle.append(connection)  # keep-alive: stays open, sends nothing
+        started = time.perf_counter()
+        client = http.client.HTTPConnection("127.0.0.1", port, timeout=idle_timeout + 10)
+        try:
+            client.request("GET", "/index.html")
+            status = client.getresponse().status
+        except OSError:
+            status = 0
+        finally:
+            client.close()
+        return {
+            "threads": threads,
+            "idle_connections": len(idle),
+            "idle_timeout_s": idle_timeout,
+            "new_client_s": time.perf_counter() - started,
+            "status": status,
+        }
+    finally:
+        for connection in idle:
+            connection.close()
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 15.0) -> float:
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return time.perf_counter() - started
+        except OSError:
+            time.sleep(0.01)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def bench(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory(prefix="static-bench-") as tmp:
+        site_root = args.directory
+        if site_root is None:
+            site_root = Path(tmp) / "web"
+            build_synthetic_site(site_root)
+        paths = ["/" + p.relative_to(site_root).as_posix() for p in sorted(site_root.rglob("*")) if p.is_file()]
+        # Browsers fetch the entry point first, then the rest in parallel.
+        paths.sort(key=lambda p: (p != "/index.html", p))
+        ready_file = Path(tmp) / "ready.json"
+
+        servers = {
+            "http.server": lambda port: [
+                sys.executable, "-m", "http.server", str(port),
+                "--bind", "127.0.0.1", "--directory", str(site_root),
+            ],
+            "web_static_server": lambda port: [
+                sys.executable, str(Path(__file__).resolve()), "serve", str(site_root),
+                "--host", "127.0.0.1", "--port", str(port), "--ready-file", str(ready_file),
+            ],
+        }
+        results: dict[str, dict[str, float]] = {}
+        for name, command in servers.items():
+            port = free_port()
+            process = subprocess.Popen(
+                command(port), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            try:
+                startup = wait_for_port(port)
+                if name == "web_static_server":
+                    # Time the steady state, not the first second of precompression.
+                    while not (
+                        ready_file.exists()
+                        and json.loads(ready_file.read_text(encoding="utf-8"))["compressed"]
+                    ):
+                        time.sleep(0.01)
+                cold: list[float] = []
+                warm: list[float] = []
+                cold_bytes = warm_bytes = 0
+                for _ in range(args.specs):
+                    cache: dict[str, dict[str, str]] = {}
+                    elapsed, cold_bytes = spec_load("127.0.0.1", port, paths, args.workers, cache)
+                    cold.append(elapsed)
+                    elapsed, warm_bytes = spec_load("127.0.0.1", port, paths, args.workers, cache)
+                    warm.append(elapsed)
+                results[name] = {
+                    "startup_s": startup,
+                    "cold_s": sorted(cold)[len(cold) // 2],
+                    "warm_s": sorted(warm)[len(warm) // 2],
+                    "cold_mb": cold_bytes / 1e6,
+                    "warm_mb": warm_bytes / 1e6,
+                }
+            finally:
+                process.terminate()
+                process.wait(timeout=10)
+        idle = idle_connections_case(site_root, args.idle_threads, args.idle_timeout)
+
+    print(
+        f"Static server bench: {len(paths)} files, {args.specs} specs, "
+        f"{args.workers} connections (median per spec load)"
+    )
+    print(f"{'':>18} {'startup s':>10} {'cold s':>8} {'cold MB':>8} {'reload s':>9} {'reload MB':>10}")
+    for name, row in results.items():
+        print(
+            f"{name:>18} {row['startup_s']:>10.3f} {row['cold_s']:>8.3f} {row['cold_mb']:>8.2f} "
+            f"{row['warm_s']:>9.3f} {row['warm_mb']:>10.2f}"
+        )
+    stock = results["http.server"]
+    ours = results["web_static_server"]
+    spec_saving = (stock["cold_s"] + stock["warm_s"]) - (ours["cold_s"] + ours["warm_s"])
+    print(
+        f"Per spec (cold load + reload): {stock['cold_s'] + stock['warm_s']:.3f}s -> "
+        f"{ours['cold_s'] + ours['warm_s']:.3f}s ({spec_saving:+.3f}s saved); "
+        f"bytes {stock['cold_mb']:.1f} MB -> {ours['cold_mb']:.1f} MB cold."
+    )
+    # A fresh client must be served once idle workers time out, not hang.
+    idle_ok = idle["status"] == 200 and idle["new_client_s"] <= idle["idle_timeout_s"] + 2.0
+    print(
+        f"Idle keep-alive: {idle['idle_connections']} idle connections on {idle['threads']} threads; "
+        f"new client served in {idle['new_client_s']:.2f}s (idle timeout {idle['idle_timeout_s']:.1f}s)"
+        + ("" if idle_ok else " -- FAILED")
+    )
+    if args.json_file:
+        payload = {**results, "idle_connections": idle}
+        args.json_file.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    return 0 if idle_ok else 1
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Precompressing, cache-aware static server for the Flutter web build.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = sub.add_parser("serve", help="Serve a directory.")
+    serve_parser.add_argument("directory", type=Path, nargs="?", default=ROOT / "build" / "web")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument("--threads", type=int, default=DEFAULT_THREADS)
+    serve_parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT_S,
+        help="Close keep-alive connections idle this many seconds.",
+    )
+    serve_parser.add_argument("--max-age", type=int, default=DEFAULT_MAX_AGE)
+    serve_parser.add_argument(
+        "--gzip-level", type=int, default=6, choices=range(0, 10), help="0 disables gzip.",
+    )
+    serve_parser.add_argument("--ready-file", type=Path, help="Write {url, pid} here once listening.")
+    serve_parser.add_argument("--verbose", action="store_true", help="Log every request.")
+
+    wait_parser = sub.add_parser("wait", help="Block until a ready file is written.")
+    wait_parser.add_argument("--ready-file", type=Path, required=True)
+    wait_parser.add_argument("--timeout", type=float, default=30.0)
+
+    bench_parser = sub.add_parser("bench", help="Compare spec page loads with http.server.")
+    bench_parser.add_argument(
+        "directory",
+        type=Path,
+        nargs="?",
+        help="Web build to serve (default: a synthetic Flutter-shaped build).",
+    )
+    bench_parser.add_argument("--specs", type=int, default=5)
+    bench_parser.add_argument("--workers", type=int, default=6)
+    bench_parser.add_argument(
+        "--idle-threads",
+        type=int,
+        default=4,
+        help="Pool size for the idle-connection case (more idle sockets than this are opened).",
+    )
+    bench_parser.add_argument("--idle-timeout", type=float, default=1.0)
+    bench_parser.add_argument("--json-file", type=Path)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.command == "serve":
+        return serve(args)
+    if args.command == "wait":
+        return wait(args)
+    return bench(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())